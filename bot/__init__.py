@@ -3,12 +3,19 @@ Bot package - Core bot components and utilities.
 
 This package contains the main bot behavior, database access,
 TTS functionality, UI components, and various downloaders.
+
+The exports below load on first access, so importing a light submodule
+(e.g. from a loudness worker process) does not pull in discord and vosk.
 """
 
-from bot.core import Bot
-from bot.environment import Environment
-from bot.database import Database
-from bot.behavior import BotBehavior
+from importlib import import_module
+
+_EXPORTS = {
+    'Bot': 'bot.core',
+    'Environment': 'bot.environment',
+    'Database': 'bot.database',
+    'BotBehavior': 'bot.behavior',
+}
 
 __all__ = [
     'Bot',
@@ -16,3 +23,12 @@ __all__ = [
     'Database',
     'BotBehavior',
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
@@ -18,6 +18,7 @@ import sqlite3
 
 from bot.repositories import ActionRepository, ListRepository, SoundRepository
 from bot.database import Database  # Keep for get_sounds_by_similarity until migrated
+from bot.services.sound_autocomplete import get_sound_autocomplete_service
 from bot.ui import PaginatedSoundListView
 
 
@@ -37,22 +38,12 @@ def _get_repos():
 async def _get_sound_autocomplete(ctx: discord.AutocompleteContext):
     """Autocomplete for sound names."""
     try:
-        _, db = _get_repos()
-        guild_id = getattr(getattr(ctx, "interaction", None), "guild_id", None)
-        current = ctx.value.lower() if ctx.value else ""
-        if not current or len(current) < 2:
-            return []
-        
-        similar_sounds = db.get_sounds_by_similarity(current, 15, guild_id=guild_id)
-        # Return just the filenames without .mp3 extension
-        completions = []
-        for sound_data, _score in similar_sounds:
-            if isinstance(sound_data, (sqlite3.Row, dict)):
-                filename = sound_data["Filename"]
-            else:
-                filename = sound_data[2]
-            completions.append(filename.split('/')[-1].replace('.mp3', ''))
-        return completions
+        interaction = getattr(ctx, "interaction", None)
+        return await get_sound_autocomplete_service().complete(
+            ctx.value,
+            guild_id=getattr(interaction, "guild_id", None),
+            requester=getattr(getattr(interaction, "user", None), "id", None),
+        )
     except Exception as e:
         print(f"Autocomplete error: {e}")
         return []
@@ -16,29 +16,18 @@ import sqlite3
 
 from bot.database import Database
 from bot.models.sound import SoundEffect
+from bot.services.sound_autocomplete import get_sound_autocomplete_service
 
 
 async def _get_sound_autocomplete(ctx: discord.AutocompleteContext):
     """Autocomplete for sound names."""
     try:
-        db = Database()
-        current = ctx.value.lower() if ctx.value else ""
-        if not current or len(current) < 2:
-            return []
-        
-        guild_id = getattr(getattr(ctx, "interaction", None), "guild_id", None)
-        similar_sounds = db.get_sounds_by_similarity(current, 15, guild_id=guild_id)
-        # similar_sounds is a list of (sound_data, score)
-        completions = []
-        for s in similar_sounds:
-            sound_data = s[0]
-            # Robustly get filename from Row, dict, or tuple
-            if isinstance(sound_data, (sqlite3.Row, dict)):
-                filename = sound_data['Filename']
-            else:
-                filename = sound_data[2]
-            completions.append(filename.split('/')[-1].replace('.mp3', ''))
-        return completions
+        interaction = getattr(ctx, "interaction", None)
+        return await get_sound_autocomplete_service().complete(
+            ctx.value,
+            guild_id=getattr(interaction, "guild_id", None),
+            requester=getattr(getattr(interaction, "user", None), "id", None),
+        )
     except Exception as e:
         print(f"Autocomplete error: {e}")
         return []
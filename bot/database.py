@@ -36,6 +36,9 @@ class Database:
     _instance = None
     _sound_cache = None  # In-memory cache: list of (id, original_filename, filename, favorite, blacklist, ...)
     _sound_cache_normalized = None  # Pre-normalized filenames for faster matching
+    _sound_cache_by_id = None  # id -> (sound dict, normalized filename) for indexed lookups
+    _sound_search_available = False  # Whether the sounds_fts trigram index exists
+    FTS_RANK_WEIGHT = 10.0  # Max bonus points added for the best bm25 rank in indexed search
     _cache_timestamp = None  # Track when cache was last refreshed
 
     def __new__(cls, *args, **kwargs):
@@ -82,6 +85,18 @@ class Database:
         # Share connection with repositories for consistency
         from bot.repositories.base import BaseRepository
         BaseRepository.set_shared_connection(self.conn, self.db_path)
+
+        # FTS5 trigram index over sound names (optional; LIKE/full scans are the fallback).
+        self._ensure_sound_search_index()
+
+        # Trigger-maintained filter options for the web soundboard tables.
+        self._ensure_web_filter_facets()
+
+        # Persisted sound durations for the web duration map.
+        self._ensure_sound_durations()
+
+        # Precomputed similar-sound lists (filled by the background index job).
+        self._ensure_sound_neighbors()
         
         # Initialize sound cache on first run
         self._load_sound_cache()
@@ -100,23 +115,77 @@ class Database:
                  self.normalize_text(sound['Filename'] if isinstance(sound, sqlite3.Row) else sound[2]))
                 for sound in Database._sound_cache
             ]
+            Database._sound_cache_by_id = {
+                sound["id"]: (sound, normalized)
+                for sound, normalized in Database._sound_cache_normalized
+            }
             Database._cache_timestamp = time.time()
             print(f"[Database] Sound cache loaded: {len(Database._sound_cache)} sounds")
         except sqlite3.Error as e:
             print(f"[Database] Error loading sound cache: {e}")
             Database._sound_cache = []
             Database._sound_cache_normalized = []
+            Database._sound_cache_by_id = {}
 
     def refresh_sound_cache(self):
         """Manually refresh the sound cache (call after adding/removing sounds)."""
         self._load_sound_cache()
 
+    def get_sound_cache_snapshot(self):
+        """Return the pre-normalized sound cache and when it was loaded.
+
+        Returns:
+            ``(entries, timestamp)`` where ``entries`` is a list of
+            ``(sound dict, normalized filename)`` pairs, or ``(None, None)``
+            while the cache is invalidated. The list is shared; do not mutate it.
+        """
+        return Database._sound_cache_normalized, Database._cache_timestamp
+
     def invalidate_sound_cache(self):
         """Invalidate the cache so it reloads on next similarity search."""
         Database._sound_cache = None
         Database._sound_cache_normalized = None
+        Database._sound_cache_by_id = None
         Database._cache_timestamp = None
 
+    def _ensure_sound_search_index(self):
+        """Create the sound-name FTS index when this SQLite build supports it."""
+        from bot.repositories.sound_search import SoundSearchRepository
+
+        try:
+            SoundSearchRepository().ensure_schema()
+            Database._sound_search_available = True
+        except sqlite3.Error as e:
+            Database._sound_search_available = False
+            print(f"[Database] Sound search index unavailable, using full scans: {e}")
+
+    def _ensure_web_filter_facets(self):
+        """Create the precomputed web filter facets and their sync triggers."""
+        from bot.repositories.web_filter_facets import WebFilterFacetRepository
+
+        try:
+            WebFilterFacetRepository().ensure_schema()
+        except sqlite3.Error as e:
+            print(f"[Database] Web filter facets unavailable, using DISTINCT scans: {e}")
+
+    def _ensure_sound_durations(self):
+        """Create the persisted sound-duration table and its invalidation triggers."""
+        from bot.repositories.sound_duration import SoundDurationRepository
+
+        try:
+            SoundDurationRepository().ensure_schema()
+        except sqlite3.Error as e:
+            print(f"[Database] Sound duration table unavailable: {e}")
+
+    def _ensure_sound_neighbors(self):
+        """Create the similar-sound neighbor tables and their change-queue triggers."""
+        from bot.repositories.sound_neighbors import SoundNeighborRepository
+
+        try:
+            SoundNeighborRepository().ensure_schema()
+        except sqlite3.Error as e:
+            print(f"[Database] Similar-sound table unavailable, using live search: {e}")
+
     def _table_exists(self, table_name: str) -> bool:
         """Return True if a SQLite table exists."""
         row = self.conn.execute(
@@ -607,41 +676,35 @@ class Database:
     # ===== Fuzzy similarity search (complex logic kept here) =====
     
     def normalize_text(self, text):
-        """Normalize text for fuzzy matching.
-        
-        Handles:
-        - Leet-speak substitutions (0->o, 1->i, etc.)
-        - File extensions (.mp3)
-        - Special characters (hyphens, underscores -> spaces)
-        - Multiple spaces collapsed to single space
-        """
-        import re
-        
-        # Leet-speak substitutions
-        substitutions = {
-            '0': 'o',
-            '1': 'i',
-            '3': 'e',
-            '4': 'a',
-            '5': 's',
-            '7': 't',
-            '@': 'a',
-            '$': 's',
-            '!': 'i',
-        }
-        for key, value in substitutions.items():
-            text = text.replace(key, value)
-        
-        # Remove .mp3 extension
-        text = text.replace('.mp3', '')
-        
-        # Replace hyphens and underscores with spaces (improves tokenization)
-        text = re.sub(r'[-_]+', ' ', text)
-        
-        # Collapse multiple spaces to single space
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text.lower()
+        """Normalize text for fuzzy matching (see ``normalize_sound_text``)."""
+        from bot.repositories.sound_search import normalize_sound_text
+
+        return normalize_sound_text(text)
+
+    @staticmethod
+    def _is_similarity_candidate(sound_dict, guild_id=None):
+        """Return whether a cached sound may appear in similarity results."""
+        if sound_dict.get('is_elevenlabs', 0) == 1:
+            return False
+        if sound_dict.get('blacklist', 0) == 1:
+            return False
+        sound_guild_id = sound_dict.get("guild_id")
+        if guild_id is not None and sound_guild_id not in (None, str(guild_id), guild_id):
+            return False
+        return True
+
+    @staticmethod
+    def _score_similarity(normalized_req, normalized_filename, sound_dict, guild_id=None):
+        """Combine RapidFuzz ratios into the weighted similarity score."""
+        token_set_score = fuzz.token_set_ratio(normalized_req, normalized_filename)
+        partial_ratio_score = fuzz.partial_ratio(normalized_req, normalized_filename)
+        token_sort_score = fuzz.token_sort_ratio(normalized_req, normalized_filename)
+
+        # Combine scores with weighted average
+        combined_score = (0.5 * token_set_score) + (0.3 * partial_ratio_score) + (0.2 * token_sort_score)
+        if guild_id is not None and str(sound_dict.get("guild_id")) == str(guild_id):
+            combined_score += 5.0  # Prefer guild-local sounds over global fallback.
+        return combined_score
 
     def get_sounds_by_similarity(self, req_sound, num_results=5, sleep_interval=0.0, guild_id=None):
         """Return the most similar sounds using in-memory cache.
@@ -663,26 +726,12 @@ class Database:
         
         # Use cached sounds with pre-normalized filenames
         for sound, normalized_filename in Database._sound_cache_normalized:
-            # Skip ElevenLabs generated sounds
+            # Skip ElevenLabs generated, blacklisted and other-guild sounds
             sound_dict = sound if isinstance(sound, dict) else dict(sound)
-            if sound_dict.get('is_elevenlabs', 0) == 1:
-                continue
-            if sound_dict.get('blacklist', 0) == 1:
+            if not self._is_similarity_candidate(sound_dict, guild_id):
                 continue
-            sound_guild_id = sound_dict.get("guild_id")
-            if guild_id is not None and sound_guild_id not in (None, str(guild_id), guild_id):
-                continue
-            
-            # Calculate multiple fuzzy matching scores (same algorithms, C++ speed)
-            token_set_score = fuzz.token_set_ratio(normalized_req, normalized_filename)
-            partial_ratio_score = fuzz.partial_ratio(normalized_req, normalized_filename)
-            token_sort_score = fuzz.token_sort_ratio(normalized_req, normalized_filename)
-
-            # Combine scores with weighted average
-            combined_score = (0.5 * token_set_score) + (0.3 * partial_ratio_score) + (0.2 * token_sort_score)
-            if guild_id is not None and str(sound_guild_id) == str(guild_id):
-                combined_score += 5.0  # Prefer guild-local sounds over global fallback.
 
+            combined_score = self._score_similarity(normalized_req, normalized_filename, sound_dict, guild_id)
             scored_matches.append((combined_score, sound))
         
         # Sort by combined score descending
@@ -694,91 +743,56 @@ class Database:
         print("Sounds found successfully")
         return [(match[1], match[0]) for match in top_matches]  # (sound data, score) pairs
 
-    def get_sounds_by_similarity_optimized(self, req_sound, num_results=5):
-        """Optimized similarity search using SQL pre-filtering."""
+    def get_sounds_by_similarity_indexed(self, req_sound, num_results=5, guild_id=None, candidate_limit=200):
+        """Return similar sounds, prefiltering candidates through the FTS trigram index.
+
+        Candidates sharing trigrams with the request are fetched in bm25 order,
+        then re-scored with the usual fuzzy ratios plus a bonus of up to
+        ``FTS_RANK_WEIGHT`` points for the best bm25 rank. Falls back to the
+        full ``get_sounds_by_similarity`` scan when the index is unavailable,
+        the query is too short, or too few candidates survive filtering.
+        """
+        if not Database._sound_search_available:
+            return self.get_sounds_by_similarity(req_sound, num_results, guild_id=guild_id)
+
+        if Database._sound_cache_by_id is None:
+            self._load_sound_cache()
+
+        from bot.repositories.sound_search import SoundSearchRepository
+
         normalized_req = self.normalize_text(req_sound)
         try:
-            # Split the search term into words
-            search_words = normalized_req.replace('-', ' ').split()
-            
-            # Build dynamic SQL query
-            like_conditions = []
-            params = []
-
-            # Handle special word combinations
-            i = 0
-            while i < len(search_words):
-                current_word = search_words[i]
-                next_word = search_words[i + 1] if i + 1 < len(search_words) else None
-
-                # Handle "he is" / "hes" variations
-                if current_word == "he" and next_word == "is":
-                    like_conditions.extend([
-                        "LOWER(Filename) LIKE ?",
-                        "LOWER(Filename) LIKE ?"
-                    ])
-                    params.extend([f"%he%is%", f"%hes%"])
-                    i += 2
-                    continue
-                elif current_word == "hes":
-                    like_conditions.extend([
-                        "LOWER(Filename) LIKE ?",
-                        "LOWER(Filename) LIKE ?"
-                    ])
-                    params.extend([f"%he%is%", f"%hes%"])
-                elif current_word == "is":
-                    like_conditions.extend([
-                        "LOWER(Filename) LIKE ?",
-                        "LOWER(Filename) LIKE ?"
-                    ])
-                    params.extend([f"%is%", f"%'s%"])
-                else:
-                    like_conditions.append("LOWER(Filename) LIKE ?")
-                    params.append(f"%{current_word}%")
+            candidates = SoundSearchRepository().find_similar_candidates(normalized_req, limit=candidate_limit)
+        except sqlite3.Error as e:
+            print(f"[Database] Sound search index query failed: {e}")
+            candidates = None
+        if candidates is None:
+            return self.get_sounds_by_similarity(req_sound, num_results, guild_id=guild_id)
 
-                i += 1
+        best_rank = min((rank for _sound_id, rank in candidates), default=0.0)
+        scored_matches = []
+        for sound_id, rank in candidates:
+            cached = Database._sound_cache_by_id.get(sound_id)
+            if cached is None:
+                continue
+            sound, normalized_filename = cached
+            if not self._is_similarity_candidate(sound, guild_id):
+                continue
 
-            # Add full phrase match
-            like_conditions.append("LOWER(Filename) LIKE ?")
-            full_phrase = normalized_req.replace(' ', '%')
-            params.append(f"%{full_phrase}%")
-            
-            query = f"""
-                SELECT * FROM sounds 
-                WHERE ({" OR ".join(like_conditions)})
-                LIMIT 150
-            """
-            
-            self.cursor.execute(query, tuple(params))
-            potential_matches = self.cursor.fetchall()
-
-            if not potential_matches:
-                return []
-
-            # Score matches using multiple fuzzy ratios
-            scored_matches = []
-            for sound in potential_matches:
-                filename = sound[2]
-                normalized_filename = self.normalize_text(filename)
-                
-                token_set_score = fuzz.token_set_ratio(normalized_req, normalized_filename)
-                partial_ratio_score = fuzz.partial_ratio(normalized_req, normalized_filename)
-                token_sort_score = fuzz.token_sort_ratio(normalized_req, normalized_filename)
-                
-                # Bonus for matches containing all search words
-                all_words_present = all(word in normalized_filename for word in search_words)
-                word_presence_bonus = 20 if all_words_present else 0
-                
-                combined_score = (0.5 * token_set_score) + (0.3 * partial_ratio_score) + (0.2 * token_sort_score) + word_presence_bonus
-                scored_matches.append((combined_score, sound))
-            
-            # Sort and return top matches
-            scored_matches.sort(key=lambda x: x[0], reverse=True)
-            return [(match[1], match[0]) for match in scored_matches[:num_results]]
-            
-        except sqlite3.Error as e:
-            print(f"An error occurred: {e}")
-            return []
+            combined_score = self._score_similarity(normalized_req, normalized_filename, sound, guild_id)
+            if best_rank < 0:
+                combined_score += self.FTS_RANK_WEIGHT * (rank / best_rank)
+            scored_matches.append((combined_score, sound))
+
+        if len(scored_matches) < num_results:
+            return self.get_sounds_by_similarity(req_sound, num_results, guild_id=guild_id)
+
+        scored_matches.sort(key=lambda x: x[0], reverse=True)
+        return [(match[1], match[0]) for match in scored_matches[:num_results]]
+
+    def get_sounds_by_similarity_optimized(self, req_sound, num_results=5):
+        """Optimized similarity search using the FTS trigram index for pre-filtering."""
+        return self.get_sounds_by_similarity_indexed(req_sound, num_results)
 
     # ===== Sound lookup (used by downloaders) =====
     
@@ -3,21 +3,34 @@ Sound downloader using Selenium.
 
 This module provides functionality to scrape sounds from MyInstants
 and automatically add them to the database.
+
+A scrape run checks candidates against one in-memory set of known
+filenames, downloads new files through a bounded pool sharing one pooled
+HTTP session (with a minimum request spacing, ``Retry-After`` handling and
+recent 404s remembered in ``data/scraper_http_cache.json``), and
+``move_sounds`` normalizes each batch through the shared loudness process
+pool before inserting it with one sounds/actions write and one cache
+invalidation.
+
+A file that is already in Downloads, Sounds or the database is skipped
+without a request, so a GET only happens when no local copy exists; it is
+therefore always a full GET (a 304 would leave the sound missing).
 """
 
 import asyncio
 import glob
+import json
 import os
 import random
 import shutil
+import sqlite3
 import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any
+from typing import Any, Optional
 
 import requests
-from pydub import AudioSegment
-from pydub.effects import compress_dynamic_range
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -27,6 +40,58 @@ from selenium.webdriver.support.ui import WebDriverWait
 from unidecode import unidecode
 from webdriver_manager.chrome import ChromeDriverManager
 
+import config
+from bot.repositories.action import ActionRepository
+from bot.repositories.sound import SoundRepository
+from bot.services.loudness import get_loudness_normalizer, ingest_target_from_env, normalize_file
+
+
+def _env_float(name: str, default: float) -> float:
+    """Parse a float environment variable, falling back on bad values."""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class _RequestSpacer:
+    """
+    Keep request starts at least ``min_interval`` apart across threads.
+    """
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = max(0.0, min_interval)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller may start a request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def back_off(self, seconds: float) -> None:
+        """Push every following request back after a 429/503."""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def normalize_sound_file(sound_file: str, target_dBFS: float) -> None:
+    """
+    Normalize a sound file to a target volume level in place.
+
+    Runs the loudness engine in the calling thread; ``move_sounds`` goes
+    through the shared loudness pool instead.
+
+    Args:
+        sound_file: Path to the MP3 file.
+        target_dBFS: Target volume level in dBFS.
+    """
+    normalize_file(sound_file, ingest_target_from_env(target_dBFS))
+
 
 class SoundDownloader:
     """
@@ -38,6 +103,8 @@ class SoundDownloader:
     
     # Number of threads to use for downloading sounds
     DOWNLOAD_THREADS = 8
+    # How long a 404 is remembered before the URL is tried again
+    NOT_FOUND_RETRY_SECONDS = 7 * 86400
     
     def __init__(self, bot, db, chromedriver_path: str = ""):
         """
@@ -61,6 +128,20 @@ class SoundDownloader:
                 # Fallback to auto-download
                 self.chromedriver_path = ChromeDriverManager().install()
         self.dwdir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "downloads"))
+        self.sounds_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds"))
+        self.download_workers = max(
+            1, int(_env_float("SCRAPER_DOWNLOAD_WORKERS", self.DOWNLOAD_THREADS))
+        )
+        self.http_cache_path = os.getenv("SCRAPER_HTTP_CACHE_PATH", "").strip() or str(
+            config.DATA_DIR / "scraper_http_cache.json"
+        )
+        # Per-run state, set up by download_sound().
+        self._known_filenames: set[str] = set()
+        self._known_lock = threading.Lock()
+        self._http_cache: dict[str, dict[str, Any]] = {}
+        self._http_cache_lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._spacer = _RequestSpacer(_env_float("SCRAPER_DOWNLOAD_MIN_INTERVAL_SECONDS", 0.1))
         
     def _create_driver(self):
         """Create a new Chrome WebDriver instance."""
@@ -80,35 +161,98 @@ class SoundDownloader:
         options.add_argument('window-size=1200x600')
         return webdriver.Chrome(service=service, options=options)
 
-    def _check_sound_exists_in_db(self, filename: str) -> bool:
+    def _load_known_filenames(self) -> set[str]:
         """
-        Check if sound exists in database.
-        
-        Args:
-            filename: Original filename to check.
-            
-        Returns:
-            True if sound exists, False otherwise.
+        Return every filename a scrape should skip, in one pass.
+
+        Combines all original filenames in the database with the files
+        already in the Sounds and Downloads folders.
         """
+        known: set[str] = set()
         try:
-            # Create a local connection/cursor for thread safety
-            # SQLite cursors are not reentrant, so we must not reuse self.db.cursor
-            # when called from multiple threads simultaneously (as in ThreadPoolExecutor)
-            import sqlite3
-            conn = sqlite3.connect(self.db.db_path, timeout=5.0)
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM sounds WHERE originalfilename = ?", (filename,))
-            result = cursor.fetchone()
-            conn.close()
-            return result is not None
-        except Exception as e:
-            print(f"{self.__class__.__name__}: DB check error: {e}")
-            return False
+            known.update(
+                SoundRepository(db_path=self.db.db_path, use_shared=False).get_original_filenames()
+            )
+        except sqlite3.Error as e:
+            print(f"{self.__class__.__name__}: DB filename load error: {e}")
+        for directory in (self.sounds_dir, self.dwdir):
+            try:
+                known.update(os.listdir(directory))
+            except OSError:
+                pass
+        return known
+
+    def _is_known(self, filename: str) -> bool:
+        with self._known_lock:
+            return filename in self._known_filenames
+
+    # ── HTTP: pooled session, request spacing, 404 cache ─────────────────
+
+    def _open_session(self) -> requests.Session:
+        """Create the session shared by the download pool."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.download_workers,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _load_http_cache(self) -> dict[str, dict[str, Any]]:
+        """Load remembered 404s, dropping expired and non-404 entries."""
+        try:
+            with open(self.http_cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        cutoff = time.time() - self.NOT_FOUND_RETRY_SECONDS
+        return {
+            url: entry
+            for url, entry in cache.items()
+            if isinstance(entry, dict)
+            and entry.get("status") == 404
+            and float(entry.get("checked_at") or 0) >= cutoff
+        }
+
+    def _save_http_cache(self) -> None:
+        """Persist remembered 404s for the next run."""
+        with self._http_cache_lock:
+            snapshot = dict(self._http_cache)
+        tmp_path = f"{self.http_cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.http_cache_path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.http_cache_path)
+        except OSError as e:
+            print(f"{self.__class__.__name__}: Could not save HTTP cache: {e}")
+
+    def _get_with_backoff(self, url: str, headers: dict[str, str]) -> requests.Response:
+        """GET through the shared session, retrying once after a 429/503."""
+        session = self._session or self._open_session()
+        for attempt in range(2):
+            self._spacer.wait()
+            response = session.get(url, headers=headers, timeout=30)
+            if response.status_code not in (429, 503) or attempt:
+                return response
+            try:
+                delay = float(response.headers.get("Retry-After", "5"))
+            except ValueError:
+                delay = 5.0
+            self._spacer.back_off(min(60.0, max(1.0, delay)))
+        return response
 
     def _download_single_file(self, url: str, filename: str) -> tuple[str, bool, str]:
         """
         Download a single file from a URL.
         
+        Files are written as ``<name>.part`` and renamed when complete so
+        ``move_sounds`` never picks up a partial MP3.
+
         Args:
             url: URL to download from.
             filename: Name to save the file as.
@@ -123,30 +267,49 @@ class SoundDownloader:
                 return (filename, False, "already exists in Downloads")
             
             # Check if file already exists in Sounds folder
-            sounds_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds"))
-            sounds_file_path = os.path.join(sounds_dir, filename)
-            if os.path.exists(sounds_file_path):
+            if os.path.exists(os.path.join(self.sounds_dir, filename)):
                 return (filename, False, "already exists in sounds")
             
-            # Re-check database right before download (thread-safe, catches race conditions)
-            if self._check_sound_exists_in_db(filename):
+            if self._is_known(filename):
                 return (filename, False, "already in database")
-            
-            response = requests.get(url, timeout=30)
+
+            with self._http_cache_lock:
+                cached = self._http_cache.get(url) or {}
+            if time.time() - float(cached.get("checked_at") or 0) < self.NOT_FOUND_RETRY_SECONDS:
+                return (filename, False, "404 not found (cached)")
+
+            # No local copy exists, so this is a full GET without validators.
+            response = self._get_with_backoff(url, {})
             if response.status_code == 404:
+                with self._http_cache_lock:
+                    self._http_cache[url] = {"status": 404, "checked_at": time.time()}
                 return (filename, False, "404 not found")
-            with open(out_file_path, 'wb') as out_file:
+            if response.status_code != 200:
+                return (filename, False, f"HTTP {response.status_code}")
+
+            part_path = out_file_path + ".part"
+            with open(part_path, 'wb') as out_file:
                 out_file.write(response.content)
+            os.replace(part_path, out_file_path)
+            with self._http_cache_lock:
+                self._http_cache.pop(url, None)
+            with self._known_lock:
+                self._known_filenames.add(filename)
             return (filename, True, "")
         except Exception as e:
             return (filename, False, str(e))
 
-    def _scrape_single_site(self, country: str) -> tuple[list[tuple[str, str]], int]:
+    def _scrape_single_site(
+        self,
+        country: str,
+        known_filenames: Optional[set[str]] = None,
+    ) -> tuple[list[tuple[str, str]], int]:
         """
         Scrape a single MyInstants site for sound URLs.
         
         Args:
             country: Country code (pt, us, br).
+            known_filenames: Filenames to skip; loaded when not given.
             
         Returns:
             Tuple of:
@@ -156,6 +319,8 @@ class SoundDownloader:
         driver = None
         sounds_to_download = []
         sounds_seen = 0
+        if known_filenames is None:
+            known_filenames = self._load_known_filenames()
         
         try:
             print(f"{self.__class__.__name__}: Opening Chrome for {country}")
@@ -200,14 +365,7 @@ class SoundDownloader:
                     filename = filename.replace('"', '')
                     url = "https://www.myinstants.com/media/sounds/" + filename
 
-                    if not self._check_sound_exists_in_db(filename):
-                        # Also check if file already exists on disk
-                        sounds_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds"))
-                        downloads_dir = self.dwdir
-                        if os.path.exists(os.path.join(sounds_dir, filename)):
-                            continue
-                        if os.path.exists(os.path.join(downloads_dir, filename)):
-                            continue
+                    if filename not in known_filenames:
                         sounds_to_download.append((url, filename))
                 except Exception as e:
                     print(f"{self.__class__.__name__}: Error processing sound element: {e}")
@@ -237,11 +395,14 @@ class SoundDownloader:
         per_country_sounds_seen: dict[str, int] = {}
         total_sounds_seen = 0
         scrape_errors = 0
+        with self._known_lock:
+            self._known_filenames = self._load_known_filenames()
+            known_filenames = frozenset(self._known_filenames)
         
         # Scrape all sites concurrently using threads
         print(f"{self.__class__.__name__}: Starting scrape of all {len(countries)} sites concurrently")
         with ThreadPoolExecutor(max_workers=len(countries)) as executor:
-            futures = {executor.submit(self._scrape_single_site, country): country 
+            futures = {executor.submit(self._scrape_single_site, country, known_filenames): country 
                       for country in countries}
             
             for future in as_completed(futures):
@@ -278,28 +439,35 @@ class SoundDownloader:
                 "duration_seconds": round(time.time() - start_time, 1),
             }
         
-        # Download all sounds concurrently using thread pool
+        # Download all sounds through a bounded pool sharing one HTTP session
         new_sounds_downloaded = 0
         new_sounds_invalid = 0
+        self._http_cache = self._load_http_cache()
+        self._session = self._open_session()
         
-        print(f"{self.__class__.__name__}: Starting download with {self.DOWNLOAD_THREADS} threads")
-        with ThreadPoolExecutor(max_workers=self.DOWNLOAD_THREADS) as executor:
-            futures = {executor.submit(self._download_single_file, url, filename): filename 
-                      for url, filename in unique_sounds}
-            
-            for future in as_completed(futures):
-                filename = futures[future]
-                try:
-                    fname, success, error = future.result()
-                    if success:
-                        new_sounds_downloaded += 1
-                        print(f"{self.__class__.__name__}: Downloaded {fname}")
-                    else:
+        print(f"{self.__class__.__name__}: Starting download with {self.download_workers} threads")
+        try:
+            with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+                futures = {executor.submit(self._download_single_file, url, filename): filename 
+                          for url, filename in unique_sounds}
+                
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    try:
+                        fname, success, error = future.result()
+                        if success:
+                            new_sounds_downloaded += 1
+                            print(f"{self.__class__.__name__}: Downloaded {fname}")
+                        else:
+                            new_sounds_invalid += 1
+                            print(f"{self.__class__.__name__}: Failed to download {fname}: {error}")
+                    except Exception as e:
                         new_sounds_invalid += 1
-                        print(f"{self.__class__.__name__}: Failed to download {fname}: {error}")
-                except Exception as e:
-                    new_sounds_invalid += 1
-                    print(f"{self.__class__.__name__}: Error downloading {filename}: {e}")
+                        print(f"{self.__class__.__name__}: Error downloading {filename}: {e}")
+        finally:
+            self._session.close()
+            self._session = None
+            self._save_http_cache()
         
         print(
             f"{self.__class__.__name__}: Sound Downloader finished. "
@@ -323,50 +491,132 @@ class SoundDownloader:
         """
         Monitor Downloads directory and move new sounds to Sounds directory.
         
-        Runs as a background task, checking every 10 seconds for new MP3 files,
-        normalizing their volume, and adding them to the database.
+        Runs as a background task, checking every 10 seconds for new MP3 files
+        and importing each batch with ``_import_downloaded_files``.
         """
-        # Import here to avoid circular imports
-        from bot.database import Database
-        from bot.services.sound_import_notifications import SoundImportNotificationService
         target_dbfs = float(os.getenv("SOUND_INGEST_TARGET_DBFS", "-18.0"))
         
         while True:
-            downloads_path = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), "..", "..", "downloads", "*.mp3")
-            )
-            list_of_files = glob.glob(downloads_path)
-            
-            for file in list_of_files:
+            downloads_path = os.path.join(self.dwdir, "*.mp3")
+            list_of_files = sorted(glob.glob(downloads_path))
+            if list_of_files:
                 try:
-                    print(self.__class__.__name__, " MOVER: ", file, " chosen")
-                    print(self.__class__.__name__, " MOVER: Adjusting sound volume")
-                    self.adjust_volume(file, target_dbfs)
-                    destination_folder = os.path.abspath(
-                        os.path.join(os.path.dirname(__file__), "..", "..", "sounds")
-                    )
-                    
-                    if not self.db.get_sound(os.path.basename(file), original_filename=True):
-                        print(self.__class__.__name__, " MOVER: Moving file to " + destination_folder)
-                        notif_service = SoundImportNotificationService()
-                        await notif_service.send_notification(
-                            behavior=self.bot,
-                            filename=os.path.basename(file),
-                            source="scraper",
-                        )
-                        shutil.move(file, os.path.join(destination_folder, os.path.basename(file)))
-                        self.db.insert_sound(os.path.basename(file), os.path.basename(file))
-                        self.db.insert_action("admin", "scrape_sound", os.path.basename(file))
-                    else:
-                        print(self.__class__.__name__, " MOVER: Sound already exists ", os.path.basename(file))
-                        print(self.__class__.__name__, " MOVER: Removing file")
-                        os.remove(file)
+                    await self._import_downloaded_files(list_of_files, target_dbfs)
                 except Exception as e:
-                    print(self.__class__.__name__, " MOVER: Error moving sound: ", e)
-                    os.remove(file)
+                    print(self.__class__.__name__, " MOVER: Error importing batch: ", e)
                     
             await asyncio.sleep(10)
 
+    async def _import_downloaded_files(self, files: list[str], target_dbfs: float) -> list[str]:
+        """
+        Normalize, move, register and announce a batch of downloaded files.
+
+        Files already in the database are removed. The rest are normalized
+        through the shared loudness pool, moved into Sounds and inserted with
+        one sounds write, one actions write and one sound-cache invalidation
+        for the whole batch, then announced one by one. Database writes run
+        in a worker thread; if the sounds insert fails the moved files go
+        back to Downloads unannounced so the next pass retries them.
+
+        Args:
+            files: Paths of MP3 files in the Downloads folder.
+            target_dbfs: Loudness target passed to ``normalize_sound_file``.
+
+        Returns:
+            Filenames that were imported.
+        """
+        # Import here to avoid circular imports
+        from bot.services.sound_import_notifications import SoundImportNotificationService
+
+        sound_repository = SoundRepository(db_path=self.db.db_path, use_shared=False)
+        known = await asyncio.to_thread(sound_repository.get_original_filenames)
+        fresh = []
+        for file in files:
+            if os.path.basename(file) in known:
+                print(self.__class__.__name__, " MOVER: Sound already exists ", os.path.basename(file))
+                print(self.__class__.__name__, " MOVER: Removing file")
+                self._remove_quietly(file)
+            else:
+                fresh.append(file)
+        if not fresh:
+            return []
+
+        print(self.__class__.__name__, f" MOVER: Adjusting sound volume for {len(fresh)} file(s)")
+        errors = await self._normalize_files(fresh, target_dbfs)
+
+        imported = []
+        moves = []
+        for file, error in zip(fresh, errors):
+            filename = os.path.basename(file)
+            try:
+                if error is not None:
+                    raise error
+                print(self.__class__.__name__, " MOVER: Moving file to " + self.sounds_dir)
+                destination = os.path.join(self.sounds_dir, filename)
+                shutil.move(file, destination)
+                moves.append((file, destination))
+                imported.append(filename)
+            except Exception as e:
+                print(self.__class__.__name__, " MOVER: Error moving sound: ", e)
+                self._remove_quietly(file)
+
+        if not imported:
+            return imported
+        try:
+            await asyncio.to_thread(sound_repository.insert_sounds, imported)
+        except Exception:
+            print(self.__class__.__name__, f" MOVER: Insert failed, returning {len(moves)} file(s) to Downloads")
+            for source, destination in moves:
+                try:
+                    shutil.move(destination, source)
+                except OSError as e:
+                    print(self.__class__.__name__, " MOVER: Could not roll back move: ", e)
+            raise
+        self.db.invalidate_sound_cache()
+        try:
+            action_repository = ActionRepository(db_path=self.db.db_path, use_shared=False)
+            await asyncio.to_thread(action_repository.insert_many, "admin", "scrape_sound", imported)
+        except Exception as e:
+            print(self.__class__.__name__, " MOVER: Error logging scrape actions: ", e)
+
+        notif_service = SoundImportNotificationService()
+        for filename in imported:
+            try:
+                await notif_service.send_notification(
+                    behavior=self.bot,
+                    filename=filename,
+                    source="scraper",
+                )
+            except Exception as e:
+                print(self.__class__.__name__, " MOVER: Error announcing sound: ", e)
+        return imported
+
+    async def _normalize_files(self, files: list[str], target_dbfs: float) -> list[Optional[Exception]]:
+        """
+        Normalize a batch off the event loop through the shared loudness pool.
+
+        Each file waits on ``get_loudness_normalizer()`` from its own worker
+        thread, so the batch spreads over the pool's processes without
+        starting a pool per batch.
+
+        Returns:
+            One entry per file: ``None`` on success, else the exception.
+        """
+        normalizer = get_loudness_normalizer()
+        target = ingest_target_from_env(target_dbfs)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(normalizer.normalize, file, target, source="scrape") for file in files),
+            return_exceptions=True,
+        )
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    @staticmethod
+    def _remove_quietly(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
     def scroll_a_little(self, driver) -> None:
         """
         Scroll the page to load more content.
@@ -392,39 +642,4 @@ class SoundDownloader:
             sound_file: Path to the MP3 file.
             target_dBFS: Target volume level in dBFS.
         """
-        sound = AudioSegment.from_file(sound_file, format="mp3")
-        if float(sound.dBFS) == float("-inf"):
-            return
-
-        compression_enabled = (
-            os.getenv("SOUND_INGEST_COMPRESS_ENABLED", "true").strip().lower()
-            not in {"0", "false", "off", "no"}
-        )
-        compression_threshold_dbfs = float(
-            os.getenv("SOUND_INGEST_COMPRESS_THRESHOLD_DBFS", "-14.0")
-        )
-        compression_ratio = max(
-            1.0,
-            float(os.getenv("SOUND_INGEST_COMPRESS_RATIO", "6.0")),
-        )
-        peak_ceiling_dbfs = float(
-            os.getenv("SOUND_INGEST_PEAK_CEILING_DBFS", "-2.0")
-        )
-
-        working_sound = sound
-        if compression_enabled:
-            working_sound = compress_dynamic_range(
-                working_sound,
-                threshold=compression_threshold_dbfs,
-                ratio=compression_ratio,
-                attack=5.0,
-                release=80.0,
-            )
-
-        desired_gain = target_dBFS - float(working_sound.dBFS)
-        max_allowed_gain = peak_ceiling_dbfs - float(working_sound.max_dBFS)
-        gain = min(desired_gain, max_allowed_gain)
-        adjusted_sound = working_sound.apply_gain(gain)
-        if float(adjusted_sound.max_dBFS) > peak_ceiling_dbfs:
-            adjusted_sound = adjusted_sound.apply_gain(peak_ceiling_dbfs - float(adjusted_sound.max_dBFS))
-        adjusted_sound.export(sound_file, format="mp3")
+        normalize_sound_file(sound_file, target_dBFS)
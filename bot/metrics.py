@@ -0,0 +1,393 @@
+"""
+In-process metrics registry with OpenMetrics text exposition.
+
+Counters, gauges and fixed-bucket histograms are declared once at module
+level through ``REGISTRY`` and updated from hot paths (audio player thread,
+event loop, Flask workers). Counter and histogram updates go to a
+per-thread shard, so writers never take a lock; shards are only summed when
+the registry is rendered. When a thread exits (Flask starts one per
+request) its shard is folded into a shared base, so shards do not pile up.
+
+Each process renders its own registry with a name prefix (``bot_`` or
+``web_``). The bot also writes its exposition to ``data/metrics/bot.prom``
+so the web ``/metrics`` route can serve both processes from one scrape.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Optional
+
+import config
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+BOT_METRICS_TEXTFILE_NAME = "bot.prom"
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way OpenMetrics expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Return ``{a="x",b="y"}`` or an empty string."""
+    pairs = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    """Shared naming/label handling for all metric types."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        """Return label values in declaration order."""
+        if not self.labelnames:
+            return ()
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self, prefix: str) -> list[str]:
+        """Return ``# TYPE``/``# HELP`` lines."""
+        full_name = prefix + self.name
+        return [
+            f"# TYPE {full_name} {self.type_name}",
+            f"# HELP {full_name} {self.documentation}",
+        ]
+
+    @abstractmethod
+    def render(self, prefix: str) -> list[str]:
+        """Return exposition lines for this metric."""
+
+
+class _ShardOwner:
+    """Thread-local handle whose collection signals that its thread exited."""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: dict[LabelValues, Any]) -> None:
+        self.shard = shard
+
+
+class _ShardedMetric(_Metric):
+    """Metric whose updates go to a shard owned by the calling thread."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._local = threading.local()
+        self._shards: dict[int, dict[LabelValues, Any]] = {}
+        self._base: dict[LabelValues, Any] = {}
+        # Reentrant: a retiring thread's finalizer may run during a snapshot.
+        self._shards_lock = threading.RLock()
+
+    def _shard(self) -> dict[LabelValues, Any]:
+        """Return this thread's shard, registering it on first use."""
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = _ShardOwner({})
+            self._local.owner = owner
+            with self._shards_lock:
+                self._shards[id(owner.shard)] = owner.shard
+            weakref.finalize(owner, self._retire_shard, owner.shard)
+        return owner.shard
+
+    def _retire_shard(self, shard: dict[LabelValues, Any]) -> None:
+        """Fold an exited thread's shard into the base aggregate."""
+        with self._shards_lock:
+            self._shards.pop(id(shard), None)
+            for key, value in shard.items():
+                current = self._base.get(key)
+                self._base[key] = value if current is None else self._combine(current, value)
+
+    @abstractmethod
+    def _combine(self, current: Any, value: Any) -> Any:
+        """Return a new value merging two shard entries for one label set."""
+
+    def _snapshot_shards(self) -> list[list[tuple[LabelValues, Any]]]:
+        """Copy the base and every live shard's items (``list(dict.items())`` is atomic)."""
+        with self._shards_lock:
+            return [list(self._base.items())] + [list(shard.items()) for shard in self._shards.values()]
+
+
+class Counter(_ShardedMetric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Increase the counter for a label set."""
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def _combine(self, current: float, value: float) -> float:
+        return current + value
+
+    def value(self, **labels: Any) -> float:
+        """Return the summed value for a label set."""
+        key = self._key(labels)
+        return sum(
+            value for items in self._snapshot_shards() for item_key, value in items if item_key == key
+        )
+
+    def render(self, prefix: str) -> list[str]:
+        totals: dict[LabelValues, float] = {}
+        for items in self._snapshot_shards():
+            for key, value in items:
+                totals[key] = totals.get(key, 0.0) + value
+        lines = self.header(prefix)
+        for key in sorted(totals):
+            lines.append(
+                f"{prefix}{self.name}_total{_format_labels(self.labelnames, key)} "
+                f"{_format_value(totals[key])}"
+            )
+        return lines
+
+
+class Histogram(_ShardedMetric):
+    """Distribution over fixed upper-bound buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation."""
+        shard = self._shard()
+        key = self._key(labels)
+        state = shard.get(key)
+        if state is None:
+            # [per-bucket counts..., +Inf count, sum]
+            state = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[key] = state
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        state[index] += 1
+        state[-1] += value
+
+    def time(self, **labels: Any) -> "_HistogramTimer":
+        """Return a context manager that observes its elapsed time."""
+        return _HistogramTimer(self, labels)
+
+    def _combine(self, current: list[float], value: list[float]) -> list[float]:
+        return [a + b for a, b in zip(current, value)]
+
+    def _merged(self) -> dict[LabelValues, list[float]]:
+        """Sum every shard's bucket counts and sums."""
+        merged: dict[LabelValues, list[float]] = {}
+        for items in self._snapshot_shards():
+            for key, state in items:
+                current = merged.get(key)
+                merged[key] = list(state) if current is None else self._combine(current, state)
+        return merged
+
+    def count(self, **labels: Any) -> int:
+        """Return the number of observations for a label set."""
+        state = self._merged().get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def render(self, prefix: str) -> list[str]:
+        lines = self.header(prefix)
+        bounds = [*self.buckets, math.inf]
+        merged = self._merged()
+        for key in sorted(merged):
+            state = merged[key]
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, state[:-1]):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                lines.append(f"{prefix}{self.name}_bucket{labels} {int(cumulative)}")
+            label_text = _format_labels(self.labelnames, key)
+            lines.append(f"{prefix}{self.name}_count{label_text} {int(cumulative)}")
+            lines.append(f"{prefix}{self.name}_sum{label_text} {_format_value(state[-1])}")
+        return lines
+
+
+class _HistogramTimer:
+    """Context manager returned by ``Histogram.time``."""
+
+    def __init__(self, histogram: Histogram, labels: dict[str, Any]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_HistogramTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; last write wins, or read from a callback."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float | None]] = None
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge for a label set."""
+        self._values[self._key(labels)] = float(value)
+
+    def set_function(self, function: Callable[[], float | None]) -> None:
+        """Read the (label-less) gauge from *function* at render time."""
+        self._function = function
+
+    def value(self, **labels: Any) -> float | None:
+        """Return the current value for a label set."""
+        if self._function is not None and not labels:
+            return self._read_function()
+        return self._values.get(self._key(labels))
+
+    def _read_function(self) -> float | None:
+        try:
+            value = self._function() if self._function is not None else None
+        except Exception:
+            return None
+        return None if value is None else float(value)
+
+    def render(self, prefix: str) -> list[str]:
+        lines = self.header(prefix)
+        if self._function is not None:
+            value = self._read_function()
+            if value is not None:
+                lines.append(f"{prefix}{self.name} {_format_value(value)}")
+            return lines
+        for key, value in sorted(dict(self._values).items()):
+            lines.append(
+                f"{prefix}{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics; declaring the same name twice returns it.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name!r} already registered as {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Declare (or fetch) a counter; ``name`` excludes the ``_total`` suffix."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Declare (or fetch) a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Declare (or fetch) a fixed-bucket histogram."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self, prefix: str = "", *, include_eof: bool = True) -> str:
+        """
+        Render every metric in OpenMetrics text format.
+
+        Args:
+            prefix: Prepended to every metric name (e.g. ``bot_``).
+            include_eof: Whether to end with ``# EOF`` (omit when concatenating).
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render(prefix))
+        if include_eof:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def bot_metrics_textfile_path(main_db_path: Optional[str] = None) -> str:
+    """
+    Return where the bot writes its exposition for the web process.
+
+    ``BOT_METRICS_TEXTFILE`` overrides the default ``data/metrics/bot.prom``
+    beside the main database.
+    """
+    override = os.getenv("BOT_METRICS_TEXTFILE", "").strip()
+    if override:
+        return override
+    base = str(main_db_path or config.DATABASE_PATH)
+    return os.path.join(os.path.dirname(os.path.abspath(base)), "metrics", BOT_METRICS_TEXTFILE_NAME)
+
+
+def write_metrics_textfile(path: str, text: str) -> None:
+    """Atomically replace *path* with *text*."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def read_metrics_textfile(path: str) -> str:
+    """Return an exported exposition without its ``# EOF`` line, or ``''``."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return ""
+    lines = [line for line in text.splitlines() if line.strip() != "# EOF"]
+    return "\n".join(lines) + "\n" if lines else ""
@@ -4,6 +4,9 @@ Web-facing models for the optional Flask application.
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 from dataclasses import dataclass, field
 from typing import Any, Mapping
 
@@ -99,10 +102,68 @@ class DiscordWebUser:
         }
 
 
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Keyset position after the last row of a ``(timestamp DESC, id DESC)`` page.
+
+    Attributes:
+        timestamp: Sort timestamp of the last returned row, or ``None``.
+        id: Primary key of the last returned row, used as the tie-breaker.
+    """
+
+    timestamp: str | None
+    id: int
+
+    def encode(self) -> str:
+        """
+        Serialize the cursor as an opaque URL-safe token.
+
+        Returns:
+            Base64 token suitable for a ``cursor`` query arg.
+        """
+        raw = json.dumps([self.timestamp, self.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: Any) -> "PageCursor | None":
+        """
+        Parse a cursor token produced by :meth:`encode`.
+
+        Args:
+            token: Raw token from the request.
+
+        Returns:
+            Parsed cursor when the token is valid, otherwise ``None``.
+        """
+        text = str(token or "").strip()
+        if not text:
+            return None
+
+        try:
+            padded = text + "=" * (-len(text) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (ValueError, binascii.Error, UnicodeError):
+            return None
+
+        if not isinstance(payload, list) or len(payload) != 2:
+            return None
+        timestamp, row_id = payload
+        if timestamp is not None and not isinstance(timestamp, str):
+            return None
+        if isinstance(row_id, bool) or not isinstance(row_id, int):
+            return None
+        return cls(timestamp=timestamp, id=row_id)
+
+
 @dataclass(frozen=True)
 class PaginatedQuery:
     """
     Shared web query parameters for paginated endpoints.
+
+    When ``cursor`` is set, repositories continue the keyset scan after that
+    position instead of skipping ``offset`` rows. ``include_count`` lets
+    cursor-driven clients skip the ``COUNT(*)`` query once they know the total.
     """
 
     page: int
@@ -110,10 +171,14 @@ class PaginatedQuery:
     search_query: str = ""
     guild_id: int | None = None
     filters: dict[str, list[str]] = field(default_factory=dict)
+    cursor: PageCursor | None = None
+    include_count: bool = True
 
     @property
     def offset(self) -> int:
         """Return the SQL offset for the current page."""
+        if self.cursor is not None:
+            return 0
         return (self.page - 1) * self.per_page
 
 
@@ -2,7 +2,7 @@
 Action repository for action-related database operations.
 """
 
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 import sqlite3
 import logging
 import time
@@ -132,6 +132,51 @@ class ActionRepository(BaseRepository):
                 )
         return result
 
+    def insert_many(
+        self,
+        username: str,
+        action: str,
+        targets: List[str],
+        guild_id: Optional[int | str] = None,
+    ) -> int:
+        """
+        Log the same action for several targets in one transaction.
+
+        Publishes a single ``actions_changed`` event for the batch.
+
+        Args:
+            username: The user performing the action
+            action: Action type shared by every row
+            targets: Action targets (usually filenames)
+            guild_id: Optional guild scope
+
+        Returns:
+            Number of inserted rows
+        """
+        if not targets:
+            return 0
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        guild_value = str(guild_id) if guild_id is not None else None
+        inserted = self._execute_many(
+            "INSERT INTO actions (username, action, target, timestamp, guild_id) VALUES (?, ?, ?, ?, ?)",
+            [(username, action, str(target), timestamp, guild_value) for target in targets],
+        )
+        if _publish_soundboard_event is not None:
+            try:
+                _publish_soundboard_event(
+                    self._db_path,
+                    "actions_changed",
+                    {"action": action, "count": len(targets), "guild_id": guild_value},
+                )
+            except Exception:
+                logger.warning(
+                    "[ActionRepository] actions_changed publish failed action=%s count=%s",
+                    action,
+                    len(targets),
+                    exc_info=True,
+                )
+        return inserted
+
     def has_action_for_target(
         self,
         action: str,
@@ -315,6 +360,34 @@ class ActionRepository(BaseRepository):
         )
         return row['count'] if row else 0
 
+    def get_play_counts_by_guild(self) -> Dict[Optional[str], Dict[int, int]]:
+        """
+        Get all-time play counts per sound, grouped by guild.
+
+        Returns:
+            Mapping of guild id (``None`` for legacy unscoped plays) to a
+            mapping of sound id to play count.
+        """
+        rows = self._execute(
+            """
+            SELECT target, guild_id, COUNT(*) as count
+            FROM actions
+            WHERE action IN ('play_random_sound', 'replay_sound', 'play_random_favorite_sound',
+                             'play_request', 'play_from_list', 'play_similar_sound', 'play_sound_periodically')
+            GROUP BY target, guild_id
+            """
+        )
+        counts: Dict[Optional[str], Dict[int, int]] = {}
+        for row in rows:
+            try:
+                sound_id = int(row["target"])
+            except (TypeError, ValueError):
+                continue
+            guild_key = str(row["guild_id"]) if row["guild_id"] is not None else None
+            per_guild = counts.setdefault(guild_key, {})
+            per_guild[sound_id] = per_guild.get(sound_id, 0) + int(row["count"])
+        return counts
+
     def get_distinct_usernames(
         self,
         guild_id: Optional[int | str] = None,
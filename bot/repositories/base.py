@@ -7,6 +7,13 @@ from typing import TypeVar, Generic, Optional, List, Any
 import sqlite3
 import os
 import config
+from bot.metrics import REGISTRY
+
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    "db_write_seconds",
+    "SQLite write latency including commit and lock retries.",
+    ("repository",),
+)
 
 T = TypeVar('T')
 
@@ -128,41 +135,42 @@ class BaseRepository(ABC, Generic[T]):
         """
         import time as _time
 
-        max_attempts = 3
-        last_exc: Exception | None = None
-
-        for attempt in range(1, max_attempts + 1):
-            try:
-                if self._use_shared and BaseRepository._shared_connection is not None:
-                    cursor = BaseRepository._shared_connection.cursor()
-                    cursor.execute(query, params)
-                    BaseRepository._shared_connection.commit()
-                    return cursor.lastrowid
+        with DB_WRITE_SECONDS.time(repository=type(self).__name__):
+            max_attempts = 3
+            last_exc: Exception | None = None
 
-                conn = self._get_connection()
+            for attempt in range(1, max_attempts + 1):
                 try:
-                    cursor = conn.cursor()
-                    cursor.execute(query, params)
-                    conn.commit()
-                    return cursor.lastrowid
-                finally:
-                    conn.close()
-            except sqlite3.OperationalError as exc:
-                error_str = str(exc).lower()
-                if "database is locked" in error_str or "locked" in error_str:
-                    last_exc = exc
-                    if attempt < max_attempts:
-                        delay = 0.1 * (2 ** (attempt - 1))  # 0.1, 0.2, 0.4
-                        _time.sleep(delay)
-                        continue
-                # Not a lock error or final attempt — re-raise immediately.
-                raise
-            # Non-OperationalError — re-raise immediately.
-            except Exception:
-                raise
+                    if self._use_shared and BaseRepository._shared_connection is not None:
+                        cursor = BaseRepository._shared_connection.cursor()
+                        cursor.execute(query, params)
+                        BaseRepository._shared_connection.commit()
+                        return cursor.lastrowid
+
+                    conn = self._get_connection()
+                    try:
+                        cursor = conn.cursor()
+                        cursor.execute(query, params)
+                        conn.commit()
+                        return cursor.lastrowid
+                    finally:
+                        conn.close()
+                except sqlite3.OperationalError as exc:
+                    error_str = str(exc).lower()
+                    if "database is locked" in error_str or "locked" in error_str:
+                        last_exc = exc
+                        if attempt < max_attempts:
+                            delay = 0.1 * (2 ** (attempt - 1))  # 0.1, 0.2, 0.4
+                            _time.sleep(delay)
+                            continue
+                    # Not a lock error or final attempt — re-raise immediately.
+                    raise
+                # Non-OperationalError — re-raise immediately.
+                except Exception:
+                    raise
 
-        # All retries exhausted.
-        raise last_exc  # type: ignore[return-value]
+            # All retries exhausted.
+            raise last_exc  # type: ignore[return-value]
     
     def _execute_many(self, query: str, params_list: List[tuple]) -> int:
         """
@@ -175,20 +183,21 @@ class BaseRepository(ABC, Generic[T]):
         Returns:
             Number of rows affected
         """
-        if self._use_shared and BaseRepository._shared_connection is not None:
-            cursor = BaseRepository._shared_connection.cursor()
-            cursor.executemany(query, params_list)
-            BaseRepository._shared_connection.commit()
-            return cursor.rowcount
-        
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.executemany(query, params_list)
-            conn.commit()
-            return cursor.rowcount
-        finally:
-            conn.close()
+        with DB_WRITE_SECONDS.time(repository=type(self).__name__):
+            if self._use_shared and BaseRepository._shared_connection is not None:
+                cursor = BaseRepository._shared_connection.cursor()
+                cursor.executemany(query, params_list)
+                BaseRepository._shared_connection.commit()
+                return cursor.rowcount
+
+            conn = self._get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(query, params_list)
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                conn.close()
     
     # Abstract methods that subclasses must implement
     
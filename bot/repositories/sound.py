@@ -2,6 +2,7 @@
 Sound repository for sound-related database operations.
 """
 
+import logging
 from typing import Optional, List, Tuple
 import sqlite3
 from datetime import datetime
@@ -15,6 +16,8 @@ try:
 except ImportError:
     _publish_soundboard_event = None
 
+logger = logging.getLogger(__name__)
+
 
 class SoundRepository(BaseRepository[Sound]):
     """
@@ -551,6 +554,53 @@ class SoundRepository(BaseRepository[Sound]):
                 params,
             )
     
+    def get_original_filenames(self) -> set[str]:
+        """Return every stored ``originalfilename`` for bulk existence checks."""
+        rows = self._execute("SELECT originalfilename FROM sounds WHERE originalfilename IS NOT NULL")
+        return {row["originalfilename"] for row in rows}
+
+    def insert_sounds(self, filenames: List[str], date=None) -> int:
+        """
+        Insert several new sounds in one transaction.
+
+        Each filename is used as both original and current filename, like
+        the scraper's per-file ``insert_sound`` calls. A single
+        ``sounds_changed`` event is published for the whole batch.
+
+        Args:
+            filenames: Filenames to insert.
+            date: Timestamp for every row (defaults to now).
+
+        Returns:
+            Number of inserted rows.
+        """
+        if not filenames:
+            return 0
+        if date is None:
+            date = datetime.now()
+        time_value = date.strftime("%Y-%m-%d %H:%M:%S") if hasattr(date, "strftime") else str(date)
+        inserted = self._execute_many(
+            """
+            INSERT INTO sounds (originalfilename, filename, favorite, blacklist, timestamp, slap, is_elevenlabs, guild_id)
+            VALUES (?, ?, 0, 0, ?, 0, 0, NULL)
+            """,
+            [(filename, filename, time_value) for filename in filenames],
+        )
+        if _publish_soundboard_event is not None:
+            try:
+                _publish_soundboard_event(
+                    self._db_path,
+                    "sounds_changed",
+                    {"count": len(filenames), "guild_id": None},
+                )
+            except Exception:
+                logger.warning(
+                    "[SoundRepository] sounds_changed publish failed count=%s",
+                    len(filenames),
+                    exc_info=True,
+                )
+        return inserted
+
     def update_sound(self, filename: str, new_filename: str = None, 
                      favorite: int = None, slap: int = None) -> bool:
         """Update a sound's properties (backwards compatibility signature)."""
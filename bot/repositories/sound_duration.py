@@ -0,0 +1,133 @@
+"""
+Repository for persisted sound durations.
+
+``sound_durations`` stores the MP3 length of each sound keyed by sound id so
+web tables never have to stat and parse files on the request path. Rows are
+written when a duration is first read (upload or first display) and dropped
+by triggers when a sound is renamed or deleted, because the web resolves the
+audio file from ``Filename`` first and a rename may point at another file.
+
+``sound_duration_state`` holds one counter bumped on every change so
+per-process maps can tell with a single primary-key read whether to reload.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Mapping
+from typing import Any
+
+from bot.repositories.base import BaseRepository
+
+SOUND_DURATIONS_TABLE = "sound_durations"
+SOUND_DURATION_STATE_TABLE = "sound_duration_state"
+
+_BUMP_VERSION_SQL = f"UPDATE {SOUND_DURATION_STATE_TABLE} SET version = version + 1 WHERE id = 1"
+
+
+class SoundDurationRepository(BaseRepository[dict[str, Any]]):
+    """
+    Repository for the sound-duration metadata table.
+    """
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        """Convert a row to a plain dictionary."""
+        return dict(row)
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        """Fetch one stored duration row by sound id."""
+        row = self._execute_one(
+            f"SELECT sound_id, duration_seconds, updated_at FROM {SOUND_DURATIONS_TABLE} WHERE sound_id = ?",
+            (id,),
+        )
+        return self._row_to_entity(row) if row else None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Not used; see ``get_duration_map``."""
+        return []
+
+    def ensure_schema(self) -> None:
+        """Create the duration tables and the triggers that invalidate rows."""
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SOUND_DURATIONS_TABLE} (
+                sound_id INTEGER PRIMARY KEY,
+                duration_seconds REAL NOT NULL,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SOUND_DURATION_STATE_TABLE} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._execute_write(
+            f"INSERT OR IGNORE INTO {SOUND_DURATION_STATE_TABLE} (id, version) VALUES (1, 0)"
+        )
+        self._execute_write(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sound_durations_after_rename
+            AFTER UPDATE OF Filename, originalfilename ON sounds
+            WHEN OLD.Filename IS NOT NEW.Filename OR OLD.originalfilename IS NOT NEW.originalfilename
+            BEGIN
+                DELETE FROM {SOUND_DURATIONS_TABLE} WHERE sound_id = OLD.id;
+                {_BUMP_VERSION_SQL};
+            END
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sound_durations_after_delete
+            AFTER DELETE ON sounds
+            BEGIN
+                DELETE FROM {SOUND_DURATIONS_TABLE} WHERE sound_id = OLD.id;
+                {_BUMP_VERSION_SQL};
+            END
+            """
+        )
+
+    def is_available(self) -> bool:
+        """Return whether the duration tables exist in this database."""
+        row = self._execute_one(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (SOUND_DURATION_STATE_TABLE,),
+        )
+        return row is not None
+
+    def get_version(self) -> int:
+        """Return the change counter for stored durations."""
+        row = self._execute_one(f"SELECT version FROM {SOUND_DURATION_STATE_TABLE} WHERE id = 1")
+        return int(row["version"]) if row else 0
+
+    def get_duration_map(self) -> dict[int, float]:
+        """Return every stored duration keyed by sound id."""
+        rows = self._execute(f"SELECT sound_id, duration_seconds FROM {SOUND_DURATIONS_TABLE}")
+        return {int(row["sound_id"]): float(row["duration_seconds"]) for row in rows}
+
+    def upsert_durations(self, durations: Mapping[int, float]) -> int:
+        """
+        Store durations and bump the change counter.
+
+        Args:
+            durations: Seconds keyed by sound id.
+
+        Returns:
+            The new change counter.
+        """
+        if durations:
+            self._execute_many(
+                f"""
+                INSERT INTO {SOUND_DURATIONS_TABLE} (sound_id, duration_seconds, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(sound_id) DO UPDATE SET
+                    duration_seconds = excluded.duration_seconds,
+                    updated_at = excluded.updated_at
+                """,
+                [(int(sound_id), float(seconds)) for sound_id, seconds in durations.items()],
+            )
+            self._execute_write(_BUMP_VERSION_SQL)
+        return self.get_version()
@@ -0,0 +1,277 @@
+"""
+Repository for the precomputed similar-sounds table.
+
+``sound_neighbors`` holds the top-K most similar sounds for each sound and
+scope, ranked by the weighted fuzzy score ``Database.get_sounds_by_similarity``
+uses. A scope is a guild id (candidates are that guild's sounds plus global
+ones, with the guild-local bonus), ``''`` for the unscoped catalog, or
+``'*'`` for global sounds only. Guilds that own no guild-local sounds have
+no list of their own and read the shared ``'*'`` list.
+``sound_neighbor_sources`` records which ``(sound, scope)`` lists have been
+computed together with the K-th best score, which the incremental updater
+compares against to decide whether a new name can enter a list.
+
+Triggers on ``sounds`` push added, renamed, re-scoped and deleted sound ids
+into ``sound_neighbor_queue``; ``SoundNeighborIndex`` drains it in the
+background. Blacklisted sounds are kept in the lists and filtered when read,
+because the web panel still suggests them and the Discord view does not.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from bot.repositories.base import BaseRepository
+
+SOUND_NEIGHBORS_TABLE = "sound_neighbors"
+SOUND_NEIGHBOR_SOURCES_TABLE = "sound_neighbor_sources"
+SOUND_NEIGHBOR_QUEUE_TABLE = "sound_neighbor_queue"
+
+# Scope used for lookups without a guild.
+UNSCOPED = ""
+# Scope shared by guilds without guild-local sounds (global candidates only).
+GLOBAL_ONLY = "*"
+
+_ENQUEUE_SQL = (
+    f"INSERT OR REPLACE INTO {SOUND_NEIGHBOR_QUEUE_TABLE} (sound_id, queued_at) "
+    "VALUES ({row}.id, CURRENT_TIMESTAMP);"
+)
+
+
+def neighbor_scope(guild_id: int | str | None) -> str:
+    """Return the stored scope for a guild id (``''`` for no guild)."""
+    return UNSCOPED if guild_id is None else str(guild_id)
+
+
+class SoundNeighborRepository(BaseRepository[dict[str, Any]]):
+    """
+    Repository for precomputed sound neighbors and their change queue.
+    """
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        """Convert a row to a plain dictionary."""
+        return dict(row)
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        """Not used for this query-oriented repository."""
+        return None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Not used for this query-oriented repository."""
+        return []
+
+    def ensure_schema(self) -> None:
+        """Create the neighbor tables and the ``sounds`` triggers feeding the queue."""
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SOUND_NEIGHBORS_TABLE} (
+                sound_id INTEGER NOT NULL,
+                scope TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                neighbor_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (sound_id, scope, rank)
+            ) WITHOUT ROWID
+            """
+        )
+        self._execute_write(
+            f"CREATE INDEX IF NOT EXISTS idx_sound_neighbors_neighbor ON {SOUND_NEIGHBORS_TABLE} (neighbor_id)"
+        )
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SOUND_NEIGHBOR_SOURCES_TABLE} (
+                sound_id INTEGER NOT NULL,
+                scope TEXT NOT NULL,
+                neighbor_count INTEGER NOT NULL,
+                kth_score REAL,
+                computed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (sound_id, scope)
+            ) WITHOUT ROWID
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SOUND_NEIGHBOR_QUEUE_TABLE} (
+                sound_id INTEGER PRIMARY KEY,
+                queued_at TEXT NOT NULL
+            )
+            """
+        )
+        triggers = {
+            "sound_neighbors_sounds_insert": f"AFTER INSERT ON sounds BEGIN {_ENQUEUE_SQL.format(row='NEW')} END",
+            "sound_neighbors_sounds_update": (
+                "AFTER UPDATE OF Filename, is_elevenlabs, guild_id ON sounds "
+                "WHEN OLD.Filename IS NOT NEW.Filename "
+                "OR OLD.is_elevenlabs IS NOT NEW.is_elevenlabs "
+                "OR OLD.guild_id IS NOT NEW.guild_id "
+                f"BEGIN {_ENQUEUE_SQL.format(row='NEW')} END"
+            ),
+            "sound_neighbors_sounds_delete": f"AFTER DELETE ON sounds BEGIN {_ENQUEUE_SQL.format(row='OLD')} END",
+        }
+        for name, definition in triggers.items():
+            self._execute_write(f"CREATE TRIGGER IF NOT EXISTS {name} {definition}")
+
+    def is_populated(self) -> bool:
+        """Return whether any neighbor list has been computed."""
+        row = self._execute_one(f"SELECT 1 AS present FROM {SOUND_NEIGHBOR_SOURCES_TABLE} LIMIT 1")
+        return row is not None
+
+    def get_candidates(self) -> list[sqlite3.Row]:
+        """Return ``id``, ``Filename`` and ``guild_id`` of every sound that can be suggested."""
+        return self._execute(
+            "SELECT id, Filename, guild_id FROM sounds WHERE is_elevenlabs = 0 ORDER BY id"
+        )
+
+    def get_neighbors(
+        self,
+        sound_id: int,
+        scope: str,
+        limit: int,
+        *,
+        include_blacklisted: bool = True,
+    ) -> list[tuple[dict[str, Any], float]] | None:
+        """
+        Return the precomputed neighbors of one sound.
+
+        Args:
+            sound_id: Source sound id.
+            scope: Value from ``neighbor_scope``.
+            limit: Maximum neighbors returned.
+            include_blacklisted: Whether blacklisted sounds may be returned.
+
+        Returns:
+            ``(sound row dict, score)`` pairs best first, or ``None`` when the
+            list has not been computed yet.
+        """
+        if not self._is_computed(sound_id, scope):
+            if scope in (UNSCOPED, GLOBAL_ONLY) or self._guild_has_sounds(scope):
+                return None
+            scope = GLOBAL_ONLY
+            if not self._is_computed(sound_id, scope):
+                return None
+        blacklist_sql = "" if include_blacklisted else "AND s.blacklist = 0"
+        rows = self._execute(
+            f"""
+            SELECT s.*, n.score AS neighbor_score
+            FROM {SOUND_NEIGHBORS_TABLE} n
+            JOIN sounds s ON s.id = n.neighbor_id
+            WHERE n.sound_id = ? AND n.scope = ? AND s.is_elevenlabs = 0 {blacklist_sql}
+            ORDER BY n.rank
+            LIMIT ?
+            """,
+            (sound_id, scope, limit),
+        )
+        neighbors = []
+        for row in rows:
+            sound = dict(row)
+            score = float(sound.pop("neighbor_score"))
+            neighbors.append((sound, score))
+        return neighbors
+
+    def _is_computed(self, sound_id: int, scope: str) -> bool:
+        """Return whether the ``(sound_id, scope)`` list has been computed."""
+        row = self._execute_one(
+            f"SELECT 1 AS present FROM {SOUND_NEIGHBOR_SOURCES_TABLE} WHERE sound_id = ? AND scope = ?",
+            (sound_id, scope),
+        )
+        return row is not None
+
+    def _guild_has_sounds(self, scope: str) -> bool:
+        """Return whether a guild scope owns any suggestible guild-local sound."""
+        row = self._execute_one(
+            "SELECT 1 AS present FROM sounds WHERE guild_id = ? AND is_elevenlabs = 0 LIMIT 1",
+            (scope,),
+        )
+        return row is not None
+
+    def get_thresholds(self) -> dict[tuple[int, str], tuple[int, float | None]]:
+        """Return ``(sound_id, scope) -> (neighbor_count, kth_score)`` for computed lists."""
+        rows = self._execute(
+            f"SELECT sound_id, scope, neighbor_count, kth_score FROM {SOUND_NEIGHBOR_SOURCES_TABLE}"
+        )
+        return {
+            (int(row["sound_id"]), str(row["scope"])): (int(row["neighbor_count"]), row["kth_score"])
+            for row in rows
+        }
+
+    def get_sources_referencing(self, neighbor_ids: Iterable[int]) -> set[tuple[int, str]]:
+        """Return the ``(sound_id, scope)`` lists that contain any of ``neighbor_ids``."""
+        ids = sorted({int(value) for value in neighbor_ids})
+        found: set[tuple[int, str]] = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._execute(
+                f"SELECT DISTINCT sound_id, scope FROM {SOUND_NEIGHBORS_TABLE} WHERE neighbor_id IN ({placeholders})",
+                tuple(chunk),
+            )
+            found.update((int(row["sound_id"]), str(row["scope"])) for row in rows)
+        return found
+
+    def replace_neighbors(self, lists: Mapping[tuple[int, str], Sequence[tuple[int, float]]]) -> None:
+        """
+        Store freshly computed neighbor lists.
+
+        Rows are overwritten rank by rank and only surplus ranks are deleted,
+        so concurrent readers never see a list disappear mid-update.
+
+        Args:
+            lists: ``(sound_id, scope) -> [(neighbor_id, score), ...]`` best first.
+        """
+        if not lists:
+            return
+        self._execute_many(
+            f"INSERT OR REPLACE INTO {SOUND_NEIGHBORS_TABLE} (sound_id, scope, rank, neighbor_id, score) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (sound_id, scope, rank, neighbor_id, score)
+                for (sound_id, scope), neighbors in lists.items()
+                for rank, (neighbor_id, score) in enumerate(neighbors)
+            ],
+        )
+        self._execute_many(
+            f"DELETE FROM {SOUND_NEIGHBORS_TABLE} WHERE sound_id = ? AND scope = ? AND rank >= ?",
+            [(sound_id, scope, len(neighbors)) for (sound_id, scope), neighbors in lists.items()],
+        )
+        self._execute_many(
+            f"""
+            INSERT INTO {SOUND_NEIGHBOR_SOURCES_TABLE} (sound_id, scope, neighbor_count, kth_score, computed_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(sound_id, scope) DO UPDATE SET
+                neighbor_count = excluded.neighbor_count,
+                kth_score = excluded.kth_score,
+                computed_at = excluded.computed_at
+            """,
+            [
+                (sound_id, scope, len(neighbors), neighbors[-1][1] if neighbors else None)
+                for (sound_id, scope), neighbors in lists.items()
+            ],
+        )
+
+    def delete_sources(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Drop computed lists, e.g. for deleted sounds or vanished scopes."""
+        params = [(int(sound_id), str(scope)) for sound_id, scope in keys]
+        if not params:
+            return
+        self._execute_many(f"DELETE FROM {SOUND_NEIGHBORS_TABLE} WHERE sound_id = ? AND scope = ?", params)
+        self._execute_many(f"DELETE FROM {SOUND_NEIGHBOR_SOURCES_TABLE} WHERE sound_id = ? AND scope = ?", params)
+
+    def take_queue(self, limit: int = 500) -> list[int]:
+        """Remove and return up to ``limit`` queued sound ids, oldest first."""
+        rows = self._execute(
+            f"SELECT sound_id, queued_at FROM {SOUND_NEIGHBOR_QUEUE_TABLE} ORDER BY queued_at, sound_id LIMIT ?",
+            (limit,),
+        )
+        if rows:
+            # Only delete the entries read; a re-queue in the meantime stays queued.
+            self._execute_many(
+                f"DELETE FROM {SOUND_NEIGHBOR_QUEUE_TABLE} WHERE sound_id = ? AND queued_at = ?",
+                [(row["sound_id"], row["queued_at"]) for row in rows],
+            )
+        return [int(row["sound_id"]) for row in rows]
+
+    def clear_queue(self) -> None:
+        """Drop queued changes (a full rebuild covers them)."""
+        self._execute_write(f"DELETE FROM {SOUND_NEIGHBOR_QUEUE_TABLE}")
@@ -0,0 +1,270 @@
+"""
+Repository for the FTS5 trigram index over sound names.
+
+``sounds_fts`` mirrors ``sounds.Filename``/``sounds.originalfilename`` plus a
+normalized name column (``normalize_sound_text`` rules, mirrored in SQL) and
+is kept in sync by triggers on ``sounds``. ``normalize_sound_text`` is the
+one Python copy of those rules; live search, the similar-sounds index and the
+web options panel all call it so they never disagree. The rowid of each index row is the
+sound ``id`` so results join straight back to ``sounds``.
+
+The index is optional: SQLite builds without FTS5 (or test schemas that never
+call ``ensure_schema()``) simply report ``is_available() == False`` and callers
+fall back to ``LIKE`` scans.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Any
+
+from bot.repositories.base import BaseRepository
+
+SOUND_SEARCH_TABLE = "sounds_fts"
+
+# Trigram queries need at least three characters to use the index.
+SOUND_SEARCH_MIN_TERM_LENGTH = 3
+
+# Leet-speak substitutions applied by ``normalize_sound_text``.
+LEET_SUBSTITUTIONS: dict[str, str] = {
+    "0": "o",
+    "1": "i",
+    "3": "e",
+    "4": "a",
+    "5": "s",
+    "7": "t",
+    "@": "a",
+    "$": "s",
+    "!": "i",
+}
+
+# Cap the OR-chain for fuzzy candidate queries so long inputs stay cheap.
+_MAX_CANDIDATE_TRIGRAMS = 32
+
+# Enough halving passes to collapse runs of up to 64 spaces in a name.
+_SPACE_COLLAPSE_PASSES = 6
+
+
+def normalize_sound_text(text: str | None) -> str:
+    """
+    Normalize a sound name or query for fuzzy matching.
+
+    Lowercases, applies ``LEET_SUBSTITUTIONS``, drops ``.mp3``, turns hyphens
+    and underscores into spaces and collapses whitespace.
+    ``_normalized_name_sql`` mirrors these rules for the index column.
+    """
+    text = str(text or "").lower()
+    for source, target in LEET_SUBSTITUTIONS.items():
+        text = text.replace(source, target)
+    text = text.replace(".mp3", "")
+    text = re.sub(r"[-_]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _normalized_name_sql(column: str) -> str:
+    """Return a SQL expression applying ``normalize_sound_text`` rules to a column."""
+    expression = f"LOWER(COALESCE({column}, ''))"
+    for source, target in LEET_SUBSTITUTIONS.items():
+        expression = f"REPLACE({expression}, '{source}', '{target}')"
+    expression = f"REPLACE({expression}, '.mp3', '')"
+    for separator in ("'-'", "'_'", "char(9)", "char(10)", "char(13)"):
+        expression = f"REPLACE({expression}, {separator}, ' ')"
+    # SQLite has no regex replace; each pass halves runs of spaces.
+    for _ in range(_SPACE_COLLAPSE_PASSES):
+        expression = f"REPLACE({expression}, '  ', ' ')"
+    return f"TRIM({expression})"
+
+
+def _quote_fts_phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase string."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class SoundSearchRepository(BaseRepository[dict[str, Any]]):
+    """
+    Repository for indexed sound-name search.
+    """
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        """Convert a row to a plain dictionary."""
+        return dict(row)
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        """Not used for this query-oriented repository."""
+        return None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Not used for this query-oriented repository."""
+        return []
+
+    def ensure_schema(self) -> None:
+        """
+        Create the FTS5 index and its sync triggers, backfilling when empty.
+
+        Raises:
+            sqlite3.Error: When SQLite lacks FTS5/trigram support.
+        """
+        self._execute_write(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SOUND_SEARCH_TABLE} USING fts5(
+                filename,
+                original_filename,
+                normalized_name,
+                tokenize = 'trigram'
+            )
+            """
+        )
+        stale_rules = self._drop_stale_sync_triggers()
+        self._execute_write(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sounds_fts_after_insert
+            AFTER INSERT ON sounds
+            BEGIN
+                INSERT INTO {SOUND_SEARCH_TABLE} (rowid, filename, original_filename, normalized_name)
+                VALUES (
+                    NEW.id,
+                    NEW.Filename,
+                    NEW.originalfilename,
+                    {_normalized_name_sql("NEW.Filename")}
+                );
+            END
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sounds_fts_after_update
+            AFTER UPDATE OF Filename, originalfilename ON sounds
+            BEGIN
+                DELETE FROM {SOUND_SEARCH_TABLE} WHERE rowid = OLD.id;
+                INSERT INTO {SOUND_SEARCH_TABLE} (rowid, filename, original_filename, normalized_name)
+                VALUES (
+                    NEW.id,
+                    NEW.Filename,
+                    NEW.originalfilename,
+                    {_normalized_name_sql("NEW.Filename")}
+                );
+            END
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sounds_fts_after_delete
+            AFTER DELETE ON sounds
+            BEGIN
+                DELETE FROM {SOUND_SEARCH_TABLE} WHERE rowid = OLD.id;
+            END
+            """
+        )
+
+        indexed = self._execute_one(f"SELECT COUNT(*) AS count FROM {SOUND_SEARCH_TABLE}")
+        if stale_rules or not indexed or int(indexed["count"]) == 0:
+            self.rebuild()
+
+    def _drop_stale_sync_triggers(self) -> bool:
+        """
+        Drop sync triggers written with older normalization rules.
+
+        Returns:
+            Whether triggers were dropped, so the index must be rebuilt.
+        """
+        rows = self._execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN (?, ?)",
+            ("sounds_fts_after_insert", "sounds_fts_after_update"),
+        )
+        expected = _normalized_name_sql("NEW.Filename")
+        stale = [row["name"] for row in rows if expected not in (row["sql"] or "")]
+        for name in stale:
+            self._execute_write(f"DROP TRIGGER IF EXISTS {name}")
+        return bool(stale)
+
+    def rebuild(self) -> None:
+        """Repopulate the index from the ``sounds`` table."""
+        self._execute_write(f"DELETE FROM {SOUND_SEARCH_TABLE}")
+        self._execute_write(
+            f"""
+            INSERT INTO {SOUND_SEARCH_TABLE} (rowid, filename, original_filename, normalized_name)
+            SELECT id, Filename, originalfilename, {_normalized_name_sql("Filename")}
+            FROM sounds
+            """
+        )
+
+    def is_available(self) -> bool:
+        """Return whether the FTS index exists in this database."""
+        row = self._execute_one(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (SOUND_SEARCH_TABLE,),
+        )
+        return row is not None
+
+    def find_similar_candidates(
+        self,
+        normalized_query: str,
+        limit: int = 200,
+    ) -> list[tuple[int, float]] | None:
+        """
+        Return sounds sharing trigrams with a normalized query, best first.
+
+        Args:
+            normalized_query: Query already passed through ``normalize_text``.
+            limit: Maximum number of candidates to return.
+
+        Returns:
+            ``(sound_id, bm25)`` pairs ordered by bm25 (more negative is
+            better), or ``None`` when the query is too short to use the index.
+        """
+        match_expression = self.build_trigram_match(normalized_query)
+        if match_expression is None:
+            return None
+
+        rows = self._execute(
+            f"""
+            SELECT rowid AS sound_id, bm25({SOUND_SEARCH_TABLE}) AS rank
+            FROM {SOUND_SEARCH_TABLE}
+            WHERE {SOUND_SEARCH_TABLE} MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match_expression, limit),
+        )
+        return [(int(row["sound_id"]), float(row["rank"])) for row in rows]
+
+    @staticmethod
+    def build_substring_match(term: str) -> str | None:
+        """
+        Build a MATCH expression equivalent to ``LIKE '%term%'`` on raw names.
+
+        Args:
+            term: User search text.
+
+        Returns:
+            FTS5 expression, or ``None`` when the term is too short for trigrams.
+        """
+        text = term.strip()
+        if len(text) < SOUND_SEARCH_MIN_TERM_LENGTH:
+            return None
+        return "{filename original_filename} : " + _quote_fts_phrase(text)
+
+    @staticmethod
+    def build_trigram_match(normalized_query: str) -> str | None:
+        """
+        Build an OR-of-trigrams MATCH expression for fuzzy candidate lookup.
+
+        Args:
+            normalized_query: Query already passed through ``normalize_text``.
+
+        Returns:
+            FTS5 expression, or ``None`` when no word has three characters.
+        """
+        trigrams: list[str] = []
+        seen: set[str] = set()
+        for word in normalized_query.split():
+            for start in range(len(word) - SOUND_SEARCH_MIN_TERM_LENGTH + 1):
+                trigram = word[start:start + SOUND_SEARCH_MIN_TERM_LENGTH]
+                if trigram not in seen:
+                    seen.add(trigram)
+                    trigrams.append(trigram)
+        if not trigrams:
+            return None
+        phrases = " OR ".join(_quote_fts_phrase(t) for t in trigrams[:_MAX_CANDIDATE_TRIGRAMS])
+        return f"normalized_name : ({phrases})"
@@ -367,6 +367,8 @@ class SpeechTrainingRepository(BaseRepository):
         search: str = "",
         sort_by: str = "captured_at",
         sort_dir: str = "desc",
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> List[int]:
         """Return IDs of all clips matching the given filters, without pagination.
 
@@ -377,6 +379,8 @@ class SpeechTrainingRepository(BaseRepository):
             search: Optional search in username/display_name/filename.
             sort_by: Column to sort by (allowlisted). Default ``captured_at``.
             sort_dir: Sort direction (``asc`` or ``desc``). Default ``desc``.
+            offset: Matching rows to skip.
+            limit: Optional maximum number of IDs returned.
 
         Returns:
             List of clip IDs (integers).
@@ -389,8 +393,13 @@ class SpeechTrainingRepository(BaseRepository):
             where_clause = "WHERE " + " AND ".join(conditions)
         order_clause = self._build_clip_order(sort_by=sort_by, sort_dir=sort_dir)
 
+        window_clause = ""
+        if limit is not None or offset:
+            window_clause = "LIMIT ? OFFSET ?"
+            params = [*params, -1 if limit is None else max(0, int(limit)), max(0, int(offset))]
+
         rows = self._execute(
-            f"SELECT id FROM speech_training_clips {where_clause} {order_clause}",
+            f"SELECT id FROM speech_training_clips {where_clause} {order_clause} {window_clause}",
             tuple(params),
         )
         return [r["id"] for r in rows]
@@ -0,0 +1,472 @@
+"""
+Repository for host system-monitor history, stored in its own SQLite file.
+
+The bot writes CPU/RAM/disk/temperature and per-process samples every second.
+Keeping them in ``data/system_monitor.db`` instead of the main database means
+telemetry commits never compete with playback-path writes for the main WAL
+lock.
+
+Samples are folded into fixed-width rollup tiers as they are written:
+
+===========  ==========
+Bucket       Retention
+===========  ==========
+1 s          2 hours
+10 s         2 days
+5 min        30 days
+===========  ==========
+
+Each rollup row keeps ``min``, ``max``, ``sum`` and ``count`` so averages
+stay exact when buckets merge. Range queries pick the finest tier that both
+covers the range and yields at most ``max_points`` buckets, so the 24 h view
+reads ~288 rows instead of ~86k raw samples.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import config
+from bot.repositories.base import BaseRepository
+
+TIMESERIES_DB_FILENAME = "system_monitor.db"
+
+# Raw-sample table the main database used before this store existed.
+LEGACY_SAMPLES_TABLE = "system_monitor_samples"
+
+_MERGE_ROLLUP_SQL = """
+    INSERT INTO system_monitor_rollups (
+        tier, metric_type, metric_key, bucket,
+        min_value, max_value, sum_value, sample_count
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tier, metric_type, metric_key, bucket) DO UPDATE SET
+        min_value = MIN(min_value, excluded.min_value),
+        max_value = MAX(max_value, excluded.max_value),
+        sum_value = sum_value + excluded.sum_value,
+        sample_count = sample_count + excluded.sample_count
+"""
+
+
+@dataclass(frozen=True)
+class TimeSeriesTier:
+    """One rollup resolution and how long its buckets are kept."""
+
+    width_seconds: int
+    retention_seconds: int
+
+
+TIMESERIES_TIERS: tuple[TimeSeriesTier, ...] = (
+    TimeSeriesTier(width_seconds=1, retention_seconds=2 * 3600),
+    TimeSeriesTier(width_seconds=10, retention_seconds=2 * 86400),
+    TimeSeriesTier(width_seconds=300, retention_seconds=30 * 86400),
+)
+
+
+def timeseries_db_path_for(main_db_path: Optional[str] = None) -> str:
+    """
+    Return the time-series database path that sits next to the main database.
+
+    ``SYSTEM_MONITOR_DB_PATH`` overrides the location.
+
+    Args:
+        main_db_path: Path of the main bot database (defaults to config).
+    """
+    override = os.getenv("SYSTEM_MONITOR_DB_PATH", "").strip()
+    if override:
+        return override
+    base = str(main_db_path or config.DATABASE_PATH)
+    return os.path.join(os.path.dirname(os.path.abspath(base)), TIMESERIES_DB_FILENAME)
+
+
+class SystemMonitorTimeSeriesRepository(BaseRepository[dict[str, Any]]):
+    """
+    Tiered rollup store for system-monitor samples.
+
+    The schema is created lazily on the first write; reads against a file
+    that does not exist yet return empty results without creating it.
+    Writes share one long-lived connection; reads (the web process) open a
+    connection per query.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        tiers: tuple[TimeSeriesTier, ...] = TIMESERIES_TIERS,
+        prune_interval_seconds: int = 60,
+    ):
+        super().__init__(db_path=db_path or timeseries_db_path_for(), use_shared=False)
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.width_seconds))
+        self.prune_interval_seconds = prune_interval_seconds
+        self._schema_ready = False
+        self._last_prune_time = 0
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # BaseRepository interface
+    # ------------------------------------------------------------------
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        return dict(row)
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        """Not used; rollups are keyed by tier, metric and bucket."""
+        return None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Not used; see ``get_samples``."""
+        return []
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open a connection; WAL plus ``synchronous=NORMAL`` keeps commits off fsync."""
+        conn = super()._get_connection()
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _writer(self) -> sqlite3.Connection:
+        """Return the long-lived write connection, opening it on first use."""
+        if self._write_conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA busy_timeout = 5000")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._write_conn = conn
+        return self._write_conn
+
+    def close(self) -> None:
+        """Close the write connection (reopened by the next write)."""
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+                self._schema_ready = False
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def ensure_schema(self) -> None:
+        """Create the rollup table in WAL mode."""
+        with self._write_lock:
+            self._ensure_schema_locked()
+
+    def _ensure_schema_locked(self) -> None:
+        conn = self._writer()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS system_monitor_rollups (
+                tier INTEGER NOT NULL,
+                metric_type TEXT NOT NULL,
+                metric_key TEXT NOT NULL DEFAULT '',
+                bucket INTEGER NOT NULL,
+                min_value REAL NOT NULL,
+                max_value REAL NOT NULL,
+                sum_value REAL NOT NULL,
+                sample_count INTEGER NOT NULL,
+                PRIMARY KEY (tier, metric_type, metric_key, bucket)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_system_monitor_rollups_tier_bucket
+            ON system_monitor_rollups(tier, bucket)
+            """
+        )
+        conn.commit()
+        self._schema_ready = True
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_samples(self, samples: list[tuple[str, str, int, float]]) -> int:
+        """
+        Fold samples into every tier in one transaction, pruning periodically.
+
+        Args:
+            samples: ``(metric_type, metric_key, unix_seconds, value)`` tuples.
+
+        Returns:
+            Number of samples recorded.
+        """
+        if not samples:
+            return 0
+
+        latest = max(int(sample[2]) for sample in samples)
+        with self._write_lock:
+            if not self._schema_ready:
+                self._ensure_schema_locked()
+            conn = self._writer()
+            try:
+                for tier in self.tiers:
+                    width = tier.width_seconds
+                    conn.executemany(
+                        _MERGE_ROLLUP_SQL,
+                        [
+                            (
+                                width,
+                                metric_type,
+                                metric_key or "",
+                                int(timestamp) - int(timestamp) % width,
+                                float(value),
+                                float(value),
+                                float(value),
+                                1,
+                            )
+                            for metric_type, metric_key, timestamp, value in samples
+                        ],
+                    )
+                if latest - self._last_prune_time >= self.prune_interval_seconds:
+                    for tier in self.tiers:
+                        conn.execute(
+                            "DELETE FROM system_monitor_rollups WHERE tier = ? AND bucket < ?",
+                            (tier.width_seconds, latest - tier.retention_seconds),
+                        )
+                    self._last_prune_time = latest
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return len(samples)
+
+    def import_legacy_samples(
+        self,
+        legacy_db_path: str,
+        now: Optional[int] = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """
+        Fold the old main-database ``system_monitor_samples`` table into the tiers.
+
+        Raw rows are grouped per tier bucket in SQL, so only rollup rows are
+        copied. Rows older than a tier's retention are skipped for that tier.
+        The legacy table is dropped once its rollups are committed; without
+        the table this is a no-op.
+
+        Args:
+            legacy_db_path: Path of the main bot database.
+            now: Current unix time, for retention cut-offs.
+            batch_size: Rollup rows written per ``executemany``.
+
+        Returns:
+            Number of rollup rows merged.
+        """
+        now = int(time.time()) if now is None else now
+        source = sqlite3.connect(legacy_db_path, timeout=5.0)
+        try:
+            exists = source.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (LEGACY_SAMPLES_TABLE,),
+            ).fetchone()
+            if exists is None:
+                return 0
+
+            merged = 0
+            with self._write_lock:
+                if not self._schema_ready:
+                    self._ensure_schema_locked()
+                conn = self._writer()
+                try:
+                    for tier in self.tiers:
+                        width = tier.width_seconds
+                        cursor = source.execute(
+                            f"""
+                            SELECT metric_type, metric_key, timestamp - timestamp % ? AS bucket,
+                                   MIN(value), MAX(value), SUM(value), COUNT(*)
+                            FROM {LEGACY_SAMPLES_TABLE}
+                            WHERE timestamp >= ?
+                            GROUP BY metric_type, metric_key, bucket
+                            """,
+                            (width, now - tier.retention_seconds),
+                        )
+                        while True:
+                            rows = cursor.fetchmany(batch_size)
+                            if not rows:
+                                break
+                            conn.executemany(
+                                _MERGE_ROLLUP_SQL,
+                                [
+                                    (width, metric_type, metric_key or "", bucket, low, high, total, count)
+                                    for metric_type, metric_key, bucket, low, high, total, count in rows
+                                ],
+                            )
+                            merged += len(rows)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            source.execute(f"DROP TABLE IF EXISTS {LEGACY_SAMPLES_TABLE}")
+            source.commit()
+            return merged
+        finally:
+            source.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def select_tier(
+        self,
+        start_time: int,
+        end_time: int,
+        max_points: int,
+        now: Optional[int] = None,
+    ) -> TimeSeriesTier:
+        """
+        Pick the finest tier that still holds ``start_time`` and fits ``max_points``.
+
+        Falls back to the finest tier that holds ``start_time`` (the query then
+        merges buckets), or to the coarsest tier when none reaches back that far.
+        """
+        now = int(time.time()) if now is None else now
+        span = max(1, end_time - start_time)
+        covering = [
+            tier for tier in self.tiers if start_time >= now - tier.retention_seconds
+        ]
+        for tier in covering:
+            if math.ceil(span / tier.width_seconds) <= max_points:
+                return tier
+        return covering[0] if covering else self.tiers[-1]
+
+    def get_samples(
+        self,
+        metric_type: str,
+        metric_key: str,
+        start_time: int,
+        end_time: int,
+        max_points: int = 500,
+        now: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return at most ``max_points`` buckets for one metric.
+
+        Args:
+            metric_type: One of 'cpu', 'ram', 'disk', 'temp', 'process'.
+            metric_key: Identifier for the metric ('' for host metrics).
+            start_time: Start of range (unix seconds, inclusive).
+            end_time: End of range (unix seconds, inclusive).
+            max_points: Maximum number of points to return.
+            now: Current unix time, for tier retention checks.
+
+        Returns:
+            Dicts with ``time`` (bucket start), ``value`` (average), ``min``
+            and ``max``, sorted by time.
+        """
+        if max_points <= 0 or not os.path.exists(self.db_path):
+            return []
+
+        tier = self.select_tier(start_time, end_time, max_points, now=now)
+        width = tier.width_seconds
+        bucket_count = math.ceil(max(1, end_time - start_time) / width)
+        group_seconds = width * max(1, math.ceil(bucket_count / max_points))
+        first_bucket = start_time - start_time % group_seconds
+
+        try:
+            rows = self._execute(
+                """
+                SELECT
+                    (bucket / ?) * ? AS group_bucket,
+                    MIN(min_value) AS min_value,
+                    MAX(max_value) AS max_value,
+                    SUM(sum_value) / SUM(sample_count) AS avg_value
+                FROM system_monitor_rollups
+                WHERE tier = ? AND metric_type = ? AND metric_key = ?
+                  AND bucket >= ? AND bucket <= ?
+                GROUP BY group_bucket
+                ORDER BY group_bucket ASC
+                """,
+                (
+                    group_seconds,
+                    group_seconds,
+                    width,
+                    metric_type,
+                    metric_key or "",
+                    first_bucket,
+                    end_time,
+                ),
+            )
+        except sqlite3.OperationalError:
+            # File exists but the bot has not created the table yet.
+            return []
+
+        return [
+            {
+                "time": int(row["group_bucket"]),
+                "value": row["avg_value"],
+                "min": row["min_value"],
+                "max": row["max_value"],
+            }
+            for row in rows[-max_points:]
+        ]
+
+    def get_processes_at_time(
+        self,
+        timestamp: int,
+        tolerance_seconds: int = 5,
+        limit: int = 8,
+        now: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return process CPU averages near a timestamp from the finest retained tier.
+
+        Args:
+            timestamp: Target Unix timestamp in seconds.
+            tolerance_seconds: Search window around the timestamp.
+            limit: Maximum number of processes to return.
+            now: Current unix time, for tier retention checks.
+
+        Returns:
+            Dicts with 'key', 'value' (cpu percent) and 'time', sorted by value desc.
+        """
+        if not os.path.exists(self.db_path):
+            return []
+
+        now = int(time.time()) if now is None else now
+        tier = next(
+            (t for t in self.tiers if timestamp >= now - t.retention_seconds),
+            self.tiers[-1],
+        )
+        width = tier.width_seconds
+        start_time = timestamp - tolerance_seconds
+        try:
+            rows = self._execute(
+                """
+                SELECT metric_key, bucket, sum_value / sample_count AS avg_value
+                FROM system_monitor_rollups
+                WHERE tier = ? AND bucket >= ? AND bucket <= ?
+                  AND metric_type = 'process'
+                ORDER BY ABS(bucket - ?) ASC, avg_value DESC
+                """,
+                (
+                    width,
+                    start_time - start_time % width,
+                    timestamp + tolerance_seconds,
+                    timestamp - timestamp % width,
+                ),
+            )
+        except sqlite3.OperationalError:
+            return []
+
+        seen_keys: set[str] = set()
+        processes: list[dict[str, Any]] = []
+        for row in rows:
+            key = row["metric_key"]
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            processes.append({"key": key, "value": row["avg_value"], "time": row["bucket"]})
+            if len(processes) >= limit:
+                break
+
+        processes.sort(key=lambda process: process["value"], reverse=True)
+        return processes
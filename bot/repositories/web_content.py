@@ -11,6 +11,16 @@ import sqlite3
 
 from bot.models.web import PaginatedQuery
 from bot.repositories.base import BaseRepository
+from bot.repositories.sound_search import SOUND_SEARCH_TABLE, SoundSearchRepository
+from bot.repositories.web_filter_facets import (
+    FACET_ACTION,
+    FACET_ACTION_SOUND,
+    FACET_ACTION_USER,
+    FACET_FAVORITE_SOUND,
+    FACET_SOUND,
+    FACET_SOUND_DATE,
+    WebFilterFacetRepository,
+)
 
 SLAP_SOUND_LIST_FILTER_VALUE = "__slap_sounds__"
 
@@ -20,6 +30,18 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
     Repository for web soundboard tables and filter metadata.
     """
 
+    def __init__(self, db_path: str | None = None, use_shared: bool = True) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            db_path: Path to SQLite database. If None, uses default.
+            use_shared: If True and shared connection exists, use it.
+        """
+        super().__init__(db_path=db_path, use_shared=use_shared)
+        self._sound_search_available: bool | None = None
+        self._filter_facets_available: bool | None = None
+
     def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
         """Convert a row to a plain dictionary."""
         return dict(row)
@@ -43,11 +65,13 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
             List of raw action rows.
         """
         conditions, params = self._build_action_conditions(query)
+        self._append_keyset_condition(conditions, params, query, "a.timestamp", "a.id")
         where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
 
         rows = self._execute(
             f"""
             SELECT
+                a.id AS action_id,
                 s.Filename AS filename,
                 s.id AS sound_id,
                 s.favorite AS favorite,
@@ -107,6 +131,13 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
             Filter values grouped by column.
         """
         selected_keys = set(filter_keys or ("action", "user", "sound"))
+        if self._filter_facets_index_available():
+            return self._get_facet_filters(
+                {"action": FACET_ACTION, "user": FACET_ACTION_USER, "sound": FACET_ACTION_SOUND},
+                selected_keys,
+                guild_id,
+            )
+
         filters: dict[str, list[str]] = {}
 
         if "action" in selected_keys:
@@ -163,10 +194,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         params: list[object] = []
         self._append_sound_guild_condition(conditions, params, query.guild_id, alias="s")
 
-        if query.search_query:
-            search_term = f"%{query.search_query}%"
-            conditions.append("(s.Filename LIKE ? OR s.originalfilename LIKE ?)")
-            params.extend([search_term, search_term])
+        rank = self._sound_search_rank_join(query.search_query, alias="s")
+        if query.search_query and rank is None:
+            self._append_sound_name_search_condition(conditions, params, query.search_query, alias="s")
 
         sound_filters = query.filters.get("sound", [])
         if sound_filters:
@@ -202,6 +232,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
             )
             params.extend(clause_params)
 
+        if rank is None:
+            self._append_keyset_condition(conditions, params, query, "lf.last_favorited", "s.id")
+        rank_join, rank_params = rank or ("", [])
         where_clause = f" WHERE {' AND '.join(conditions)}"
         rows = self._execute(
             f"""
@@ -222,11 +255,13 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                     s.slap AS slap,
                     s.timestamp AS timestamp,
                     s.guild_id AS guild_id,
-                    lf.last_favorited AS last_favorited
+                    lf.last_favorited AS last_favorited,
+                    {"sr.rank" if rank else "NULL"} AS search_rank
                 FROM sounds s
                 LEFT JOIN LatestFavorite lf ON lf.sound_id = s.id
+                {rank_join}
                 {where_clause}
-                ORDER BY lf.last_favorited DESC, s.id DESC
+                ORDER BY {"sr.rank ASC, " if rank else ""}lf.last_favorited DESC, s.id DESC
                 LIMIT ? OFFSET ?
             )
             SELECT
@@ -236,6 +271,8 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                 ps.favorite AS favorite,
                 ps.slap AS slap,
                 ps.timestamp AS timestamp,
+                ps.last_favorited AS last_favorited,
+                ps.search_rank AS search_rank,
                 (
                     SELECT a.username
                     FROM actions a
@@ -261,9 +298,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                       AND (a.guild_id = ps.guild_id OR a.guild_id IS NULL OR ps.guild_id IS NULL)
                 ) AS first_seen_at
             FROM PageSounds ps
-            ORDER BY ps.last_favorited DESC, ps.sound_id DESC
+            ORDER BY {"ps.search_rank ASC, " if rank else ""}ps.last_favorited DESC, ps.sound_id DESC
             """,
-            (*params, query.per_page, query.offset),
+            (*rank_params, *params, query.per_page, self._page_offset(query, ranked=rank is not None)),
         )
         return [self._row_to_entity(row) for row in rows]
 
@@ -282,9 +319,7 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         self._append_sound_guild_condition(conditions, params, query.guild_id)
 
         if query.search_query:
-            search_term = f"%{query.search_query}%"
-            conditions.append("(Filename LIKE ? OR originalfilename LIKE ?)")
-            params.extend([search_term, search_term])
+            self._append_sound_name_search_condition(conditions, params, query.search_query)
 
         sound_filters = query.filters.get("sound", [])
         if sound_filters:
@@ -347,7 +382,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         selected_keys = set(filter_keys or ("sound", "user"))
         filters: dict[str, list[str]] = {}
 
-        if "sound" in selected_keys:
+        if "sound" in selected_keys and self._filter_facets_index_available():
+            filters.update(self._get_facet_filters({"sound": FACET_FAVORITE_SOUND}, selected_keys, guild_id))
+        elif "sound" in selected_keys:
             filters["sound"] = self._fetch_distinct_values(
                 f"""
                 SELECT DISTINCT Filename AS value
@@ -410,10 +447,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         params: list[object] = []
         self._append_sound_guild_condition(conditions, params, query.guild_id, alias="s")
 
-        if query.search_query:
-            search_term = f"%{query.search_query}%"
-            conditions.append("(s.Filename LIKE ? OR s.originalfilename LIKE ?)")
-            params.extend([search_term, search_term])
+        rank = self._sound_search_rank_join(query.search_query, alias="s")
+        if query.search_query and rank is None:
+            self._append_sound_name_search_condition(conditions, params, query.search_query, alias="s")
 
         sound_filters = query.filters.get("sound", [])
         if sound_filters:
@@ -431,6 +467,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         if list_filters:
             self._append_all_sounds_list_filter_condition(conditions, params, list_filters)
 
+        if rank is None:
+            self._append_keyset_condition(conditions, params, query, "s.timestamp", "s.id")
+        rank_join, rank_params = rank or ("", [])
         rows = self._execute(
             f"""
             WITH PageSounds AS (
@@ -441,10 +480,12 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                     s.favorite AS favorite,
                     s.slap AS slap,
                     s.timestamp AS timestamp,
-                    s.guild_id AS guild_id
+                    s.guild_id AS guild_id,
+                    {"sr.rank" if rank else "NULL"} AS search_rank
                 FROM sounds s
+                {rank_join}
                 WHERE {' AND '.join(conditions)}
-                ORDER BY s.timestamp DESC, s.id DESC
+                ORDER BY {"sr.rank ASC, " if rank else ""}s.timestamp DESC, s.id DESC
                 LIMIT ? OFFSET ?
             )
             SELECT
@@ -454,6 +495,7 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                 ps.favorite AS favorite,
                 ps.slap AS slap,
                 ps.timestamp AS timestamp,
+                ps.search_rank AS search_rank,
                 (
                     SELECT a.username
                     FROM actions a
@@ -479,9 +521,9 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
                       AND (a.guild_id = ps.guild_id OR a.guild_id IS NULL OR ps.guild_id IS NULL)
                 ) AS first_seen_at
             FROM PageSounds ps
-            ORDER BY ps.timestamp DESC, ps.sound_id DESC
+            ORDER BY {"ps.search_rank ASC, " if rank else ""}ps.timestamp DESC, ps.sound_id DESC
             """,
-            (*params, query.per_page, query.offset),
+            (*rank_params, *params, query.per_page, self._page_offset(query, ranked=rank is not None)),
         )
         return [self._row_to_entity(row) for row in rows]
 
@@ -500,9 +542,7 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         self._append_sound_guild_condition(conditions, params, query.guild_id, alias="s")
 
         if query.search_query:
-            search_term = f"%{query.search_query}%"
-            conditions.append("(s.Filename LIKE ? OR s.originalfilename LIKE ?)")
-            params.extend([search_term, search_term])
+            self._append_sound_name_search_condition(conditions, params, query.search_query, alias="s")
 
         sound_filters = query.filters.get("sound", [])
         if sound_filters:
@@ -547,6 +587,16 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         selected_keys = set(filter_keys or ("sound", "date", "list"))
         filters: dict[str, list[Any]] = {}
 
+        if self._filter_facets_index_available():
+            filters.update(
+                self._get_facet_filters(
+                    {"sound": FACET_SOUND, "date": FACET_SOUND_DATE},
+                    selected_keys,
+                    guild_id,
+                )
+            )
+            selected_keys -= {"sound", "date"}
+
         if "sound" in selected_keys:
             filters["sound"] = self._fetch_distinct_values(
                 f"""
@@ -611,6 +661,113 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
         )
         return options
 
+    def _append_sound_name_search_condition(
+        self,
+        conditions: list[str],
+        params: list[object],
+        search_query: str,
+        alias: str | None = None,
+    ) -> None:
+        """
+        Append a substring search over sound names.
+
+        Uses the ``sounds_fts`` trigram index when it exists and the term is
+        long enough, otherwise falls back to ``LIKE '%term%'`` scans.
+        """
+        prefix = f"{alias}." if alias else ""
+        match_expression = SoundSearchRepository.build_substring_match(search_query)
+        if match_expression is not None and self._sound_search_index_available():
+            conditions.append(
+                f"{prefix}id IN (SELECT rowid FROM {SOUND_SEARCH_TABLE} WHERE {SOUND_SEARCH_TABLE} MATCH ?)"
+            )
+            params.append(match_expression)
+            return
+
+        search_term = f"%{search_query}%"
+        conditions.append(f"({prefix}Filename LIKE ? OR {prefix}originalfilename LIKE ?)")
+        params.extend([search_term, search_term])
+
+    def _sound_search_rank_join(
+        self,
+        search_query: str,
+        alias: str,
+    ) -> tuple[str, list[object]] | None:
+        """
+        Return a join exposing ``sr.rank`` (bm25, lower is better) for a search.
+
+        The join also filters to matching sounds. Returns ``None`` when there
+        is no search, the term is too short for trigrams, or the index is
+        missing, in which case callers keep the ``LIKE`` filter and their
+        usual ordering.
+        """
+        if not search_query:
+            return None
+        match_expression = SoundSearchRepository.build_substring_match(search_query)
+        if match_expression is None or not self._sound_search_index_available():
+            return None
+        return (
+            f"""
+                JOIN (
+                    SELECT rowid AS sound_id, bm25({SOUND_SEARCH_TABLE}) AS rank
+                    FROM {SOUND_SEARCH_TABLE}
+                    WHERE {SOUND_SEARCH_TABLE} MATCH ?
+                ) sr ON sr.sound_id = {alias}.id
+            """,
+            [match_expression],
+        )
+
+    @staticmethod
+    def _page_offset(query: PaginatedQuery, ranked: bool) -> int:
+        """Return the page offset; ranked searches page by offset, not keyset."""
+        if ranked:
+            return max(query.page - 1, 0) * query.per_page
+        return query.offset
+
+    def _sound_search_index_available(self) -> bool:
+        """Return whether this database has the sound-name FTS index (cached per instance)."""
+        if self._sound_search_available is None:
+            self._sound_search_available = SoundSearchRepository(
+                db_path=self.db_path,
+                use_shared=self._use_shared,
+            ).is_available()
+        return self._sound_search_available
+
+    def get_filter_facet_versions(self) -> dict[str, int] | None:
+        """
+        Return facet invalidation counters for per-process filter caches.
+
+        Returns:
+            Version per group (``actions``, ``sounds``, ``favorites``,
+            ``lists``), or ``None`` when this database has no facet tables.
+        """
+        if not self._filter_facets_index_available():
+            return None
+        return self._filter_facet_repository().get_versions()
+
+    def _get_facet_filters(
+        self,
+        scopes: dict[str, str],
+        selected_keys: set[str],
+        guild_id: int | str | None,
+    ) -> dict[str, list[str]]:
+        """Read selected filter groups from the precomputed facet table."""
+        repository = self._filter_facet_repository()
+        return {
+            key: repository.get_values(scope, guild_id=guild_id)
+            for key, scope in scopes.items()
+            if key in selected_keys
+        }
+
+    def _filter_facet_repository(self) -> WebFilterFacetRepository:
+        """Return a facet repository bound to the same database."""
+        return WebFilterFacetRepository(db_path=self.db_path, use_shared=self._use_shared)
+
+    def _filter_facets_index_available(self) -> bool:
+        """Return whether this database has the filter facet tables (cached per instance)."""
+        if self._filter_facets_available is None:
+            self._filter_facets_available = self._filter_facet_repository().is_available()
+        return self._filter_facets_available
+
     def _append_all_sounds_list_filter_condition(
         self,
         conditions: list[str],
@@ -676,6 +833,34 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
 
         return conditions, params
 
+    @staticmethod
+    def _append_keyset_condition(
+        conditions: list[str],
+        params: list[object],
+        query: PaginatedQuery,
+        timestamp_column: str,
+        id_column: str,
+    ) -> None:
+        """
+        Append a keyset condition that continues a ``(timestamp DESC, id DESC)`` scan.
+
+        SQLite sorts ``NULL`` timestamps last in descending order, so rows
+        without a timestamp always follow any cursor that still has one.
+        """
+        cursor = query.cursor
+        if cursor is None:
+            return
+        if cursor.timestamp is None:
+            conditions.append(f"({timestamp_column} IS NULL AND {id_column} < ?)")
+            params.append(cursor.id)
+            return
+        conditions.append(
+            f"({timestamp_column} < ? "
+            f"OR ({timestamp_column} = ? AND {id_column} < ?) "
+            f"OR {timestamp_column} IS NULL)"
+        )
+        params.extend([cursor.timestamp, cursor.timestamp, cursor.id])
+
     @staticmethod
     def _action_count_needs_sound_join(query: PaginatedQuery) -> bool:
         """Return whether an action count must join sounds for filters/search."""
@@ -683,28 +868,28 @@ class WebContentRepository(BaseRepository[dict[str, Any]]):
 
     def get_sound_duration_rows(
         self,
-        sound_ids: Sequence[int],
+        sound_ids: Sequence[int] | None,
         guild_id: int | str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Fetch filename and originalfilename for given sound IDs to compute durations.
 
         Args:
-            sound_ids: Sound primary keys to look up.
+            sound_ids: Sound primary keys to look up, or ``None`` for every
+                visible sound in scope.
             guild_id: Optional guild scope to filter by.
 
         Returns:
             List of rows with ``sound_id``, ``filename``, ``original_filename``.
         """
-        if not sound_ids:
+        if sound_ids is not None and not sound_ids:
             return []
 
-        conditions = [
-            "s.id IN ({})".format(", ".join("?" for _ in sound_ids)),
-            "s.is_elevenlabs = 0",
-            "s.blacklist = 0",
-        ]
-        params: list[object] = [str(sid) for sid in sound_ids]
+        conditions = ["s.is_elevenlabs = 0", "s.blacklist = 0"]
+        params: list[object] = []
+        if sound_ids is not None:
+            conditions.insert(0, "s.id IN ({})".format(", ".join("?" for _ in sound_ids)))
+            params.extend(str(sid) for sid in sound_ids)
         self._append_sound_guild_condition(conditions, params, guild_id, alias="s")
 
         rows = self._execute(
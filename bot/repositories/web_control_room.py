@@ -12,6 +12,48 @@ import sqlite3
 
 from bot.repositories.base import BaseRepository
 
+_UPSERT_STATUS_SQL = """
+    INSERT INTO web_bot_status (
+        guild_id,
+        guild_name,
+        voice_connected,
+        voice_channel_id,
+        voice_channel_name,
+        voice_member_count,
+        voice_members,
+        is_playing,
+        is_paused,
+        current_sound,
+        current_requester,
+        current_duration_seconds,
+        current_elapsed_seconds,
+        muted,
+        mute_remaining_seconds,
+        recent_play_traces,
+        sampled_at_unix,
+        updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(guild_id) DO UPDATE SET
+        guild_name = excluded.guild_name,
+        voice_connected = excluded.voice_connected,
+        voice_channel_id = excluded.voice_channel_id,
+        voice_channel_name = excluded.voice_channel_name,
+        voice_member_count = excluded.voice_member_count,
+        voice_members = excluded.voice_members,
+        is_playing = excluded.is_playing,
+        is_paused = excluded.is_paused,
+        current_sound = excluded.current_sound,
+        current_requester = excluded.current_requester,
+        current_duration_seconds = excluded.current_duration_seconds,
+        current_elapsed_seconds = excluded.current_elapsed_seconds,
+        muted = excluded.muted,
+        mute_remaining_seconds = excluded.mute_remaining_seconds,
+        recent_play_traces = excluded.recent_play_traces,
+        sampled_at_unix = excluded.sampled_at_unix,
+        updated_at = excluded.updated_at
+"""
+
 
 class WebControlRoomRepository(BaseRepository[dict[str, Any]]):
     """
@@ -70,6 +112,8 @@ class WebControlRoomRepository(BaseRepository[dict[str, Any]]):
                 current_elapsed_seconds REAL,
                 muted INTEGER NOT NULL DEFAULT 0,
                 mute_remaining_seconds INTEGER NOT NULL DEFAULT 0,
+                recent_play_traces TEXT,
+                sampled_at_unix REAL,
                 updated_at DATETIME NOT NULL
             )
             """
@@ -77,6 +121,8 @@ class WebControlRoomRepository(BaseRepository[dict[str, Any]]):
         self._ensure_column("voice_members TEXT", "voice_members")
         self._ensure_column("current_duration_seconds REAL", "current_duration_seconds")
         self._ensure_column("current_elapsed_seconds REAL", "current_elapsed_seconds")
+        self._ensure_column("sampled_at_unix REAL", "sampled_at_unix")
+        self._ensure_column("recent_play_traces TEXT", "recent_play_traces")
 
     def _ensure_column(self, column_def: str, column_name: str) -> None:
         """Add a missing status-table column for existing deployments."""
@@ -103,6 +149,8 @@ class WebControlRoomRepository(BaseRepository[dict[str, Any]]):
         current_elapsed_seconds: float | None,
         muted: bool,
         mute_remaining_seconds: int,
+        recent_play_traces: list[dict[str, Any]] | None = None,
+        sampled_at_unix: float | None = None,
         updated_at: datetime | None = None,
     ) -> int:
         """
@@ -124,71 +172,101 @@ class WebControlRoomRepository(BaseRepository[dict[str, Any]]):
             current_elapsed_seconds: Current playback progress in seconds.
             muted: Whether runtime mute is active.
             mute_remaining_seconds: Runtime mute remaining seconds.
+            recent_play_traces: Latest completed playback startup traces.
+            sampled_at_unix: Unix time the elapsed/mute counters were read;
+                readers extrapolate from it. ``None`` means "as stored".
             updated_at: Optional timestamp for deterministic tests.
 
         Returns:
             SQLite row ID or status code from the write operation.
         """
-        timestamp = (updated_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
-        voice_members_json = json.dumps(voice_members or [])
         return self._execute_write(
-            """
-            INSERT INTO web_bot_status (
-                guild_id,
-                guild_name,
-                voice_connected,
-                voice_channel_id,
-                voice_channel_name,
-                voice_member_count,
-                voice_members,
-                is_playing,
-                is_paused,
-                current_sound,
-                current_requester,
-                current_duration_seconds,
-                current_elapsed_seconds,
-                muted,
-                mute_remaining_seconds,
-                updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(guild_id) DO UPDATE SET
-                guild_name = excluded.guild_name,
-                voice_connected = excluded.voice_connected,
-                voice_channel_id = excluded.voice_channel_id,
-                voice_channel_name = excluded.voice_channel_name,
-                voice_member_count = excluded.voice_member_count,
-                voice_members = excluded.voice_members,
-                is_playing = excluded.is_playing,
-                is_paused = excluded.is_paused,
-                current_sound = excluded.current_sound,
-                current_requester = excluded.current_requester,
-                current_duration_seconds = excluded.current_duration_seconds,
-                current_elapsed_seconds = excluded.current_elapsed_seconds,
-                muted = excluded.muted,
-                mute_remaining_seconds = excluded.mute_remaining_seconds,
-                updated_at = excluded.updated_at
-            """,
-            (
-                str(guild_id),
-                guild_name,
-                1 if voice_connected else 0,
-                str(voice_channel_id) if voice_channel_id is not None else None,
-                voice_channel_name,
-                max(0, int(voice_member_count)),
-                voice_members_json,
-                1 if is_playing else 0,
-                1 if is_paused else 0,
-                current_sound,
-                current_requester,
-                current_duration_seconds,
-                current_elapsed_seconds,
-                1 if muted else 0,
-                max(0, int(mute_remaining_seconds)),
-                timestamp,
+            _UPSERT_STATUS_SQL,
+            self._status_params(
+                guild_id=guild_id,
+                guild_name=guild_name,
+                voice_connected=voice_connected,
+                voice_channel_id=voice_channel_id,
+                voice_channel_name=voice_channel_name,
+                voice_member_count=voice_member_count,
+                voice_members=voice_members,
+                is_playing=is_playing,
+                is_paused=is_paused,
+                current_sound=current_sound,
+                current_requester=current_requester,
+                current_duration_seconds=current_duration_seconds,
+                current_elapsed_seconds=current_elapsed_seconds,
+                muted=muted,
+                mute_remaining_seconds=mute_remaining_seconds,
+                recent_play_traces=recent_play_traces,
+                sampled_at_unix=sampled_at_unix,
+                updated_at=updated_at,
             ),
         )
 
+    def upsert_statuses(self, statuses: list[dict[str, Any]]) -> int:
+        """
+        Insert or update several guilds' runtime status in one transaction.
+
+        Args:
+            statuses: Dicts with the same keys as ``upsert_status`` arguments.
+
+        Returns:
+            Number of status rows written.
+        """
+        if not statuses:
+            return 0
+        self._execute_many(
+            _UPSERT_STATUS_SQL,
+            [self._status_params(**status) for status in statuses],
+        )
+        return len(statuses)
+
+    def _status_params(
+        self,
+        *,
+        guild_id: int | str,
+        guild_name: str,
+        voice_connected: bool,
+        voice_channel_id: int | str | None,
+        voice_channel_name: str | None,
+        voice_member_count: int,
+        voice_members: list[dict[str, Any]] | None,
+        is_playing: bool,
+        is_paused: bool,
+        current_sound: str | None,
+        current_requester: str | None,
+        current_duration_seconds: float | None,
+        current_elapsed_seconds: float | None,
+        muted: bool,
+        mute_remaining_seconds: int,
+        recent_play_traces: list[dict[str, Any]] | None = None,
+        sampled_at_unix: float | None = None,
+        updated_at: datetime | None = None,
+    ) -> tuple[Any, ...]:
+        """Build the positional parameters for ``_UPSERT_STATUS_SQL``."""
+        timestamp = (updated_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            str(guild_id),
+            guild_name,
+            1 if voice_connected else 0,
+            str(voice_channel_id) if voice_channel_id is not None else None,
+            voice_channel_name,
+            max(0, int(voice_member_count)),
+            json.dumps(voice_members or []),
+            1 if is_playing else 0,
+            1 if is_paused else 0,
+            current_sound,
+            current_requester,
+            current_duration_seconds,
+            current_elapsed_seconds,
+            1 if muted else 0,
+            max(0, int(mute_remaining_seconds)),
+            json.dumps(recent_play_traces or []),
+            sampled_at_unix,
+            timestamp,
+        )
+
     def get_status(self, guild_id: int | str) -> dict[str, Any] | None:
         """
         Get one guild's latest runtime status.
@@ -0,0 +1,402 @@
+"""
+Repository for precomputed soundboard filter-option facets.
+
+``web_filter_facets`` stores one row per ``(scope, guild_id, value)`` with a
+reference count, maintained by triggers on ``actions``, ``sounds`` and
+``sound_lists``. Reading the options for a table becomes a primary-key range
+scan instead of ``SELECT DISTINCT`` over every action or sound row, and
+because the triggers run inside SQLite the facets stay correct no matter
+which process (bot, web, Honker worker) performed the write.
+
+Rows with a NULL ``guild_id`` are stored under ``''`` so they take part in the
+primary key; lookups for a guild read both that guild and the ``''`` bucket,
+matching the ``guild_id = ? OR guild_id IS NULL`` rule of the table queries.
+
+``actions`` is the hot write path, so inserts there carry no trigger at all.
+``web_filter_facet_rollup`` keeps the highest action id already counted;
+the bot's background loop folds newer actions in with one grouped statement
+(a trigger on the watermark row, so concurrent rollups in other processes
+cannot count the same rows twice). Reads never write, so action facets lag
+inserts by at most one rollup interval. Deletes of counted actions still
+decrement through a trigger.
+
+``web_filter_facet_versions`` holds a counter per invalidation group that the
+same triggers bump, so per-process caches can serve options in O(1) and only
+recompute after a relevant write. Sound lists and favorite users are not
+stored as facets (lists are a tiny indexed table, favorite users depend on
+the latest favorite action per user) but still get a version group.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from typing import Any
+
+from bot.repositories.base import BaseRepository
+
+WEB_FILTER_FACETS_TABLE = "web_filter_facets"
+WEB_FILTER_FACET_VERSIONS_TABLE = "web_filter_facet_versions"
+WEB_FILTER_FACET_ROLLUP_TABLE = "web_filter_facet_rollup"
+
+_ACTIONS_HIGH_WATER_SQL = f"(SELECT actions_high_water FROM {WEB_FILTER_FACET_ROLLUP_TABLE} WHERE id = 1)"
+_NEWEST_ACTION_SQL = "COALESCE((SELECT MAX(id) FROM actions), 0)"
+
+# Facet scopes stored in ``web_filter_facets``.
+FACET_ACTION = "action"
+FACET_ACTION_USER = "action_user"
+FACET_ACTION_SOUND = "action_sound"
+FACET_SOUND = "sound"
+FACET_FAVORITE_SOUND = "favorite_sound"
+FACET_SOUND_DATE = "sound_date"
+
+# Invalidation groups in ``web_filter_facet_versions``.
+VERSION_ACTIONS = "actions"
+VERSION_SOUNDS = "sounds"
+VERSION_FAVORITES = "favorites"
+VERSION_LISTS = "lists"
+FACET_VERSION_GROUPS = (VERSION_ACTIONS, VERSION_SOUNDS, VERSION_FAVORITES, VERSION_LISTS)
+
+_DESCENDING_SCOPES = frozenset({FACET_SOUND_DATE})
+
+
+def _non_empty_sql(expression: str) -> str:
+    """Return SQL testing that an expression is a non-blank string."""
+    return f"{expression} IS NOT NULL AND TRIM({expression}) != ''"
+
+
+def _visible_sound_sql(row: str) -> str:
+    """Return SQL for the sound visibility rule used by the web tables."""
+    return f"{row}.is_elevenlabs = 0 AND {row}.blacklist = 0"
+
+
+def _action_sound_name_sql(row: str) -> str:
+    """Return SQL resolving an action target to its sound filename."""
+    return (
+        f"COALESCE((SELECT Filename FROM sounds "
+        f"WHERE id = {row}.target AND CAST(id AS TEXT) = {row}.target), {row}.target)"
+    )
+
+
+def _action_facets(row: str) -> list[tuple[str, str, str]]:
+    """Return ``(scope, value_sql, condition_sql)`` facets contributed by an action row."""
+    sound_name = _action_sound_name_sql(row)
+    return [
+        (FACET_ACTION, f"{row}.action", _non_empty_sql(f"{row}.action")),
+        (FACET_ACTION_USER, f"{row}.username", _non_empty_sql(f"{row}.username")),
+        (FACET_ACTION_SOUND, sound_name, _non_empty_sql(sound_name)),
+    ]
+
+
+def _sound_facets(row: str) -> list[tuple[str, str, str]]:
+    """Return ``(scope, value_sql, condition_sql)`` facets contributed by a sound row."""
+    visible = _visible_sound_sql(row)
+    named = f"{visible} AND {_non_empty_sql(f'{row}.Filename')}"
+    return [
+        (FACET_SOUND, f"{row}.Filename", named),
+        (FACET_FAVORITE_SOUND, f"{row}.Filename", f"{named} AND {row}.favorite = 1"),
+        (
+            FACET_SOUND_DATE,
+            f"date({row}.timestamp)",
+            f"{visible} AND {_non_empty_sql(f'{row}.timestamp')} AND date({row}.timestamp) IS NOT NULL",
+        ),
+    ]
+
+
+def _increment_sql(row: str, scope: str, value: str, condition: str) -> str:
+    """Return a trigger statement adding one reference to a facet value."""
+    return f"""
+        INSERT INTO {WEB_FILTER_FACETS_TABLE} (scope, guild_id, value, ref_count)
+        SELECT '{scope}', COALESCE({row}.guild_id, ''), {value}, 1
+        WHERE {condition}
+        ON CONFLICT(scope, guild_id, value) DO UPDATE SET ref_count = ref_count + 1;
+    """
+
+
+def _decrement_sql(row: str, scope: str, value: str, condition: str) -> str:
+    """Return trigger statements removing one reference from a facet value."""
+    match = f"scope = '{scope}' AND guild_id = COALESCE({row}.guild_id, '') AND value = {value}"
+    return f"""
+        UPDATE {WEB_FILTER_FACETS_TABLE} SET ref_count = ref_count - 1
+        WHERE {match} AND {condition};
+        DELETE FROM {WEB_FILTER_FACETS_TABLE} WHERE {match} AND ref_count <= 0;
+    """
+
+
+def _action_rollup_sql(after_id: str, through_id: str) -> str:
+    """Return a statement counting the facets of actions in ``(after_id, through_id]``."""
+    selects = "\n            UNION ALL ".join(
+        f"SELECT '{scope}' AS scope, COALESCE(a.guild_id, '') AS guild_id, {value} AS value "
+        f"FROM actions a WHERE a.id > {after_id} AND a.id <= {through_id} AND {condition}"
+        for scope, value, condition in _action_facets("a")
+    )
+    return f"""
+        INSERT INTO {WEB_FILTER_FACETS_TABLE} (scope, guild_id, value, ref_count)
+        SELECT scope, guild_id, value, COUNT(*)
+        FROM ({selects})
+        WHERE true
+        GROUP BY scope, guild_id, value
+        ON CONFLICT(scope, guild_id, value) DO UPDATE SET ref_count = ref_count + excluded.ref_count;
+    """
+
+
+def _move_action_sound_sql(sound_id: str, old_value: str, new_value: str) -> str:
+    """Return trigger statements re-labelling counted actions that target a sound id."""
+    target_match = f"target = CAST({sound_id} AS TEXT) AND actions.id <= {_ACTIONS_HIGH_WATER_SQL}"
+    return f"""
+        INSERT INTO {WEB_FILTER_FACETS_TABLE} (scope, guild_id, value, ref_count)
+        SELECT '{FACET_ACTION_SOUND}', COALESCE(guild_id, ''), {new_value}, COUNT(*)
+        FROM actions
+        WHERE {target_match} AND {_non_empty_sql(new_value)}
+        GROUP BY COALESCE(guild_id, '')
+        ON CONFLICT(scope, guild_id, value) DO UPDATE SET ref_count = ref_count + excluded.ref_count;
+        UPDATE {WEB_FILTER_FACETS_TABLE}
+        SET ref_count = ref_count - (
+            SELECT COUNT(*) FROM actions
+            WHERE {target_match}
+              AND COALESCE(actions.guild_id, '') = {WEB_FILTER_FACETS_TABLE}.guild_id
+        )
+        WHERE scope = '{FACET_ACTION_SOUND}' AND value = {old_value};
+        DELETE FROM {WEB_FILTER_FACETS_TABLE}
+        WHERE scope = '{FACET_ACTION_SOUND}' AND value = {old_value} AND ref_count <= 0;
+    """
+
+
+def _bump_versions_sql(groups: Iterable[str], condition: str | None = None) -> str:
+    """Return a trigger statement bumping invalidation counters."""
+    names = ", ".join(f"'{group}'" for group in groups)
+    extra = f" AND {condition}" if condition else ""
+    return (
+        f"UPDATE {WEB_FILTER_FACET_VERSIONS_TABLE} SET version = version + 1 "
+        f"WHERE name IN ({names}){extra};"
+    )
+
+
+_FAVORITE_ACTION_SQL = "{row}.action IN ('favorite_sound', 'unfavorite_sound')"
+
+
+def _trigger_definitions() -> dict[str, str]:
+    """Return trigger name -> ``CREATE TRIGGER`` SQL for facet maintenance."""
+    def body(statements: Iterable[str]) -> str:
+        return "\n".join(statements)
+
+    action_rollup = body(
+        [
+            _action_rollup_sql("OLD.actions_high_water", "NEW.actions_high_water"),
+            _bump_versions_sql([VERSION_ACTIONS]),
+            _bump_versions_sql(
+                [VERSION_FAVORITES],
+                "EXISTS (SELECT 1 FROM actions a WHERE a.id > OLD.actions_high_water "
+                "AND a.id <= NEW.actions_high_water AND "
+                + _FAVORITE_ACTION_SQL.format(row="a")
+                + ")",
+            ),
+        ]
+    )
+    # After deleting the newest rows SQLite reuses their ids, so pull the
+    # watermark back or those new actions would look already counted.
+    action_delete = body(
+        [_decrement_sql("OLD", *facet) for facet in _action_facets("OLD")]
+        + [
+            _bump_versions_sql([VERSION_ACTIONS]),
+            _bump_versions_sql([VERSION_FAVORITES], _FAVORITE_ACTION_SQL.format(row="OLD")),
+            f"UPDATE {WEB_FILTER_FACET_ROLLUP_TABLE} SET actions_high_water = {_NEWEST_ACTION_SQL} "
+            f"WHERE id = 1 AND actions_high_water > {_NEWEST_ACTION_SQL};",
+        ]
+    )
+    sound_insert = body(
+        [_increment_sql("NEW", *facet) for facet in _sound_facets("NEW")]
+        + [
+            _move_action_sound_sql("NEW.id", "CAST(NEW.id AS TEXT)", "NEW.Filename"),
+            _bump_versions_sql([VERSION_SOUNDS, VERSION_ACTIONS]),
+        ]
+    )
+    sound_update = body(
+        [_decrement_sql("OLD", *facet) for facet in _sound_facets("OLD")]
+        + [_increment_sql("NEW", *facet) for facet in _sound_facets("NEW")]
+        + [
+            _bump_versions_sql([VERSION_SOUNDS, VERSION_FAVORITES]),
+        ]
+    )
+    sound_rename = body(
+        [
+            _move_action_sound_sql("NEW.id", "OLD.Filename", "NEW.Filename"),
+            _bump_versions_sql([VERSION_ACTIONS]),
+        ]
+    )
+    sound_delete = body(
+        [_decrement_sql("OLD", *facet) for facet in _sound_facets("OLD")]
+        + [
+            _move_action_sound_sql("OLD.id", "OLD.Filename", "CAST(OLD.id AS TEXT)"),
+            _bump_versions_sql([VERSION_SOUNDS, VERSION_FAVORITES, VERSION_ACTIONS]),
+        ]
+    )
+    list_change = _bump_versions_sql([VERSION_LISTS])
+
+    sound_columns = "Filename, favorite, blacklist, is_elevenlabs, timestamp, guild_id"
+    return {
+        "web_filter_facets_actions_rollup": (
+            f"AFTER UPDATE OF actions_high_water ON {WEB_FILTER_FACET_ROLLUP_TABLE} "
+            f"WHEN NEW.actions_high_water > OLD.actions_high_water BEGIN {action_rollup} END"
+        ),
+        "web_filter_facets_actions_delete": (
+            f"AFTER DELETE ON actions WHEN OLD.id <= {_ACTIONS_HIGH_WATER_SQL} BEGIN {action_delete} END"
+        ),
+        "web_filter_facets_sounds_insert": f"AFTER INSERT ON sounds BEGIN {sound_insert} END",
+        "web_filter_facets_sounds_update": (
+            f"AFTER UPDATE OF {sound_columns} ON sounds BEGIN {sound_update} END"
+        ),
+        "web_filter_facets_sounds_rename": (
+            "AFTER UPDATE OF Filename ON sounds "
+            f"WHEN OLD.Filename IS NOT NEW.Filename BEGIN {sound_rename} END"
+        ),
+        "web_filter_facets_sounds_delete": f"AFTER DELETE ON sounds BEGIN {sound_delete} END",
+        "web_filter_facets_lists_insert": f"AFTER INSERT ON sound_lists BEGIN {list_change} END",
+        "web_filter_facets_lists_update": f"AFTER UPDATE ON sound_lists BEGIN {list_change} END",
+        "web_filter_facets_lists_delete": f"AFTER DELETE ON sound_lists BEGIN {list_change} END",
+    }
+
+
+class WebFilterFacetRepository(BaseRepository[dict[str, Any]]):
+    """
+    Repository for trigger-maintained filter-option facets.
+    """
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        """Convert a row to a plain dictionary."""
+        return dict(row)
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        """Not used for this query-oriented repository."""
+        return None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Not used for this query-oriented repository."""
+        return []
+
+    def ensure_schema(self) -> None:
+        """Create the facet tables and triggers, backfilling on first creation."""
+        created = not self.is_available()
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {WEB_FILTER_FACETS_TABLE} (
+                scope TEXT NOT NULL,
+                guild_id TEXT NOT NULL DEFAULT '',
+                value TEXT NOT NULL,
+                ref_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (scope, guild_id, value)
+            ) WITHOUT ROWID
+            """
+        )
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {WEB_FILTER_FACET_VERSIONS_TABLE} (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._execute_many(
+            f"INSERT OR IGNORE INTO {WEB_FILTER_FACET_VERSIONS_TABLE} (name, version) VALUES (?, 0)",
+            [(group,) for group in FACET_VERSION_GROUPS],
+        )
+        self._execute_write(
+            f"""
+            CREATE TABLE IF NOT EXISTS {WEB_FILTER_FACET_ROLLUP_TABLE} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                actions_high_water INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._execute_write(
+            f"INSERT OR IGNORE INTO {WEB_FILTER_FACET_ROLLUP_TABLE} (id, actions_high_water) VALUES (1, 0)"
+        )
+        for name, definition in _trigger_definitions().items():
+            self._execute_write(f"CREATE TRIGGER IF NOT EXISTS {name} {definition}")
+
+        if created:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recount every facet from the source tables."""
+        self._execute_write(f"DELETE FROM {WEB_FILTER_FACETS_TABLE}")
+        self._execute_write(f"UPDATE {WEB_FILTER_FACET_ROLLUP_TABLE} SET actions_high_water = 0 WHERE id = 1")
+        self.roll_up_actions()
+        for scope, value, condition in _sound_facets("s"):
+            self._execute_write(
+                f"""
+                INSERT INTO {WEB_FILTER_FACETS_TABLE} (scope, guild_id, value, ref_count)
+                SELECT '{scope}', COALESCE(s.guild_id, ''), {value}, COUNT(*)
+                FROM sounds s
+                WHERE {condition}
+                GROUP BY 1, 2, 3
+                """
+            )
+        self._execute_write(f"UPDATE {WEB_FILTER_FACET_VERSIONS_TABLE} SET version = version + 1")
+
+    def is_available(self) -> bool:
+        """Return whether the facet tables exist in this database."""
+        row = self._execute_one(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (WEB_FILTER_FACET_VERSIONS_TABLE,),
+        )
+        return row is not None
+
+    def roll_up_actions(self) -> None:
+        """
+        Count actions inserted since the last rollup into their facets.
+
+        A write; run it from a background job, never from a request handler.
+        """
+        row = self._execute_one(
+            f"SELECT actions_high_water, {_NEWEST_ACTION_SQL} AS newest "
+            f"FROM {WEB_FILTER_FACET_ROLLUP_TABLE} WHERE id = 1"
+        )
+        if row is None or int(row["newest"]) <= int(row["actions_high_water"]):
+            return
+        # The rollup trigger counts the range between the old and new watermark
+        # inside this one statement, so racing readers never overlap.
+        self._execute_write(
+            f"UPDATE {WEB_FILTER_FACET_ROLLUP_TABLE} SET actions_high_water = {_NEWEST_ACTION_SQL} "
+            f"WHERE id = 1 AND actions_high_water < {_NEWEST_ACTION_SQL}"
+        )
+
+    def get_values(self, scope: str, guild_id: int | str | None = None) -> list[str]:
+        """
+        Return the distinct values of one facet.
+
+        Args:
+            scope: Facet scope, e.g. ``FACET_ACTION_USER``.
+            guild_id: Optional guild; global (NULL-guild) values are included.
+
+        Returns:
+            Stripped values ordered like the original ``SELECT DISTINCT``
+            queries (case-insensitive ascending, dates newest first).
+        """
+        order = "value DESC" if scope in _DESCENDING_SCOPES else "value COLLATE NOCASE ASC"
+        guild_sql = ""
+        params: list[object] = [scope]
+        if guild_id is not None:
+            guild_sql = "AND guild_id IN (?, '')"
+            params.append(str(guild_id))
+
+        rows = self._execute(
+            f"""
+            SELECT DISTINCT value
+            FROM {WEB_FILTER_FACETS_TABLE}
+            WHERE scope = ? {guild_sql} AND ref_count > 0
+            ORDER BY {order}
+            """,
+            tuple(params),
+        )
+        values: list[str] = []
+        for row in rows:
+            text = str(row["value"]).strip()
+            if text:
+                values.append(text)
+        return values
+
+    def get_versions(self) -> dict[str, int]:
+        """Return the current invalidation counter for every group."""
+        rows = self._execute(f"SELECT name, version FROM {WEB_FILTER_FACET_VERSIONS_TABLE}")
+        return {str(row["name"]): int(row["version"]) for row in rows}
@@ -0,0 +1,120 @@
+"""
+Repository for web viewer presence shared between the web and bot processes.
+
+Each web worker owns one ``web_viewer_presence`` row keyed by ``worker_id``
+holding its open SSE stream count and when it last served an ``/api/``
+request.  The bot reads the rows to decide whether anyone is watching the
+web UI (see ``bot.services.adaptive_scheduler``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import sqlite3
+
+from bot.repositories.base import BaseRepository
+
+
+class WebViewerPresenceRepository(BaseRepository[dict[str, Any]]):
+    """
+    One row per web worker describing current viewer activity.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, use_shared: bool = True):
+        super().__init__(db_path=db_path, use_shared=use_shared)
+        self.ensure_schema()
+
+    # ------------------------------------------------------------------
+    # BaseRepository interface
+    # ------------------------------------------------------------------
+
+    def _row_to_entity(self, row: sqlite3.Row) -> dict[str, Any]:
+        return dict(row) if row else {}
+
+    def get_by_id(self, id: int) -> dict[str, Any] | None:
+        return None
+
+    def get_all(self, limit: int = 100) -> list[dict[str, Any]]:
+        rows = self._execute(
+            "SELECT * FROM web_viewer_presence ORDER BY updated_at_unix DESC LIMIT ?",
+            (limit,),
+        )
+        return [self._row_to_entity(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def ensure_schema(self) -> None:
+        """Ensure the ``web_viewer_presence`` table exists."""
+        self._execute_write(
+            """
+            CREATE TABLE IF NOT EXISTS web_viewer_presence (
+                worker_id TEXT PRIMARY KEY,
+                stream_clients INTEGER NOT NULL DEFAULT 0,
+                last_request_unix REAL,
+                updated_at_unix REAL NOT NULL
+            )
+            """
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        worker_id: str,
+        stream_clients: int,
+        last_request_unix: Optional[float],
+        updated_at_unix: float,
+    ) -> None:
+        """
+        Insert or replace one worker's presence row.
+
+        Args:
+            worker_id: Stable identifier of the web worker process.
+            stream_clients: Open ``/api/events`` streams on that worker.
+            last_request_unix: When the worker last served an API request.
+            updated_at_unix: When the row was written.
+        """
+        self._execute_write(
+            """
+            INSERT OR REPLACE INTO web_viewer_presence (
+                worker_id, stream_clients, last_request_unix, updated_at_unix
+            ) VALUES (?, ?, ?, ?)
+            """,
+            (worker_id, max(0, int(stream_clients)), last_request_unix, updated_at_unix),
+        )
+
+    def count_active_viewers(self, since_unix: float) -> int:
+        """
+        Return open streams plus recently polling workers seen since a cutoff.
+
+        Rows not refreshed since ``since_unix`` (e.g. from a worker that
+        died) are ignored.
+
+        Args:
+            since_unix: Oldest ``updated_at_unix``/``last_request_unix`` that
+                still counts as live.
+        """
+        row = self._execute_one(
+            """
+            SELECT COALESCE(SUM(
+                stream_clients
+                + CASE WHEN last_request_unix >= ? THEN 1 ELSE 0 END
+            ), 0) AS viewers
+            FROM web_viewer_presence
+            WHERE updated_at_unix >= ?
+            """,
+            (since_unix, since_unix),
+        )
+        return int(row["viewers"]) if row else 0
+
+    def prune(self, before_unix: float) -> None:
+        """Delete rows not refreshed since ``before_unix``."""
+        self._execute_write(
+            "DELETE FROM web_viewer_presence WHERE updated_at_unix < ?",
+            (before_unix,),
+        )
@@ -5,16 +5,22 @@ Services encapsulate business operations and coordinate between
 repositories, external APIs, and other services.
 """
 
-from bot.services.message import MessageService
-from bot.services.mute import MuteService
-from bot.services import backup
-from bot.services.backup import BackupService
-from bot.services.image_generator import ImageGeneratorService
-from bot.services.year_review_video import YearReviewVideoService
-from bot.services.guild_settings import GuildSettingsService
-from bot.services.rl_store import RocketLeagueStoreService
-from bot.services.weekly_wrapped import WeeklyWrappedService
-from bot.services.web_tts_settings import WebTtsSettingsService
+from importlib import import_module
+
+# Loaded on first access so light submodules (e.g. loudness, imported by
+# worker processes) do not drag in every service.
+_EXPORTS = {
+    "MessageService": "bot.services.message",
+    "MuteService": "bot.services.mute",
+    "backup": "bot.services.backup",
+    "BackupService": "bot.services.backup",
+    "ImageGeneratorService": "bot.services.image_generator",
+    "YearReviewVideoService": "bot.services.year_review_video",
+    "GuildSettingsService": "bot.services.guild_settings",
+    "RocketLeagueStoreService": "bot.services.rl_store",
+    "WeeklyWrappedService": "bot.services.weekly_wrapped",
+    "WebTtsSettingsService": "bot.services.web_tts_settings",
+}
 
 __all__ = [
     "MessageService",
@@ -27,3 +33,14 @@ __all__ = [
     "WeeklyWrappedService",
     "WebTtsSettingsService",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = import_module(module)
+    if name != "backup":
+        value = getattr(value, name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,241 @@
+"""
+Demand-driven cadence for ``BackgroundService`` periodic loops.
+
+Each registered ``discord.ext.tasks.Loop`` declares an active and an idle
+interval plus the demand signals that keep it active:
+
+- ``viewers``: someone has the web UI open (SSE streams or API polling);
+- ``voice``: the bot sits in a voice channel with non-bot members;
+- ``interaction``: a Discord interaction arrived recently.
+
+``refresh`` switches loops between the two intervals with
+``Loop.change_interval``, which reschedules a sleeping loop immediately, so
+a viewer opening the control room gets 1 s updates on the next refresh while
+an idle night costs one tick per idle interval. Every loop gets a stable
+per-loop jitter factor so loops sharing a nominal interval drift apart
+instead of waking on the same tick. Loops registered without a cadence
+(wall-clock schedulers, outbox drains) keep their own interval and are only
+timed.
+
+Each loop's coroutine is wrapped to collect runtime stats (runs, errors,
+last/max/total duration), exposed through ``stats`` and the metrics registry.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from bot.metrics import REGISTRY
+
+DEMAND_VIEWERS = "viewers"
+DEMAND_VOICE = "voice"
+DEMAND_INTERACTION = "interaction"
+
+LOOP_SECONDS = REGISTRY.histogram(
+    "background_loop_seconds",
+    "Duration of one BackgroundService loop iteration.",
+    ("loop",),
+)
+LOOP_INTERVAL = REGISTRY.gauge(
+    "background_loop_interval_seconds",
+    "Current interval of a BackgroundService loop.",
+    ("loop",),
+)
+
+
+@dataclass(frozen=True)
+class LoopCadence:
+    """Active/idle intervals of one loop and the demand that keeps it active."""
+
+    active_seconds: float
+    idle_seconds: float
+    demands: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class LoopRuntimeStats:
+    """Runtime counters for one loop."""
+
+    runs: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-safe summary."""
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.runs * 1000.0, 2) if self.runs else 0.0,
+            "max_ms": round(self.max_seconds * 1000.0, 2),
+            "last_ms": round(self.last_seconds * 1000.0, 2),
+        }
+
+
+@dataclass(slots=True)
+class _RegisteredLoop:
+    loop: Any
+    cadence: Optional[LoopCadence]
+    jitter: float
+    stats: LoopRuntimeStats
+    on_change: Optional[Callable[[float], None]]
+    interval: Optional[float] = None
+
+
+class AdaptiveLoopScheduler:
+    """
+    Pick each registered loop's interval from the current demand.
+    """
+
+    def __init__(
+        self,
+        *,
+        jitter_fraction: float = 0.1,
+        interaction_window_seconds: float = 120.0,
+        rng: Optional[random.Random] = None,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            jitter_fraction: Maximum relative stretch applied to each
+                loop's interval (0 disables jitter).
+            interaction_window_seconds: How long a Discord interaction
+                keeps ``interaction`` demand active.
+            rng: Random source for the per-loop jitter factors.
+            time_func: Monotonic clock (injectable for tests).
+        """
+        self.jitter_fraction = max(0.0, jitter_fraction)
+        self.interaction_window_seconds = max(0.0, interaction_window_seconds)
+        self._rng = rng or random.Random()
+        self._time = time_func
+        self._loops: dict[str, _RegisteredLoop] = {}
+        self._viewers = 0
+        self._voice = False
+        self._last_interaction: Optional[float] = None
+
+    def register(
+        self,
+        name: str,
+        loop: Any,
+        cadence: Optional[LoopCadence] = None,
+        on_change: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        """
+        Track a loop and wrap its coroutine for runtime stats.
+
+        Registering the same name again is a no-op.
+
+        Args:
+            name: Label used in stats and metrics.
+            loop: ``discord.ext.tasks.Loop`` bound to its instance.
+            cadence: Intervals and demand signals for the loop; ``None``
+                leaves the loop's interval alone.
+            on_change: Called with the new interval after it changes.
+        """
+        if name in self._loops:
+            return
+        entry = _RegisteredLoop(
+            loop=loop,
+            cadence=cadence,
+            jitter=1.0 + self._rng.uniform(0.0, self.jitter_fraction),
+            stats=LoopRuntimeStats(),
+            on_change=on_change,
+        )
+        self._loops[name] = entry
+        loop.coro = self._timed(name, entry.stats, loop.coro)
+
+    @staticmethod
+    def _timed(name: str, stats: LoopRuntimeStats, coro: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(coro)
+        async def _run(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await coro(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.runs += 1
+                stats.total_seconds += elapsed
+                stats.last_seconds = elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                LOOP_SECONDS.observe(elapsed, loop=name)
+
+        return _run
+
+    def note_interaction(self) -> None:
+        """Record that a Discord interaction just arrived."""
+        self._last_interaction = self._time()
+
+    def update_demand(self, *, viewers: int, voice: bool) -> None:
+        """Set the demand signals sampled by the caller."""
+        self._viewers = max(0, int(viewers))
+        self._voice = bool(voice)
+
+    def active_demands(self) -> set[str]:
+        """Return the demand signals currently present."""
+        active = set()
+        if self._viewers:
+            active.add(DEMAND_VIEWERS)
+        if self._voice:
+            active.add(DEMAND_VOICE)
+        if (
+            self._last_interaction is not None
+            and self._time() - self._last_interaction < self.interaction_window_seconds
+        ):
+            active.add(DEMAND_INTERACTION)
+        return active
+
+    def interval_for(self, name: str, demands: Optional[Iterable[str]] = None) -> Optional[float]:
+        """Return the jittered interval a loop should use for ``demands``."""
+        entry = self._loops[name]
+        cadence = entry.cadence
+        if cadence is None:
+            return None
+        active = self.active_demands() if demands is None else set(demands)
+        if not cadence.demands or active.intersection(cadence.demands):
+            seconds = cadence.active_seconds
+        else:
+            seconds = cadence.idle_seconds
+        return round(seconds * entry.jitter, 3)
+
+    def refresh(self) -> dict[str, float]:
+        """
+        Apply the interval each loop should use now.
+
+        Returns:
+            Mapping of loop name to the interval it was switched to, for
+            loops whose interval changed.
+        """
+        active = self.active_demands()
+        changed: dict[str, float] = {}
+        for name, entry in self._loops.items():
+            seconds = self.interval_for(name, active)
+            if seconds is None or entry.interval == seconds:
+                continue
+            entry.loop.change_interval(seconds=seconds)
+            entry.interval = seconds
+            changed[name] = seconds
+            LOOP_INTERVAL.set(seconds, loop=name)
+            if entry.on_change is not None:
+                entry.on_change(seconds)
+        return changed
+
+    def stats(self) -> dict[str, Any]:
+        """Return demand and per-loop interval/runtime stats."""
+        return {
+            "demands": sorted(self.active_demands()),
+            "viewers": self._viewers,
+            "loops": {
+                name: {"interval_seconds": entry.interval, **entry.stats.to_dict()}
+                for name, entry in self._loops.items()
+            },
+        }
@@ -16,13 +16,16 @@ import random
 import re
 from datetime import datetime
 import traceback
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from collections import deque
 from mutagen.mp3 import MP3
 import speech_recognition as sr
 import vosk
 from discord import sinks
 from bot.tts import ElevenLabsQuotaExceededError
+from bot.metrics import REGISTRY
+from bot.services.playback_trace import PlaybackTrace, PlaybackTracer
+from bot.services.progress_updates import ProgressJob, get_progress_scheduler
 from bot.repositories import (
     SoundRepository, ActionRepository, ListRepository, 
     StatsRepository, KeywordRepository
@@ -34,6 +37,37 @@ from bot.services.speech_training import (
     _compute_rms,
 )
 
+PLAYBACK_STARTUP_SECONDS = REGISTRY.histogram(
+    "playback_startup_seconds",
+    "Time from play request to voice_client.play().",
+)
+FFMPEG_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "ffmpeg_queue_wait_seconds",
+    "Time spent waiting for the ffmpeg spawn semaphore.",
+)
+FFMPEG_SPAWN_SECONDS = REGISTRY.histogram(
+    "ffmpeg_spawn_seconds",
+    "Time to probe and start an ffmpeg opus source.",
+)
+FFMPEG_PROBE_SECONDS = REGISTRY.histogram(
+    "ffmpeg_probe_seconds",
+    "Time spent in FFmpegOpusAudio.probe.",
+)
+PLAYBACK_REQUESTS_DROPPED = REGISTRY.counter(
+    "playback_requests_dropped",
+    "Play requests rejected by per-guild limits.",
+    ("reason",),
+)
+PLAYBACK_READ_STALLS = REGISTRY.counter(
+    "playback_read_stalls",
+    "Audio source reads that exceeded the gap or duration warning threshold.",
+    ("kind",),
+)
+
+
+# Completed startup traces per guild shipped with each control-room status row.
+CONTROL_ROOM_TRACE_LIMIT = 8
+
 
 class PlaybackDiagnosticsAudioSource(discord.AudioSource):
     """Wrap an audio source and log voice-player read stalls."""
@@ -47,6 +81,8 @@ class PlaybackDiagnosticsAudioSource(discord.AudioSource):
         play_id: str,
         gap_warning_seconds: float,
         read_warning_seconds: float,
+        trace: Optional[PlaybackTrace] = None,
+        on_first_packet: Optional[Callable[[], None]] = None,
     ) -> None:
         self._source = source
         self.guild_id = guild_id
@@ -61,6 +97,9 @@ class PlaybackDiagnosticsAudioSource(discord.AudioSource):
         self.zero_read_count = 0
         self.started_at = time.monotonic()
         self._last_read_started_at: Optional[float] = None
+        self._trace = trace
+        self._on_first_packet = on_first_packet
+        self._first_read_ended_at: Optional[float] = None
 
     def _source_process_state(self) -> str:
         """Return compact FFmpeg process state for read-stall diagnostics."""
@@ -77,11 +116,14 @@ class PlaybackDiagnosticsAudioSource(discord.AudioSource):
 
     def read(self) -> bytes:
         read_started = time.monotonic()
+        if self._trace is not None and self.read_count == 1:
+            self._record_first_packet(read_started)
         if self._last_read_started_at is not None:
             gap = read_started - self._last_read_started_at
             self.max_gap_seconds = max(self.max_gap_seconds, gap)
             if self.gap_warning_seconds and gap >= self.gap_warning_seconds:
                 self.warning_count += 1
+                PLAYBACK_READ_STALLS.inc(kind="gap")
                 logger.warning(
                     "[AudioService] [PLAY-STUTTER] audio_source_read_gap "
                     "play_id=%s guild_id=%s file=%s gap=%.3fs reads=%s "
@@ -98,11 +140,20 @@ class PlaybackDiagnosticsAudioSource(discord.AudioSource):
         data = self._source.read()
         read_elapsed = time.monotonic() - read_started
         self.max_read_seconds = max(self.max_read_seconds, read_elapsed)
+        if self._trace is not None and self.read_count == 0:
+            self._first_read_ended_at = read_started + read_elapsed
+            self._trace.add_span(
+                "first_read",
+                read_started,
+                self._first_read_ended_at,
+                bytes=len(data) if data else 0,
+            )
         self.read_count += 1
         if not data:
             self.zero_read_count += 1
         if self.read_warning_seconds and read_elapsed >= self.read_warning_seconds:
             self.warning_count += 1
+            PLAYBACK_READ_STALLS.inc(kind="slow_read")
             logger.warning(
                 "[AudioService] [PLAY-STUTTER] audio_source_read_slow "
                 "play_id=%s guild_id=%s file=%s duration=%.3fs reads=%s "
@@ -120,6 +171,22 @@ class PlaybackDiagnosticsAudioSource(discord.AudioSource):
         self._last_read_started_at = read_started
         return data
 
+    def _record_first_packet(self, second_read_started: float) -> None:
+        """
+        Mark when the first Opus frame went out.
+
+        The voice player sends the frame returned by the first ``read()`` and
+        then sleeps one frame before reading again, so the second read bounds
+        the send from above.
+        """
+        sent_at = max(
+            self._first_read_ended_at or second_read_started,
+            second_read_started - discord.player.AudioPlayer.DELAY,
+        )
+        self._trace.mark("first_packet", at=sent_at)
+        if self._on_first_packet is not None:
+            self._on_first_packet()
+
     def is_opus(self) -> bool:
         return self._source.is_opus()
 
@@ -445,6 +512,13 @@ class AudioService:
         """Return a random filename from the done prompt pool (backward-compat)."""
         return random.choice(self.voice_command_done_sounds)
 
+    def _get_playback_tracer(self) -> PlaybackTracer:
+        """Return the playback startup tracer, creating it on first use."""
+        tracer = getattr(self, "playback_tracer", None)
+        if tracer is None:
+            tracer = self.playback_tracer = PlaybackTracer.from_env()
+        return tracer
+
     def _log_perf(self, operation: str, start_time: float, extra: str = ""):
         """Log performance metrics for an operation."""
         duration = time.time() - start_time
@@ -459,6 +533,7 @@ class AudioService:
         play_id: str,
         ffmpeg_options: str,
         ffmpeg_before_options: str,
+        trace: Optional[PlaybackTrace] = None,
     ) -> discord.AudioSource:
         """Create a Discord FFmpeg opus source with probe/constructor timing logs."""
         try:
@@ -489,8 +564,17 @@ class AudioService:
             executable=self.ffmpeg_path,
         )
         probe_duration = time.monotonic() - probe_start
+        FFMPEG_PROBE_SECONDS.observe(probe_duration)
         selected_codec = "copy" if codec in ("opus", "libopus") else "libopus"
         selected_bitrate = bitrate if bitrate is not None else 128
+        if trace is not None:
+            trace.add_span(
+                "ffmpeg_probe",
+                probe_start,
+                probe_start + probe_duration,
+                parent="ffmpeg_spawn",
+                codec=selected_codec,
+            )
         logger.info(
             "[AudioService] [FFMPEG-TRACE] probe_end "
             "play_id=%s guild_id=%s file=%s duration=%.4fs "
@@ -517,6 +601,13 @@ class AudioService:
             stderr=None,
         )
         ctor_duration = time.monotonic() - ctor_start
+        if trace is not None:
+            trace.add_span(
+                "ffmpeg_ctor",
+                ctor_start,
+                ctor_start + ctor_duration,
+                parent="ffmpeg_spawn",
+            )
         process = getattr(audio_source, "_process", None)
         logger.info(
             "[AudioService] [FFMPEG-TRACE] ctor_end "
@@ -748,6 +839,10 @@ class AudioService:
             "current_requester": self._guild_current_requester.get(guild_id) if is_playing or is_paused else None,
             "current_duration_seconds": current_duration if is_playing or is_paused else None,
             "current_elapsed_seconds": current_elapsed if is_playing or is_paused else None,
+            "recent_play_traces": self._get_playback_tracer().recent(
+                guild_id,
+                limit=CONTROL_ROOM_TRACE_LIMIT,
+            ),
         }
 
     def _track_guild_play_request(self, guild_id: int) -> bool:
@@ -759,9 +854,11 @@ class AudioService:
 
         pending = self._play_pending_count.get(guild_id, 0)
         if pending >= self._play_pending_limit:
+            PLAYBACK_REQUESTS_DROPPED.inc(reason="backpressure")
             print(f"[AudioService] [PERF] dropped_play_request guild_id={guild_id} reason=backpressure pending={pending}")
             return False
         if len(timestamps) >= self._play_request_max_per_window:
+            PLAYBACK_REQUESTS_DROPPED.inc(reason="rate_limit")
             print(f"[AudioService] [PERF] dropped_play_request guild_id={guild_id} reason=rate_limit requests={len(timestamps)}")
             return False
 
@@ -2371,17 +2468,30 @@ class AudioService:
                         loading_message: 'discord.Message' = None,
                         allow_tts_interrupt: bool = False,
                         request_note: Optional[str] = None,
-                        interrupt_existing: bool = True):
-        """Play an audio file in the specified voice channel."""
+                        interrupt_existing: bool = True,
+                        requested_at: Optional[float] = None):
+        """
+        Play an audio file in the specified voice channel.
+
+        ``requested_at`` is the Unix time the triggering interaction was
+        received; when given, the play's startup trace starts there.
+        """
         play_start_time = time.time()
         guild_id = channel.guild.id
         self._ensure_guild_playback_state(guild_id)
         self._set_active_guild(guild_id)
         print(f"[AudioService] play_audio(file={audio_file}, user={user}, guild={channel.guild.name}, guild_id={guild_id})")
         play_id = f"{guild_id}-{int(play_start_time * 1000)}"
+        trace = self._get_playback_tracer().start(
+            play_id,
+            guild_id,
+            audio_file,
+            requested_at_unix=requested_at,
+        )
         MAX_RETRIES = 3
 
         if self.mute_service.is_muted:
+            trace.finish("muted")
             if self.message_service:
                 await self.message_service.send_message(
                     title="🔇 Bot Muted",
@@ -2393,8 +2503,10 @@ class AudioService:
 
         sound_repo = getattr(self, "sound_repo", None)
         if not is_tts and sound_repo is not None:
-            sound = await asyncio.to_thread(sound_repo.get_by_filename, audio_file, guild_id)
+            with trace.span("sound_lookup"):
+                sound = await asyncio.to_thread(sound_repo.get_by_filename, audio_file, guild_id)
             if sound is not None and getattr(sound, "blacklist", False) is True:
+                trace.finish("blacklisted")
                 if self.message_service:
                     await self.message_service.send_error(f"Sound '{audio_file}' has been rejected.")
                 return False
@@ -2408,10 +2520,12 @@ class AudioService:
                     "[AudioService] Skipping non-interrupting playback - "
                     f"audio already active in {channel.guild.name}"
                 )
+                trace.finish("skipped_busy")
                 return False
 
         # Per-guild rate limiting and backpressure for non-TTS plays.
         if not is_tts and not self._track_guild_play_request(guild_id):
+            trace.finish("rate_limited")
             bot_channel = self.message_service.get_bot_channel(channel.guild)
             if bot_channel:
                 await bot_channel.send(
@@ -2433,8 +2547,10 @@ class AudioService:
         try:
             self._guild_current_similar_sounds[guild_id] = None
             self.current_similar_sounds = None
-            voice_client = await self.ensure_voice_connected(channel)
+            with trace.span("voice_connect"):
+                voice_client = await self.ensure_voice_connected(channel)
             if not voice_client:
+                trace.finish("voice_connect_failed")
                 self._release_guild_play_request(guild_id)
                 return False
             print(
@@ -2452,11 +2568,13 @@ class AudioService:
                     "[AudioService] Skipping non-interrupting playback - "
                     f"audio still active in {channel.guild.name} after connect"
                 )
+                trace.finish("skipped_busy")
                 self._release_guild_play_request(guild_id)
                 return False
 
             if is_currently_playing:
                 if is_tts and not allow_tts_interrupt:
+                    trace.finish("tts_busy")
                     await self._notify_tts_busy(
                         channel=channel,
                         user=user,
@@ -2475,7 +2593,8 @@ class AudioService:
                 self._guild_stop_progress_update[guild_id] = True
                 self.stop_progress_update = True
                 self._cancel_progress_update_task(guild_id)
-                await self._stop_voice_client_and_wait(voice_client)
+                with trace.span("stop_previous"):
+                    await self._stop_voice_client_and_wait(voice_client)
                 
                 # Update the previous sound's message with skip emoji
                 if previous_sound_message: 
@@ -2506,7 +2625,8 @@ class AudioService:
                         f"lingering_player_id={lingering_player_id} "
                         f"state={self._voice_client_state_summary(voice_client)}"
                     )
-                    lingering_exited = await self._wait_for_audio_player_thread(lingering_player, timeout=2.0)
+                    with trace.span("wait_lingering_player"):
+                        lingering_exited = await self._wait_for_audio_player_thread(lingering_player, timeout=2.0)
                     print(
                         "[AudioService] [PLAY-DEBUG] lingering_player_wait_done "
                         f"play_id={play_id} guild_id={guild_id} file={audio_file} "
@@ -2515,6 +2635,7 @@ class AudioService:
                     )
                     await asyncio.sleep(0.05)
 
+            warmup_span = trace.begin("entrance_warmup") if is_entrance else None
             await self._maybe_apply_entrance_playback_warmup(
                 guild_id=guild_id,
                 audio_file=audio_file,
@@ -2522,28 +2643,34 @@ class AudioService:
                 voice_client=voice_client,
                 is_entrance=is_entrance,
             )
+            if warmup_span is not None:
+                trace.end(warmup_span)
 
             # Resolve file path immediately to avoid pre-playback DB reads
             audio_file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds", audio_file))
             if not os.path.exists(audio_file_path):
                 # Fallback to DB lookup only if file not found directly
-                sound_info = await asyncio.to_thread(self.sound_repo.get_sound, audio_file, False, guild_id)
+                with trace.span("path_lookup"):
+                    sound_info = await asyncio.to_thread(self.sound_repo.get_sound, audio_file, False, guild_id)
                 if sound_info:
                     audio_file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds", sound_info[1]))
                 
                 # Double check existence
                 if not os.path.exists(audio_file_path):
                     # Try original name lookup
-                    sound_info_orig = await asyncio.to_thread(self.sound_repo.get_sound, audio_file, True, guild_id)
+                    with trace.span("path_lookup", by_original_name=True):
+                        sound_info_orig = await asyncio.to_thread(self.sound_repo.get_sound, audio_file, True, guild_id)
                     if sound_info_orig and len(sound_info_orig) > 2:
                         audio_file_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "sounds", sound_info_orig[2]))
                     
                     if not os.path.exists(audio_file_path):
+                        trace.finish("file_not_found")
                         await self.message_service.send_error(f"Audio file not found: {audio_file}")
                         self._release_guild_play_request(guild_id)
                         return False
 
             if not self.ffmpeg_path or not os.path.exists(self.ffmpeg_path):
+                trace.finish("ffmpeg_missing")
                 await self.message_service.send_error(f"Invalid FFmpeg path: {self.ffmpeg_path}")
                 self._release_guild_play_request(guild_id)
                 return False
@@ -2555,13 +2682,14 @@ class AudioService:
             playback_bitrate_bps: Optional[int] = None
             if audio_file_path.lower().endswith(".mp3"):
                 mp3_info_start = time.time()
-                (
-                    mp3_duration_seconds,
-                    playback_sample_rate_hz,
-                    playback_bitrate_bps,
-                ) = await asyncio.to_thread(
-                    self._read_mp3_playback_info, audio_file_path
-                )
+                with trace.span("mp3_info"):
+                    (
+                        mp3_duration_seconds,
+                        playback_sample_rate_hz,
+                        playback_bitrate_bps,
+                    ) = await asyncio.to_thread(
+                        self._read_mp3_playback_info, audio_file_path
+                    )
                 mp3_info_duration = time.time() - mp3_info_start
                 if mp3_info_duration > 0.2:
                     print(
@@ -2660,12 +2788,16 @@ class AudioService:
             # START PLAYBACK IMMEDIATELY
             try:
                 ffmpeg_wait_start = time.time()
+                queue_span = trace.begin("ffmpeg_queue_wait")
                 async with self._ffmpeg_semaphore:
+                    trace.end(queue_span)
                     ffmpeg_queue_wait = time.time() - ffmpeg_wait_start
+                    FFMPEG_QUEUE_WAIT_SECONDS.observe(ffmpeg_queue_wait)
                     print(
                         f"[AudioService] [PERF] ffmpeg_queue_wait guild_id={guild_id} wait={ffmpeg_queue_wait:.4f}s"
                     )
                     ffmpeg_spawn_start = time.time()
+                    spawn_span = trace.begin("ffmpeg_spawn")
                     audio_source = await self._create_ffmpeg_opus_audio_source(
                         audio_file_path=audio_file_path,
                         audio_file=audio_file,
@@ -2673,6 +2805,7 @@ class AudioService:
                         play_id=play_id,
                         ffmpeg_options=ffmpeg_options,
                         ffmpeg_before_options=ffmpeg_before_options,
+                        trace=trace,
                     )
                     audio_source = PlaybackDiagnosticsAudioSource(
                         audio_source,
@@ -2689,8 +2822,15 @@ class AudioService:
                             "playback_read_duration_warning_seconds",
                             0.04,
                         ),
+                        trace=trace,
+                        on_first_packet=functools.partial(
+                            self.bot.loop.call_soon_threadsafe,
+                            trace.finish,
+                        ),
                     )
+                    trace.end(spawn_span)
                     ffmpeg_spawn_duration = time.time() - ffmpeg_spawn_start
+                    FFMPEG_SPAWN_SECONDS.observe(ffmpeg_spawn_duration)
                     print(
                         f"[AudioService] [PERF] ffmpeg_spawn guild_id={guild_id} duration={ffmpeg_spawn_duration:.4f}s"
                     )
@@ -2741,12 +2881,17 @@ class AudioService:
                             guild_id,
                             play_id,
                         )
+                        self.bot.loop.call_soon_threadsafe(
+                            trace.finish,
+                            "error" if error else "ok",
+                        )
 
                 guild_event = self._guild_playback_done.get(guild_id)
                 if guild_event is not None:
                     guild_event.clear()
                 self.playback_done.clear()
-                voice_client.play(audio_source, after=after_playing)
+                with trace.span("voice_play"):
+                    voice_client.play(audio_source, after=after_playing)
                 self._mark_playback_started(
                     guild_id,
                     audio_file,
@@ -2785,11 +2930,13 @@ class AudioService:
                         f"error={probe_schedule_error}"
                     )
                 request_to_play_start = time.time() - play_start_time
+                PLAYBACK_STARTUP_SECONDS.observe(request_to_play_start)
                 print(
                     f"[AudioService] [PERF] request_to_playback_start guild_id={guild_id} duration={request_to_play_start:.4f}s"
                 )
             except Exception as e:
                 print(f"[AudioService] Error starting playback: {e}")
+                trace.finish("start_failed")
                 self.playback_done.set()
                 self._release_guild_play_request(guild_id)
                 return False
@@ -3144,6 +3291,7 @@ class AudioService:
         except Exception as e:
             print(f"[AudioService] Error in play_audio: {e}")
             traceback.print_exc()
+            trace.finish("error")
             self.playback_done.set()
             guild_event = self._guild_playback_done.get(guild_id)
             if guild_event is not None:
@@ -3158,7 +3306,13 @@ class AudioService:
         view: discord.ui.View = None,
         guild_id: Optional[int] = None,
     ):
-        """Update the progress bar embed for a currently playing sound."""
+        """
+        Animate the progress button of a currently playing sound.
+
+        Edits are driven by the shared ``ProgressUpdateScheduler`` (one timer
+        for all guilds); this coroutine waits until the bar finishes, the
+        message is replaced, or the task is cancelled.
+        """
         if duration <= 0:
             return
         if guild_id is None:
@@ -3166,101 +3320,69 @@ class AudioService:
             guild_id = guild.id if guild else 0
         self._ensure_guild_playback_state(guild_id)
 
-        start_time = time.time()
         # Shorter bar for button (Wider now, but trimmed to 6 ✅)
         bar_length = 7
         total_time_str = self._format_duration(duration)
         target_view = view if view is not None else self._guild_current_view.get(guild_id)
         target_message_id = getattr(sound_message, "id", None)
 
-        try:
-            while time.time() - start_time < duration:
-                if self._guild_stop_progress_update.get(guild_id, False):
-                    break
-
-                current_message = self._guild_current_sound_message.get(guild_id)
-                if (
-                    target_message_id is not None
-                    and (
-                        current_message is None
-                        or getattr(current_message, "id", None) != target_message_id
-                    )
-                ):
-                    break
-                    
-                # Add delay offset to account for image processing/Discord send delay.
-                offset = self._get_progress_start_offset(duration)
-                elapsed = min(duration, (time.time() - start_time) + offset)
-                progress = max(0.0, min(1.0, elapsed / duration))
-                
-                # Calculate dot position
-                filled = int(bar_length * progress)
-                # Ensure dot doesn't go beyond bounds
-                if filled >= bar_length:
-                    filled = bar_length
-                
-                # Construct bar: ▬▬▬▬🔘▬▬▬▬▬
-                bar = "▬" * filled + "🔘" + "▬" * (bar_length - filled)
-                current_time_str = self._format_duration(elapsed)
-                
-                # Format: ▶️ 🔘▬▬▬▬ 0:05
-                seeker_text = f"▶️ {bar} {current_time_str}"
-                
-                current_view = target_view
-                if (
-                    target_message_id is not None
-                    and self._guild_current_sound_message.get(guild_id)
-                    and getattr(self._guild_current_sound_message.get(guild_id), "id", None) == target_message_id
-                    and self._guild_current_view.get(guild_id) is not None
-                ):
-                    # Keep supporting in-place view replacements for the same active message.
-                    current_view = self._guild_current_view.get(guild_id)
-
-                if current_view and hasattr(current_view, 'update_progress_label'):
-                    try:
-                        current_view.update_progress_label(seeker_text)
-                        await sound_message.edit(view=current_view)
-                    except discord.NotFound:
-                        break
-                    except Exception:
-                        pass
-                
-                # Fallback for embeds (no view update here to keep simple, or keep old logic if needed)
-                elif sound_message.embeds:
-                    pass
-                
-                await asyncio.sleep(1.0) # Update roughly once per second
-
-            # Final update
-            if not self._guild_stop_progress_update.get(guild_id, False):
-                final_bar = "▬" * bar_length + "🔘"
-                final_text = f"✅ {final_bar} {total_time_str}"
+        def _is_active() -> bool:
+            if self._guild_stop_progress_update.get(guild_id, False):
+                return False
+            current_message = self._guild_current_sound_message.get(guild_id)
+            return target_message_id is None or (
+                current_message is not None
+                and getattr(current_message, "id", None) == target_message_id
+            )
 
-                current_message = self._guild_current_sound_message.get(guild_id)
-                if (
-                    target_message_id is not None
-                    and (
-                        current_message is None
-                        or getattr(current_message, "id", None) != target_message_id
-                    )
-                ):
-                    return
+        if not _is_active():
+            return
+        # Add delay offset to account for image processing/Discord send delay.
+        offset = self._get_progress_start_offset(duration)
+
+        def _current_view():
+            if (
+                target_message_id is not None
+                and self._guild_current_sound_message.get(guild_id)
+                and getattr(self._guild_current_sound_message.get(guild_id), "id", None) == target_message_id
+                and self._guild_current_view.get(guild_id) is not None
+            ):
+                # Keep supporting in-place view replacements for the same active message.
+                return self._guild_current_view.get(guild_id)
+            return target_view
+
+        def _label(elapsed: float) -> str:
+            progress = max(0.0, min(1.0, elapsed / duration))
+            filled = min(bar_length, int(bar_length * progress))
+            # Format: ▶️ ▬▬▬▬🔘▬▬▬ 0:05
+            bar = "▬" * filled + "🔘" + "▬" * (bar_length - filled)
+            return f"▶️ {bar} {self._format_duration(elapsed)}"
+
+        async def _edit(label: str, final: bool) -> bool:
+            current_view = _current_view()
+            # Embed-only messages (no view) keep their static description.
+            if not current_view or not hasattr(current_view, 'update_progress_label'):
+                return False
+            current_view.update_progress_label(label)
+            if final:
+                self._set_view_controls_toggle_disabled(current_view, False)
+            await sound_message.edit(view=current_view)
+            return True
 
-                current_view = target_view
-                if (
-                    target_message_id is not None
-                    and self._guild_current_sound_message.get(guild_id)
-                    and getattr(self._guild_current_sound_message.get(guild_id), "id", None) == target_message_id
-                    and self._guild_current_view.get(guild_id) is not None
-                ):
-                    current_view = self._guild_current_view.get(guild_id)
-                if current_view and hasattr(current_view, 'update_progress_label'):
-                    try:
-                        current_view.update_progress_label(final_text)
-                        self._set_view_controls_toggle_disabled(current_view, False)
-                        await sound_message.edit(view=current_view)
-                    except:
-                        pass
+        job = ProgressJob(
+            key=target_message_id if target_message_id is not None else id(sound_message),
+            channel_id=getattr(getattr(sound_message, "channel", None), "id", None) or guild_id,
+            duration=duration,
+            offset=offset,
+            label=_label,
+            final_label=f"✅ {'▬' * bar_length}🔘 {total_time_str}",
+            edit=_edit,
+            is_active=_is_active,
+            # The message was sent with this label; don't re-send it.
+            last_label=_label(min(duration, offset)),
+        )
+        try:
+            await get_progress_scheduler().run(job)
         except asyncio.CancelledError:
             return
         except Exception as e:
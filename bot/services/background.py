@@ -13,6 +13,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, Tuple
 import discord
 from discord.ext import tasks
+import config
 from bot.repositories import (
     SoundRepository,
     ActionRepository,
@@ -23,10 +24,37 @@ from bot.repositories import (
 from bot.repositories.keyword import KeywordRepository
 from bot.repositories.speech_training import SpeechTrainingRepository
 from bot.repositories.app_settings import AppSettingsRepository
+from bot.repositories.sound_neighbors import SoundNeighborRepository
+from bot.repositories.web_filter_facets import WebFilterFacetRepository
+from bot.repositories.system_monitor_timeseries import (
+    SystemMonitorTimeSeriesRepository,
+    timeseries_db_path_for,
+)
 from bot.downloaders.sound import SoundDownloader
-from bot.services.guild_settings import GuildSettingsService
+from bot.services.adaptive_scheduler import (
+    DEMAND_INTERACTION,
+    DEMAND_VIEWERS,
+    DEMAND_VOICE,
+    AdaptiveLoopScheduler,
+    LoopCadence,
+)
+from bot.services.control_room_publisher import ControlRoomStatePublisher
+from bot.services.guild_settings import (
+    GUILD_SETTINGS_CHANNEL,
+    GuildSettingsService,
+    invalidate_guild_settings_cache,
+)
+from bot.services.loop_stall_profiler import EventLoopStallProfiler
+from bot.services.metrics_server import MetricsHttpServer
+from bot.metrics import (
+    REGISTRY,
+    bot_metrics_textfile_path,
+    write_metrics_textfile,
+)
 from bot.services.system_monitor import HostSystemMonitorService
 from bot.services.sound_import_notifications import SoundImportNotificationService
+from bot.services.sound_neighbors import SoundNeighborIndex
+from bot.services.web_viewer_presence import WebViewerPresenceService
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +70,31 @@ class BackgroundService:
     BACKUP_SCHEDULER_ACTION = "scheduled_backup_created"
     # Discord allows 5 presence updates per 20 seconds, so 4s is the fastest safe cadence.
     STATUS_UPDATE_INTERVAL_SECONDS = 4
+    # Active/idle cadence per loop; see bot.services.adaptive_scheduler.
+    # The system monitor idles below the 10 s staleness limit of the CPU
+    # shown in the bot status. Wall-clock schedulers, the outbox drains,
+    # the voice-activity check and the self-heal watchdog keep their own
+    # interval and are only timed.
+    ADAPTIVE_LOOP_CADENCES: dict[str, LoopCadence] = {
+        "web_control_room_status_loop": LoopCadence(1.0, 15.0, (DEMAND_VIEWERS,)),
+        "web_system_monitor_status_loop": LoopCadence(1.0, 8.0, (DEMAND_VIEWERS,)),
+        "keyword_detection_health_check": LoopCadence(30.0, 120.0, (DEMAND_VOICE,)),
+        "update_bot_status_loop": LoopCadence(
+            STATUS_UPDATE_INTERVAL_SECONDS, 60.0, (DEMAND_VOICE, DEMAND_INTERACTION)
+        ),
+        "ensure_last_message_controls_button_loop": LoopCadence(
+            60.0, 300.0, (DEMAND_INTERACTION,)
+        ),
+    }
+    ADAPTIVE_TRACKED_LOOPS = (
+        "weekly_wrapped_scheduler_loop",
+        "rlstore_notification_loop",
+        "backup_scheduler_loop",
+        "favorite_watcher_loop",
+        "sound_import_notification_drain_loop",
+        "check_voice_activity_loop",
+        "bot_self_heal_watchdog_loop",
+    )
     
     def __init__(self, bot, audio_service, sound_service, behavior=None):
         self.bot = bot
@@ -54,6 +107,9 @@ class BackgroundService:
         self.action_repo = ActionRepository()
         self.web_control_room_repo = WebControlRoomRepository()
         self.web_system_status_repo = WebSystemStatusRepository()
+        self.system_monitor_timeseries_repo = SystemMonitorTimeSeriesRepository(
+            db_path=timeseries_db_path_for(self.web_system_status_repo.db_path)
+        )
         self.guild_settings_service = GuildSettingsService()
 
         # Host system monitor (collects host CPU/RAM/top processes)
@@ -87,6 +143,33 @@ class BackgroundService:
             0.0, float(os.getenv("PERFORMANCE_LOOP_LAG_WARNING_MS", "1000"))
         )
         self._perf_last_loop_lag_warning_monotonic = 0.0
+        # Metrics export: textfile for the web /metrics route, optional HTTP.
+        self._metrics_textfile_path = bot_metrics_textfile_path(self.sound_repo.db_path)
+        self._metrics_export_interval_seconds = max(
+            1.0, float(os.getenv("BOT_METRICS_EXPORT_INTERVAL_SECONDS", "5"))
+        )
+        self._metrics_last_export_monotonic = 0.0
+        self._metrics_http_server = MetricsHttpServer.from_env()
+        # Stack-samples the loop thread while it misses its heartbeat.
+        self._loop_stall_profiler: EventLoopStallProfiler | None = None
+        if self._env_flag("LOOP_STALL_PROFILER_ENABLED", True):
+            self._loop_stall_profiler = EventLoopStallProfiler(
+                os.getenv("LOOP_STALL_PROFILER_DIR", "").strip()
+                or config.DATA_DIR / "loop_stalls",
+                threshold_seconds=self._env_int("LOOP_STALL_PROFILER_THRESHOLD_MS", 250, 50, 60000) / 1000.0,
+                sample_interval_seconds=self._env_int("LOOP_STALL_PROFILER_SAMPLE_MS", 100, 10, 1000) / 1000.0,
+                context_func=self._collect_active_audio_playbacks,
+            )
+        # Demand-driven loop cadence (web viewers, voice, recent interactions).
+        self._adaptive_scheduling_enabled = self._env_flag("BACKGROUND_ADAPTIVE_SCHEDULING", True)
+        self._loop_scheduler = AdaptiveLoopScheduler(
+            jitter_fraction=self._env_int("BACKGROUND_LOOP_JITTER_PERCENT", 10, 0, 50) / 100.0,
+            interaction_window_seconds=self._env_int(
+                "BACKGROUND_INTERACTION_WINDOW_SECONDS", 120, 0, 3600
+            ),
+        )
+        # Lazily created in the scheduler loop (reads the web presence table).
+        self._web_viewer_presence: WebViewerPresenceService | None = None
         self._clock_ticks_per_second = self._resolve_clock_ticks_per_second()
         self._cpu_core_count = max(1, os.cpu_count() or 1)
         self._weekly_wrapped_enabled = self._env_flag("WEEKLY_WRAPPED_ENABLED", True)
@@ -143,6 +226,7 @@ class BackgroundService:
         # Control room signature cache for SSE event dedup.
         # Maps guild_id → tuple of significant fields; publish only on change.
         self._ctrl_room_signatures: dict[int, tuple] = {}
+        self._control_room_publisher = ControlRoomStatePublisher(self.web_control_room_repo)
 
     # ── Keyword scan schedule metadata keys ─────────────────────────────
 
@@ -217,6 +301,10 @@ class BackgroundService:
             return
         self._started = True
         
+        @self.bot.listen('on_interaction')
+        async def on_interaction_note_demand(_interaction):
+            self._loop_scheduler.note_interaction()
+
         # Register with bot's on_ready event
         @self.bot.listen('on_ready')
         async def on_ready_start_tasks():
@@ -232,6 +320,13 @@ class BackgroundService:
                 self.check_voice_activity_loop.start()
             if not self.ensure_last_message_controls_button_loop.is_running():
                 self.ensure_last_message_controls_button_loop.start()
+            if self._loop_stall_profiler is not None and not self._loop_stall_profiler.running:
+                self._loop_stall_profiler.start()
+            if self._metrics_http_server is not None and self._metrics_http_server._runner is None:
+                try:
+                    await self._metrics_http_server.start()
+                except OSError as exc:
+                    logger.warning("[BackgroundService] Metrics endpoint failed to start: %s", exc)
             if not self.performance_telemetry_loop.is_running():
                 self.performance_telemetry_loop.change_interval(
                     seconds=self._perf_tick_rate_seconds
@@ -253,16 +348,33 @@ class BackgroundService:
                 self.bot_self_heal_watchdog_loop.start()
             if not self.sound_import_notification_drain_loop.is_running():
                 self.sound_import_notification_drain_loop.start()
+            if not self.similar_sounds_index_loop.is_running():
+                self.similar_sounds_index_loop.start()
+            if not self.filter_facet_rollup_loop.is_running():
+                self.filter_facet_rollup_loop.start()
+            if self._legacy_monitor_import_task is None:
+                loop = asyncio.get_event_loop()
+                self._legacy_monitor_import_task = loop.create_task(
+                    self._import_legacy_monitor_samples()
+                )
             if self._honker_sound_import_listener_task is None:
                 loop = asyncio.get_event_loop()
                 self._honker_sound_import_listener_task = loop.create_task(
                     self._start_honker_sound_import_listener()
                 )
+            if self._honker_guild_settings_listener_task is None:
+                loop = asyncio.get_event_loop()
+                self._honker_guild_settings_listener_task = loop.create_task(
+                    self._start_honker_guild_settings_listener()
+                )
             if self._keyword_scan_daily_enabled and not self.speech_training_keyword_scan_loop.is_running():
                 self.speech_training_keyword_scan_loop.change_interval(
                     seconds=self._keyword_scan_daily_interval
                 )
                 self.speech_training_keyword_scan_loop.start()
+            if self._adaptive_scheduling_enabled and not self.adaptive_scheduler_loop.is_running():
+                self._register_adaptive_loops()
+                self.adaptive_scheduler_loop.start()
 
             # Persist initial keyword scan schedule metadata
             try:
@@ -598,6 +710,11 @@ class BackgroundService:
             "network_tx_bytes_per_second": self._safe_float(tx_bytes_per_second),
         }
 
+    def _on_performance_tick_changed(self, seconds: float) -> None:
+        """Measure loop lag against the new telemetry interval."""
+        self._perf_tick_rate_seconds = seconds
+        self._perf_expected_tick_monotonic = None
+
     def _compute_loop_lag_ms(self, sample_monotonic: float) -> float:
         """Estimate event-loop lag by comparing expected and actual loop wakeup times."""
         if self._perf_expected_tick_monotonic is None:
@@ -1455,6 +1572,7 @@ class BackgroundService:
                     payload.get("audio_pending_connection_count"),
                 )
             #logger.info("[PerformanceMonitor] %s", json.dumps(payload, sort_keys=True))
+            self._record_performance_metrics(payload, sample_monotonic)
         except Exception as e:
             logger.error(
                 "[BackgroundService] Error in performance telemetry loop: %s",
@@ -1462,10 +1580,111 @@ class BackgroundService:
                 exc_info=True,
             )
 
+    # Snapshot fields mirrored into gauges: payload key -> (metric, help, scale).
+    PERFORMANCE_GAUGES: dict[str, tuple[str, str, float]] = {
+        "loop_lag_ms": ("event_loop_lag_seconds", "Last measured event-loop lag.", 0.001),
+        "asyncio_task_pending": ("asyncio_tasks_pending", "Pending asyncio tasks.", 1.0),
+        "asyncio_executor_pending": (
+            "asyncio_executor_pending",
+            "Work items queued on the default executor.",
+            1.0,
+        ),
+        "process_memory_rss_bytes": ("process_rss_bytes", "Bot process resident memory.", 1.0),
+        "process_cpu_percent_of_one_core": (
+            "process_cpu_percent",
+            "Bot process CPU usage as a percent of one core.",
+            1.0,
+        ),
+        "audio_active_playbacks": ("audio_active_playbacks", "Guilds currently playing audio.", 1.0),
+        "audio_pending_connection_count": (
+            "audio_pending_connections",
+            "Voice connections being established.",
+            1.0,
+        ),
+    }
+
+    def _record_performance_metrics(self, payload: Dict[str, Any], sample_monotonic: float) -> None:
+        """Mirror the telemetry snapshot into gauges and export the registry."""
+        for key, (name, documentation, scale) in self.PERFORMANCE_GAUGES.items():
+            value = payload.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                REGISTRY.gauge(name, documentation).set(value * scale)
+
+        if sample_monotonic - self._metrics_last_export_monotonic < self._metrics_export_interval_seconds:
+            return
+        self._metrics_last_export_monotonic = sample_monotonic
+        REGISTRY.gauge(
+            "metrics_exported_at_seconds",
+            "Unix time the bot last exported its metrics.",
+        ).set(time.time())
+        try:
+            write_metrics_textfile(self._metrics_textfile_path, REGISTRY.render("bot_"))
+        except OSError as exc:
+            logger.debug("[BackgroundService] Metrics export failed: %s", exc)
+
+    def _register_adaptive_loops(self) -> None:
+        """Hand the periodic loops to the adaptive scheduler."""
+        scheduler = self._loop_scheduler
+        scheduler.register(
+            "performance_telemetry_loop",
+            self.performance_telemetry_loop,
+            LoopCadence(
+                self._perf_tick_rate_seconds,
+                max(5.0, self._perf_tick_rate_seconds),
+                (DEMAND_VIEWERS, DEMAND_VOICE, DEMAND_INTERACTION),
+            ),
+            on_change=self._on_performance_tick_changed,
+        )
+        for name, cadence in self.ADAPTIVE_LOOP_CADENCES.items():
+            scheduler.register(name, getattr(self, name), cadence)
+        for name in self.ADAPTIVE_TRACKED_LOOPS:
+            scheduler.register(name, getattr(self, name))
+
+    def _count_web_viewers(self) -> int:
+        """Return live web viewers reported by the web process."""
+        if self._web_viewer_presence is None:
+            self._web_viewer_presence = WebViewerPresenceService()
+        return self._web_viewer_presence.active_viewer_count()
+
+    @tasks.loop(seconds=5)
+    async def adaptive_scheduler_loop(self):
+        """Re-evaluate loop cadences from web viewers, voice and interactions."""
+        try:
+            try:
+                viewers = self._count_web_viewers()
+            except Exception as e:
+                # Without presence data, assume someone is watching.
+                logger.debug("[BackgroundService] Viewer presence unavailable: %s", e)
+                viewers = 1
+            self._loop_scheduler.update_demand(
+                viewers=viewers,
+                voice=self._has_active_voice_session(),
+            )
+            changed = self._loop_scheduler.refresh()
+            if changed:
+                logger.info(
+                    "[BackgroundService] Loop cadence demands=%s changed=%s",
+                    sorted(self._loop_scheduler.active_demands()) or ["idle"],
+                    changed,
+                )
+        except Exception as e:
+            logger.error(
+                "[BackgroundService] Error in adaptive scheduler loop: %s",
+                e,
+                exc_info=True,
+            )
+
     @tasks.loop(seconds=1)
     async def web_control_room_status_loop(self):
-        """Persist live bot status for the optional web soundboard panel."""
+        """Publish live bot status for the optional web soundboard panel.
+
+        Status is gathered every second while the web UI has viewers (every
+        15 s otherwise, see ``ADAPTIVE_LOOP_CADENCES``) but only guilds whose
+        rows changed are written, together in one transaction (see
+        ``ControlRoomStatePublisher``).
+        """
         try:
+            statuses = []
             for guild in self.bot.guilds:
                 snapshot = self.audio_service.get_guild_playback_snapshot(guild)
                 mute_service = getattr(self.audio_service, "mute_service", None)
@@ -1475,41 +1694,48 @@ class BackgroundService:
                     if muted and hasattr(mute_service, "get_remaining_seconds")
                     else 0
                 )
-                self.web_control_room_repo.upsert_status(
-                    guild_id=guild.id,
-                    guild_name=guild.name,
-                    voice_connected=snapshot["voice_connected"],
-                    voice_channel_id=snapshot["voice_channel_id"],
-                    voice_channel_name=snapshot["voice_channel_name"],
-                    voice_member_count=snapshot["voice_member_count"],
-                    voice_members=snapshot["voice_members"],
-                    is_playing=snapshot["is_playing"],
-                    is_paused=snapshot["is_paused"],
-                    current_sound=snapshot["current_sound"],
-                    current_requester=snapshot["current_requester"],
-                    current_duration_seconds=snapshot["current_duration_seconds"],
-                    current_elapsed_seconds=snapshot["current_elapsed_seconds"],
-                    muted=muted,
-                    mute_remaining_seconds=mute_remaining,
+                statuses.append(
+                    {
+                        "guild_id": guild.id,
+                        "guild_name": guild.name,
+                        "voice_connected": snapshot["voice_connected"],
+                        "voice_channel_id": snapshot["voice_channel_id"],
+                        "voice_channel_name": snapshot["voice_channel_name"],
+                        "voice_member_count": snapshot["voice_member_count"],
+                        "voice_members": snapshot["voice_members"],
+                        "is_playing": snapshot["is_playing"],
+                        "is_paused": snapshot["is_paused"],
+                        "current_sound": snapshot["current_sound"],
+                        "current_requester": snapshot["current_requester"],
+                        "current_duration_seconds": snapshot["current_duration_seconds"],
+                        "current_elapsed_seconds": snapshot["current_elapsed_seconds"],
+                        "muted": muted,
+                        "mute_remaining_seconds": mute_remaining,
+                        "recent_play_traces": snapshot.get("recent_play_traces") or [],
+                    }
                 )
+            self._control_room_publisher.publish(statuses)
+
+            for status in statuses:
+                guild_id = status["guild_id"]
                 # Compute a signature of significant fields (excluding fast-changing
                 # elapsed seconds and full voice_members list). Publish a Honker
                 # event only when the signature changes.
                 sig = (
-                    snapshot["voice_connected"],
-                    snapshot["voice_channel_id"],
-                    snapshot["voice_member_count"],
-                    snapshot["is_playing"],
-                    snapshot["is_paused"],
-                    snapshot["current_sound"],
-                    snapshot["current_requester"],
-                    muted,
+                    status["voice_connected"],
+                    status["voice_channel_id"],
+                    status["voice_member_count"],
+                    status["is_playing"],
+                    status["is_paused"],
+                    status["current_sound"],
+                    status["current_requester"],
+                    status["muted"],
                 )
-                if self._ctrl_room_signatures.get(guild.id) != sig:
-                    self._ctrl_room_signatures[guild.id] = sig
+                if self._ctrl_room_signatures.get(guild_id) != sig:
+                    self._ctrl_room_signatures[guild_id] = sig
                     try:
                         from bot.services.honker_integration import publish_soundboard_event as _pub
-                        _pub(self.sound_repo.db_path, "control_room_changed", {"guild_id": guild.id})
+                        _pub(self.sound_repo.db_path, "control_room_changed", {"guild_id": guild_id})
                     except Exception:
                         pass
         except Exception as e:
@@ -1517,7 +1743,11 @@ class BackgroundService:
 
     @tasks.loop(seconds=1)
     async def web_system_monitor_status_loop(self):
-        """Collect host CPU/RAM/top processes and persist to DB every 1 s."""
+        """Collect host CPU/RAM/top processes every 1 s (8 s without web viewers).
+
+        The snapshot goes to the main database; metric samples go to the
+        separate time-series file so they never hold the main write lock.
+        """
         try:
             started = time.monotonic()
             active_voice = self._has_active_voice_session()
@@ -1550,7 +1780,7 @@ class BackgroundService:
                 self.web_system_status_repo.upsert_snapshot(snapshot)
                 if timeseries_samples:
                     try:
-                        self.web_system_status_repo.insert_samples_batch(timeseries_samples)
+                        self.system_monitor_timeseries_repo.record_samples(timeseries_samples)
                     except Exception as e:
                         logger.warning(
                             "[BackgroundService] Failed to insert time-series samples: %s",
@@ -1794,6 +2024,39 @@ class BackgroundService:
                 exc_info=True,
             )
 
+    @tasks.loop(seconds=60)
+    async def similar_sounds_index_loop(self):
+        """Build the similar-sounds table once, then apply queued sound changes."""
+        try:
+            updated = await self._run_with_honker_lock(
+                "similar_sounds_index",
+                self._run_similar_sounds_index_tick,
+            )
+            if updated:
+                print(f"[BackgroundService] Similar-sound lists updated: {updated}")
+        except Exception as e:
+            print(f"[BackgroundService] Error refreshing similar-sound lists: {e}")
+
+    async def _run_similar_sounds_index_tick(self) -> int:
+        """Refresh the neighbor table off the event loop on its own connection."""
+        index = SoundNeighborIndex.from_env(
+            SoundNeighborRepository(db_path=self._resolve_db_path(), use_shared=False)
+        )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, index.refresh)
+
+    @tasks.loop(seconds=5)
+    async def filter_facet_rollup_loop(self):
+        """Fold newly inserted actions into the soundboard filter facets."""
+        try:
+            await asyncio.to_thread(self._roll_up_filter_facets)
+        except Exception as e:
+            print(f"[BackgroundService] Error rolling up filter facets: {e}")
+
+    def _roll_up_filter_facets(self) -> None:
+        """Run the action-facet rollup on its own connection, so web reads stay read-only."""
+        WebFilterFacetRepository(db_path=self._resolve_db_path(), use_shared=False).roll_up_actions()
+
     @tasks.loop(seconds=10)
     async def favorite_watcher_loop(self):
         """Poll watched TikTok collections and import newly added videos."""
@@ -1884,6 +2147,23 @@ class BackgroundService:
             )
 
     _honker_sound_import_listener_task: Any = None
+    _legacy_monitor_import_task: Any = None
+
+    async def _import_legacy_monitor_samples(self) -> None:
+        """Move pre-rollup monitor history from the main database, once."""
+        try:
+            merged = await asyncio.to_thread(
+                self.system_monitor_timeseries_repo.import_legacy_samples,
+                self.web_system_status_repo.db_path,
+            )
+            if merged:
+                logger.info(
+                    "[BackgroundService] Imported %s legacy system-monitor rollup rows", merged
+                )
+        except Exception as e:
+            logger.warning(
+                "[BackgroundService] Legacy system-monitor import failed: %s", e
+            )
 
     async def _start_honker_sound_import_listener(self) -> None:
         """Start a Honker listener for sound_import_notifications."""
@@ -1908,6 +2188,32 @@ class BackgroundService:
                 "[Honker] Sound import notification listener stopped: %s", exc
             )
 
+    _honker_guild_settings_listener_task: Any = None
+
+    async def _start_honker_guild_settings_listener(self) -> None:
+        """Drop cached guild settings when another process changes them."""
+        try:
+            from bot.services.honker_integration import (
+                availability as _honker_available,
+                listen_notifications as _honker_listen,
+            )
+        except ImportError:
+            return
+
+        if not _honker_available():
+            return
+
+        db_path = self._resolve_db_path()
+        logger.info("[Honker] Starting %s listener...", GUILD_SETTINGS_CHANNEL)
+        try:
+            async for notification in _honker_listen(db_path, GUILD_SETTINGS_CHANNEL, fallback_poll_s=1.0):
+                payload = getattr(notification, "payload", notification)
+                invalidate_guild_settings_cache(payload.get("guild_id") if isinstance(payload, dict) else None)
+        except Exception as exc:
+            logger.warning(
+                "[Honker] Guild settings listener stopped: %s", exc
+            )
+
     @tasks.loop(seconds=3)
     async def sound_import_notification_drain_loop(self) -> None:
         """
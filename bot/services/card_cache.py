@@ -0,0 +1,324 @@
+"""
+Caches behind ``ImageGeneratorService``.
+
+Two levels, both size-bounded LRUs:
+
+- ``ImageStore`` keeps downloaded avatars, character thumbnails and store
+  tile images on disk, keyed by URL. Entries are served without a request
+  while fresh; after that they are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since`` so an unchanged image costs a 304 instead of a
+  download. A stale entry is still served when the origin cannot be reached.
+  Recency and eviction share ``DiskLRU`` with ``TTSAudioCache``, so the
+  store survives restarts without a separate index.
+- ``RenderedCardCache`` keeps finished card PNGs in memory, keyed by a hash
+  of the template data dict (which already embeds the image bytes), so a
+  repeat of the same card skips layout and rendering entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from bot.metrics import REGISTRY
+from bot.services.disk_lru import DiskLRU
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_LOOKUPS = REGISTRY.counter(
+    "image_cache_lookups",
+    "Card image lookups by result (hit, revalidated, miss, stale, error).",
+    ("result",),
+)
+IMAGE_CACHE_BYTES = REGISTRY.gauge(
+    "image_cache_bytes",
+    "Bytes currently stored in the on-disk card image cache.",
+)
+IMAGE_CACHE_EVICTIONS = REGISTRY.counter(
+    "image_cache_evictions",
+    "Card image cache entries evicted to stay under the size limit.",
+)
+RENDERED_CARD_LOOKUPS = REGISTRY.counter(
+    "rendered_card_cache_lookups",
+    "Rendered card PNG cache lookups by card type and result (hit/miss).",
+    ("card", "result"),
+)
+RENDERED_CARD_BYTES = REGISTRY.gauge(
+    "rendered_card_cache_bytes",
+    "Bytes of rendered card PNGs held in memory.",
+)
+
+BODY_SUFFIX = ".img"
+META_SUFFIX = ".json"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class ImageStore:
+    """
+    Persistent, revalidating cache of downloaded images.
+
+    Args:
+        directory: Cache directory (created on first store).
+        max_bytes: Total body size kept before evicting least-recently-used
+            images. ``0`` disables the store (every call downloads).
+        fresh_seconds: How long an entry is served without contacting the
+            origin.
+        headers: Headers sent with every request.
+        timeout: ``requests`` timeout for downloads and revalidations.
+        time_func: Clock used for freshness (tests inject a fake).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int,
+        *,
+        fresh_seconds: float = 300.0,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Any = (1.0, 2.0),
+        time_func: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.enabled = self.max_bytes > 0
+        self.fresh_seconds = max(0.0, float(fresh_seconds))
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self._time = time_func
+        self._lru = DiskLRU(
+            self.directory,
+            BODY_SUFFIX,
+            self.max_bytes,
+            bytes_gauge=IMAGE_CACHE_BYTES,
+            evictions=IMAGE_CACHE_EVICTIONS,
+            sidecar_suffixes=(META_SUFFIX,),
+            log_prefix="[ImageStore]",
+        )
+
+    @classmethod
+    def from_env(cls, headers: Optional[Dict[str, str]] = None) -> "ImageStore":
+        """Build the store from ``IMAGE_CACHE_*`` environment variables."""
+        import config
+
+        directory = os.getenv("IMAGE_CACHE_DIR") or str(Path(config.DATA_DIR) / "image_cache")
+        max_mb = _env_float("IMAGE_CACHE_MAX_MB", 50.0)
+        fresh_seconds = _env_float("IMAGE_CACHE_FRESH_SECONDS", 300.0)
+        return cls(directory, int(max_mb * 1024 * 1024), fresh_seconds=fresh_seconds, headers=headers)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Return the cache key for ``url``."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[tuple[Dict[str, Any], bytes]]:
+        try:
+            meta = json.loads(self._lru.path(key, META_SUFFIX).read_text(encoding="utf-8"))
+            body = self._lru.path(key).read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        path = self._lru.path(key, META_SUFFIX)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Return the image at ``url``, from the store when possible.
+
+        Args:
+            url: Image URL.
+
+        Returns:
+            Image bytes, or ``None`` when the image is unavailable and nothing
+            usable is cached.
+        """
+        if not url:
+            return None
+        if not self.enabled:
+            body = self._download(url, {})
+            IMAGE_CACHE_LOOKUPS.inc(result="miss" if body is not None else "error")
+            return body if isinstance(body, bytes) else None
+
+        key = self.key(url)
+        known = self._lru.lookup(key)
+        cached = self._read(key) if known else None
+        if known and cached is None:
+            self._lru.forget(key)
+
+        now = self._time()
+        if cached is not None:
+            meta, body = cached
+            if now - float(meta.get("checked_at", 0)) < self.fresh_seconds:
+                self._lru.touch(key)
+                IMAGE_CACHE_LOOKUPS.inc(result="hit")
+                return body
+
+        conditional = {}
+        if cached is not None:
+            if cached[0].get("etag"):
+                conditional["If-None-Match"] = cached[0]["etag"]
+            if cached[0].get("last_modified"):
+                conditional["If-Modified-Since"] = cached[0]["last_modified"]
+
+        result = self._download(url, conditional)
+        if result is _NOT_MODIFIED and cached is not None:
+            meta, body = cached
+            meta["checked_at"] = now
+            try:
+                self._write_meta(key, meta)
+            except OSError as e:
+                logger.warning("[ImageStore] Could not refresh %s: %s", url, e)
+            self._lru.touch(key)
+            IMAGE_CACHE_LOOKUPS.inc(result="revalidated")
+            return body
+        if isinstance(result, _Fetched):
+            self._store(key, url, result, now)
+            IMAGE_CACHE_LOOKUPS.inc(result="miss")
+            return result.body
+        if cached is not None:
+            # Origin unreachable or erroring: a stale avatar beats no avatar.
+            IMAGE_CACHE_LOOKUPS.inc(result="stale")
+            return cached[1]
+        IMAGE_CACHE_LOOKUPS.inc(result="error")
+        return None
+
+    def _download(self, url: str, conditional: Dict[str, str]) -> Any:
+        """Return ``_Fetched``, ``_NOT_MODIFIED`` or ``None`` on failure."""
+        try:
+            response = requests.get(url, timeout=self.timeout, headers={**self.headers, **conditional})
+        except Exception as e:
+            print(f"[ImageGeneratorService] Error downloading image from {url}: {e}")
+            return None
+        if response.status_code == 304 and conditional:
+            return _NOT_MODIFIED
+        if response.status_code != 200 or not response.content:
+            print(f"[ImageGeneratorService] Download failed ({response.status_code}) from {url}")
+            return None
+        if not self.enabled:
+            return response.content
+        return _Fetched(
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    def _store(self, key: str, url: str, fetched: "_Fetched", now: float) -> None:
+        """Write a downloaded image and evict old entries; failures are ignored."""
+        body_path = self._lru.path(key)
+        tmp = body_path.with_name(f".{body_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(fetched.body)
+            os.replace(tmp, body_path)
+            self._write_meta(
+                key,
+                {
+                    "url": url,
+                    "etag": fetched.etag,
+                    "last_modified": fetched.last_modified,
+                    "checked_at": now,
+                },
+            )
+        except OSError as e:
+            logger.warning("[ImageStore] Could not store %s: %s", url, e)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+
+        self._lru.add(key, len(fetched.body))
+
+
+class _Fetched:
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+_NOT_MODIFIED = object()
+
+
+class RenderedCardCache:
+    """
+    In-memory LRU of finished card PNGs.
+
+    Args:
+        max_bytes: Total PNG bytes kept; ``0`` disables the cache.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RenderedCardCache":
+        """Build the cache from ``RENDERED_CARD_CACHE_MAX_MB``."""
+        return cls(int(_env_float("RENDERED_CARD_CACHE_MAX_MB", 16.0) * 1024 * 1024))
+
+    @staticmethod
+    def key(card: str, data: Dict[str, Any], salt: str = "") -> str:
+        """
+        Hash a template data dict into a cache key.
+
+        Args:
+            card: Card type, part of the key and the metrics label.
+            data: Everything the template sees, images included.
+            salt: Template/renderer identity, so layout changes miss.
+        """
+        payload = json.dumps(
+            {"card": card, "salt": salt, "data": data},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, card: str, key: str) -> Optional[bytes]:
+        """Return a cached PNG, or ``None`` on a miss."""
+        if not self.max_bytes:
+            return None
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+        RENDERED_CARD_LOOKUPS.inc(card=card, result="hit" if png is not None else "miss")
+        return png
+
+    def put(self, key: str, png: Optional[bytes]) -> None:
+        """Cache a rendered PNG; ``None`` (failed renders) is never cached."""
+        if not self.max_bytes or not png or len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= len(old)
+            self._entries[key] = png
+            self._total_bytes += len(png)
+            while self._total_bytes > self.max_bytes:
+                _old_key, old_png = self._entries.popitem(last=False)
+                self._total_bytes -= len(old_png)
+            RENDERED_CARD_BYTES.set(self._total_bytes)
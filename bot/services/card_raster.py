@@ -0,0 +1,781 @@
+"""
+Native Pillow renderer for sound cards.
+
+Reproduces ``templates/sound_card.html`` without a browser for the card
+shapes the bot sends most often:
+
+- standard sound cards: leading icon or character thumbnail, title, stat
+  pills, footer with the ``Added:`` date and the request-note pill, and the
+  requester avatar;
+- notification-only cards (title only);
+- summary notifications (``event_data`` pill with a one- or two-column grid).
+
+It takes the same data dict that ``ImageGeneratorService`` passes to Jinja and
+returns a full-size PNG (the service scales it like a browser capture).
+``render`` returns ``None`` when a card needs something this renderer cannot
+reproduce faithfully (glyphs outside DejaVu Sans, such as emoji or CJK; stat
+pills wider than the card; missing fonts). The service then falls back to the
+Chrome renderer.
+
+Fonts, SVG icons rasterized from the template's own path data, rounded-corner
+masks and the gradient background are cached, so a render is only layout,
+a few composites and a PNG encode.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from bot.metrics import REGISTRY
+
+NATIVE_RENDER_SECONDS = REGISTRY.histogram(
+    "card_native_render_seconds",
+    "Time to lay out and encode a sound card with the Pillow renderer.",
+)
+NATIVE_RENDERS = REGISTRY.counter(
+    "card_native_renders",
+    "Pillow sound card renders by outcome (ok, unsupported).",
+    ("result",),
+)
+
+CARD_WIDTH = 580
+SUPERSAMPLE = 3
+FONT_DIRS = (
+    os.getenv("SOUND_CARD_FONT_DIR", ""),
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+)
+# Characters from here up (symbols, dingbats, emoji, CJK) are rendered by
+# Chrome with font fallback; DejaVu Sans would draw boxes.
+MAX_NATIVE_CODEPOINT = 0x25FF
+
+RGBA = Tuple[int, int, int, int]
+Box = Tuple[float, float, float, float]
+
+_TOKEN_RE = re.compile(r"[MmLlHhVvCcSsZz]|-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_PATH_RE = re.compile(r'\bd="([^"]+)"')
+_FILL_RE = re.compile(r'fill="(#[0-9a-fA-F]{6})"')
+
+
+def _hex_rgb(color: str) -> Tuple[int, int, int]:
+    value = (color or "").strip().lstrip("#")
+    if len(value) == 3:
+        value = "".join(ch * 2 for ch in value)
+    try:
+        return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+    except (ValueError, IndexError):
+        return 88, 101, 242
+
+
+def _with_alpha(rgb: Tuple[int, int, int], alpha: float) -> RGBA:
+    return rgb[0], rgb[1], rgb[2], int(round(255 * alpha))
+
+
+# --------------------------------------------------------------------------
+# Cached resources
+
+
+def _font_path(bold: bool) -> Optional[str]:
+    name = "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf"
+    for directory in FONT_DIRS:
+        if directory and os.path.exists(os.path.join(directory, name)):
+            return os.path.join(directory, name)
+    return None
+
+
+@lru_cache(maxsize=64)
+def _font(bold: bool, size: int) -> ImageFont.FreeTypeFont:
+    path = _font_path(bold)
+    if path is None:
+        raise OSError("DejaVu Sans not found")
+    return ImageFont.truetype(path, size)
+
+
+def fonts_available() -> bool:
+    """Return whether the DejaVu fonts the template asks for are installed."""
+    return _font_path(False) is not None and _font_path(True) is not None
+
+
+def _svg_polygons(path_data: str, scale: float) -> List[List[Tuple[float, float]]]:
+    """Flatten an SVG path (M/L/H/V/C/S/Z, absolute or relative) to polygons."""
+    tokens = _TOKEN_RE.findall(path_data)
+    polygons: List[List[Tuple[float, float]]] = []
+    current: List[Tuple[float, float]] = []
+    x = y = start_x = start_y = 0.0
+    last_ctrl: Optional[Tuple[float, float]] = None
+    command = ""
+    i = 0
+
+    def numbers(count: int) -> List[float]:
+        nonlocal i
+        values = [float(v) for v in tokens[i : i + count]]
+        i += count
+        return values
+
+    def cubic(p1, p2, p3) -> None:
+        nonlocal x, y
+        for step in range(1, 9):
+            t = step / 8
+            mt = 1 - t
+            current.append((
+                mt**3 * x + 3 * mt * mt * t * p1[0] + 3 * mt * t * t * p2[0] + t**3 * p3[0],
+                mt**3 * y + 3 * mt * mt * t * p1[1] + 3 * mt * t * t * p2[1] + t**3 * p3[1],
+            ))
+        x, y = p3
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in "Zz":
+                if current:
+                    polygons.append(current)
+                current = []
+                x, y = start_x, start_y
+                last_ctrl = None
+                continue
+        relative = command.islower()
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+        upper = command.upper()
+        if upper == "M":
+            if current:
+                polygons.append(current)
+            mx, my = numbers(2)
+            x, y = ox + mx, oy + my
+            start_x, start_y = x, y
+            current = [(x, y)]
+            # Further coordinate pairs after a moveto are linetos.
+            command = "l" if relative else "L"
+            last_ctrl = None
+        elif upper == "L":
+            lx, ly = numbers(2)
+            x, y = ox + lx, oy + ly
+            current.append((x, y))
+            last_ctrl = None
+        elif upper == "H":
+            (hx,) = numbers(1)
+            x = ox + hx
+            current.append((x, y))
+            last_ctrl = None
+        elif upper == "V":
+            (vy,) = numbers(1)
+            y = (y if relative else 0.0) + vy
+            current.append((x, y))
+            last_ctrl = None
+        elif upper == "C":
+            x1, y1, x2, y2, x3, y3 = numbers(6)
+            p1, p2, p3 = (ox + x1, oy + y1), (ox + x2, oy + y2), (ox + x3, oy + y3)
+            cubic(p1, p2, p3)
+            last_ctrl = p2
+        elif upper == "S":
+            x2, y2, x3, y3 = numbers(4)
+            p1 = (2 * x - last_ctrl[0], 2 * y - last_ctrl[1]) if last_ctrl else (x, y)
+            p2, p3 = (ox + x2, oy + y2), (ox + x3, oy + y3)
+            cubic(p1, p2, p3)
+            last_ctrl = p2
+        else:
+            raise ValueError(f"Unsupported SVG path command: {command}")
+    if current:
+        polygons.append(current)
+    return [[(px * scale, py * scale) for px, py in polygon] for polygon in polygons]
+
+
+@lru_cache(maxsize=64)
+def _icon(svg: str, size: int, opacity: float = 1.0) -> Image.Image:
+    """Rasterize a 24x24 single-path SVG icon to an RGBA image."""
+    path_match = _PATH_RE.search(svg)
+    fill_match = _FILL_RE.search(svg)
+    big = size * SUPERSAMPLE * 2
+    mask = Image.new("L", (big, big), 0)
+    if path_match:
+        # Even-odd combination of subpaths reproduces the icons' holes.
+        for polygon in _svg_polygons(path_match.group(1), big / 24.0):
+            if len(polygon) < 3:
+                continue
+            layer = Image.new("L", (big, big), 0)
+            ImageDraw.Draw(layer).polygon(polygon, fill=255)
+            mask = ImageChops.difference(mask, layer)
+    alpha = mask.resize((size, size), Image.Resampling.LANCZOS)
+    if opacity < 1.0:
+        alpha = alpha.point(lambda v: int(v * opacity))
+    icon = Image.new("RGBA", (size, size), (*_hex_rgb(fill_match.group(1) if fill_match else "#5865F2"), 0))
+    icon.putalpha(alpha)
+    return icon
+
+
+@lru_cache(maxsize=128)
+def _rounded_mask(width: int, height: int, radius: float) -> Image.Image:
+    """Anti-aliased rounded-rectangle mask."""
+    radius = max(0.0, min(radius, width / 2, height / 2))
+    big = Image.new("L", (width * SUPERSAMPLE, height * SUPERSAMPLE), 0)
+    ImageDraw.Draw(big).rounded_rectangle(
+        (0, 0, width * SUPERSAMPLE - 1, height * SUPERSAMPLE - 1),
+        radius=radius * SUPERSAMPLE,
+        fill=255,
+    )
+    return big.resize((width, height), Image.Resampling.LANCZOS)
+
+
+@lru_cache(maxsize=32)
+def _card_background(width: int, height: int) -> Image.Image:
+    """``linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #1a1a2e 100%)``."""
+    xs = np.arange(width, dtype=np.float32)[None, :] + 0.5
+    ys = np.arange(height, dtype=np.float32)[:, None] + 0.5
+    t = (xs - width / 2 + ys - height / 2) / float(width + height) + 0.5
+    weight = 1.0 - np.abs(2.0 * np.clip(t, 0.0, 1.0) - 1.0)
+    edge = np.array([0x1A, 0x1A, 0x2E], dtype=np.float32)
+    middle = np.array([0x16, 0x21, 0x3E], dtype=np.float32)
+    pixels = edge + (middle - edge) * weight[..., None]
+    rgb = Image.fromarray(np.round(pixels).astype(np.uint8), "RGB")
+    return rgb.convert("RGBA")
+
+
+def _circle_image(image_b64: str, diameter: int) -> Optional[Image.Image]:
+    """Decode an image, crop it to a centred square and mask it to a circle."""
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(image_b64))) as source:
+            image = source.convert("RGBA")
+    except Exception:
+        return None
+    side = min(image.size)
+    left, top = (image.width - side) // 2, (image.height - side) // 2
+    image = image.crop((left, top, left + side, top + side)).resize(
+        (diameter, diameter), Image.Resampling.LANCZOS
+    )
+    alpha = ImageChops.multiply(image.getchannel("A"), _rounded_mask(diameter, diameter, diameter / 2))
+    image.putalpha(alpha)
+    return image
+
+
+# --------------------------------------------------------------------------
+# Text layout
+
+
+def _line_height(font: ImageFont.FreeTypeFont, factor: Optional[float] = None) -> float:
+    """CSS line height: ``factor * size`` or the font's normal height."""
+    if factor is not None:
+        return factor * font.size
+    ascent, descent = font.getmetrics()
+    return float(ascent + descent)
+
+
+def _wrap(text: str, font: ImageFont.FreeTypeFont, width: float) -> List[str]:
+    """Greedy word wrap with ``overflow-wrap: anywhere`` for long words."""
+    lines: List[str] = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if font.getlength(candidate) <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+            line = ""
+        while font.getlength(word) > width and len(word) > 1:
+            cut = len(word) - 1
+            while cut > 1 and font.getlength(word[:cut]) > width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        line = word
+    if line or not lines:
+        lines.append(line)
+    return lines
+
+
+@dataclass
+class _TextBlock:
+    lines: List[str]
+    font: ImageFont.FreeTypeFont
+    line_height: float
+    color: RGBA
+
+    @property
+    def height(self) -> float:
+        return self.line_height * len(self.lines)
+
+    @property
+    def width(self) -> float:
+        return max((self.font.getlength(line) for line in self.lines), default=0.0)
+
+    def draw(self, draw: ImageDraw.ImageDraw, x: float, y: float, width: float, align: str = "left") -> None:
+        ascent, descent = self.font.getmetrics()
+        # CSS centres the glyph box (ascent + descent) inside each line box.
+        baseline_offset = (self.line_height - (ascent + descent)) / 2 + ascent
+        for index, line in enumerate(self.lines):
+            line_width = self.font.getlength(line)
+            if align == "center":
+                lx = x + (width - line_width) / 2
+            else:
+                lx = x
+            draw.text(
+                (round(lx), round(y + index * self.line_height + baseline_offset)),
+                line,
+                font=self.font,
+                fill=self.color,
+                anchor="ls",
+            )
+
+
+def _text(text: str, bold: bool, size: int, width: float, color: RGBA, factor: Optional[float] = None) -> _TextBlock:
+    font = _font(bold, size)
+    return _TextBlock(_wrap(text, font, width), font, _line_height(font, factor), color)
+
+
+def _supported_text(*values: Any) -> bool:
+    for value in values:
+        if value is None:
+            continue
+        if any(ord(ch) > MAX_NATIVE_CODEPOINT for ch in str(value)):
+            return False
+    return True
+
+
+# --------------------------------------------------------------------------
+# Drawing helpers
+
+
+@dataclass
+class _Canvas:
+    image: Image.Image
+    ops: List[Tuple[str, tuple]] = field(default_factory=list)
+
+    def fill(self, box: Box, radius: float, color: RGBA) -> None:
+        x0, y0, x1, y1 = (int(round(v)) for v in box)
+        width, height = x1 - x0, y1 - y0
+        if width <= 0 or height <= 0 or color[3] == 0:
+            return
+        alpha = _rounded_mask(width, height, radius)
+        if color[3] < 255:
+            alpha = alpha.point(lambda v, a=color[3]: v * a // 255)
+        layer = Image.new("RGBA", (width, height), color[:3] + (0,))
+        layer.putalpha(alpha)
+        self.image.alpha_composite(layer, (x0, y0))
+
+    def gradient_fill(self, box: Box, radius: float, rgb: Tuple[int, int, int], start: float, end: float) -> None:
+        """135deg two-stop gradient of one colour from ``start`` to ``end`` alpha."""
+        x0, y0, x1, y1 = (int(round(v)) for v in box)
+        width, height = x1 - x0, y1 - y0
+        if width <= 0 or height <= 0:
+            return
+        xs = np.arange(width, dtype=np.float32)[None, :] + 0.5
+        ys = np.arange(height, dtype=np.float32)[:, None] + 0.5
+        t = np.clip((xs - width / 2 + ys - height / 2) / float(width + height) + 0.5, 0.0, 1.0)
+        alpha = (start + (end - start) * t) * np.asarray(_rounded_mask(width, height, radius), dtype=np.float32)
+        layer = Image.new("RGBA", (width, height), rgb + (0,))
+        layer.putalpha(Image.fromarray(np.round(alpha).astype(np.uint8), "L"))
+        self.image.alpha_composite(layer, (x0, y0))
+
+    def outline(self, box: Box, radius: float, width: float, color: RGBA) -> None:
+        x0, y0, x1, y1 = (int(round(v)) for v in box)
+        w, h = x1 - x0, y1 - y0
+        inset = int(round(width))
+        if w <= 2 * inset or h <= 2 * inset:
+            return
+        outer = _rounded_mask(w, h, radius)
+        inner = Image.new("L", (w, h), 0)
+        inner.paste(_rounded_mask(w - 2 * inset, h - 2 * inset, max(0.0, radius - inset)), (inset, inset))
+        ring = ImageChops.subtract(outer, inner)
+        if color[3] < 255:
+            ring = ring.point(lambda v, a=color[3]: v * a // 255)
+        layer = Image.new("RGBA", (w, h), color[:3] + (0,))
+        layer.putalpha(ring)
+        self.image.alpha_composite(layer, (x0, y0))
+
+    def paste(self, image: Image.Image, x: float, y: float) -> None:
+        self.image.alpha_composite(image, (int(round(x)), int(round(y))))
+
+
+# --------------------------------------------------------------------------
+# Card layout
+
+
+@dataclass
+class _Pill:
+    icon: Image.Image
+    text: _TextBlock
+    width: float
+    height: float
+
+
+class NativeSoundCardRenderer:
+    """
+    Lay out and rasterize sound cards with Pillow.
+
+    Args:
+        icons: Icon name -> base64 SVG, as built by ``ImageGeneratorService``.
+    """
+
+    STAT_GAP = 16
+    NAME_GAP = 14
+
+    def __init__(self, icons: Dict[str, str]) -> None:
+        self._svg_by_b64 = {
+            encoded: base64.b64decode(encoded).decode("utf-8") for encoded in icons.values()
+        }
+
+    def available(self) -> bool:
+        """Return whether fonts are installed so native rendering can run."""
+        return fonts_available()
+
+    def render(self, data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Render the card described by the template ``data`` dict.
+
+        Returns:
+            PNG bytes at template size (580 px wide), or ``None`` when the
+            card should go through the browser renderer instead.
+        """
+        started = time.perf_counter()
+        try:
+            image = self._render(data)
+        except Exception as e:
+            print(f"[NativeSoundCardRenderer] Falling back to browser: {e}")
+            image = None
+        if image is None:
+            NATIVE_RENDERS.inc(result="unsupported")
+            return None
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=False, compress_level=3)
+        NATIVE_RENDERS.inc(result="ok")
+        NATIVE_RENDER_SECONDS.observe(time.perf_counter() - started)
+        return buffer.getvalue()
+
+    def _svg(self, encoded: Optional[str]) -> Optional[str]:
+        return self._svg_by_b64.get(encoded) if encoded else None
+
+    def _stat_pills(self, data: Dict[str, Any]) -> List[_Pill]:
+        entries = []
+        if data.get("duration"):
+            entries.append((data["icon_timer"], str(data["duration"])))
+        if data.get("play_count") is not None:
+            entries.append((data["icon_chart"], f"{data['play_count']} plays"))
+        if data.get("lists"):
+            entries.append((data["icon_folder"], str(data["lists"])))
+        if data.get("favorited_by"):
+            entries.append((data["icon_heart"], str(data["favorited_by"])))
+
+        pills = []
+        font = _font(False, 15)
+        for icon_b64, label in entries:
+            svg = self._svg(icon_b64)
+            if svg is None:
+                raise ValueError("unknown stat icon")
+            text = _TextBlock([label], font, _line_height(font), (0xA0, 0xA0, 0xB0, 255))
+            height = 8 + max(16.0, text.height)
+            pills.append(_Pill(_icon(svg, 16), text, 10 + 16 + 6 + text.width + 10, height))
+        return pills
+
+    def _render(self, data: Dict[str, Any]) -> Optional[Image.Image]:
+        if not fonts_available():
+            return None
+        if not _supported_text(
+            data.get("sound_name"),
+            data.get("duration"),
+            data.get("lists"),
+            data.get("favorited_by"),
+            data.get("event_data"),
+            data.get("request_note"),
+            data.get("download_date"),
+            data.get("play_count"),
+        ):
+            return None
+
+        card_class = str(data.get("card_class") or "")
+        summary = "summary-notification" in card_class.split()
+        notification_only = bool(data.get("notification_only"))
+        has_avatar = bool(data.get("requester_avatar_b64"))
+        has_stats = bool(data.get("has_stats"))
+        has_footer = bool(data.get("show_footer") or data.get("request_note"))
+        accent_hex = str(data.get("accent_color") or "#5865F2")
+        accent = _hex_rgb(accent_hex)
+
+        border = 3 if summary else 6
+        radius = 24 if summary else 40
+        if notification_only:
+            pad_top, pad_right, pad_bottom, pad_left = 14, 20, 14, 20
+        elif summary:
+            pad_top, pad_right, pad_bottom, pad_left = 18, 22, 14, 22
+        else:
+            pad_top, pad_right, pad_bottom, pad_left = 24, 26, 16, 26
+        content_x = border + pad_left
+        content_w = CARD_WIDTH - 2 * border - pad_left - pad_right
+
+        # ---- Row 1: leading icon/thumbnail + title ----
+        thumbnail = None
+        leading_icon = None
+        if data.get("sts_thumbnail_b64"):
+            thumbnail = _circle_image(data["sts_thumbnail_b64"], 66)
+            if thumbnail is None:
+                return None
+            lead_w = lead_h = 72
+        elif data.get("speaker_icon"):
+            svg = self._svg(data["speaker_icon"])
+            if svg is None:
+                return None
+            leading_icon = _icon(svg, 28)
+            lead_w = lead_h = 28
+        else:
+            lead_w = lead_h = 0
+        has_leading = lead_w > 0
+
+        name_area_w = content_w - (98 if has_avatar else 0)
+        text_x = content_x + (lead_w + self.NAME_GAP if has_leading else 0)
+        text_w = name_area_w - (lead_w + self.NAME_GAP if has_leading else 0)
+        title = _text(
+            str(data.get("sound_name") or ""),
+            True,
+            int(data.get("title_font_size") or 26),
+            text_w,
+            (255, 255, 255, 255),
+            factor=1.2,
+        )
+        if has_leading:
+            title_align = "left"
+        elif summary:
+            title_align = "left"
+        else:
+            title_align = "center"
+        name_h = max(float(lead_h), title.height)
+        if summary:
+            name_margin = 16
+        elif notification_only or not has_leading:
+            name_margin = 0
+        else:
+            name_margin = 12
+
+        # ---- Row 2: stat pills and summary pill ----
+        pills = self._stat_pills(data) if has_stats else []
+        if any(pill.width > content_w for pill in pills):
+            return None
+        pill_rows: List[List[_Pill]] = []
+        row_width = 0.0
+        for pill in pills:
+            if pill_rows and row_width + self.STAT_GAP + pill.width <= content_w:
+                pill_rows[-1].append(pill)
+                row_width += self.STAT_GAP + pill.width
+            else:
+                pill_rows.append([pill])
+                row_width = pill.width
+        stat_rows_h = [max(p.height for p in row) for row in pill_rows]
+
+        summary_layout = self._layout_summary(data, summary, content_w) if has_stats and data.get("event_data") else None
+        stats_lines_h = list(stat_rows_h) + ([summary_layout["height"]] if summary_layout else [])
+        stats_h = sum(stats_lines_h) + self.STAT_GAP * max(0, len(stats_lines_h) - 1)
+        stats_margin = 0 if summary else 12
+
+        # ---- Row 3: footer ----
+        footer_layout = self._layout_footer(data, accent, content_w) if has_footer else None
+
+        height = border + pad_top + name_h + name_margin
+        if has_stats:
+            height += stats_h + stats_margin
+        if footer_layout:
+            height += footer_layout["height"]
+        height += pad_bottom + border
+        card_h = int(round(height))
+
+        # ---- Paint ----
+        canvas = _Canvas(Image.new("RGBA", (CARD_WIDTH, card_h), (0, 0, 0, 0)))
+        canvas.fill((0, 0, CARD_WIDTH, card_h), radius, accent + (255,))
+        inner_w, inner_h = CARD_WIDTH - 2 * border, card_h - 2 * border
+        content = Image.new("RGBA", (inner_w, inner_h), (0, 0, 0, 0))
+        content.alpha_composite(_card_background(inner_w, inner_h))
+        layer = _Canvas(Image.new("RGBA", (CARD_WIDTH, card_h), (0, 0, 0, 0)))
+        draw = ImageDraw.Draw(layer.image)
+
+        y = border + pad_top
+        if has_leading:
+            lead_y = y + (name_h - lead_h) / 2
+            if thumbnail is not None:
+                layer.fill((content_x, lead_y, content_x + 72, lead_y + 72), 36, (0x58, 0x65, 0xF2, 255))
+                layer.paste(thumbnail, content_x + 3, lead_y + 3)
+            else:
+                layer.paste(leading_icon, content_x, lead_y)
+        title.draw(draw, text_x, y + (name_h - title.height) / 2, text_w, title_align)
+        y += name_h + name_margin
+
+        if has_stats:
+            for row, row_h in zip(pill_rows, stat_rows_h):
+                x = content_x
+                for pill in row:
+                    top = y + (row_h - pill.height) / 2
+                    layer.fill((x, top, x + pill.width, top + pill.height), min(20.0, pill.height / 2), (99, 102, 241, 38))
+                    layer.paste(pill.icon, x + 10, top + (pill.height - 16) / 2)
+                    pill.text.draw(draw, x + 10 + 16 + 6, top + (pill.height - pill.text.height) / 2, pill.text.width)
+                    x += pill.width + self.STAT_GAP
+                y += row_h + self.STAT_GAP
+            if summary_layout:
+                self._draw_summary(layer, draw, summary_layout, content_x, y, content_w, accent, summary)
+                y += summary_layout["height"]
+            else:
+                y -= self.STAT_GAP
+            y += stats_margin
+
+        if footer_layout:
+            self._draw_footer(layer, draw, footer_layout, content_x, y, content_w, accent)
+
+        if has_avatar:
+            avatar = _circle_image(data["requester_avatar_b64"], 72)
+            if avatar is None:
+                return None
+            ax, ay = CARD_WIDTH - border - 14 - 80, border + 14
+            layer.fill((ax, ay, ax + 80, ay + 80), 40, accent + (255,))
+            layer.paste(avatar, ax + 4, ay + 4)
+
+        # overflow: hidden clips to the padding box.
+        content.alpha_composite(layer.image.crop((border, border, border + inner_w, border + inner_h)))
+        inner_mask = _rounded_mask(inner_w, inner_h, max(0.0, radius - border))
+        content.putalpha(ImageChops.multiply(content.getchannel("A"), inner_mask))
+        canvas.image.alpha_composite(content, (border, border))
+        return canvas.image
+
+    def _layout_summary(self, data: Dict[str, Any], summary: bool, content_w: float) -> Dict[str, Any]:
+        parts = [part.strip() for part in str(data.get("event_data") or "").split("|")]
+        parts = [part for part in parts if part]
+        single = bool(data.get("is_single_summary"))
+        pad_x = 14 if summary else 12
+        grid_w = content_w - 2 - 2 * pad_x - 16 - 10
+        columns = 1 if single else 2
+        gap = 0 if single else 6
+        col_w = (grid_w - gap * (columns - 1)) / columns
+        if single:
+            size, factor = 14, 1.45
+        else:
+            size, factor = 13, 1.3
+        item_pad_x, item_pad_y, item_border, min_h = (0, 0, 0, 0.0) if summary else (8, 4, 1, 44.0)
+
+        items = [
+            _text(part, True, size, col_w - 2 * item_pad_x - 2 * item_border, (0xF5, 0xF7, 0xFF, 250), factor)
+            for part in parts
+        ]
+        rows = [items[i : i + columns] for i in range(0, len(items), columns)]
+        row_heights = [
+            max(max(min_h, block.height + 2 * item_pad_y + 2 * item_border) for block in row) for row in rows
+        ]
+        grid_h = sum(row_heights) + gap * max(0, len(rows) - 1)
+        body_h = max(grid_h, 17.0)
+        svg = self._svg(data.get("icon_event"))
+        return {
+            "icon": _icon(svg, 16) if svg else None,
+            "rows": rows,
+            "row_heights": row_heights,
+            "columns": columns,
+            "col_w": col_w,
+            "gap": gap,
+            "single": single,
+            "pad_x": pad_x,
+            "item_pad": (item_pad_x, item_pad_y, item_border),
+            "height": 2 + 2 * 10 + body_h,
+        }
+
+    def _draw_summary(
+        self,
+        layer: _Canvas,
+        draw: ImageDraw.ImageDraw,
+        layout: Dict[str, Any],
+        x: float,
+        y: float,
+        width: float,
+        accent: Tuple[int, int, int],
+        summary: bool,
+    ) -> None:
+        box = (x, y, x + width, y + layout["height"])
+        if summary:
+            layer.fill(box, 14, _with_alpha(accent, 0.12))
+            layer.outline(box, 14, 1, _with_alpha(accent, 0.30))
+        else:
+            layer.gradient_fill(box, 14, accent, 0.20 * 255, 0.10 * 255)
+            layer.outline(box, 14, 1, _with_alpha(accent, 0.50))
+            layer.outline((x + 1, y + 1, x + width - 1, y + layout["height"] - 1), 13, 1, (255, 255, 255, 15))
+
+        inner_x = x + 1 + layout["pad_x"]
+        inner_y = y + 1 + 10
+        if layout["icon"] is not None:
+            layer.paste(layout["icon"], inner_x, inner_y + 1)
+        grid_x = inner_x + 16 + 10
+        item_pad_x, item_pad_y, item_border = layout["item_pad"]
+        row_y = inner_y
+        for row, row_h in zip(layout["rows"], layout["row_heights"]):
+            for column, block in enumerate(row):
+                cell_x = grid_x + column * (layout["col_w"] + layout["gap"])
+                if not summary:
+                    cell = (cell_x, row_y, cell_x + layout["col_w"], row_y + row_h)
+                    layer.fill(cell, 9, (5, 8, 20, 87))
+                    layer.outline(cell, 9, 1, (255, 255, 255, 20))
+                text_x = cell_x + item_pad_x + item_border
+                text_w = layout["col_w"] - 2 * (item_pad_x + item_border)
+                block.draw(
+                    draw,
+                    text_x,
+                    row_y + (row_h - block.height) / 2,
+                    text_w,
+                    "left" if layout["single"] else "center",
+                )
+            row_y += row_h + layout["gap"]
+
+    def _layout_footer(self, data: Dict[str, Any], accent: Tuple[int, int, int], content_w: float) -> Dict[str, Any]:
+        date_text = f"Added: {data['download_date']}" if data.get("download_date") else ""
+        date_font = _font(False, 12)
+        date_block = _TextBlock([date_text] if date_text else [], date_font, _line_height(date_font), (0x6B, 0x72, 0x80, 255))
+
+        note = None
+        if data.get("request_note"):
+            label_font = _font(True, 11)
+            label = _TextBlock(["TTS:"], label_font, _line_height(label_font), _with_alpha(accent, 0.9))
+            max_pill_w = min(360.0, content_w - (date_block.width + 8 if date_text else 0))
+            fixed_w = 2 + 16 + 12 + 5 + label.width + 5
+            note_font = _font(False, 11)
+            natural = note_font.getlength(str(data["request_note"]))
+            text_w = max(1.0, min(natural + 1, max_pill_w - fixed_w))
+            text = _text(str(data["request_note"]), False, 11, text_w, (0xD0, 0xD0, 0xD8, 255))
+            svg = self._svg(data.get("speaker_icon") or data.get("icon_timer"))
+            body_h = max(12.0, label.height, text.height)
+            note = {
+                "label": label,
+                "text": text,
+                "icon": _icon(svg, 12, 0.7) if svg else None,
+                "width": fixed_w + text.width,
+                "height": 2 + 4 + body_h,
+            }
+
+        body_h = max(13.0, date_block.height, note["height"] if note else 0.0)
+        return {"date": date_block, "note": note, "height": 1 + 4 + body_h}
+
+    def _draw_footer(
+        self,
+        layer: _Canvas,
+        draw: ImageDraw.ImageDraw,
+        layout: Dict[str, Any],
+        x: float,
+        y: float,
+        width: float,
+        accent: Tuple[int, int, int],
+    ) -> None:
+        layer.fill((x, y, x + width, y + 1), 0, (99, 102, 241, 51))
+        top = y + 5
+        layout["date"].draw(draw, x, top, width)
+        note = layout["note"]
+        if note is None:
+            return
+        box = (x + width - note["width"], top, x + width, top + note["height"])
+        layer.fill(box, 10, _with_alpha(accent, 0.12))
+        layer.outline(box, 10, 1, _with_alpha(accent, 0.25))
+        cursor = box[0] + 1 + 8
+        inner_top = top + 1 + 2
+        if note["icon"] is not None:
+            layer.paste(note["icon"], cursor, inner_top)
+        cursor += 12 + 5
+        note["label"].draw(draw, cursor, inner_top, note["label"].width)
+        cursor += note["label"].width + 5
+        note["text"].draw(draw, cursor, inner_top, note["text"].width)
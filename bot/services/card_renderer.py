@@ -0,0 +1,397 @@
+"""
+Pool of warm headless Chrome renderers for HTML cards.
+
+``ImageGeneratorService`` used to own one Selenium driver behind a lock, so
+every card render in every guild queued behind the previous one. The
+``CardRendererPool`` keeps up to ``size`` drivers alive and hands each render
+to an idle one:
+
+- Admission is bounded: at most ``size + queue_limit`` renders are in the
+  pool at once. Further requests are rejected immediately, and queued ones
+  give up after ``acquire_timeout``. The caller then falls back to
+  html2image.
+- Each driver remembers the ``<head>`` (styles) of the last document it
+  loaded. Cards rendered from the same template only swap the ``<body>``
+  markup through JS, so navigation and stylesheet parsing are skipped.
+- Queue wait, load, measure and capture times are exported per render.
+
+Drivers start lazily on first use and stay warm. A driver that fails a
+render is discarded and replaced on demand.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bot.metrics import REGISTRY
+
+CARD_RENDER_SECONDS = REGISTRY.histogram(
+    "card_render_seconds",
+    "Card render time by stage (queue, load, measure, capture, total).",
+    ("stage",),
+)
+CARD_RENDERS = REGISTRY.counter(
+    "card_renders",
+    "Card renders by outcome (ok, failed, rejected, timeout, unavailable) and document reuse.",
+    ("result",),
+)
+CARD_RENDERERS_BUSY = REGISTRY.gauge(
+    "card_renderers_busy",
+    "Renderers currently producing a card.",
+)
+
+_BODY_RE = re.compile(r"<body([^>]*)>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_HEAD_RE = re.compile(r"<head[^>]*>(.*)</head>", re.IGNORECASE | re.DOTALL)
+
+_MEASURE_SCRIPT = """
+const el = document.querySelector(arguments[0]);
+if (!el) return null;
+const rect = el.getBoundingClientRect();
+const doc = document.documentElement;
+const body = document.body;
+const documentHeight = Math.max(
+    rect.height,
+    el.scrollHeight || 0,
+    doc ? doc.scrollHeight || 0 : 0,
+    body ? body.scrollHeight || 0 : 0
+);
+const documentWidth = Math.max(
+    rect.width,
+    el.scrollWidth || 0,
+    doc ? doc.scrollWidth || 0 : 0,
+    body ? body.scrollWidth || 0 : 0
+);
+return {
+    x: Math.max(0, rect.x),
+    y: Math.max(0, rect.y),
+    width: Math.max(1, Math.ceil(rect.width)),
+    height: Math.max(1, Math.ceil(rect.height)),
+    requiredWidth: Math.max(1, Math.ceil(documentWidth + 32)),
+    requiredHeight: Math.max(1, Math.ceil(documentHeight + 40)),
+    viewportWidth: Math.max(1, window.innerWidth || 0),
+    viewportHeight: Math.max(1, window.innerHeight || 0),
+    scale: window.devicePixelRatio || 1
+};
+"""
+
+# Swap body markup and wait for embedded images so the capture never races
+# a data: URI decode.
+_SWAP_BODY_SCRIPT = """
+const done = arguments[arguments.length - 1];
+document.body.setAttribute('style', arguments[1]);
+document.body.style.background = 'transparent';
+document.body.innerHTML = arguments[0];
+window.scrollTo(0, 0);
+const pending = Array.from(document.images).filter((img) => !img.complete);
+if (!pending.length) { done(true); return; }
+let left = pending.length;
+const settle = () => { left -= 1; if (left <= 0) done(true); };
+pending.forEach((img) => { img.onload = settle; img.onerror = settle; });
+"""
+
+
+def split_document(html: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a full HTML document into ``(head_key, body_attrs, body_html)``.
+
+    ``head_key`` is a digest of the ``<head>`` markup; documents with the same
+    key can share a loaded page. Returns ``None`` for fragments.
+    """
+    head = _HEAD_RE.search(html)
+    body = _BODY_RE.search(html)
+    if head is None or body is None:
+        return None
+    digest = hashlib.sha1(head.group(1).encode("utf-8")).hexdigest()
+    return digest, body.group(1), body.group(2)
+
+
+def _body_style(body_attrs: str) -> str:
+    match = re.search(r'style\s*=\s*"([^"]*)"', body_attrs)
+    return match.group(1) if match else ""
+
+
+def create_chrome_driver() -> Any:
+    """Start a headless Chrome driver configured for transparent captures."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-features=Translate,BackForwardCache")
+    options.add_argument("--hide-scrollbars")
+    options.add_argument("--window-size=1200,1000")
+
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(5)
+    driver.set_script_timeout(2)
+    # Keep compositor background transparent so rounded corners preserve alpha.
+    driver.execute_cdp_cmd("Page.enable", {})
+    driver.execute_cdp_cmd(
+        "Emulation.setDefaultBackgroundColorOverride",
+        {"color": {"r": 0, "g": 0, "b": 0, "a": 0}},
+    )
+    return driver
+
+
+class ChromeRenderer:
+    """One warm driver plus the template document it currently has loaded."""
+
+    def __init__(self, driver: Any) -> None:
+        self.driver = driver
+        self.loaded_head: Optional[str] = None
+        self.window_size: Optional[Tuple[int, int]] = None
+
+    def _set_window_size(self, width: int, height: int) -> None:
+        if self.window_size != (width, height):
+            self.driver.set_window_size(width, height)
+            self.window_size = (width, height)
+
+    def _load(self, html_content: str) -> None:
+        parts = split_document(html_content)
+        if parts is not None and parts[0] == self.loaded_head:
+            _, body_attrs, body_html = parts
+            self.driver.execute_async_script(_SWAP_BODY_SCRIPT, body_html, _body_style(body_attrs))
+            CARD_RENDERS.inc(result="reused")
+            return
+
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.loaded_head = None
+        self.driver.get("about:blank")
+        self.driver.execute_script(
+            "document.open();document.write(arguments[0]);document.close();",
+            html_content,
+        )
+        self.driver.execute_script(
+            "document.documentElement.style.background='transparent';"
+            "document.body.style.background='transparent';"
+        )
+        WebDriverWait(self.driver, 2.0).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        self.loaded_head = parts[0] if parts is not None else None
+
+    def measure(self, selector: str) -> Optional[Dict[str, float]]:
+        """Measure the selector and document size for stable screenshot capture."""
+        return self.driver.execute_script(_MEASURE_SCRIPT, selector)
+
+    def render(
+        self,
+        html_content: str,
+        size: Tuple[int, int],
+        selector: Optional[str],
+    ) -> Optional[bytes]:
+        """Load ``html_content`` and capture ``selector`` (or the page) as PNG."""
+        width, height = size
+        base_width, base_height = max(900, width), max(640, height)
+
+        started = time.perf_counter()
+        self._set_window_size(base_width, base_height)
+        self._load(html_content)
+        loaded = time.perf_counter()
+        CARD_RENDER_SECONDS.observe(loaded - started, stage="load")
+
+        params: Dict[str, Any] = {"format": "png", "omitBackground": True, "fromSurface": True}
+        if selector:
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.support.ui import WebDriverWait
+
+            WebDriverWait(self.driver, 2.0).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+            )
+            clip = self.measure(selector)
+            if not clip:
+                return None
+            required_width = max(base_width, int(clip.get("requiredWidth", width)))
+            required_height = max(base_height, int(clip.get("requiredHeight", height)))
+            viewport_width = int(clip.get("viewportWidth", width))
+            viewport_height = int(clip.get("viewportHeight", height))
+            if required_width > viewport_width or required_height > viewport_height:
+                self._set_window_size(required_width, required_height)
+                self.driver.execute_script("window.scrollTo(0, 0);")
+                clip = self.measure(selector)
+                if not clip:
+                    return None
+            params["clip"] = clip
+        measured = time.perf_counter()
+        CARD_RENDER_SECONDS.observe(measured - loaded, stage="measure")
+
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        CARD_RENDER_SECONDS.observe(time.perf_counter() - measured, stage="capture")
+        return base64.b64decode(result["data"])
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class CardRendererPool:
+    """
+    Bounded pool of ``ChromeRenderer`` instances shared by all card renders.
+
+    Args:
+        size: Maximum number of live Chrome drivers.
+        queue_limit: Renders allowed to wait for a driver beyond ``size``.
+        acquire_timeout: Seconds a queued render waits before giving up.
+        driver_factory: Callable returning a new Selenium driver.
+        retry_after: Seconds before retrying after the driver failed to start.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        queue_limit: int = 8,
+        acquire_timeout: float = 10.0,
+        driver_factory: Callable[[], Any] = create_chrome_driver,
+        retry_after: float = 60.0,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.size = max(1, size)
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+        self._driver_factory = driver_factory
+        self._time = time_func
+        self._admission = threading.BoundedSemaphore(self.size + max(0, queue_limit))
+        self._idle: "queue.LifoQueue[ChromeRenderer]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._busy = 0
+        self._unavailable_until = 0.0
+
+    @classmethod
+    def from_env(cls) -> "CardRendererPool":
+        """Build the pool from ``CARD_RENDERER_*`` environment variables."""
+
+        def _read(name: str, default: float) -> float:
+            try:
+                return float(os.getenv(name, str(default)))
+            except ValueError:
+                return default
+
+        return cls(
+            int(_read("CARD_RENDERER_POOL_SIZE", 2)),
+            queue_limit=int(_read("CARD_RENDERER_QUEUE_LIMIT", 8)),
+            acquire_timeout=_read("CARD_RENDERER_TIMEOUT_SECONDS", 10.0),
+        )
+
+    def _set_busy(self, delta: int) -> None:
+        with self._lock:
+            self._busy += delta
+            CARD_RENDERERS_BUSY.set(self._busy)
+
+    def _acquire(self) -> Tuple[Optional[ChromeRenderer], str]:
+        """Return an idle renderer, start a new one, or wait for one."""
+        try:
+            return self._idle.get_nowait(), "ok"
+        except queue.Empty:
+            pass
+
+        start_new = False
+        with self._lock:
+            if self._time() < self._unavailable_until:
+                return None, "unavailable"
+            if self._live < self.size:
+                self._live += 1
+                start_new = True
+        if start_new:
+            try:
+                return ChromeRenderer(self._driver_factory()), "ok"
+            except Exception as e:
+                print(f"[CardRendererPool] Selenium renderer unavailable: {e}")
+                with self._lock:
+                    self._live -= 1
+                    self._unavailable_until = self._time() + self.retry_after
+                return None, "unavailable"
+
+        try:
+            return self._idle.get(timeout=self.acquire_timeout), "ok"
+        except queue.Empty:
+            return None, "timeout"
+
+    def _discard(self, renderer: ChromeRenderer) -> None:
+        renderer.quit()
+        with self._lock:
+            self._live -= 1
+
+    def render(
+        self,
+        html_content: str,
+        size: Tuple[int, int],
+        selector: Optional[str] = ".card",
+    ) -> Optional[bytes]:
+        """
+        Render ``html_content`` on a pooled driver.
+
+        Returns:
+            PNG bytes, or ``None`` when the pool is full, timed out, has no
+            working driver, or the render failed.
+        """
+        if not self._admission.acquire(blocking=False):
+            CARD_RENDERS.inc(result="rejected")
+            return None
+        started = time.perf_counter()
+        try:
+            renderer, status = self._acquire()
+            CARD_RENDER_SECONDS.observe(time.perf_counter() - started, stage="queue")
+            if renderer is None:
+                CARD_RENDERS.inc(result=status)
+                return None
+
+            self._set_busy(1)
+            try:
+                image = renderer.render(html_content, size, selector)
+            except Exception as e:
+                print(f"[CardRendererPool] Selenium render failed: {e}")
+                self._discard(renderer)
+                CARD_RENDERS.inc(result="failed")
+                return None
+            finally:
+                self._set_busy(-1)
+            self._idle.put(renderer)
+            CARD_RENDERS.inc(result="ok" if image is not None else "failed")
+            return image
+        finally:
+            CARD_RENDER_SECONDS.observe(time.perf_counter() - started, stage="total")
+            self._admission.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Return live, busy and idle renderer counts."""
+        with self._lock:
+            return {"live": self._live, "busy": self._busy, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        """Quit every idle driver."""
+        while True:
+            try:
+                renderer = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(renderer)
+
+
+_pool: Optional[CardRendererPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_card_renderer_pool() -> CardRendererPool:
+    """Return the process-wide renderer pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CardRendererPool.from_env()
+        return _pool
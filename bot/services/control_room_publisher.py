@@ -0,0 +1,129 @@
+"""
+Change-only persistence for the web control-room status panel.
+
+The bot samples every guild's playback/voice/mute state once per second, but
+almost every tick only advances ``current_elapsed_seconds`` and
+``mute_remaining_seconds``. Both move at wall-clock speed, so the web side
+extrapolates them from ``sampled_at_unix`` and the bot only needs to write a
+row when something else changes, when the counters stop following the clock
+(seek, pause, new mute), or when a heartbeat is due. Rows that do need a
+write go out together in one transaction per tick.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from bot.repositories.web_control_room import WebControlRoomRepository
+
+# Fields that advance with the clock and are extrapolated by the reader.
+CLOCK_FIELDS = ("current_elapsed_seconds", "mute_remaining_seconds")
+
+
+class ControlRoomStatePublisher:
+    """
+    Keep the latest control-room status per guild and persist only changes.
+    """
+
+    def __init__(
+        self,
+        repository: WebControlRoomRepository,
+        drift_tolerance_seconds: float = 1.5,
+        heartbeat_seconds: float = 60.0,
+        time_func: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the publisher.
+
+        Args:
+            repository: Repository that stores ``web_bot_status`` rows.
+            drift_tolerance_seconds: How far a clock field may stray from its
+                extrapolated value before the row is rewritten.
+            heartbeat_seconds: Maximum age of a persisted row.
+            time_func: Clock used for ``sampled_at_unix`` (injectable for tests).
+        """
+        self.repository = repository
+        self.drift_tolerance_seconds = drift_tolerance_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._time = time_func
+        self._persisted: dict[str, dict[str, Any]] = {}
+
+    def latest(self, guild_id: int | str) -> dict[str, Any] | None:
+        """Return the last persisted status for a guild, if any."""
+        return self._persisted.get(str(guild_id))
+
+    def publish(self, statuses: list[dict[str, Any]]) -> list[str]:
+        """
+        Persist the statuses that changed since the last write.
+
+        Args:
+            statuses: Dicts with ``WebControlRoomRepository.upsert_status``
+                keyword arguments (without ``sampled_at_unix``/``updated_at``).
+
+        Returns:
+            Guild IDs whose rows were written.
+        """
+        now = self._time()
+        changed: list[dict[str, Any]] = []
+        for status in statuses:
+            previous = self._persisted.get(str(status["guild_id"]))
+            if previous is None or self._needs_write(previous, status, now):
+                changed.append(
+                    {
+                        **status,
+                        "sampled_at_unix": now,
+                        "updated_at": datetime.fromtimestamp(now),
+                    }
+                )
+
+        if changed:
+            self.repository.upsert_statuses(changed)
+            for status in changed:
+                self._persisted[str(status["guild_id"])] = status
+        return [str(status["guild_id"]) for status in changed]
+
+    def _needs_write(
+        self,
+        previous: dict[str, Any],
+        status: dict[str, Any],
+        now: float,
+    ) -> bool:
+        """Return whether the stored row no longer describes *status*."""
+        if now - previous["sampled_at_unix"] >= self.heartbeat_seconds:
+            return True
+        for key, value in status.items():
+            if key not in CLOCK_FIELDS and previous.get(key) != value:
+                return True
+
+        age = max(0.0, now - previous["sampled_at_unix"])
+        elapsed_running = bool(status.get("is_playing")) and not bool(status.get("is_paused"))
+        if self._drifted(
+            previous.get("current_elapsed_seconds"),
+            status.get("current_elapsed_seconds"),
+            age if elapsed_running else 0.0,
+        ):
+            return True
+        mute_running = bool(status.get("muted"))
+        return self._drifted(
+            previous.get("mute_remaining_seconds"),
+            status.get("mute_remaining_seconds"),
+            -age if mute_running else 0.0,
+            floor=0.0,
+        )
+
+    def _drifted(
+        self,
+        stored: float | None,
+        actual: float | None,
+        delta: float,
+        floor: float | None = None,
+    ) -> bool:
+        """Return whether *actual* strays from ``stored + delta``."""
+        if stored is None or actual is None:
+            return stored is not actual
+        predicted = float(stored) + delta
+        if floor is not None:
+            predicted = max(floor, predicted)
+        return abs(predicted - float(actual)) > self.drift_tolerance_seconds
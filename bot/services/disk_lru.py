@@ -0,0 +1,143 @@
+"""
+Size-bounded LRU index over the files of one cache directory.
+
+Shared by ``TTSAudioCache`` and ``ImageStore``. Entries are the files named
+``<key><suffix>``; the index is rebuilt from the directory on first use,
+ordered by file mtime, and ``touch`` refreshes the mtime on a hit, so
+recency survives restarts without a separate index file. Adding an entry
+evicts least-recently-used files (and their sidecars) until the directory
+fits ``max_bytes``; the newest entry is always kept.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRU:
+    """
+    LRU bookkeeping for a directory of cached files.
+
+    Args:
+        directory: Cache directory (may not exist yet).
+        suffix: Suffix of the files that are indexed and counted.
+        max_bytes: Total indexed size kept before evicting.
+        bytes_gauge: Gauge set to the indexed size after every change.
+        evictions: Counter incremented by the number of evicted entries.
+        sidecar_suffixes: Suffixes of per-entry files deleted alongside an
+            evicted entry (not counted toward ``max_bytes``).
+        log_prefix: Tag used in warning logs, e.g. ``"[TTSCache]"``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        suffix: str,
+        max_bytes: int,
+        *,
+        bytes_gauge: Any,
+        evictions: Any,
+        sidecar_suffixes: Sequence[str] = (),
+        log_prefix: str = "[DiskLRU]",
+    ) -> None:
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.max_bytes = max(0, int(max_bytes))
+        self.sidecar_suffixes = tuple(sidecar_suffixes)
+        self.log_prefix = log_prefix
+        self._bytes_gauge = bytes_gauge
+        self._evictions = evictions
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def path(self, key: str, suffix: Optional[str] = None) -> Path:
+        """Return the file for ``key`` (the indexed file unless ``suffix`` is given)."""
+        return self.directory / f"{key}{self.suffix if suffix is None else suffix}"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        """Rebuild the LRU order from file mtimes (caller holds the lock)."""
+        if self._entries is not None:
+            return self._entries
+        found = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.suffix) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[: -len(self.suffix)], stat.st_size))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("%s Could not scan %s: %s", self.log_prefix, self.directory, e)
+        found.sort()
+        self._entries = OrderedDict((key, size) for _mtime, key, size in found)
+        self._total_bytes = sum(self._entries.values())
+        self._bytes_gauge.set(self._total_bytes)
+        return self._entries
+
+    def lookup(self, key: str) -> bool:
+        """Return whether ``key`` is indexed, marking it most recently used."""
+        with self._lock:
+            entries = self._load_index()
+            if key not in entries:
+                return False
+            entries.move_to_end(key)
+            return True
+
+    def touch(self, key: str) -> None:
+        """Refresh the entry's mtime so its recency survives a restart."""
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+
+    def add(self, key: str, size: int) -> None:
+        """
+        Index a freshly written entry and evict old ones to fit the budget.
+
+        Args:
+            key: Entry key; its file must already be in place.
+            size: Size of the indexed file in bytes.
+        """
+        evicted = []
+        with self._lock:
+            entries = self._load_index()
+            self._total_bytes += size - entries.pop(key, 0)
+            entries[key] = size
+            while self._total_bytes > self.max_bytes and len(entries) > 1:
+                old_key, old_size = entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+            self._bytes_gauge.set(self._total_bytes)
+        for old_key in evicted:
+            for suffix in (self.suffix, *self.sidecar_suffixes):
+                try:
+                    self.path(old_key, suffix).unlink()
+                except OSError:
+                    pass
+        if evicted:
+            self._evictions.inc(len(evicted))
+
+    def forget(self, key: str) -> None:
+        """Drop ``key`` from the index (its files are left to be overwritten)."""
+        with self._lock:
+            entries = self._load_index()
+            size = entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+                self._bytes_gauge.set(self._total_bytes)
+
+    def stats(self) -> tuple[int, int]:
+        """Return ``(entry count, indexed bytes)``."""
+        with self._lock:
+            entries = self._load_index()
+            return len(entries), self._total_bytes
@@ -1,52 +1,166 @@
 """
 Service for guild-level bot configuration and feature flags.
+
+Settings are read through a process-wide in-memory cache: a guild's row is
+loaded once, served from memory afterwards, and only created with defaults
+when it is missing, so hot-path reads (bot channel lookups, STT checks,
+periodic playback) never write to the database. Updates made through this
+service replace the cached row and publish a ``guild_settings_changed``
+Honker notification; other processes drop their copy when they receive it
+(``invalidate_guild_settings_cache``). Entries also expire after
+``GUILD_SETTINGS_CACHE_TTL_SECONDS`` so changes still propagate when Honker
+is unavailable.
 """
 
+import dataclasses
+import logging
 import os
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional
 
 from bot.models.guild_settings import GuildSettings
 from bot.repositories.guild_settings import GuildSettingsRepository
 
+try:
+    from bot.services.honker_integration import publish_notification as _publish_notification
+except ImportError:
+    _publish_notification = None
+
+logger = logging.getLogger(__name__)
+
+GUILD_SETTINGS_CHANNEL = "guild_settings_changed"
+
+
+def _env_float(name: str, default: float) -> float:
+    """Parse a float environment variable, falling back on bad values."""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        logger.warning("[GuildSettings] Ignoring invalid %s; using %s", name, default)
+        return default
+
+
+class GuildSettingsCache:
+    """Read-through cache of guild settings keyed by database path and guild."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds an entry is served before it is re-read.
+            time_func: Monotonic clock (injectable for tests).
+        """
+        self.ttl_seconds = ttl_seconds
+        self._time = time_func
+        self._entries: dict[tuple[str, str], tuple[GuildSettings, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_path: str, guild_id: str) -> Optional[GuildSettings]:
+        """Return a copy of the cached settings, or ``None`` when missing or expired."""
+        with self._lock:
+            entry = self._entries.get((db_path, guild_id))
+        if entry is None:
+            return None
+        settings, loaded_at = entry
+        if self._time() - loaded_at >= self.ttl_seconds:
+            return None
+        return dataclasses.replace(settings)
+
+    def put(self, db_path: str, settings: GuildSettings) -> None:
+        """Store settings loaded from the database."""
+        with self._lock:
+            self._entries[(db_path, settings.guild_id)] = (dataclasses.replace(settings), self._time())
+
+    def invalidate(self, guild_id: Optional[int | str] = None) -> None:
+        """Drop one guild's entries (for every database), or everything."""
+        with self._lock:
+            if guild_id is None:
+                self._entries.clear()
+                return
+            gid = str(guild_id)
+            for key in [key for key in self._entries if key[1] == gid]:
+                del self._entries[key]
+
+
+_SHARED_CACHE = GuildSettingsCache(
+    ttl_seconds=_env_float("GUILD_SETTINGS_CACHE_TTL_SECONDS", 300.0),
+)
+
+
+def invalidate_guild_settings_cache(guild_id: Optional[int | str] = None) -> None:
+    """Drop cached settings for one guild (or all guilds) in this process."""
+    _SHARED_CACHE.invalidate(guild_id)
+
 
 class GuildSettingsService:
     """Business logic wrapper for guild settings operations."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[GuildSettingsCache] = None):
         self.repo = GuildSettingsRepository()
+        self.cache = cache or _SHARED_CACHE
         self.default_autojoin = os.getenv("AUTOJOIN_DEFAULT", "false").lower() == "true"
         self.default_periodic = os.getenv("PERIODIC_DEFAULT", "false").lower() == "true"
         self.default_stt = os.getenv("STT_DEFAULT", "false").lower() == "true"
         self.default_audio_policy = os.getenv("AUDIO_LATENCY_MODE", "low_latency")
 
-    def ensure_guild(self, guild_id: int | str) -> GuildSettings:
-        """Ensure a guild has a settings row and return it."""
-        gid = str(guild_id)
-        try:
+    def _defaults(self, guild_id: str) -> GuildSettings:
+        return GuildSettings(
+            guild_id=guild_id,
+            autojoin_enabled=self.default_autojoin,
+            periodic_enabled=self.default_periodic,
+            stt_enabled=self.default_stt,
+            audio_policy=self.default_audio_policy,
+        )
+
+    def _load(self, guild_id: str) -> GuildSettings:
+        """Read a guild's row (creating defaults only when missing) and cache it."""
+        settings = self.repo.get_by_guild_id(guild_id)
+        if settings is None:
             self.repo.upsert_defaults(
-                guild_id=gid,
+                guild_id=guild_id,
                 autojoin_enabled=self.default_autojoin,
                 periodic_enabled=self.default_periodic,
                 stt_enabled=self.default_stt,
                 audio_policy=self.default_audio_policy,
             )
-            settings = self.repo.get_by_guild_id(gid)
+            settings = self.repo.get_by_guild_id(guild_id)
             if not settings:
                 # Defensive fallback; should not happen after upsert.
-                return GuildSettings(guild_id=gid)
-            return settings
+                return GuildSettings(guild_id=guild_id)
+        self.cache.put(self.repo.db_path, settings)
+        return settings
+
+    def _after_write(self, guild_id: str) -> GuildSettings:
+        """Write the updated row through to the cache and notify other processes."""
+        self.cache.invalidate(guild_id)
+        settings = self.ensure_guild(guild_id)
+        if _publish_notification is not None:
+            try:
+                _publish_notification(self.repo.db_path, GUILD_SETTINGS_CHANNEL, {"guild_id": guild_id})
+            except Exception:
+                logger.warning("[GuildSettings] Failed to publish change for guild %s", guild_id, exc_info=True)
+        return settings
+
+    def ensure_guild(self, guild_id: int | str) -> GuildSettings:
+        """Return a guild's settings, creating the row with defaults if missing."""
+        gid = str(guild_id)
+        cached = self.cache.get(self.repo.db_path, gid)
+        if cached is not None:
+            return cached
+        try:
+            return self._load(gid)
         except Exception:
             # Keep service resilient in tests or early startup when schema is not ready.
-            return GuildSettings(
-                guild_id=gid,
-                autojoin_enabled=self.default_autojoin,
-                periodic_enabled=self.default_periodic,
-                stt_enabled=self.default_stt,
-                audio_policy=self.default_audio_policy,
-            )
+            return self._defaults(gid)
 
     def get(self, guild_id: int | str) -> GuildSettings:
-        """Get guild settings, creating defaults when missing."""
+        """Get guild settings from the cache, creating defaults when missing."""
         return self.ensure_guild(guild_id)
 
     def set_channels(
@@ -66,7 +180,7 @@ class GuildSettingsService:
             )
         except Exception:
             pass
-        return self.get(gid)
+        return self._after_write(gid)
 
     def clear_channel(self, guild_id: int | str, field_name: str) -> GuildSettings:
         """Clear one configured channel field."""
@@ -76,7 +190,7 @@ class GuildSettingsService:
             self.repo.clear_channel(gid, field_name)
         except Exception:
             pass
-        return self.get(gid)
+        return self._after_write(gid)
 
     def set_feature(
         self,
@@ -101,7 +215,7 @@ class GuildSettingsService:
             self.repo.update_features(guild_id=gid, **kwargs)
         except Exception:
             pass
-        return self.get(gid)
+        return self._after_write(gid)
 
     def set_audio_policy(self, guild_id: int | str, policy: str) -> GuildSettings:
         """Set audio policy for a guild."""
@@ -111,7 +225,7 @@ class GuildSettingsService:
             self.repo.update_audio_policy(gid, policy)
         except Exception:
             pass
-        return self.get(gid)
+        return self._after_write(gid)
 
     def is_feature_enabled(self, guild_id: int | str, feature: str) -> bool:
         """Return whether a feature flag is enabled for a guild."""
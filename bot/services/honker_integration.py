@@ -16,19 +16,60 @@ Environment variables:
         logging and falling back.
     HONKER_WORKER_ID — Worker/process identifier used for claim-group
         naming and lock identity.  Defaults to ``hostname-pid``.
+    HONKER_PUBLISH_ASYNC (default ``true``) — Publish soundboard events from
+        a background batching thread instead of the caller's thread.  Ignored
+        when ``HONKER_REQUIRED`` is true so publish failures still raise.
+    HONKER_PUBLISH_COALESCE_MS (default ``50``) — How long a queued soundboard
+        event waits for others to join its batch.
+    HONKER_PUBLISH_MAX_PENDING (default ``1000``) — Distinct queued soundboard
+        events before new ones are dropped.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
 import platform
 import threading
+import time
 from typing import Any, Callable
 
+from bot.metrics import REGISTRY
+
 logger = logging.getLogger(__name__)
 
+SOUNDBOARD_PUBLISH_SECONDS = REGISTRY.histogram(
+    "honker_publish_seconds",
+    "Time to notify and stream-publish one soundboard event.",
+    ("event_type",),
+)
+SOUNDBOARD_PUBLISH_FAILURES = REGISTRY.counter(
+    "honker_publish_failures",
+    "Soundboard events that failed to publish.",
+    ("event_type",),
+)
+SOUNDBOARD_PUBLISH_LAG_SECONDS = REGISTRY.histogram(
+    "honker_publish_lag_seconds",
+    "Time from queueing a soundboard event to its NOTIFY commit.",
+    ("event_type",),
+)
+SOUNDBOARD_PUBLISH_BATCHES = REGISTRY.counter(
+    "honker_publish_batches",
+    "Soundboard publish transactions.",
+)
+SOUNDBOARD_EVENTS_COALESCED = REGISTRY.counter(
+    "honker_events_coalesced",
+    "Soundboard events merged into an already queued event.",
+    ("event_type",),
+)
+SOUNDBOARD_EVENTS_DROPPED = REGISTRY.counter(
+    "honker_events_dropped",
+    "Soundboard events dropped before publishing.",
+    ("event_type", "reason"),
+)
+
 # ---------------------------------------------------------------------------
 # Module-level state
 # ---------------------------------------------------------------------------
@@ -48,6 +89,18 @@ _thread_honker = threading.local()
 # Environment helpers
 # ---------------------------------------------------------------------------
 
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Read an integer env var, falling back to *default* when unset or invalid."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(minimum, int(raw))
+    except ValueError:
+        logger.warning("[Honker] Ignoring invalid %s=%r; using %d", name, raw, default)
+        return default
+
+
 _HONKER_ENABLED = os.getenv("HONKER_ENABLED", "auto").strip().lower()
 _HONKER_REQUIRED = os.getenv("HONKER_REQUIRED", "false").strip().lower() in (
     "1", "true", "yes"
@@ -56,6 +109,11 @@ _HONKER_WORKER_ID = os.getenv(
     "HONKER_WORKER_ID",
     f"{platform.node() or 'unknown'}-{os.getpid()}",
 )
+_HONKER_PUBLISH_ASYNC = os.getenv("HONKER_PUBLISH_ASYNC", "true").strip().lower() not in (
+    "0", "false", "no", "off"
+)
+_HONKER_PUBLISH_COALESCE_MS = _env_int("HONKER_PUBLISH_COALESCE_MS", 50, minimum=0)
+_HONKER_PUBLISH_MAX_PENDING = _env_int("HONKER_PUBLISH_MAX_PENDING", 1000, minimum=1)
 
 
 def _honker_required() -> bool:
@@ -747,6 +805,14 @@ def publish_soundboard_event(
     updates.  When Honker is unavailable, this is a no-op and the web
     UI falls back to polling.
 
+    By default the event is handed to this process's
+    ``SoundboardEventPublisher`` and the call returns immediately; the
+    publisher coalesces and NOTIFYs from a background thread.  Set
+    ``HONKER_PUBLISH_ASYNC=false`` to publish synchronously on the
+    caller's thread.  With ``HONKER_REQUIRED=true`` events are always
+    published synchronously so a failure raises to the caller instead of
+    only being logged by the background thread.
+
     Event types (``event_type``):
         ``playback_queued`` — A sound or control request was just queued.
         ``sound_imported`` — A new sound was approved/inserted.
@@ -758,29 +824,32 @@ def publish_soundboard_event(
             consistently regardless of which code path initiated playback.
         ``actions_changed`` — A new action was logged.
         ``sounds_changed`` — Sound inventory changed.
+
+    Returns:
+        True when the event was published (sync) or accepted for
+        publishing (async).
     """
     if not availability():
         return False
 
-    payload: dict[str, Any] = {"type": event_type}
-    if data:
-        payload["data"] = data
+    if _HONKER_PUBLISH_ASYNC and not _honker_required():
+        return get_soundboard_publisher(db_path).submit(event_type, data)
 
+    payload = _soundboard_payload(event_type, data)
+    started = time.perf_counter()
     try:
-        # Publish both as a notification (hot wake) and stream event
-        # (replay for slow consumers).
-        conn = _get_honker_connection(db_path)
-        with conn.transaction() as tx:
-            tx.notify("soundboard_events", payload)
-
-        stream = conn.stream("soundboard_events")
-        stream.publish(payload)
+        _publish_soundboard_payloads(db_path, [payload])
+        SOUNDBOARD_PUBLISH_SECONDS.observe(
+            time.perf_counter() - started, event_type=event_type
+        )
         return True
     except RuntimeError:
+        SOUNDBOARD_PUBLISH_FAILURES.inc(event_type=event_type)
         if _honker_required():
             raise
         return False
     except Exception as exc:
+        SOUNDBOARD_PUBLISH_FAILURES.inc(event_type=event_type)
         logger.warning(
             "[Honker] Failed to publish soundboard event '%s': %s",
             event_type,
@@ -789,3 +858,222 @@ def publish_soundboard_event(
         if _honker_required():
             raise
         return False
+
+
+def _soundboard_payload(
+    event_type: str,
+    data: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Build the ``{type, data}`` payload sent on ``soundboard_events``."""
+    payload: dict[str, Any] = {"type": event_type}
+    if data:
+        payload["data"] = data
+    return payload
+
+
+def _publish_soundboard_payloads(db_path: str, payloads: list[dict[str, Any]]) -> None:
+    """NOTIFY all payloads in one transaction, then append them to the stream.
+
+    The notification is the hot wake for SSE listeners; the stream copy lets
+    slow consumers replay.
+    """
+    conn = _get_honker_connection(db_path)
+    with conn.transaction() as tx:
+        for payload in payloads:
+            tx.notify("soundboard_events", payload)
+
+    stream = conn.stream("soundboard_events")
+    for payload in payloads:
+        stream.publish(payload)
+
+
+# ---------------------------------------------------------------------------
+# Batched soundboard publisher
+# ---------------------------------------------------------------------------
+
+# Event fields that keep two events of the same type apart when coalescing.
+# Everything else in ``data`` is taken from the latest event.
+_COALESCE_KEY_FIELDS = ("guild_id", "job_id", "reason")
+
+
+class SoundboardEventPublisher:
+    """Queue soundboard events and publish them in batches off the caller's thread.
+
+    Events with the same type and ``_COALESCE_KEY_FIELDS`` values that arrive
+    while an earlier one is still queued are merged into it (latest data wins,
+    ``data["coalesced"]`` counts the merged events).  A daemon thread waits
+    ``coalesce_window_seconds`` after the first queued event, then NOTIFYs
+    the whole batch in one transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        coalesce_window_seconds: float = 0.05,
+        max_pending: int = 1000,
+        publish_func: Callable[[str, list[dict[str, Any]]], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            db_path: Path to the SQLite database.
+            coalesce_window_seconds: How long the first queued event waits for
+                others to join its batch.
+            max_pending: Distinct queued events before new ones are dropped.
+            publish_func: Batch publisher (injectable for tests).
+        """
+        self.db_path = db_path
+        self.coalesce_window_seconds = max(0.0, coalesce_window_seconds)
+        self.max_pending = max(1, max_pending)
+        self._publish = publish_func or _publish_soundboard_payloads
+        self._pending: dict[tuple[str, ...], tuple[float, dict[str, Any]]] = {}
+        self._cond = threading.Condition()
+        self._in_flight = False
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self.pid = os.getpid()
+
+    def submit(self, event_type: str, data: dict[str, Any] | None = None) -> bool:
+        """Queue an event; returns False when it had to be dropped."""
+        data = dict(data or {})
+        key = (event_type,) + tuple(str(data.get(field, "")) for field in _COALESCE_KEY_FIELDS)
+        with self._cond:
+            if self._stopping:
+                SOUNDBOARD_EVENTS_DROPPED.inc(event_type=event_type, reason="stopped")
+                return False
+            queued = self._pending.get(key)
+            if queued is not None:
+                first_submitted, previous = queued
+                merged = int(previous.get("data", {}).get("coalesced", 1)) + 1
+                self._pending[key] = (
+                    first_submitted,
+                    _soundboard_payload(event_type, {**data, "coalesced": merged}),
+                )
+                SOUNDBOARD_EVENTS_COALESCED.inc(event_type=event_type)
+                return True
+            if len(self._pending) >= self.max_pending:
+                SOUNDBOARD_EVENTS_DROPPED.inc(event_type=event_type, reason="queue_full")
+                return False
+            self._pending[key] = (time.monotonic(), _soundboard_payload(event_type, data))
+            self._ensure_thread()
+            self._cond.notify()
+        return True
+
+    def _ensure_thread(self) -> None:
+        """Start the publisher thread on first use (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="honker-soundboard-publisher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Publisher thread body."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            if self.coalesce_window_seconds and not self._stopping:
+                time.sleep(self.coalesce_window_seconds)
+            with self._cond:
+                batch = list(self._pending.values())
+                self._pending.clear()
+                self._in_flight = True
+            try:
+                self._publish_batch(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = False
+                    self._cond.notify_all()
+
+    def _publish_batch(self, batch: list[tuple[float, dict[str, Any]]]) -> None:
+        """Publish one batch and record lag/failure metrics."""
+        payloads = [payload for _submitted, payload in batch]
+        started = time.perf_counter()
+        try:
+            self._publish(self.db_path, payloads)
+        except Exception as exc:
+            for payload in payloads:
+                SOUNDBOARD_PUBLISH_FAILURES.inc(event_type=payload["type"])
+            log = logger.error if _honker_required() else logger.warning
+            log(
+                "[Honker] Failed to publish %d soundboard event(s): %s",
+                len(payloads),
+                exc,
+            )
+            return
+        elapsed = time.perf_counter() - started
+        published_at = time.monotonic()
+        SOUNDBOARD_PUBLISH_BATCHES.inc()
+        for submitted, payload in batch:
+            SOUNDBOARD_PUBLISH_SECONDS.observe(elapsed, event_type=payload["type"])
+            SOUNDBOARD_PUBLISH_LAG_SECONDS.observe(
+                published_at - submitted, event_type=payload["type"]
+            )
+        if elapsed > 0.2:
+            logger.warning(
+                "[Honker] Slow soundboard publish batch size=%d duration=%.3fs",
+                len(payloads),
+                elapsed,
+            )
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until every queued event has been published (or failed)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Publish what is queued, then stop the thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+_soundboard_publishers: dict[str, SoundboardEventPublisher] = {}
+_soundboard_publishers_lock = threading.Lock()
+
+
+def get_soundboard_publisher(db_path: str) -> SoundboardEventPublisher:
+    """Return this process's publisher for *db_path*, creating it on first use.
+
+    Publishers created before a fork (e.g. in a Gunicorn master) are
+    replaced in the child, since their thread does not survive the fork.
+    """
+    with _soundboard_publishers_lock:
+        publisher = _soundboard_publishers.get(db_path)
+        if publisher is None or publisher.pid != os.getpid():
+            publisher = SoundboardEventPublisher(
+                db_path,
+                coalesce_window_seconds=_HONKER_PUBLISH_COALESCE_MS / 1000.0,
+                max_pending=_HONKER_PUBLISH_MAX_PENDING,
+            )
+            _soundboard_publishers[db_path] = publisher
+        return publisher
+
+
+def flush_soundboard_publishers(timeout: float = 1.0) -> None:
+    """Stop every publisher in this process after draining its queue."""
+    with _soundboard_publishers_lock:
+        publishers = [
+            publisher
+            for publisher in _soundboard_publishers.values()
+            if publisher.pid == os.getpid()
+        ]
+        _soundboard_publishers.clear()
+    for publisher in publishers:
+        publisher.stop(timeout=timeout)
+
+
+atexit.register(flush_soundboard_publishers)
@@ -0,0 +1,259 @@
+"""
+Pooled outbound HTTP sessions for provider APIs.
+
+Every provider call (ElevenLabs, Groq Whisper, the Ventura chat LLM,
+rlshop.gg) used to open its own ``aiohttp.ClientSession`` and pay DNS, TCP
+and TLS setup per request; a voice command chains three of them. The
+``OutboundHTTPClient`` keeps one long-lived session per provider on the
+running event loop, with:
+
+- a keep-alive connection pool whose size is the provider's concurrency
+  limit (extra requests queue for a free connection);
+- a DNS cache shared by the pool;
+- trace hooks recording time to first byte (response headers) and total
+  time until the response is released, plus request counts by status.
+
+Call sites borrow the session and pass their own per-request ``timeout``:
+
+    async with get_http_client().borrow("groq") as session:
+        async with session.post(url, data=form, timeout=timeout) as resp:
+            ...
+
+aiohttp speaks HTTP/1.1 only; connection reuse gives most of what HTTP/2
+multiplexing would for these low-concurrency request chains.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+import aiohttp
+
+from bot.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_TTFB = REGISTRY.histogram(
+    "outbound_http_ttfb_seconds",
+    "Time from sending a provider request to receiving its response headers.",
+    ("provider",),
+)
+OUTBOUND_TOTAL = REGISTRY.histogram(
+    "outbound_http_seconds",
+    "Time from sending a provider request to releasing its response.",
+    ("provider",),
+)
+OUTBOUND_REQUESTS = REGISTRY.counter(
+    "outbound_http_requests",
+    "Provider requests by status (or 'error' for transport failures).",
+    ("provider", "status"),
+)
+
+PROVIDER_ELEVENLABS = "elevenlabs"
+PROVIDER_GROQ = "groq"
+PROVIDER_CHAT_LLM = "chat_llm"
+PROVIDER_RLSHOP = "rlshop"
+
+# Concurrent connections allowed per provider; further requests wait for a
+# free pooled connection.
+DEFAULT_PROVIDER_LIMITS = {
+    PROVIDER_ELEVENLABS: 4,
+    PROVIDER_GROQ: 4,
+    PROVIDER_CHAT_LLM: 4,
+    PROVIDER_RLSHOP: 2,
+}
+
+
+class _TimedClientResponse(aiohttp.ClientResponse):
+    """Response that reports total request time when released."""
+
+    _outbound_provider: Optional[str] = None
+    _outbound_started: Optional[float] = None
+
+    def _record_total(self) -> None:
+        if self._outbound_started is not None:
+            OUTBOUND_TOTAL.observe(time.perf_counter() - self._outbound_started, provider=self._outbound_provider)
+            self._outbound_started = None
+
+    def release(self) -> Any:
+        self._record_total()
+        return super().release()
+
+    def close(self) -> None:
+        self._record_total()
+        super().close()
+
+
+def _trace_config(provider: str) -> aiohttp.TraceConfig:
+    """Build trace hooks that time requests for ``provider``."""
+
+    def _context(trace_request_ctx: Any) -> SimpleNamespace:
+        return SimpleNamespace(started=None)
+
+    async def on_request_start(_session, ctx, _params) -> None:
+        ctx.started = time.perf_counter()
+
+    async def on_request_end(_session, ctx, params) -> None:
+        OUTBOUND_REQUESTS.inc(provider=provider, status=str(params.response.status))
+        if ctx.started is None:
+            return
+        OUTBOUND_TTFB.observe(time.perf_counter() - ctx.started, provider=provider)
+        response = params.response
+        if isinstance(response, _TimedClientResponse):
+            response._outbound_provider = provider
+            response._outbound_started = ctx.started
+
+    async def on_request_exception(_session, _ctx, _params) -> None:
+        OUTBOUND_REQUESTS.inc(provider=provider, status="error")
+
+    config = aiohttp.TraceConfig(trace_config_ctx_factory=_context)
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_exception)
+    return config
+
+
+class OutboundHTTPClient:
+    """
+    Per-provider pooled ``aiohttp`` sessions bound to the running loop.
+
+    Args:
+        limits: Concurrent connections per provider.
+        default_limit: Limit for providers missing from ``limits``.
+        keepalive_seconds: How long idle pooled connections stay open.
+        dns_cache_seconds: How long resolved addresses are reused.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, int]] = None,
+        *,
+        default_limit: int = 8,
+        keepalive_seconds: float = 120.0,
+        dns_cache_seconds: int = 300,
+    ) -> None:
+        self.limits = dict(DEFAULT_PROVIDER_LIMITS if limits is None else limits)
+        self.default_limit = max(1, default_limit)
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_cache_seconds = dns_cache_seconds
+        self._sessions: dict[str, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+    @classmethod
+    def from_env(cls) -> "OutboundHTTPClient":
+        """Build the client from ``HTTP_CLIENT_*`` environment variables."""
+        try:
+            keepalive = float(os.getenv("HTTP_CLIENT_KEEPALIVE_SECONDS", "120"))
+        except ValueError:
+            keepalive = 120.0
+        limits = dict(DEFAULT_PROVIDER_LIMITS)
+        for provider in limits:
+            raw = os.getenv(f"HTTP_CLIENT_{provider.upper()}_MAX_CONNECTIONS")
+            if raw:
+                try:
+                    limits[provider] = max(1, int(raw))
+                except ValueError:
+                    logger.warning("[HTTPClient] Ignoring invalid connection limit for %s: %r", provider, raw)
+        return cls(limits, keepalive_seconds=keepalive)
+
+    def session(self, provider: str) -> aiohttp.ClientSession:
+        """
+        Return the pooled session for ``provider`` on the running loop.
+
+        A new session is created the first time, after ``close``, or when
+        the previous one belongs to another (e.g. finished) event loop; that
+        previous session is closed instead of being left to leak.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(provider)
+        if entry is not None:
+            owner, session = entry
+            if owner is loop and session.closed is False:
+                return session
+            del self._sessions[provider]
+            _discard_session(provider, owner, session)
+        session = self._new_session(provider)
+        self._sessions[provider] = (loop, session)
+        return session
+
+    def _new_session(self, provider: str) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limits.get(provider, self.default_limit),
+            keepalive_timeout=self.keepalive_seconds,
+            ttl_dns_cache=self.dns_cache_seconds,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[_trace_config(provider)],
+            response_class=_TimedClientResponse,
+        )
+
+    @contextlib.asynccontextmanager
+    async def borrow(self, provider: str) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the pooled session without closing it afterwards."""
+        yield self.session(provider)
+
+    @contextlib.asynccontextmanager
+    async def dedicated(self, provider: str) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Yield a session of its own that is closed on exit.
+
+        For short-lived event loops (``asyncio.run`` per call) where a pooled
+        session would outlive its loop.
+        """
+        session = self._new_session(provider)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def close(self) -> None:
+        """Close every session owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        for provider, (owner, session) in list(self._sessions.items()):
+            if owner is not loop:
+                continue
+            del self._sessions[provider]
+            try:
+                await session.close()
+            except Exception as exc:
+                logger.debug("[HTTPClient] Closing %s session failed: %s", provider, exc)
+
+
+def _discard_session(provider: str, owner: asyncio.AbstractEventLoop, session: aiohttp.ClientSession) -> None:
+    """Close a session that belongs to another event loop."""
+    if session.closed:
+        return
+    if owner.is_running() and not owner.is_closed():
+        asyncio.run_coroutine_threadsafe(session.close(), owner)
+        return
+    # The owning loop is gone: drop its pooled transports without awaiting.
+    connector = session.connector
+    session.detach()
+    if connector is not None:
+        try:
+            connector._close()
+        except Exception as exc:
+            logger.debug("[HTTPClient] Discarding %s session failed: %s", provider, exc)
+
+
+_client: Optional[OutboundHTTPClient] = None
+
+
+def get_http_client() -> OutboundHTTPClient:
+    """Return the process-wide outbound HTTP client."""
+    global _client
+    if _client is None:
+        _client = OutboundHTTPClient.from_env()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide client's sessions (bot shutdown)."""
+    if _client is not None:
+        await _client.close()
@@ -4,15 +4,17 @@ Service for generating images from HTML templates.
 Uses html2image to render HTML to PNG for Discord messages.
 """
 import base64
+import hashlib
 import io
 import os
 import re
-import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, Tuple
 
-import requests
+from bot.services.card_cache import ImageStore, RenderedCardCache
+from bot.services.card_raster import NativeSoundCardRenderer
+from bot.services.card_renderer import get_card_renderer_pool
 
 
 class ImageGeneratorService:
@@ -45,18 +47,27 @@ class ImageGeneratorService:
         self._sound_card_template = None
         self._rl_store_card_template = None
 
-        self._render_lock = threading.Lock()
-        self._driver = None
-        self._driver_init_attempted = False
+        self._renderer_pool = get_card_renderer_pool()
         self._request_headers = {"User-Agent": "Mozilla/5.0 (compatible; DiscordBot/1.0)"}
-        self._avatar_cache: Dict[str, Tuple[float, str]] = {}
-        self._avatar_cache_lock = threading.Lock()
-        self._avatar_cache_ttl_seconds = 300
-        self._avatar_cache_max_entries = 256
+        self._image_store = ImageStore.from_env(headers=self._request_headers)
+        self._rendered_cards = RenderedCardCache.from_env()
         self._download_pool = ThreadPoolExecutor(max_workers=4)
         self._card_image_scale = 0.75
 
         self._icons = self._build_encoded_icons()
+        self._native_renderer: Optional[NativeSoundCardRenderer] = None
+        if os.getenv("SOUND_CARD_RENDERER", "auto").strip().lower() != "html":
+            native_renderer = NativeSoundCardRenderer(self._icons)
+            if native_renderer.available():
+                self._native_renderer = native_renderer
+        self._card_cache_salt = hashlib.sha256(
+            "\0".join((
+                self._template_content,
+                self._rl_store_template_content,
+                "native" if self._native_renderer is not None else "html",
+                str(self._card_image_scale),
+            )).encode("utf-8")
+        ).hexdigest()
 
     def _load_template(self, path: str) -> str:
         """Load template text from disk."""
@@ -138,79 +149,14 @@ class ImageGeneratorService:
 
         return min(canvas_height, 1800)
 
-    def _measure_selector_capture_bounds(
-        self,
-        driver: Any,
-        selector: str,
-    ) -> Optional[Dict[str, float]]:
-        """Measure the selector and document size for stable screenshot capture."""
-        return driver.execute_script(
-            """
-            const el = document.querySelector(arguments[0]);
-            if (!el) return null;
-            const rect = el.getBoundingClientRect();
-            const doc = document.documentElement;
-            const body = document.body;
-            const documentHeight = Math.max(
-                rect.height,
-                el.scrollHeight || 0,
-                doc ? doc.scrollHeight || 0 : 0,
-                body ? body.scrollHeight || 0 : 0
-            );
-            const documentWidth = Math.max(
-                rect.width,
-                el.scrollWidth || 0,
-                doc ? doc.scrollWidth || 0 : 0,
-                body ? body.scrollWidth || 0 : 0
-            );
-            return {
-                x: Math.max(0, rect.x),
-                y: Math.max(0, rect.y),
-                width: Math.max(1, Math.ceil(rect.width)),
-                height: Math.max(1, Math.ceil(rect.height)),
-                requiredWidth: Math.max(1, Math.ceil(documentWidth + 32)),
-                requiredHeight: Math.max(1, Math.ceil(documentHeight + 40)),
-                viewportWidth: Math.max(1, window.innerWidth || 0),
-                viewportHeight: Math.max(1, window.innerHeight || 0),
-                scale: window.devicePixelRatio || 1
-            };
-            """,
-            selector,
-        )
-
     def _download_image_as_base64(self, url: str) -> Optional[str]:
-        """Download an image from URL and return base64, with short-lived cache."""
+        """Return an image as base64, served from the revalidating image store."""
         if not url:
             return None
-
-        now = time.time()
-        with self._avatar_cache_lock:
-            cached = self._avatar_cache.get(url)
-            if cached and cached[0] > now:
-                return cached[1]
-            if cached and cached[0] <= now:
-                del self._avatar_cache[url]
-
-        try:
-            response = requests.get(
-                url,
-                timeout=(1.0, 2.0),
-                headers=self._request_headers,
-            )
-            if response.status_code != 200 or not response.content:
-                print(f"[ImageGeneratorService] Download failed ({response.status_code}) from {url}")
-                return None
-
-            image_b64 = base64.b64encode(response.content).decode("utf-8")
-            with self._avatar_cache_lock:
-                if len(self._avatar_cache) >= self._avatar_cache_max_entries:
-                    oldest_key = next(iter(self._avatar_cache))
-                    del self._avatar_cache[oldest_key]
-                self._avatar_cache[url] = (now + self._avatar_cache_ttl_seconds, image_b64)
-            return image_b64
-        except Exception as e:
-            print(f"[ImageGeneratorService] Error downloading image from {url}: {e}")
+        image_bytes = self._image_store.get(url)
+        if image_bytes is None:
             return None
+        return base64.b64encode(image_bytes).decode("utf-8")
 
     def _download_images_parallel(
         self,
@@ -260,59 +206,6 @@ class ImageGeneratorService:
                 results[url] = None
         return results
 
-    def _get_driver(self):
-        """Get a persistent Selenium driver for fast repeated screenshots."""
-        if self._driver is not None:
-            return self._driver
-        if self._driver_init_attempted:
-            return None
-
-        with self._render_lock:
-            if self._driver is not None:
-                return self._driver
-            if self._driver_init_attempted:
-                return None
-
-            self._driver_init_attempted = True
-            try:
-                from selenium import webdriver
-                from selenium.webdriver.chrome.options import Options
-
-                options = Options()
-                options.add_argument("--headless=new")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-background-networking")
-                options.add_argument("--disable-features=Translate,BackForwardCache")
-                options.add_argument("--hide-scrollbars")
-                options.add_argument("--window-size=1200,1000")
-
-                self._driver = webdriver.Chrome(options=options)
-                self._driver.set_page_load_timeout(5)
-                # Keep compositor background transparent so rounded corners preserve alpha.
-                self._driver.execute_cdp_cmd("Page.enable", {})
-                self._driver.execute_cdp_cmd(
-                    "Emulation.setDefaultBackgroundColorOverride",
-                    {"color": {"r": 0, "g": 0, "b": 0, "a": 0}},
-                )
-            except Exception as e:
-                print(f"[ImageGeneratorService] Selenium renderer unavailable: {e}")
-                self._driver = None
-
-        return self._driver
-
-    def _invalidate_driver(self):
-        """Dispose the current Selenium driver after a renderer failure."""
-        with self._render_lock:
-            if self._driver is not None:
-                try:
-                    self._driver.quit()
-                except Exception:
-                    pass
-            self._driver = None
-            self._driver_init_attempted = False
-
     def _get_hti(self):
         """Lazy-load html2image instance."""
         if self._hti is None:
@@ -366,67 +259,8 @@ class ImageGeneratorService:
         size: Tuple[int, int],
         selector: Optional[str] = ".card",
     ) -> Optional[bytes]:
-        """Render HTML to PNG using a persistent Selenium browser session."""
-        driver = self._get_driver()
-        if driver is None:
-            return None
-
-        try:
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.webdriver.support.ui import WebDriverWait
-
-            with self._render_lock:
-                width, height = size
-                driver.set_window_size(max(900, width), max(640, height))
-                driver.get("about:blank")
-                driver.execute_script(
-                    "document.open();document.write(arguments[0]);document.close();",
-                    html_content,
-                )
-                driver.execute_script(
-                    "document.documentElement.style.background='transparent';"
-                    "document.body.style.background='transparent';"
-                )
-                WebDriverWait(driver, 2.0).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                if selector:
-                    WebDriverWait(driver, 2.0).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    clip = self._measure_selector_capture_bounds(driver, selector)
-                    if not clip:
-                        return None
-                    required_width = max(max(900, width), int(clip.get("requiredWidth", width)))
-                    required_height = max(max(640, height), int(clip.get("requiredHeight", height)))
-                    viewport_width = int(clip.get("viewportWidth", width))
-                    viewport_height = int(clip.get("viewportHeight", height))
-                    if required_width > viewport_width or required_height > viewport_height:
-                        driver.set_window_size(required_width, required_height)
-                        driver.execute_script("window.scrollTo(0, 0);")
-                        clip = self._measure_selector_capture_bounds(driver, selector)
-                        if not clip:
-                            return None
-                    result = driver.execute_cdp_cmd(
-                        "Page.captureScreenshot",
-                        {
-                            "format": "png",
-                            "omitBackground": True,
-                            "fromSurface": True,
-                            "clip": clip,
-                        },
-                    )
-                else:
-                    result = driver.execute_cdp_cmd(
-                        "Page.captureScreenshot",
-                        {"format": "png", "omitBackground": True, "fromSurface": True},
-                    )
-                return base64.b64decode(result["data"])
-        except Exception as e:
-            print(f"[ImageGeneratorService] Selenium render failed: {e}")
-            self._invalidate_driver()
-            return None
+        """Render HTML to PNG on a warm browser from the shared renderer pool."""
+        return self._renderer_pool.render(html_content, size=size, selector=selector)
 
     def _screenshot_with_html2image(
         self,
@@ -717,6 +551,18 @@ class ImageGeneratorService:
                 "request_note": request_note,
             }
 
+            cache_key = self._rendered_cards.key("sound", data, self._card_cache_salt)
+            cached = self._rendered_cards.get("sound", cache_key)
+            if cached is not None:
+                return cached
+
+            if self._native_renderer is not None:
+                rendered = self._native_renderer.render(data)
+                if rendered is not None:
+                    card = self._scale_png_bytes(rendered, scale=self._card_image_scale)
+                    self._rendered_cards.put(cache_key, card)
+                    return card
+
             html_content = self._render_template(self._template_content, data)
 
             canvas_height = self._estimate_sound_card_canvas_height(
@@ -731,7 +577,9 @@ class ImageGeneratorService:
                 size=(900, canvas_height),
                 selector=".card",
             )
-            return self._scale_png_bytes(rendered, scale=self._card_image_scale)
+            card = self._scale_png_bytes(rendered, scale=self._card_image_scale)
+            self._rendered_cards.put(cache_key, card)
+            return card
 
         except Exception as e:
             print(f"[ImageGeneratorService] Error generating sound card: {e}")
@@ -757,6 +605,11 @@ class ImageGeneratorService:
             render_data["accent_rgb"] = self._hex_to_rgb(render_data["accent_color"])
             render_data["grid_columns"] = max(1, int(card_data.get("grid_columns") or 5))
 
+            cache_key = self._rendered_cards.key("rl_store", render_data, self._card_cache_salt)
+            cached = self._rendered_cards.get("rl_store", cache_key)
+            if cached is not None:
+                return cached
+
             html_content = self._render_template(self._rl_store_template_content, render_data)
 
             rendered = self._render_html_to_png(
@@ -764,7 +617,9 @@ class ImageGeneratorService:
                 size=(1500, min(self._estimate_rl_store_canvas_height(len(tiles), render_data["grid_columns"]), 2600)),
                 selector=".store-board",
             )
-            return self._scale_png_bytes(rendered, scale=self._card_image_scale)
+            card = self._scale_png_bytes(rendered, scale=self._card_image_scale)
+            self._rendered_cards.put(cache_key, card)
+            return card
 
         except Exception as e:
             print(f"[ImageGeneratorService] Error generating RL store card: {e}")
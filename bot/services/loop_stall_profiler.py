@@ -0,0 +1,304 @@
+"""
+Event-loop stall profiler for the bot process.
+
+``BackgroundService.performance_telemetry_loop`` can only report *that* the
+loop lagged. This watchdog records *what* blocked it: the event loop bumps a
+heartbeat every ``heartbeat_interval_seconds``, and a daemon thread samples
+the loop thread's stack with ``sys._current_frames()`` while the heartbeat is
+late. When the loop catches up, the stall's samples are folded
+(``frame;frame;frame count``) and appended to
+``data/loop_stalls/stalls-YYYYMMDD.folded``, a format flamegraph.pl,
+inferno and speedscope read directly.
+
+The first frame of every folded line is a tag built from the playbacks that
+were active when the stall started (``playing:<file>`` or ``idle``), so
+playback-time stalls can be viewed separately from idle ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+FOLDED_FILE_PREFIX = "stalls-"
+FOLDED_FILE_SUFFIX = ".folded"
+
+
+@dataclass
+class LoopStall:
+    """One period during which the event loop missed its heartbeat."""
+
+    started_at: float
+    tag: str
+    duration_seconds: float = 0.0
+    samples: Counter[str] = field(default_factory=Counter)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-safe summary with the hottest stack."""
+        top_stack, top_count = (
+            self.samples.most_common(1)[0] if self.samples else ("", 0)
+        )
+        return {
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_seconds * 1000.0, 1),
+            "tag": self.tag,
+            "sample_count": sum(self.samples.values()),
+            "top_stack": top_stack,
+            "top_stack_samples": top_count,
+        }
+
+
+def fold_stack(frame: Optional[FrameType], max_depth: int = 64) -> str:
+    """
+    Return a root-to-leaf ``name (file:line)`` stack joined with ``;``.
+
+    Args:
+        frame: Innermost frame of the sampled thread.
+        max_depth: Maximum number of frames kept (innermost first).
+    """
+    frames: list[str] = []
+    while frame is not None and len(frames) < max_depth:
+        code = frame.f_code
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        frames.append(label.replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def playback_tag(playbacks: list[dict[str, Any]]) -> str:
+    """Build the root tag for a stall from active playback diagnostics."""
+    files = sorted(
+        {
+            os.path.basename(str(playback.get("audio_file") or "unknown"))
+            for playback in playbacks
+        }
+    )
+    if not files:
+        return "idle"
+    return "playing:" + ",".join(files).replace(";", ":").replace(" ", "_")
+
+
+class EventLoopStallProfiler:
+    """
+    Heartbeat watchdog that stack-samples the event-loop thread during stalls.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | os.PathLike[str],
+        *,
+        threshold_seconds: float = 0.25,
+        heartbeat_interval_seconds: float = 0.05,
+        sample_interval_seconds: float = 0.1,
+        context_func: Optional[Callable[[], list[dict[str, Any]]]] = None,
+        retention_days: int = 7,
+        max_stack_depth: int = 64,
+        recent_limit: int = 20,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the profiler; nothing runs until ``start``.
+
+        Args:
+            output_dir: Directory for daily ``.folded`` files.
+            threshold_seconds: Heartbeat lateness that counts as a stall.
+            heartbeat_interval_seconds: How often the loop bumps its heartbeat.
+            sample_interval_seconds: Sampling period while a stall is open; a
+                healthy loop is only checked when its heartbeat could next be
+                late, and never more often than this.
+            context_func: Returns active playbacks (``_collect_active_audio_playbacks``).
+            retention_days: Number of daily folded files kept.
+            max_stack_depth: Frames kept per sample.
+            recent_limit: Stall summaries kept in memory.
+            time_func: Monotonic clock (injectable for tests).
+        """
+        self.output_dir = Path(output_dir)
+        self.threshold_seconds = threshold_seconds
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        self.sample_interval_seconds = sample_interval_seconds
+        self._context_func = context_func
+        self.retention_days = max(1, retention_days)
+        self.max_stack_depth = max_stack_depth
+        self._time = time_func
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat_handle: asyncio.TimerHandle | None = None
+        self._last_beat = 0.0
+        self._current: LoopStall | None = None
+        self._recent: deque[LoopStall] = deque(maxlen=recent_limit)
+        self._stall_count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """
+        Start the heartbeat and watchdog thread.
+
+        Must be called from the event-loop thread.
+
+        Args:
+            loop: Event loop to watch (defaults to the running loop).
+        """
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = self._time()
+        self._stop_event.clear()
+        self._heartbeat_handle = self._loop.call_later(
+            self.heartbeat_interval_seconds, self._beat
+        )
+        self._thread = threading.Thread(
+            target=self._watch,
+            name="loop-stall-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and flush a stall that is still open."""
+        self._stop_event.set()
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._finish_stall(self._time())
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _beat(self) -> None:
+        """Event-loop callback: record liveness and reschedule."""
+        self._last_beat = self._time()
+        if self._loop is not None and not self._stop_event.is_set():
+            self._heartbeat_handle = self._loop.call_later(
+                self.heartbeat_interval_seconds, self._beat
+            )
+
+    def _watch(self) -> None:
+        """Watchdog thread body."""
+        while not self._stop_event.wait(self._next_wait()):
+            try:
+                self.poll()
+            except Exception as exc:
+                logger.debug("[LoopStallProfiler] Sampling failed: %s", exc)
+
+    def _next_wait(self, now: float | None = None) -> float:
+        """Return how long the watchdog sleeps before its next poll."""
+        if self._current is not None:
+            return self.sample_interval_seconds
+        now = self._time() if now is None else now
+        stall_due = self._last_beat + self.heartbeat_interval_seconds + self.threshold_seconds
+        return max(self.sample_interval_seconds, stall_due - now)
+
+    def poll(self, now: float | None = None) -> None:
+        """
+        Run one watchdog step: sample the loop thread while it is late.
+
+        Args:
+            now: Current monotonic time (defaults to ``time_func``).
+        """
+        now = self._time() if now is None else now
+        lateness = now - self._last_beat - self.heartbeat_interval_seconds
+        if lateness < self.threshold_seconds:
+            if self._current is not None:
+                self._finish_stall(now)
+            return
+
+        if self._current is None:
+            self._current = LoopStall(
+                started_at=time.time() - lateness,
+                tag=self._build_tag(),
+            )
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is not None:
+            self._current.samples[fold_stack(frame, self.max_stack_depth)] += 1
+        self._current.duration_seconds = lateness
+
+    def _build_tag(self) -> str:
+        """Tag a new stall with active playbacks, tolerating racing state."""
+        if self._context_func is None:
+            return "idle"
+        try:
+            return playback_tag(self._context_func() or [])
+        except Exception:
+            return "unknown"
+
+    def _finish_stall(self, now: float) -> None:
+        """Close the current stall, log it and append its folded stacks."""
+        stall = self._current
+        self._current = None
+        if stall is None:
+            return
+        with self._lock:
+            self._recent.append(stall)
+            self._stall_count += 1
+        summary = stall.to_dict()
+        logger.warning(
+            "[LoopStallProfiler] Event loop stalled %.1fms tag=%s samples=%d top=%s",
+            summary["duration_ms"],
+            stall.tag,
+            summary["sample_count"],
+            ";".join(summary["top_stack"].split(";")[-3:]) or "-",
+        )
+        try:
+            self._write_folded(stall)
+        except OSError as exc:
+            logger.warning("[LoopStallProfiler] Could not write folded stacks: %s", exc)
+
+    def _write_folded(self, stall: LoopStall) -> None:
+        """Append a stall's samples to today's folded file and prune old ones."""
+        if not stall.samples:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        day = datetime.fromtimestamp(stall.started_at)
+        path = self.output_dir / f"{FOLDED_FILE_PREFIX}{day:%Y%m%d}{FOLDED_FILE_SUFFIX}"
+        with open(path, "a", encoding="utf-8") as f:
+            for stack, count in stall.samples.items():
+                f.write(f"{stall.tag};{stack} {count}\n")
+
+        cutoff = f"{FOLDED_FILE_PREFIX}{day - timedelta(days=self.retention_days):%Y%m%d}"
+        for old in self.output_dir.glob(f"{FOLDED_FILE_PREFIX}*{FOLDED_FILE_SUFFIX}"):
+            if old.stem < cutoff:
+                old.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """Return stall counters and the most recent stall summaries."""
+        with self._lock:
+            recent = [stall.to_dict() for stall in self._recent]
+            count = self._stall_count
+        return {
+            "running": self.running,
+            "stall_count": count,
+            "recent_stalls": recent,
+        }
@@ -0,0 +1,569 @@
+"""
+Single-decode loudness normalization for TTS output and ingested sounds.
+
+The engine decodes a file once to float PCM through an ffmpeg pipe, then does
+all analysis and processing in NumPy:
+
+- loudness is either RMS dBFS (pydub's ``dBFS``, used by ingest targets) or
+  an EBU R128 / ITU-R BS.1770 approximation: K-weighting applied per 100 ms
+  segment in the frequency domain, 400 ms blocks with 75% overlap, absolute
+  (-70 LUFS) and relative (-10 LU) gating;
+- an optional feed-forward compressor (RMS detector, attack/release
+  smoothing) replaces pydub's pure-Python ``compress_dynamic_range``;
+- gain is limited so the sample peak stays under the ceiling.
+
+The result is encoded once by piping PCM back into ffmpeg in chunks. The
+decoded file is held in memory as float32: gated loudness is only known
+after the whole file has been measured, and streaming would mean a second
+decode. Callers go through ``get_loudness_normalizer()``, which runs jobs in
+a small spawn-context process pool so long imports do not hold the GIL of
+the bot process. Workers import only this module, NumPy and ``bot.metrics``
+(the ``bot`` packages load their exports lazily). Async callers wrap
+``normalize`` in ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import math
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from bot.metrics import REGISTRY
+
+LOUDNESS_SECONDS = REGISTRY.histogram(
+    "loudness_normalize_seconds",
+    "Wall time of one loudness normalization job, including pool wait.",
+    ("source",),
+)
+LOUDNESS_RESULTS = REGISTRY.counter(
+    "loudness_normalize_results",
+    "Loudness normalization jobs by outcome (normalized/unchanged/failed).",
+    ("source", "result"),
+)
+
+SEGMENT_SECONDS = 0.1
+BLOCK_SEGMENTS = 4
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+SILENCE_DBFS = -90.0
+_FFT_CHUNK_SEGMENTS = 600
+ENCODE_CHUNK_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class LoudnessTarget:
+    """
+    What a normalization job should aim for.
+
+    Attributes:
+        level: Target level in LUFS (``measure="lufs"``) or dBFS (``"rms"``).
+        measure: ``"lufs"`` for gated K-weighted loudness, ``"rms"`` for dBFS.
+        peak_ceiling_dbfs: Maximum sample peak after processing.
+        compress_threshold_dbfs: Compressor threshold, or ``None`` to skip it.
+        compress_ratio: Compressor ratio (>= 1).
+        attack_ms: Compressor attack.
+        release_ms: Compressor release.
+        min_gain_change_db: Leave the file untouched when no compression ran
+            and the gain change is smaller than this.
+    """
+
+    level: float
+    measure: str = "lufs"
+    peak_ceiling_dbfs: float = -1.0
+    compress_threshold_dbfs: Optional[float] = None
+    compress_ratio: float = 1.0
+    attack_ms: float = 5.0
+    release_ms: float = 80.0
+    min_gain_change_db: float = 0.0
+
+
+@dataclass(frozen=True)
+class NormalizationReport:
+    """Measurements from one processed file."""
+
+    input_level: float
+    output_level: float
+    peak_dbfs: float
+    gain_db: float
+    compressed: bool
+
+
+def ingest_target(
+    target_dbfs: float,
+    *,
+    peak_ceiling_dbfs: float,
+    compression_enabled: bool,
+    compression_threshold_dbfs: float,
+    compression_ratio: float,
+) -> LoudnessTarget:
+    """Build the RMS target used for uploaded, scraped and downloaded sounds."""
+    return LoudnessTarget(
+        level=target_dbfs,
+        measure="rms",
+        peak_ceiling_dbfs=peak_ceiling_dbfs,
+        compress_threshold_dbfs=compression_threshold_dbfs if compression_enabled else None,
+        compress_ratio=max(1.0, compression_ratio),
+        min_gain_change_db=0.25,
+    )
+
+
+def ingest_target_from_env(target_dbfs: float) -> LoudnessTarget:
+    """Build the ingest target from ``SOUND_INGEST_*`` environment variables."""
+    return ingest_target(
+        target_dbfs,
+        peak_ceiling_dbfs=float(os.getenv("SOUND_INGEST_PEAK_CEILING_DBFS", "-2.0")),
+        compression_enabled=(
+            os.getenv("SOUND_INGEST_COMPRESS_ENABLED", "true").strip().lower()
+            not in {"0", "false", "off", "no"}
+        ),
+        compression_threshold_dbfs=float(os.getenv("SOUND_INGEST_COMPRESS_THRESHOLD_DBFS", "-14.0")),
+        compression_ratio=float(os.getenv("SOUND_INGEST_COMPRESS_RATIO", "6.0")),
+    )
+
+
+def safe_gain(current_dbfs: float, peak_dbfs: float, target_dbfs: float, peak_ceiling_dbfs: float) -> float:
+    """Return gain that targets loudness without exceeding the peak ceiling."""
+    desired_gain = target_dbfs - current_dbfs
+    if not math.isfinite(peak_dbfs):
+        return desired_gain
+    return min(desired_gain, peak_ceiling_dbfs - peak_dbfs)
+
+
+def _to_db(power: float, offset: float = 0.0) -> float:
+    return offset + 10.0 * math.log10(power) if power > 0 else float("-inf")
+
+
+def rms_dbfs(samples: np.ndarray) -> float:
+    """Return RMS level over all channels, like pydub's ``dBFS``."""
+    if samples.size == 0:
+        return float("-inf")
+    return _to_db(float(np.mean(np.square(samples, dtype=np.float64))))
+
+
+def peak_dbfs(samples: np.ndarray) -> float:
+    """Return the sample peak in dBFS."""
+    if samples.size == 0:
+        return float("-inf")
+    peak = float(np.max(np.abs(samples)))
+    return 20.0 * math.log10(peak) if peak > 0 else float("-inf")
+
+
+def _biquad_power(b: tuple[float, float, float], a: tuple[float, float, float], w: np.ndarray) -> np.ndarray:
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    response = (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+    return np.abs(response) ** 2
+
+
+def k_weighting_power(seglen: int, sample_rate: int) -> np.ndarray:
+    """
+    Return the squared BS.1770 K-weighting response at ``rfft`` bin centres.
+
+    Uses the sample-rate independent design (4 dB high shelf at 1.5 kHz,
+    second-order high-pass at 38 Hz).
+    """
+    w = 2.0 * np.pi * np.fft.rfftfreq(seglen, d=1.0 / sample_rate) / sample_rate
+
+    w0 = 2.0 * math.pi * 1500.0 / sample_rate
+    amp = 10.0 ** (4.0 / 40.0)
+    alpha = math.sin(w0) / (2.0 * (1.0 / math.sqrt(2.0)))
+    cos_w0, sqrt_amp = math.cos(w0), math.sqrt(amp)
+    shelf = _biquad_power(
+        (
+            amp * ((amp + 1) + (amp - 1) * cos_w0 + 2 * sqrt_amp * alpha),
+            -2 * amp * ((amp - 1) + (amp + 1) * cos_w0),
+            amp * ((amp + 1) + (amp - 1) * cos_w0 - 2 * sqrt_amp * alpha),
+        ),
+        (
+            (amp + 1) - (amp - 1) * cos_w0 + 2 * sqrt_amp * alpha,
+            2 * ((amp - 1) - (amp + 1) * cos_w0),
+            (amp + 1) - (amp - 1) * cos_w0 - 2 * sqrt_amp * alpha,
+        ),
+        w,
+    )
+
+    w0 = 2.0 * math.pi * 38.0 / sample_rate
+    alpha, cos_w0 = math.sin(w0) / (2.0 * 0.5), math.cos(w0)
+    highpass = _biquad_power(
+        ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2),
+        (1 + alpha, -2 * cos_w0, 1 - alpha),
+        w,
+    )
+    return shelf * highpass
+
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """
+    Return gated integrated loudness in LUFS (BS.1770 approximation).
+
+    Args:
+        samples: ``(frames, channels)`` float PCM in [-1, 1].
+        sample_rate: Sample rate in Hz.
+    """
+    frames, channels = samples.shape
+    seglen = max(1, int(sample_rate * SEGMENT_SECONDS))
+    segments = frames // seglen
+    if segments == 0:
+        seglen, segments = frames, 1
+    if seglen == 0:
+        return float("-inf")
+
+    weights = k_weighting_power(seglen, sample_rate)
+    # Parseval for a one-sided spectrum: inner bins stand for two.
+    weights[1 : (seglen + 1) // 2] *= 2.0
+    weights /= float(seglen) * seglen
+
+    usable = samples[: segments * seglen].reshape(segments, seglen, channels)
+    mean_square = np.empty((segments, channels))
+    for start in range(0, segments, _FFT_CHUNK_SEGMENTS):
+        spectrum = np.fft.rfft(usable[start : start + _FFT_CHUNK_SEGMENTS], axis=1)
+        power = spectrum.real**2 + spectrum.imag**2
+        mean_square[start : start + _FFT_CHUNK_SEGMENTS] = np.einsum("sfc,f->sc", power, weights)
+
+    # 400 ms blocks with 100 ms hop are running means of four segments.
+    span = min(BLOCK_SEGMENTS, segments)
+    cumulative = np.concatenate([np.zeros((1, channels)), np.cumsum(mean_square, axis=0)])
+    blocks = (cumulative[span:] - cumulative[:-span]) / span
+    block_power = blocks.sum(axis=1)
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10.0 * np.log10(block_power)
+
+    gated = block_power[block_loudness > ABSOLUTE_GATE_LUFS]
+    if gated.size == 0:
+        return float("-inf")
+    relative_gate = _to_db(float(gated.mean()), -0.691) + RELATIVE_GATE_LU
+    gated = block_power[block_loudness > max(relative_gate, ABSOLUTE_GATE_LUFS)]
+    return _to_db(float(gated.mean()), -0.691) if gated.size else float("-inf")
+
+
+def measure_level(samples: np.ndarray, sample_rate: int, measure: str) -> float:
+    """Return the level of ``samples`` in the unit of ``measure``."""
+    if measure == "lufs":
+        return integrated_loudness(samples, sample_rate)
+    if measure == "rms":
+        return rms_dbfs(samples)
+    raise ValueError(f"Unknown loudness measure: {measure}")
+
+
+def compress(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_dbfs: float,
+    ratio: float,
+    attack_ms: float = 5.0,
+    release_ms: float = 80.0,
+) -> np.ndarray:
+    """
+    Apply feed-forward downward compression.
+
+    The detector is the RMS of ``attack_ms`` frames across channels. Gain
+    reduction is held for ``release_ms`` (sliding maximum), smoothed over
+    one attack frame each side and interpolated to per-sample gain.
+    """
+    if ratio <= 1.0 or samples.size == 0:
+        return samples
+    frames = samples.shape[0]
+    hop = max(1, int(sample_rate * attack_ms / 1000.0))
+    count = -(-frames // hop)
+    padded = np.zeros((count * hop, samples.shape[1]), dtype=samples.dtype)
+    padded[:frames] = samples
+    frame_power = np.mean(np.square(padded.reshape(count, -1), dtype=np.float64), axis=1)
+    with np.errstate(divide="ignore"):
+        level_db = 10.0 * np.log10(frame_power)
+    reduction = np.maximum(level_db - threshold_dbfs, 0.0) * (1.0 - 1.0 / ratio)
+
+    hold = max(1, int(round(release_ms / attack_ms)))
+    if hold > 1:
+        reduction = np.lib.stride_tricks.sliding_window_view(
+            np.concatenate([np.zeros(hold - 1), reduction]), hold
+        ).max(axis=1)
+    reduction = np.convolve(np.pad(reduction, 1, mode="edge"), np.full(3, 1.0 / 3.0), mode="valid")
+
+    centres = (np.arange(count) + 0.5) * hop
+    gain_db = np.interp(np.arange(frames), centres, reduction)
+    gain = np.power(10.0, -gain_db / 20.0).astype(samples.dtype)
+    return samples * gain[:, None]
+
+
+def process(
+    samples: np.ndarray,
+    sample_rate: int,
+    target: LoudnessTarget,
+) -> Optional[tuple[np.ndarray, NormalizationReport]]:
+    """
+    Compress, gain and peak-limit PCM towards ``target``.
+
+    Returns:
+        ``(samples, report)``, or ``None`` when the audio is silent or the
+        change would be inaudible.
+    """
+    if rms_dbfs(samples) <= SILENCE_DBFS:
+        return None
+    input_level = measure_level(samples, sample_rate, target.measure)
+
+    working = samples
+    compressed = target.compress_threshold_dbfs is not None and target.compress_ratio > 1.0
+    if compressed:
+        working = compress(
+            working,
+            sample_rate,
+            target.compress_threshold_dbfs,
+            target.compress_ratio,
+            target.attack_ms,
+            target.release_ms,
+        )
+
+    level = measure_level(working, sample_rate, target.measure)
+    if not math.isfinite(level):
+        return None
+    peak = peak_dbfs(working)
+    gain = safe_gain(level, peak, target.level, target.peak_ceiling_dbfs)
+    if abs(gain) < target.min_gain_change_db and not compressed:
+        return None
+
+    # The one output copy; further scaling happens in place.
+    output = working * np.float32(10.0 ** (gain / 20.0))
+    final_peak = peak_dbfs(output)
+    if math.isfinite(final_peak) and final_peak > target.peak_ceiling_dbfs:
+        output *= np.float32(10.0 ** ((target.peak_ceiling_dbfs - final_peak) / 20.0))
+    report = NormalizationReport(
+        input_level=input_level,
+        output_level=measure_level(output, sample_rate, target.measure),
+        peak_dbfs=peak_dbfs(output),
+        gain_db=gain,
+        compressed=compressed,
+    )
+    return output, report
+
+
+def _probe_format(path: str) -> tuple[int, int]:
+    """Return ``(sample_rate, channels)`` from the file header."""
+    try:
+        import mutagen
+
+        info = mutagen.File(path).info
+        return int(info.sample_rate), max(1, min(2, int(info.channels)))
+    except Exception:
+        return 44100, 2
+
+
+def decode_pcm(path: str, ffmpeg: str = "ffmpeg") -> tuple[np.ndarray, int]:
+    """
+    Decode ``path`` to ``(frames, channels)`` float32 PCM with one ffmpeg run.
+
+    Returns:
+        ``(samples, sample_rate)``.
+    """
+    sample_rate, channels = _probe_format(path)
+    result = subprocess.run(
+        [
+            ffmpeg, "-hide_banner", "-nostats", "-v", "error",
+            "-i", path,
+            "-f", "f32le", "-acodec", "pcm_f32le",
+            "-ac", str(channels), "-ar", str(sample_rate),
+            "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr.decode('utf-8', errors='ignore')[-300:]}")
+    samples = np.frombuffer(result.stdout, dtype="<f4")
+    samples = samples[: samples.size - samples.size % channels]
+    return samples.reshape(-1, channels), sample_rate
+
+
+def encode_mp3(
+    samples: np.ndarray,
+    sample_rate: int,
+    path: str,
+    ffmpeg: str = "ffmpeg",
+    bitrate: str = "128k",
+) -> None:
+    """
+    Encode PCM to MP3 at ``path`` through a pipe, replacing it atomically.
+
+    Samples are clipped and written in ``ENCODE_CHUNK_SECONDS`` chunks, so no
+    second full-length copy of the PCM is built for ffmpeg's stdin.
+    """
+    tmp_path = os.path.join(os.path.dirname(path) or ".", f".{os.path.basename(path)}.loudness.tmp.mp3")
+    chunk_frames = max(1, int(sample_rate * ENCODE_CHUNK_SECONDS))
+    try:
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(
+                [
+                    ffmpeg, "-hide_banner", "-nostats", "-v", "error", "-y",
+                    "-f", "f32le", "-ar", str(sample_rate), "-ac", str(samples.shape[1]),
+                    "-i", "pipe:0",
+                    "-b:a", bitrate, "-f", "mp3",
+                    tmp_path,
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+            )
+            try:
+                for start in range(0, samples.shape[0], chunk_frames):
+                    chunk = np.clip(samples[start : start + chunk_frames], -1.0, 1.0)
+                    proc.stdin.write(np.ascontiguousarray(chunk, dtype="<f4").data)
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its return code explains why.
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+            returncode = proc.wait()
+            if returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg encode failed: {stderr.read().decode('utf-8', errors='ignore')[-300:]}")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def normalize_file(
+    path: str,
+    target: LoudnessTarget,
+    ffmpeg: str = "ffmpeg",
+    bitrate: str = "128k",
+) -> Optional[NormalizationReport]:
+    """
+    Normalize an audio file in place: one decode, NumPy processing, one encode.
+
+    Module-level so it can run in a process pool.
+
+    Returns:
+        The report, or ``None`` when the file was left untouched.
+    """
+    samples, sample_rate = decode_pcm(path, ffmpeg)
+    processed = process(samples, sample_rate, target)
+    if processed is None:
+        return None
+    output, report = processed
+    encode_mp3(output, sample_rate, path, ffmpeg, bitrate)
+    return report
+
+
+class LoudnessNormalizer:
+    """
+    Runs ``normalize_file`` jobs in a shared spawn-context process pool.
+
+    Args:
+        max_workers: Pool size; ``0`` runs jobs in the calling thread.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max(0, max_workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LoudnessNormalizer":
+        """Build the normalizer from ``LOUDNESS_WORKERS``."""
+        try:
+            workers = int(os.getenv("LOUDNESS_WORKERS", "2"))
+        except ValueError:
+            workers = 2
+        return cls(workers)
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers == 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except OSError as e:
+                    print(f"[Loudness] Process pool unavailable, normalizing in-thread: {e}")
+                    self.max_workers = 0
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def normalize(
+        self,
+        path: str,
+        target: LoudnessTarget,
+        *,
+        source: str,
+        ffmpeg: str = "ffmpeg",
+        bitrate: str = "128k",
+    ) -> Optional[NormalizationReport]:
+        """
+        Normalize ``path`` in place, blocking until the job finishes.
+
+        Call from a worker thread (or a sync context) - never directly on the
+        event loop.
+
+        Args:
+            path: Audio file to rewrite.
+            target: Loudness target.
+            source: Metrics label (``tts``, ``ingest``, ``scrape``).
+            ffmpeg: ffmpeg executable.
+            bitrate: MP3 output bitrate.
+
+        Raises:
+            Exception: Decode/encode failures, after counting them.
+        """
+        started = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            report = None
+            if pool is not None:
+                try:
+                    report = pool.submit(normalize_file, path, target, ffmpeg, bitrate).result()
+                except BrokenProcessPool as e:
+                    print(f"[Loudness] Process pool broke, retrying in-thread: {e}")
+                    self._discard_pool(pool)
+                    pool = None
+            if pool is None:
+                report = normalize_file(path, target, ffmpeg, bitrate)
+        except Exception:
+            LOUDNESS_RESULTS.inc(source=source, result="failed")
+            raise
+        finally:
+            LOUDNESS_SECONDS.observe(time.perf_counter() - started, source=source)
+        LOUDNESS_RESULTS.inc(source=source, result="unchanged" if report is None else "normalized")
+        return report
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_normalizer: Optional[LoudnessNormalizer] = None
+_normalizer_lock = threading.Lock()
+
+
+def get_loudness_normalizer() -> LoudnessNormalizer:
+    """Return the process-wide normalizer."""
+    global _normalizer
+    with _normalizer_lock:
+        if _normalizer is None:
+            _normalizer = LoudnessNormalizer.from_env()
+            atexit.register(_normalizer.shutdown)
+        return _normalizer
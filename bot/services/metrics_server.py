@@ -0,0 +1,89 @@
+"""
+Optional bot-side HTTP endpoint that serves the metrics registry.
+
+Disabled unless ``BOT_METRICS_PORT`` is set. Binds to ``127.0.0.1`` by
+default (``BOT_METRICS_HOST``) so only a local scraper or sidecar can reach
+it; the web ``/metrics`` route is the normal way to scrape both processes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from aiohttp import web
+
+from bot.metrics import OPENMETRICS_CONTENT_TYPE, REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsHttpServer:
+    """
+    Tiny aiohttp server exposing ``GET /metrics`` on the bot event loop.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        registry: MetricsRegistry = REGISTRY,
+        prefix: str = "bot_",
+    ) -> None:
+        """
+        Args:
+            host: Interface to bind.
+            port: TCP port (``0`` picks a free port, mainly for tests).
+            registry: Registry to render.
+            prefix: Metric name prefix.
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.prefix = prefix
+        self._runner: web.AppRunner | None = None
+
+    @classmethod
+    def from_env(cls) -> "MetricsHttpServer | None":
+        """Build a server from ``BOT_METRICS_HOST``/``BOT_METRICS_PORT``, or None."""
+        raw_port = os.getenv("BOT_METRICS_PORT", "").strip()
+        if not raw_port:
+            return None
+        try:
+            port = int(raw_port)
+        except ValueError:
+            logger.warning("[Metrics] Invalid BOT_METRICS_PORT=%r; endpoint disabled", raw_port)
+            return None
+        host = os.getenv("BOT_METRICS_HOST", "127.0.0.1").strip() or "127.0.0.1"
+        return cls(host=host, port=port)
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        """Render the registry."""
+        response = web.Response(text=self.registry.render(self.prefix))
+        response.headers["Content-Type"] = OPENMETRICS_CONTENT_TYPE
+        return response
+
+    async def start(self) -> int:
+        """
+        Start listening.
+
+        Returns:
+            The bound port.
+        """
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        sockets = getattr(site._server, "sockets", None) or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info("[Metrics] Serving bot metrics on http://%s:%s/metrics", self.host, self.port)
+        return self.port
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
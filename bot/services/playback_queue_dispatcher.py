@@ -0,0 +1,434 @@
+"""
+Per-guild dispatcher for web playback-queue requests.
+
+The bot used to drain ``playback_queue`` under one global lock: every tick
+re-ran the identity-column PRAGMA checks, scanned all unplayed rows through
+the shared cursor on the event-loop thread and processed them one after the
+other, so a slow voice connect in one guild delayed button presses in every
+other guild.
+
+``PlaybackQueueDispatcher`` instead:
+
+- ensures the schema once (``claimed_at`` column and a partial index over
+  unplayed rows);
+- claims pending rows atomically with ``UPDATE ... RETURNING`` on its own
+  connection in a worker thread, so several consumers never run the same
+  request twice and the event loop never blocks on SQLite;
+- hands rows to one worker task per guild, preserving request order within a
+  guild while guilds proceed independently;
+- coalesces rapid repeats of idempotent control requests (latest wins);
+- records queue-to-start latency for each request.
+
+Rows claimed by a process that died are reclaimed after
+``stale_claim_seconds``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from bot.metrics import REGISTRY
+from bot.services.web_playback import (
+    WEB_QUEUE_MUTE_30_MINUTES,
+    WEB_QUEUE_PLAY_SOUND,
+    WEB_QUEUE_SLAP,
+    _ensure_playback_queue_identity_columns,
+)
+
+PLAYBACK_QUEUE_UNPLAYED_INDEX = "idx_playback_queue_unplayed"
+
+# Control requests where only the latest pending one per guild matters.
+# ``toggle_mute`` is excluded: two toggles must cancel out, not collapse.
+COALESCED_CONTROL_ACTIONS = frozenset({WEB_QUEUE_SLAP, WEB_QUEUE_MUTE_30_MINUTES})
+
+_CLAIM_COLUMNS = (
+    "id, guild_id, sound_filename, request_username, request_user_id, "
+    "request_type, control_action, play_action, requested_at"
+)
+_RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+RequestHandler = Callable[[tuple[Any, ...]], Awaitable[bool]]
+
+PLAYBACK_QUEUE_LATENCY_SECONDS = REGISTRY.histogram(
+    "playback_queue_latency_seconds",
+    "Time from web request insert to the bot handler starting it.",
+)
+
+
+def ensure_playback_queue_dispatch_schema(cursor: sqlite3.Cursor) -> bool:
+    """
+    Add the claim column and the partial index used by the dispatcher.
+
+    Args:
+        cursor: Cursor on the bot database.
+
+    Returns:
+        ``False`` when the ``playback_queue`` table does not exist yet.
+    """
+    row = cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'playback_queue'"
+    ).fetchone()
+    if row is None:
+        return False
+    _ensure_playback_queue_identity_columns(cursor)
+    columns = {str(info[1]) for info in cursor.execute("PRAGMA table_info(playback_queue)")}
+    if "claimed_at" not in columns:
+        try:
+            cursor.execute("ALTER TABLE playback_queue ADD COLUMN claimed_at REAL")
+        except sqlite3.OperationalError as exc:
+            # Another consumer added it between the PRAGMA and the ALTER.
+            if "duplicate column" not in str(exc).lower():
+                raise
+    cursor.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS {PLAYBACK_QUEUE_UNPLAYED_INDEX}
+        ON playback_queue(requested_at, id)
+        WHERE played_at IS NULL
+        """
+    )
+    return True
+
+
+class PlaybackQueueMetrics:
+    """
+    Counters and a rolling window of queue-to-start latencies.
+
+    Args:
+        window: Number of recent latency samples kept for percentiles.
+    """
+
+    def __init__(self, window: int = 256) -> None:
+        self.claimed = 0
+        self.started = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def observe_start(self, latency_seconds: float | None) -> None:
+        """Record one request reaching its handler."""
+        self.started += 1
+        if latency_seconds is not None:
+            self._latencies.append(max(0.0, latency_seconds))
+            PLAYBACK_QUEUE_LATENCY_SECONDS.observe(max(0.0, latency_seconds))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return counters plus p50/p95/max latency over the window."""
+        ordered = sorted(self._latencies)
+
+        def _percentile(fraction: float) -> float | None:
+            if not ordered:
+                return None
+            index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+            return round(ordered[index], 3)
+
+        return {
+            "claimed": self.claimed,
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "latency_samples": len(ordered),
+            "latency_p50_seconds": _percentile(0.5),
+            "latency_p95_seconds": _percentile(0.95),
+            "latency_max_seconds": round(ordered[-1], 3) if ordered else None,
+        }
+
+
+class PlaybackQueueDispatcher:
+    """
+    Claim queued web requests and run them on per-guild worker tasks.
+
+    Args:
+        db_path: Path to the SQLite database holding ``playback_queue``.
+        handler: Coroutine function run for each request. Receives the
+            8-column row accepted by ``process_playback_queue_request`` and is
+            expected to set ``played_at`` itself.
+        claim_batch: Maximum rows claimed per database round trip.
+        stale_claim_seconds: Age after which another consumer's claim is
+            considered abandoned.
+        slow_start_seconds: Queue-to-start latency that gets logged.
+        coalesce_actions: Control actions collapsed to the latest request.
+        logger_func: Logging function (matches the queue's ``print`` logs).
+        time_func: Wall clock in epoch seconds, exposed for tests.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        handler: RequestHandler,
+        *,
+        claim_batch: int = 50,
+        stale_claim_seconds: float = 120.0,
+        slow_start_seconds: float = 1.0,
+        coalesce_actions: Iterable[str] = COALESCED_CONTROL_ACTIONS,
+        logger_func: Callable[[str], None] = print,
+        time_func: Callable[[], float] = time.time,
+    ) -> None:
+        self.db_path = db_path
+        self.handler = handler
+        self.claim_batch = claim_batch
+        self.stale_claim_seconds = stale_claim_seconds
+        self.slow_start_seconds = slow_start_seconds
+        self.coalesce_actions = frozenset(coalesce_actions)
+        self.metrics = PlaybackQueueMetrics()
+        self._log = logger_func
+        self._time = time_func
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = threading.Lock()
+        self._schema_ready = False
+        self._draining = False
+        self._rescan = False
+        self._inflight: set[int] = set()
+        self._pending: dict[int, deque[dict[str, Any]]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    async def drain_once(self) -> int:
+        """
+        Claim every pending request and hand it to its guild worker.
+
+        Concurrent calls (poll tick plus Honker wake-up) fold into the running
+        drain, which scans again before returning.
+
+        Returns:
+            Number of rows claimed by this call.
+        """
+        if self._draining:
+            self._rescan = True
+            return 0
+
+        self._draining = True
+        claimed_total = 0
+        try:
+            while True:
+                self._rescan = False
+                rows = await asyncio.to_thread(self._claim_pending)
+                claimed_total += len(rows)
+                await self._dispatch(rows)
+                if len(rows) < self.claim_batch and not self._rescan:
+                    break
+        except sqlite3.Error as exc:
+            self._log(f"[Playback Queue] Database error: {exc}")
+        finally:
+            self._draining = False
+        return claimed_total
+
+    async def wait_idle(self) -> None:
+        """Wait until every guild worker has finished its queue."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel workers and close the claim connection."""
+        for task in list(self._workers.values()):
+            task.cancel()
+        await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+        self._workers.clear()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def inflight_count(self) -> int:
+        """Number of claimed requests not yet finished."""
+        return len(self._inflight)
+
+    def stats(self) -> dict[str, Any]:
+        """Return metrics plus current per-guild backlog sizes."""
+        return {
+            **self.metrics.snapshot(),
+            "inflight": len(self._inflight),
+            "pending_by_guild": {
+                guild_id: len(queue) for guild_id, queue in self._pending.items() if queue
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Database (runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the dispatcher's own connection, creating it once."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def _claim_pending(self) -> list[dict[str, Any]]:
+        """Atomically mark pending rows as claimed and return them in order."""
+        with self._conn_lock:
+            conn = self._connection()
+            if not self._schema_ready:
+                if not ensure_playback_queue_dispatch_schema(conn.cursor()):
+                    conn.commit()
+                    return []
+                conn.commit()
+                self._schema_ready = True
+
+            now = self._time()
+            params = (now, now - self.stale_claim_seconds, self.claim_batch)
+            candidates = """
+                SELECT id FROM playback_queue
+                WHERE played_at IS NULL
+                  AND (claimed_at IS NULL OR claimed_at < ?)
+                ORDER BY requested_at ASC, id ASC
+                LIMIT ?
+            """
+            if _RETURNING_SUPPORTED:
+                rows = conn.execute(
+                    f"""
+                    UPDATE playback_queue SET claimed_at = ?
+                    WHERE id IN ({candidates})
+                    RETURNING {_CLAIM_COLUMNS}
+                    """,
+                    params,
+                ).fetchall()
+            else:
+                rows = []
+                for (row_id,) in conn.execute(candidates, params[1:]).fetchall():
+                    updated = conn.execute(
+                        "UPDATE playback_queue SET claimed_at = ? "
+                        "WHERE id = ? AND played_at IS NULL AND (claimed_at IS NULL OR claimed_at < ?)",
+                        (now, row_id, params[1]),
+                    )
+                    if updated.rowcount == 1:
+                        rows.append(
+                            conn.execute(
+                                f"SELECT {_CLAIM_COLUMNS} FROM playback_queue WHERE id = ?",
+                                (row_id,),
+                            ).fetchone()
+                        )
+            conn.commit()
+
+        claimed = [dict(row) for row in rows]
+        for row in claimed:
+            row["claimed_at"] = now
+        claimed.sort(key=lambda row: (str(row["requested_at"] or ""), int(row["id"])))
+        return claimed
+
+    def _mark_played(self, request_ids: list[int]) -> None:
+        """Set ``played_at`` for requests that will not run (superseded or failed)."""
+        if not request_ids:
+            return
+        with self._conn_lock:
+            conn = self._connection()
+            conn.executemany(
+                "UPDATE playback_queue SET played_at = ? WHERE id = ?",
+                [(datetime.now(), request_id) for request_id in request_ids],
+            )
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Dispatch (event loop)
+    # ------------------------------------------------------------------
+
+    async def _dispatch(self, rows: list[dict[str, Any]]) -> None:
+        """Queue claimed rows per guild, coalescing superseded controls."""
+        superseded: list[int] = []
+        for row in rows:
+            request_id = int(row["id"])
+            if request_id in self._inflight:
+                continue
+            self._inflight.add(request_id)
+            self.metrics.claimed += 1
+
+            try:
+                guild_id = int(row["guild_id"])
+            except (TypeError, ValueError):
+                guild_id = 0
+            queue = self._pending.setdefault(guild_id, deque())
+            action = self._coalesce_key(row)
+            if action is not None:
+                for queued in list(queue):
+                    if self._coalesce_key(queued) == action:
+                        queue.remove(queued)
+                        superseded.append(int(queued["id"]))
+            queue.append(row)
+            if guild_id not in self._workers:
+                self._workers[guild_id] = asyncio.create_task(self._run_guild(guild_id))
+
+        if superseded:
+            self.metrics.coalesced += len(superseded)
+            self._log(
+                f"[Playback Queue] Coalesced {len(superseded)} superseded control "
+                f"request(s): {sorted(superseded)}"
+            )
+            try:
+                await asyncio.to_thread(self._mark_played, superseded)
+            finally:
+                self._inflight.difference_update(superseded)
+
+    def _coalesce_key(self, row: dict[str, Any]) -> str | None:
+        """Return the control action a row can be coalesced under, if any."""
+        request_type = str(row.get("request_type") or WEB_QUEUE_PLAY_SOUND)
+        if request_type == WEB_QUEUE_PLAY_SOUND:
+            return None
+        action = str(row.get("control_action") or request_type)
+        return action if action in self.coalesce_actions else None
+
+    async def _run_guild(self, guild_id: int) -> None:
+        """Run one guild's requests in order until its queue is empty."""
+        queue = self._pending[guild_id]
+        try:
+            while queue:
+                row = queue.popleft()
+                await self._run_request(row)
+        finally:
+            self._workers.pop(guild_id, None)
+            if not queue:
+                self._pending.pop(guild_id, None)
+
+    async def _run_request(self, row: dict[str, Any]) -> None:
+        """Invoke the handler for one request and record its latency."""
+        request_id = int(row["id"])
+        latency = self._queue_latency(row)
+        self.metrics.observe_start(latency)
+        if latency is not None and latency > self.slow_start_seconds:
+            self._log(
+                f"[Playback Queue] Request ID {request_id} waited {latency:.3f}s "
+                f"before starting in guild {row['guild_id']}"
+            )
+
+        handler_row = (
+            row["id"],
+            row["guild_id"],
+            row["sound_filename"],
+            row["request_username"],
+            row["request_user_id"],
+            row["request_type"],
+            row["control_action"],
+            row["play_action"],
+        )
+        try:
+            await self.handler(handler_row)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.metrics.failed += 1
+            self._log(f"[Playback Queue] Unexpected error for request {request_id}: {exc}")
+            try:
+                await asyncio.to_thread(self._mark_played, [request_id])
+            except sqlite3.Error as db_exc:
+                self._log(f"[Playback Queue] Could not mark request {request_id} played: {db_exc}")
+        finally:
+            self._inflight.discard(request_id)
+
+    def _queue_latency(self, row: dict[str, Any]) -> float | None:
+        """Return seconds between ``requested_at`` (UTC) and now."""
+        requested_at = row.get("requested_at")
+        if not requested_at:
+            return None
+        text = str(requested_at).strip().replace("T", " ")
+        for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
+            try:
+                parsed = datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            return self._time() - parsed.timestamp()
+        return None
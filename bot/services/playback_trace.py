@@ -0,0 +1,279 @@
+"""
+Per-play startup traces for ``AudioService.play_audio``.
+
+Each play gets a ``PlaybackTrace`` keyed by ``play_id``: a root ``play`` span
+with child spans for the interaction hand-off, DB lookups, voice connect,
+ffmpeg queue/probe/spawn and the voice player's first ``read()``, plus a
+``first_packet`` mark once the first Opus frame has been handed to the voice
+socket. Completed traces land in a bounded ring buffer (surfaced in the web
+control room) and, when ``PLAYBACK_TRACE_EXPORT_PATH`` is set, are appended
+to a JSONL file.
+
+Spans use ``time.monotonic`` and may be recorded from the voice player
+thread, so all mutation goes through a per-trace lock.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT_SPAN = "play"
+
+
+@dataclass(slots=True)
+class TraceSpan:
+    """One timed step of a playback startup."""
+
+    name: str
+    start: float
+    end: Optional[float] = None
+    parent: Optional[str] = ROOT_SPAN
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class PlaybackTrace:
+    """
+    Span tree for one ``play_id``.
+    """
+
+    def __init__(
+        self,
+        play_id: str,
+        guild_id: int,
+        audio_file: str,
+        *,
+        tracer: Optional["PlaybackTracer"] = None,
+        requested_at_unix: Optional[float] = None,
+        time_func: Callable[[], float] = time.monotonic,
+        wall_time_func: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Start a trace; the root span opens at the interaction time if known.
+
+        Args:
+            play_id: Play identifier shared with the PLAY-DEBUG logs.
+            guild_id: Discord guild ID.
+            audio_file: Requested sound filename.
+            tracer: Owning tracer, notified by ``finish``.
+            requested_at_unix: When the triggering interaction was received.
+            time_func: Monotonic clock (injectable for tests).
+            wall_time_func: Wall clock used for ``started_at``.
+        """
+        self.play_id = play_id
+        self.guild_id = guild_id
+        self.audio_file = audio_file
+        self.status: Optional[str] = None
+        self._tracer = tracer
+        self._time = time_func
+        self._lock = threading.Lock()
+
+        now = time_func()
+        wall_now = wall_time_func()
+        handoff = 0.0
+        if isinstance(requested_at_unix, (int, float)):
+            # Clock skew between Discord and this host can make this negative.
+            handoff = max(0.0, wall_now - float(requested_at_unix))
+        self.started_at_unix = wall_now - handoff
+        self._root = TraceSpan(name=ROOT_SPAN, start=now - handoff, parent=None)
+        self._spans: list[TraceSpan] = []
+        if handoff > 0.0:
+            self._spans.append(TraceSpan(name="interaction", start=self._root.start, end=now))
+
+    @property
+    def finished(self) -> bool:
+        """Whether ``finish`` has run."""
+        return self.status is not None
+
+    def begin(self, name: str, parent: str = ROOT_SPAN, **attrs: Any) -> TraceSpan:
+        """Open a span; close it with ``end``."""
+        span = TraceSpan(name=name, start=self._time(), parent=parent, attrs=attrs)
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    def end(self, span: TraceSpan, **attrs: Any) -> None:
+        """Close a span opened with ``begin``."""
+        with self._lock:
+            span.end = self._time()
+            span.attrs.update(attrs)
+
+    @contextmanager
+    def span(self, name: str, parent: str = ROOT_SPAN, **attrs: Any) -> Iterator[TraceSpan]:
+        """Time the enclosed block as a span."""
+        span = self.begin(name, parent=parent, **attrs)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        parent: str = ROOT_SPAN,
+        **attrs: Any,
+    ) -> None:
+        """Record a span measured elsewhere with the same monotonic clock."""
+        with self._lock:
+            self._spans.append(
+                TraceSpan(name=name, start=start, end=end, parent=parent, attrs=attrs)
+            )
+
+    def mark(self, name: str, at: Optional[float] = None, **attrs: Any) -> None:
+        """Record a zero-length event."""
+        at = self._time() if at is None else at
+        self.add_span(name, at, at, **attrs)
+
+    def finish(self, status: str = "ok") -> None:
+        """Close the root span and hand the trace to its tracer (idempotent)."""
+        with self._lock:
+            if self.status is not None:
+                return
+            self.status = status
+            self._root.end = self._time()
+        if self._tracer is not None:
+            self._tracer._complete(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-safe summary with span offsets in milliseconds."""
+        with self._lock:
+            root = self._root
+            spans = sorted(self._spans, key=lambda span: span.start)
+            root_end = root.end if root.end is not None else self._time()
+
+        def _ms(value: float) -> float:
+            return round(value * 1000.0, 1)
+
+        return {
+            "play_id": self.play_id,
+            "guild_id": str(self.guild_id),
+            "audio_file": self.audio_file,
+            "status": self.status or "active",
+            "started_at": round(self.started_at_unix, 3),
+            "total_ms": _ms(root_end - root.start),
+            "spans": [
+                {
+                    "name": span.name,
+                    "parent": span.parent,
+                    "start_ms": _ms(span.start - root.start),
+                    "duration_ms": (
+                        _ms(span.end - span.start) if span.end is not None else None
+                    ),
+                    **({"attrs": span.attrs} if span.attrs else {}),
+                }
+                for span in spans
+            ],
+        }
+
+
+class PlaybackTracer:
+    """
+    Track active traces and keep the most recent completed ones.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        export_path: str | os.PathLike[str] | None = None,
+        time_func: Callable[[], float] = time.monotonic,
+        wall_time_func: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            capacity: Completed traces kept in memory (and active traces
+                tracked before the oldest are abandoned).
+            export_path: Optional JSONL file that completed traces are appended to.
+            time_func: Monotonic clock passed to new traces.
+            wall_time_func: Wall clock passed to new traces.
+        """
+        self.capacity = max(1, capacity)
+        self.export_path = Path(export_path) if export_path else None
+        self._time = time_func
+        self._wall_time = wall_time_func
+        self._active: OrderedDict[str, PlaybackTrace] = OrderedDict()
+        self._completed: deque[dict[str, Any]] = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PlaybackTracer":
+        """Build a tracer from ``PLAYBACK_TRACE_CAPACITY``/``PLAYBACK_TRACE_EXPORT_PATH``."""
+        try:
+            capacity = int(os.getenv("PLAYBACK_TRACE_CAPACITY", "200"))
+        except ValueError:
+            capacity = 200
+        export_path = os.getenv("PLAYBACK_TRACE_EXPORT_PATH", "").strip() or None
+        return cls(capacity=capacity, export_path=export_path)
+
+    def start(
+        self,
+        play_id: str,
+        guild_id: int,
+        audio_file: str,
+        requested_at_unix: Optional[float] = None,
+    ) -> PlaybackTrace:
+        """Open a trace for a new play."""
+        trace = PlaybackTrace(
+            play_id,
+            guild_id,
+            audio_file,
+            tracer=self,
+            requested_at_unix=requested_at_unix,
+            time_func=self._time,
+            wall_time_func=self._wall_time,
+        )
+        with self._lock:
+            self._active[play_id] = trace
+            abandoned = []
+            while len(self._active) > self.capacity:
+                abandoned.append(self._active.popitem(last=False)[1])
+        for stale in abandoned:
+            stale.finish("abandoned")
+        return trace
+
+    def get(self, play_id: str) -> Optional[PlaybackTrace]:
+        """Return the active trace for a play, if any."""
+        with self._lock:
+            return self._active.get(play_id)
+
+    def _complete(self, trace: PlaybackTrace) -> None:
+        """Move a finished trace into the ring buffer and export it."""
+        summary = trace.to_dict()
+        with self._lock:
+            if self._active.get(trace.play_id) is trace:
+                del self._active[trace.play_id]
+            self._completed.append(summary)
+        if self.export_path is not None:
+            try:
+                self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(summary, separators=(",", ":")) + "\n")
+            except OSError as exc:
+                logger.warning("[PlaybackTrace] Could not export trace %s: %s", trace.play_id, exc)
+
+    def recent(self, guild_id: Optional[int] = None, limit: int = 20) -> list[dict[str, Any]]:
+        """
+        Return completed traces, newest first.
+
+        Args:
+            guild_id: Optional guild filter.
+            limit: Maximum number of traces.
+        """
+        with self._lock:
+            completed = list(self._completed)
+        if guild_id is not None:
+            completed = [trace for trace in completed if trace["guild_id"] == str(guild_id)]
+        return completed[::-1][: max(0, limit)]
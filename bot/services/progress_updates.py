@@ -0,0 +1,317 @@
+"""
+Shared scheduler for playback progress-bar edits.
+
+Every playing sound message gets a ``ProgressJob``; one timer task per event
+loop walks all jobs across guilds and edits the ones that are due, instead
+of each guild running its own once-a-second loop. Each due edit runs as its
+own task, so a slow or rate-limited edit only holds up its own message.
+Per job, the cadence is
+derived from the clip duration (roughly one edit per bar step, clamped to
+``min_interval``..``max_interval``) and an edit is skipped when the rendered
+label has not changed.
+
+Per channel, edits stay inside Discord's message-edit bucket (a few edits per
+few seconds, shared with other bot edits in that channel): jobs are deferred
+while the channel's recent-edit budget is spent, and a 429 or a slow edit
+(discord.py waiting on the bucket) widens that channel's cadence until edits
+are fast again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Optional, Set
+
+import discord
+
+from bot.metrics import REGISTRY
+
+PROGRESS_EDIT_SECONDS = REGISTRY.histogram(
+    "progress_edit_seconds",
+    "Latency of progress-bar message edits.",
+)
+PROGRESS_EDITS = REGISTRY.counter(
+    "progress_edits",
+    "Progress-bar edit attempts by result (ok, unchanged, deferred, rate_limited, gone, error).",
+    ("result",),
+)
+PROGRESS_JOBS = REGISTRY.gauge(
+    "progress_jobs",
+    "Sound messages whose progress bar is currently being updated.",
+)
+
+MAX_PENALTY = 8.0
+
+
+@dataclass
+class ProgressJob:
+    """
+    One message's progress bar.
+
+    Attributes:
+        key: Identity of the message; registering the same key replaces the job.
+        channel_id: Rate-limit scope for the edits.
+        duration: Clip length in seconds.
+        offset: Seconds added to the displayed elapsed time.
+        label: Label for an elapsed time (already clamped to ``duration``).
+        final_label: Label written once the clip has finished.
+        edit: Coroutine that applies a label; ``final`` is ``True`` for the
+            last edit. Returns ``False`` when there was nothing to edit.
+        is_active: Whether the message is still the current one for its guild.
+        last_label: Label currently shown (the one sent with the message).
+        in_flight: Whether an edit task for this job is running.
+    """
+
+    key: Hashable
+    channel_id: Hashable
+    duration: float
+    offset: float
+    label: Callable[[float], str]
+    final_label: str
+    edit: Callable[[str, bool], Awaitable[bool]]
+    is_active: Callable[[], bool]
+    last_label: Optional[str] = None
+    started_at: float = 0.0
+    next_due: float = 0.0
+    done: Optional[asyncio.Future] = None
+    in_flight: bool = False
+
+
+@dataclass
+class _ChannelState:
+    recent_edits: Deque[float] = field(default_factory=deque)
+    backoff_until: float = 0.0
+    penalty: float = 1.0
+
+
+class ProgressUpdateScheduler:
+    """
+    Drive progress-bar edits for all guilds from a single timer task.
+
+    Args:
+        min_interval: Shortest gap between edits of one message.
+        max_interval: Longest gap between edits of one message.
+        steps: Visible positions on the bar; cadence aims at one edit per step.
+        channel_edits: Edits allowed per channel within ``channel_window``.
+        channel_window: Seconds covered by ``channel_edits``.
+        slow_edit_seconds: Edit latency treated as rate-limit pressure.
+        time_func: Monotonic clock (tests inject a fake).
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 3.0,
+        steps: int = 7,
+        channel_edits: int = 4,
+        channel_window: float = 5.0,
+        slow_edit_seconds: float = 1.0,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.steps = max(1, int(steps))
+        self.channel_edits = max(1, int(channel_edits))
+        self.channel_window = max(0.0, float(channel_window))
+        self.slow_edit_seconds = float(slow_edit_seconds)
+        self._time = time_func
+        self._jobs: Dict[Hashable, ProgressJob] = {}
+        self._channels: Dict[Hashable, _ChannelState] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._ticks: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "ProgressUpdateScheduler":
+        """Build the scheduler from ``PROGRESS_UPDATE_*`` environment variables."""
+
+        def _float(name: str, default: float) -> float:
+            try:
+                return float(os.getenv(name, str(default)))
+            except ValueError:
+                return default
+
+        return cls(
+            min_interval=_float("PROGRESS_UPDATE_MIN_INTERVAL_SECONDS", 1.0),
+            max_interval=_float("PROGRESS_UPDATE_MAX_INTERVAL_SECONDS", 3.0),
+            channel_edits=int(_float("PROGRESS_UPDATE_CHANNEL_EDITS", 4)),
+        )
+
+    def interval_for(self, duration: float) -> float:
+        """Return the base edit interval for a clip of ``duration`` seconds."""
+        return min(self.max_interval, max(self.min_interval, duration / self.steps))
+
+    def active_jobs(self) -> int:
+        """Return how many progress bars are being driven."""
+        return len(self._jobs)
+
+    async def run(self, job: ProgressJob) -> None:
+        """
+        Register ``job`` and wait until its bar has finished or gone stale.
+
+        Cancelling the caller removes the job without a final edit.
+        """
+        loop = asyncio.get_running_loop()
+        # Jobs left behind by a previous (closed) event loop can never finish.
+        for key, stale in list(self._jobs.items()):
+            if stale.done is None or stale.done.get_loop() is not loop:
+                self._jobs.pop(key, None)
+
+        job.started_at = self._time()
+        job.next_due = job.started_at
+        job.done = loop.create_future()
+        previous = self._jobs.pop(job.key, None)
+        if previous is not None and previous.done is not None and not previous.done.done():
+            previous.done.set_result(None)
+        self._jobs[job.key] = job
+        PROGRESS_JOBS.set(len(self._jobs))
+        self._ensure_timer(loop)
+        try:
+            await job.done
+        finally:
+            if self._jobs.get(job.key) is job:
+                self._jobs.pop(job.key, None)
+            PROGRESS_JOBS.set(len(self._jobs))
+
+    def _ensure_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is None or self._timer.done() or self._timer.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._timer = loop.create_task(self._run_timer())
+        else:
+            self._wakeup.set()
+
+    async def _run_timer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._jobs:
+            now = self._time()
+            for job in list(self._jobs.values()):
+                if not job.in_flight and job.next_due <= now:
+                    job.in_flight = True
+                    task = loop.create_task(self._run_tick(job))
+                    self._ticks.add(task)
+                    task.add_done_callback(self._ticks.discard)
+            waiting = [job.next_due for job in self._jobs.values() if not job.in_flight]
+            # With every job mid-edit, sleep until an edit task finishes.
+            delay = max(0.0, min(waiting) - now) if waiting else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_tick(self, job: ProgressJob) -> None:
+        """Run one job's tick; a failure ends only that job."""
+        try:
+            await self._tick(job)
+        except Exception as e:
+            print(f"[ProgressUpdateScheduler] Progress job {job.key!r} failed: {e}")
+            PROGRESS_EDITS.inc(result="error")
+            self._finish(job)
+        finally:
+            job.in_flight = False
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _finish(self, job: ProgressJob) -> None:
+        if self._jobs.get(job.key) is job:
+            self._jobs.pop(job.key, None)
+        if job.done is not None and not job.done.done():
+            job.done.set_result(None)
+
+    async def _tick(self, job: ProgressJob) -> None:
+        if self._jobs.get(job.key) is not job:
+            return
+        if not job.is_active():
+            self._finish(job)
+            return
+
+        now = self._time()
+        ends_at = job.started_at + job.duration
+        final = now >= ends_at
+        label = job.final_label if final else job.label(min(job.duration, now - job.started_at + job.offset))
+        interval = self.interval_for(job.duration)
+        if not final and label == job.last_label:
+            PROGRESS_EDITS.inc(result="unchanged")
+            job.next_due = min(now + interval, ends_at)
+            return
+
+        channel = self._channels.setdefault(job.channel_id, _ChannelState())
+        while channel.recent_edits and channel.recent_edits[0] <= now - self.channel_window:
+            channel.recent_edits.popleft()
+        budget_free_at = (
+            channel.recent_edits[0] + self.channel_window
+            if len(channel.recent_edits) >= self.channel_edits
+            else now
+        )
+        ready_at = max(channel.backoff_until, budget_free_at)
+        if ready_at > now:
+            PROGRESS_EDITS.inc(result="deferred")
+            job.next_due = ready_at
+            return
+
+        channel.recent_edits.append(now)
+        started = time.perf_counter()
+        try:
+            edited = await job.edit(label, final)
+        except discord.NotFound:
+            PROGRESS_EDITS.inc(result="gone")
+            self._finish(job)
+            return
+        except discord.HTTPException as e:
+            if e.status != 429:
+                PROGRESS_EDITS.inc(result="error")
+                self._reschedule(job, channel, now, interval, final)
+                return
+            retry_after = float(getattr(e, "retry_after", None) or interval)
+            channel.penalty = min(MAX_PENALTY, channel.penalty * 2)
+            channel.backoff_until = self._time() + retry_after
+            PROGRESS_EDITS.inc(result="rate_limited")
+            job.next_due = channel.backoff_until
+            return
+        except Exception as e:
+            print(f"[ProgressUpdateScheduler] Edit failed: {e}")
+            PROGRESS_EDITS.inc(result="error")
+            self._reschedule(job, channel, now, interval, final)
+            return
+        latency = time.perf_counter() - started
+        if edited is False:
+            self._reschedule(job, channel, now, interval, final)
+            return
+
+        PROGRESS_EDIT_SECONDS.observe(latency)
+        PROGRESS_EDITS.inc(result="ok")
+        job.last_label = label
+        if latency >= self.slow_edit_seconds:
+            channel.penalty = min(MAX_PENALTY, channel.penalty * 2)
+        else:
+            channel.penalty = max(1.0, channel.penalty / 2)
+        self._reschedule(job, channel, now, interval, final)
+
+    def _reschedule(
+        self,
+        job: ProgressJob,
+        channel: _ChannelState,
+        now: float,
+        interval: float,
+        final: bool,
+    ) -> None:
+        if final:
+            self._finish(job)
+            return
+        job.next_due = min(now + interval * channel.penalty, job.started_at + job.duration)
+
+
+_scheduler: Optional[ProgressUpdateScheduler] = None
+
+
+def get_progress_scheduler() -> ProgressUpdateScheduler:
+    """Return the process-wide progress scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ProgressUpdateScheduler.from_env()
+    return _scheduler
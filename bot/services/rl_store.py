@@ -15,6 +15,7 @@ from bot.models import (
     RocketLeagueStoreShop,
     RocketLeagueStoreSnapshot,
 )
+from bot.services.http_client import PROVIDER_RLSHOP, get_http_client
 
 
 logger = logging.getLogger(__name__)
@@ -42,10 +43,7 @@ class RocketLeagueStoreService:
         Returns:
             A decoded store snapshot ordered like the upstream site.
         """
-        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
-        headers = {"Accept": "application/json"}
-
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+        async with get_http_client().borrow(PROVIDER_RLSHOP) as session:
             root_payload = await self._fetch_json(session, self.ROOT_PATH)
             root_meta = self._decode_data_node(root_payload, node_index=0)
             featured_shop_data = self._decode_data_node(root_payload, node_index=1)
@@ -178,7 +176,9 @@ class RocketLeagueStoreService:
     ) -> dict[str, Any]:
         """Fetch a JSON payload from rlshop.gg."""
         url = f"{self.BASE_URL}{path}"
-        async with session.get(url) as response:
+        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
+        headers = {"Accept": "application/json"}
+        async with session.get(url, headers=headers, timeout=timeout) as response:
             response.raise_for_status()
             return await response.json()
 
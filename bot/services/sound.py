@@ -4,11 +4,9 @@ import discord
 import random
 import re
 import aiohttp
-import functools
 import uuid
 import time
 import sqlite3
-import math
 import shutil
 import tempfile
 from pathlib import Path
@@ -18,8 +16,8 @@ from bot.database import Database  # Keep for get_sounds_by_similarity until mig
 from moviepy.editor import VideoFileClip
 from bot.downloaders.manual import ManualSoundDownloader
 from mutagen.mp3 import MP3
-from pydub import AudioSegment
-from pydub.effects import compress_dynamic_range
+from bot.services.loudness import LoudnessTarget, get_loudness_normalizer, ingest_target, safe_gain
+from bot.services.sound_neighbors import get_sound_neighbor_index
 
 class SoundService:
     """
@@ -85,56 +83,24 @@ class SoundService:
 
         return f"{cleaned}.mp3"
 
+    def _ingest_loudness_target(self, target_dbfs: float) -> LoudnessTarget:
+        return ingest_target(
+            target_dbfs,
+            peak_ceiling_dbfs=self.ingest_peak_ceiling_dbfs,
+            compression_enabled=self.ingest_compression_enabled,
+            compression_threshold_dbfs=self.ingest_compression_threshold_dbfs,
+            compression_ratio=self.ingest_compression_ratio,
+        )
+
     def _normalize_mp3_loudness(self, sound_file: str, target_dbfs: float) -> None:
         """Normalize an MP3 file in-place with compression and peak-safe loudness."""
-        temp_path = f"{sound_file}.normalized.tmp.mp3"
-        try:
-            sound = AudioSegment.from_file(sound_file, format="mp3")
-            current_dbfs = float(sound.dBFS)
-            if current_dbfs == float("-inf"):
-                print(
-                    f"[SoundService] Skipping loudness normalization for silent file: {sound_file}"
-                )
-                return
-
-            working_sound = sound
-            compression_applied = False
-            if self.ingest_compression_enabled:
-                working_sound = compress_dynamic_range(
-                    working_sound,
-                    threshold=self.ingest_compression_threshold_dbfs,
-                    ratio=self.ingest_compression_ratio,
-                    attack=5.0,
-                    release=80.0,
-                )
-                compression_applied = True
-
-            working_dbfs = float(working_sound.dBFS)
-            if not math.isfinite(working_dbfs):
-                print(
-                    f"[SoundService] Skipping loudness normalization due to invalid dBFS: {sound_file}"
-                )
-                return
-            peak_dbfs = float(working_sound.max_dBFS)
-            gain_change = self._calculate_safe_gain(
-                current_dbfs=working_dbfs,
-                peak_dbfs=peak_dbfs,
-                target_dbfs=target_dbfs,
-                peak_ceiling_dbfs=self.ingest_peak_ceiling_dbfs,
-            )
-            if abs(gain_change) < 0.25 and not compression_applied:
-                return
-
-            normalized = working_sound.apply_gain(gain_change)
-            final_peak_dbfs = float(normalized.max_dBFS)
-            if math.isfinite(final_peak_dbfs) and final_peak_dbfs > self.ingest_peak_ceiling_dbfs:
-                normalized = normalized.apply_gain(self.ingest_peak_ceiling_dbfs - final_peak_dbfs)
-
-            normalized.export(temp_path, format="mp3")
-            os.replace(temp_path, sound_file)
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        report = get_loudness_normalizer().normalize(
+            sound_file,
+            self._ingest_loudness_target(target_dbfs),
+            source="ingest",
+        )
+        if report is None:
+            print(f"[SoundService] Loudness unchanged (silent or already on target): {sound_file}")
 
     @staticmethod
     def _calculate_safe_gain(
@@ -144,11 +110,7 @@ class SoundService:
         peak_ceiling_dbfs: float,
     ) -> float:
         """Return gain that targets loudness without exceeding peak ceiling."""
-        desired_gain = target_dbfs - current_dbfs
-        if not math.isfinite(peak_dbfs):
-            return desired_gain
-        max_allowed_gain = peak_ceiling_dbfs - peak_dbfs
-        return min(desired_gain, max_allowed_gain)
+        return safe_gain(current_dbfs, peak_dbfs, target_dbfs, peak_ceiling_dbfs)
 
     async def _maybe_normalize_ingested_mp3(self, sound_file: str) -> None:
         """Normalize ingested MP3 loudness when enabled, without failing upload flow."""
@@ -599,29 +561,42 @@ class SoundService:
                 self.db.invalidate_sound_cache()
                 return final_path
 
+    def _lookup_similar_sounds(self, audio_file, guild_id, limit):
+        """Return similar sounds for a played file; blocking, run it in a thread.
+
+        Reads the precomputed neighbor lists and only runs the live
+        similarity search for sounds the background index has not reached.
+        """
+        sound_info = self.sound_repo.get_sound(audio_file, True)
+        if not sound_info:
+            return None
+        similar = get_sound_neighbor_index().neighbors(
+            sound_info[0],
+            guild_id,
+            limit,
+            include_blacklisted=False,
+        )
+        if similar is None:
+            similar = self.db.get_sounds_by_similarity(
+                sound_info[2].replace('.mp3', ''),
+                limit,
+                0.00001,
+                guild_id,
+            )
+        return similar
+
     async def find_and_update_similar_sounds(self, sound_message, audio_file, original_message, send_controls=False, num_suggestions=25):
         """Background task to find similar sounds and update the playback message."""
         try:
             if not sound_message:
                 return
 
-            sound_info = self.sound_repo.get_sound(audio_file, True)
-            if not sound_info:
-                return
-
-            sound_name = sound_info[2].replace('.mp3', '')
-            
-            # Use original_message for similarity search
-            loop = asyncio.get_running_loop()
-            all_similar = await loop.run_in_executor(
-                None,
-                functools.partial(
-                    self.db.get_sounds_by_similarity,
-                    sound_name,
-                    num_suggestions + 1,
-                    0.00001,
-                    sound_message.guild.id if sound_message and sound_message.guild else None,
-                ),
+            guild_id = sound_message.guild.id if sound_message and sound_message.guild else None
+            all_similar = await asyncio.to_thread(
+                self._lookup_similar_sounds,
+                audio_file,
+                guild_id,
+                num_suggestions + 1,
             )
             
             if not all_similar:
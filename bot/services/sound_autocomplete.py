@@ -0,0 +1,431 @@
+"""
+Prefix-indexed sound-name autocomplete for ``/toca`` and the list commands.
+
+Discord sends one autocomplete interaction per keystroke, so the handler must
+answer from memory. ``SoundNameIndex`` keeps every token of every normalized
+sound name (plus the name with spaces removed) in one sorted array; a query
+token's matches are the contiguous ``bisect`` range of keys that start with
+it, which is the lookup a trie or FST would give without a node per
+character. Matches are ranked by how well the name matches (exact, whole-name
+prefix, first-token prefix, inner-token prefix) plus a per-guild popularity
+prior from all-time play counts.
+
+``SoundAutocompleteService`` wraps the index with:
+
+- an LRU of recent ``(guild, query, limit)`` results;
+- an off-loop rebuild (``asyncio.to_thread``) when ``Database``'s sound cache
+  is invalidated or the index outlives ``max_age_seconds``, serving the old
+  index meanwhile;
+- a fuzzy fill through ``Database.get_sounds_by_similarity_indexed`` in a
+  worker thread when the prefix index finds fewer names than requested, so
+  typos still complete;
+- per-requester cancellation: a newer keystroke from the same user cancels
+  the older request's fuzzy fill, and queued fills that were superseded
+  return without scoring.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from bot.metrics import REGISTRY
+
+AUTOCOMPLETE_SECONDS = REGISTRY.histogram(
+    "sound_autocomplete_seconds",
+    "Time to answer one sound autocomplete request.",
+    ("path",),
+)
+
+# Ranking weights: a better match kind always beats a few extra plays, but a
+# sound played hundreds of times can outrank a marginally better match.
+_MATCH_EXACT = 4
+_MATCH_NAME_PREFIX = 3
+_MATCH_FIRST_TOKEN = 2
+_MATCH_INNER_TOKEN = 1
+MATCH_WEIGHT = 3.0
+GUILD_LOCAL_BONUS = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedSound:
+    """One autocompletable sound."""
+
+    sound_id: int
+    name: str
+    normalized: str
+    guild_id: Optional[str]
+
+
+def display_name(filename: str) -> str:
+    """Return the name shown in autocomplete for a stored filename."""
+    return filename.split("/")[-1].replace(".mp3", "")
+
+
+class SoundNameIndex:
+    """
+    Sorted prefix index over normalized sound names.
+
+    Args:
+        sounds: Sounds to index; blacklisted and generated sounds should
+            already be filtered out.
+        play_counts: Per-guild play counts as returned by
+            ``ActionRepository.get_play_counts_by_guild``.
+    """
+
+    def __init__(
+        self,
+        sounds: Iterable[IndexedSound],
+        play_counts: Optional[dict[Optional[str], dict[int, int]]] = None,
+    ) -> None:
+        self.sounds: list[IndexedSound] = list(sounds)
+        entries: set[tuple[str, int]] = set()
+        for position, sound in enumerate(self.sounds):
+            tokens = sound.normalized.split()
+            entries.update((token, position) for token in tokens)
+            if len(tokens) > 1:
+                entries.add(("".join(tokens), position))
+        ordered = sorted(entries)
+        self._compact = [sound.normalized.replace(" ", "") for sound in self.sounds]
+        self._keys = [key for key, _position in ordered]
+        self._positions = [position for _key, position in ordered]
+        self._play_counts = play_counts or {}
+        self._priors: dict[Optional[str], dict[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sounds)
+
+    def _prefix_matches(self, token: str) -> set[int]:
+        """Return positions of sounds having a key starting with ``token``."""
+        lo = bisect_left(self._keys, token)
+        hi = bisect_left(self._keys, token + "\uffff", lo)
+        return set(self._positions[lo:hi])
+
+    def _prior(self, guild_key: Optional[str]) -> dict[int, float]:
+        """Return ``log1p(plays)`` per sound id for a guild, memoized."""
+        prior = self._priors.get(guild_key)
+        if prior is None:
+            merged = dict(self._play_counts.get(None, {}))
+            if guild_key is not None:
+                for sound_id, count in self._play_counts.get(guild_key, {}).items():
+                    merged[sound_id] = merged.get(sound_id, 0) + count
+            prior = {sound_id: math.log1p(count) for sound_id, count in merged.items()}
+            self._priors[guild_key] = prior
+        return prior
+
+    def search(self, normalized_query: str, limit: int, guild_id: Any = None) -> list[str]:
+        """
+        Return display names whose tokens start with every query token.
+
+        Args:
+            normalized_query: Query passed through ``Database.normalize_text``.
+            limit: Maximum number of names.
+            guild_id: Guild whose sounds (plus global ones) are eligible.
+
+        Returns:
+            Display names, best first.
+        """
+        tokens = normalized_query.split()
+        if not tokens or limit <= 0:
+            return []
+        ranges = sorted((self._prefix_matches(token) for token in tokens), key=len)
+        candidates = ranges[0].intersection(*ranges[1:])
+
+        guild_key = str(guild_id) if guild_id is not None else None
+        prior = self._prior(guild_key)
+        compact_query = "".join(tokens)
+        first_token = tokens[0]
+        scored = []
+        for position in candidates:
+            sound = self.sounds[position]
+            if guild_key is not None and sound.guild_id not in (None, guild_key):
+                continue
+            compact = self._compact[position]
+            if compact == compact_query:
+                match = _MATCH_EXACT
+            elif compact.startswith(compact_query):
+                match = _MATCH_NAME_PREFIX
+            elif sound.normalized.startswith(first_token):
+                match = _MATCH_FIRST_TOKEN
+            else:
+                match = _MATCH_INNER_TOKEN
+            score = MATCH_WEIGHT * match + prior.get(sound.sound_id, 0.0)
+            if guild_key is not None and sound.guild_id == guild_key:
+                score += GUILD_LOCAL_BONUS
+            scored.append((score, -len(sound.normalized), sound.name))
+        return [name for _score, _length, name in heapq.nlargest(limit, scored)]
+
+
+_ResultKey = tuple[Optional[str], str, int]
+
+
+class SoundAutocompleteService:
+    """
+    Answer sound-name autocomplete requests without blocking the event loop.
+    """
+
+    MIN_QUERY_LENGTH = 2
+    FUZZY_MIN_QUERY_LENGTH = 3
+
+    def __init__(
+        self,
+        database: Any = None,
+        action_repository: Any = None,
+        *,
+        result_cache_size: int = 256,
+        max_age_seconds: float = 300.0,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            database: ``Database`` instance (created lazily when omitted).
+            action_repository: Source of play counts (created lazily).
+            result_cache_size: Number of recent query results kept.
+            max_age_seconds: Age after which the index is rebuilt so sounds
+                added by other processes show up.
+            time_func: Monotonic clock (injectable for tests).
+        """
+        self._database = database
+        self._action_repository = action_repository
+        self.result_cache_size = max(0, result_cache_size)
+        self.max_age_seconds = max_age_seconds
+        self._time = time_func
+        self._index: Optional[SoundNameIndex] = None
+        self._index_source: Any = None
+        self._index_built_at = 0.0
+        self._rebuild: Optional[asyncio.Future] = None
+        self._results: OrderedDict[_ResultKey, list[str]] = OrderedDict()
+        self._latest: dict[Hashable, int] = {}
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def database(self) -> Any:
+        """Return the ``Database`` singleton, creating it on first use."""
+        if self._database is None:
+            from bot.database import Database
+
+            self._database = Database()
+        return self._database
+
+    @property
+    def action_repository(self) -> Any:
+        """Return the play-count repository, creating it on first use."""
+        if self._action_repository is None:
+            from bot.repositories import ActionRepository
+
+            self._action_repository = ActionRepository()
+        return self._action_repository
+
+    def _index_is_current(self) -> bool:
+        """Return whether the index matches the current sound cache and is fresh."""
+        if self._index is None:
+            return False
+        _entries, source = self.database.get_sound_cache_snapshot()
+        if self._index_source != source:
+            return False
+        return self._time() - self._index_built_at < self.max_age_seconds
+
+    def build_index(self) -> SoundNameIndex:
+        """
+        Build the index from the ``Database`` sound cache (blocking).
+
+        Reloads the cache when it was invalidated or the index expired, and
+        reads play counts for the popularity prior.
+        """
+        database = self.database
+        expired = self._index is not None and self._time() - self._index_built_at >= self.max_age_seconds
+        entries, source = database.get_sound_cache_snapshot()
+        if entries is None or expired:
+            database.refresh_sound_cache()
+            entries, source = database.get_sound_cache_snapshot()
+        sounds = []
+        for sound, normalized in entries or []:
+            sound_dict = sound if isinstance(sound, dict) else dict(sound)
+            if sound_dict.get("is_elevenlabs", 0) == 1 or sound_dict.get("blacklist", 0) == 1:
+                continue
+            guild_id = sound_dict.get("guild_id")
+            sounds.append(
+                IndexedSound(
+                    sound_id=int(sound_dict["id"]),
+                    name=display_name(sound_dict["Filename"]),
+                    normalized=normalized,
+                    guild_id=str(guild_id) if guild_id is not None else None,
+                )
+            )
+        try:
+            play_counts = self.action_repository.get_play_counts_by_guild()
+        except Exception as e:
+            print(f"[SoundAutocomplete] Could not load play counts: {e}")
+            play_counts = {}
+        index = SoundNameIndex(sounds, play_counts)
+        with self._lock:
+            self._index = index
+            self._index_source = source
+            self._index_built_at = self._time()
+            self._results.clear()
+        return index
+
+    async def _ensure_index(self) -> Optional[SoundNameIndex]:
+        """Return a usable index, rebuilding it off-loop when stale."""
+        if self._index_is_current():
+            return self._index
+        if self._rebuild is None or self._rebuild.done():
+            self._rebuild = asyncio.ensure_future(asyncio.to_thread(self.build_index))
+        if self._index is not None:
+            return self._index
+        try:
+            return await asyncio.shield(self._rebuild)
+        except Exception as e:
+            print(f"[SoundAutocomplete] Index build failed: {e}")
+            return None
+
+    def _cached(self, key: _ResultKey) -> Optional[list[str]]:
+        with self._lock:
+            names = self._results.get(key)
+            if names is not None:
+                self._results.move_to_end(key)
+            return names
+
+    def _remember(self, key: _ResultKey, names: list[str], index: Optional[SoundNameIndex]) -> None:
+        if not self.result_cache_size:
+            return
+        with self._lock:
+            if index is not self._index:
+                return  # computed from an index that was replaced meanwhile
+            self._results[key] = list(names)
+            self._results.move_to_end(key)
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+
+    def _fuzzy_names(
+        self,
+        query: str,
+        limit: int,
+        guild_id: Any,
+        requester: Optional[Hashable],
+        sequence: int,
+    ) -> Optional[list[str]]:
+        """Score fuzzy matches in a worker thread unless already superseded."""
+        if requester is not None and self._latest.get(requester) != sequence:
+            return None
+        names = []
+        for sound, _score in self.database.get_sounds_by_similarity_indexed(query, limit, guild_id=guild_id):
+            filename = sound["Filename"] if isinstance(sound, (sqlite3.Row, dict)) else sound[2]
+            names.append(display_name(filename))
+        return names
+
+    async def complete(
+        self,
+        query: Optional[str],
+        *,
+        guild_id: Any = None,
+        requester: Optional[Hashable] = None,
+        limit: int = 15,
+    ) -> list[str]:
+        """
+        Return sound names completing ``query``.
+
+        Args:
+            query: Text typed so far.
+            guild_id: Guild the command runs in.
+            requester: Key identifying one typist (e.g. the user id); a newer
+                request with the same key cancels this one's fuzzy fill.
+            limit: Maximum number of names (Discord shows at most 25).
+
+        Returns:
+            Display names, best first; an empty list for short queries.
+        """
+        started = time.perf_counter()
+        normalized = self.database.normalize_text(query or "")
+        if len(normalized) < self.MIN_QUERY_LENGTH:
+            return []
+
+        self._sequence += 1
+        sequence = self._sequence
+        if requester is not None:
+            self._latest[requester] = sequence
+            previous = self._pending.pop(requester, None)
+            if previous is not None:
+                previous.cancel()
+        try:
+            return await self._complete(query, normalized, guild_id, requester, sequence, limit, started)
+        finally:
+            if requester is not None and self._latest.get(requester) == sequence:
+                del self._latest[requester]
+
+    async def _complete(
+        self,
+        query: str,
+        normalized: str,
+        guild_id: Any,
+        requester: Optional[Hashable],
+        sequence: int,
+        limit: int,
+        started: float,
+    ) -> list[str]:
+        index = await self._ensure_index()
+        key = (str(guild_id) if guild_id is not None else None, normalized, limit)
+        cached = self._cached(key)
+        if cached is not None:
+            AUTOCOMPLETE_SECONDS.observe(time.perf_counter() - started, path="cache")
+            return list(cached)
+
+        names = index.search(normalized, limit, guild_id) if index is not None else []
+        if len(names) >= limit or len(normalized) < self.FUZZY_MIN_QUERY_LENGTH:
+            self._remember(key, names, index)
+            AUTOCOMPLETE_SECONDS.observe(time.perf_counter() - started, path="prefix")
+            return names
+
+        fill = asyncio.ensure_future(
+            asyncio.to_thread(self._fuzzy_names, query, limit, guild_id, requester, sequence)
+        )
+        if requester is not None:
+            self._pending[requester] = fill
+        try:
+            await asyncio.wait({fill})
+        finally:
+            if requester is not None and self._pending.get(requester) is fill:
+                del self._pending[requester]
+        if fill.cancelled():
+            return names
+        try:
+            fuzzy = fill.result()
+        except Exception as e:
+            print(f"[SoundAutocomplete] Fuzzy fill failed: {e}")
+            return names
+        if fuzzy is None:
+            return names
+
+        seen = set(names)
+        for name in fuzzy:
+            if len(names) >= limit:
+                break
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+        self._remember(key, names, index)
+        AUTOCOMPLETE_SECONDS.observe(time.perf_counter() - started, path="fuzzy")
+        return names
+
+
+_service: Optional[SoundAutocompleteService] = None
+
+
+def get_sound_autocomplete_service() -> SoundAutocompleteService:
+    """Return the process-wide autocomplete service."""
+    global _service
+    if _service is None:
+        _service = SoundAutocompleteService()
+    return _service
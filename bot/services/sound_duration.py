@@ -0,0 +1,182 @@
+"""
+Per-process sound-duration map backed by the ``sound_durations`` table.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from bot.repositories.sound_duration import SoundDurationRepository
+
+DurationReader = Callable[[dict[str, Any]], "float | None"]
+
+
+class SoundDurationCache:
+    """
+    In-memory map of sound id -> duration seconds.
+
+    The map is loaded from ``sound_durations`` and reloaded only when the
+    table's change counter moves (uploads, renames and deletes from any
+    process), so serving durations costs one primary-key read plus dict
+    lookups. Sounds without a stored duration are read from disk through the
+    caller's reader, persisted, and added to the map; at most
+    ``max_reads_per_call`` files are parsed per call so a cold table fills in
+    over a few requests instead of stalling one.
+
+    Without a repository (or before the table exists) every call reads from
+    disk, matching the behaviour before the table was introduced.
+
+    Args:
+        repository: Optional persisted duration store.
+        max_reads_per_call: Disk reads allowed per call when the store is used.
+        unreadable_ttl: Seconds to remember files that could not be read.
+        unavailable_ttl: Seconds before re-probing a store that was missing.
+        _time_func: Monotonic clock, exposed for tests.
+    """
+
+    def __init__(
+        self,
+        repository: SoundDurationRepository | None = None,
+        max_reads_per_call: int = 100,
+        unreadable_ttl: float = 60.0,
+        unavailable_ttl: float = 30.0,
+        _time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.repository = repository
+        self.max_reads_per_call = max_reads_per_call
+        self.unreadable_ttl = unreadable_ttl
+        self.unavailable_ttl = unavailable_ttl
+        self._time_func = _time_func
+        self._durations: dict[int, float] = {}
+        self._unreadable: dict[int, float] = {}
+        self._version: int | None = None
+        self._available: bool | None = None
+        self._recheck_at = 0.0
+        self._backlog = False
+        self._lock = threading.Lock()
+
+    def get_durations(
+        self,
+        rows: Iterable[dict[str, Any]],
+        reader: DurationReader,
+    ) -> dict[int, float]:
+        """
+        Return known durations for sound rows, reading missing ones from disk.
+
+        Args:
+            rows: Rows with at least ``sound_id`` (plus whatever *reader* needs).
+            reader: Callable returning a row's duration in seconds, or ``None``.
+
+        Returns:
+            Seconds keyed by sound id; rows without a readable file are omitted.
+        """
+        if not self._store_available():
+            durations: dict[int, float] = {}
+            for row in rows:
+                seconds = reader(row)
+                if seconds is not None:
+                    durations[int(row["sound_id"])] = seconds
+            return durations
+
+        self._sync()
+        now = self._time_func()
+        durations = {}
+        misses: dict[int, float] = {}
+        reads = 0
+        skipped = False
+        for row in rows:
+            sound_id = int(row["sound_id"])
+            seconds = self._durations.get(sound_id)
+            if seconds is not None:
+                durations[sound_id] = seconds
+                continue
+            if self._unreadable.get(sound_id, 0.0) > now:
+                continue
+            if reads >= self.max_reads_per_call:
+                skipped = True
+                continue
+            reads += 1
+            seconds = reader(row)
+            if seconds is None:
+                self._unreadable[sound_id] = now + self.unreadable_ttl
+                continue
+            durations[sound_id] = seconds
+            misses[sound_id] = seconds
+
+        if misses:
+            self._store(misses)
+        self._backlog = skipped
+        return durations
+
+    def version(self) -> int | None:
+        """
+        Return the persisted change counter as a cheap response validator.
+
+        While a cold map is still filling in (the last call hit
+        ``max_reads_per_call``) the counter would not describe the next
+        response, so no validator is offered until the backlog clears.
+
+        Returns:
+            The counter, or ``None`` when there is no store or a fill is pending.
+        """
+        if self._backlog or not self._store_available():
+            return None
+        try:
+            return self.repository.get_version()
+        except sqlite3.Error:
+            return None
+
+    def record(self, sound_id: int, seconds: float | None) -> None:
+        """
+        Store a freshly known duration, e.g. right after an upload.
+
+        Args:
+            sound_id: Sound database id.
+            seconds: Duration in seconds; ignored when ``None`` or not positive.
+        """
+        if seconds is None or seconds <= 0 or not self._store_available():
+            return
+        self._store({int(sound_id): float(seconds)})
+
+    def _store(self, durations: dict[int, float]) -> None:
+        """Persist durations and fold them into the map without a reload."""
+        try:
+            new_version = self.repository.upsert_durations(durations)
+        except sqlite3.Error:
+            return
+        with self._lock:
+            self._durations.update(durations)
+            for sound_id in durations:
+                self._unreadable.pop(sound_id, None)
+            # Only skip the reload when nobody else wrote in between.
+            if self._version is not None and new_version == self._version + 1:
+                self._version = new_version
+
+    def _sync(self) -> None:
+        """Reload the map when the persisted change counter has moved."""
+        version = self.repository.get_version()
+        if version == self._version:
+            return
+        durations = self.repository.get_duration_map()
+        with self._lock:
+            self._durations = durations
+            self._unreadable.clear()
+            self._version = version
+
+    def _store_available(self) -> bool:
+        """Return whether the persisted duration table can be used."""
+        if self.repository is None:
+            return False
+        if self._available:
+            return True
+        # Remember a missing table for a while instead of probing per call.
+        now = self._time_func()
+        if self._available is False and now < self._recheck_at:
+            return False
+        self._available = self.repository.is_available()
+        self._recheck_at = now + self.unavailable_ttl
+        return self._available
@@ -0,0 +1,289 @@
+"""
+Background top-K index of similar sounds.
+
+``SoundNeighborIndex`` fills ``sound_neighbors`` (see
+``bot/repositories/sound_neighbors.py``) with, for every sound and scope, the
+best-scoring other sounds under the same weighted RapidFuzz score the live
+search uses (0.5 token-set + 0.3 partial + 0.2 token-sort on normalized
+names, +5 for guild-local sounds in a guild scope). Post-play suggestions and
+the web options panel then read one short list by primary key instead of
+scoring the whole catalog per request.
+
+The first refresh scores the catalog in chunks with ``rapidfuzz.process.cdist``.
+Later refreshes drain the trigger-fed change queue and recompute only:
+
+- the changed sounds' own lists;
+- lists that contained a changed (renamed/deleted/moved) sound;
+- lists a new or renamed name now beats, found by scoring every sound
+  against just the changed names and comparing with each list's stored
+  K-th score.
+
+Name similarity is the only signal: the repo keeps no audio fingerprints.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from bot.metrics import REGISTRY
+from bot.repositories.sound_neighbors import GLOBAL_ONLY, UNSCOPED, SoundNeighborRepository, neighbor_scope
+from bot.repositories.sound_search import normalize_sound_text
+
+SIMILAR_SOUNDS_LOOKUPS = REGISTRY.counter(
+    "similar_sounds_lookups",
+    "Similar-sound lookups by caller and result (table, fallback).",
+    ("caller", "result"),
+)
+SIMILAR_SOUNDS_REFRESH_SECONDS = REGISTRY.histogram(
+    "similar_sounds_refresh_seconds",
+    "Time spent recomputing similar-sound lists by mode (rebuild, incremental).",
+    ("mode",),
+)
+SIMILAR_SOUNDS_LISTS_UPDATED = REGISTRY.counter(
+    "similar_sounds_lists_updated",
+    "Similar-sound lists recomputed by mode (rebuild, incremental).",
+    ("mode",),
+)
+
+SCORERS = ((fuzz.token_set_ratio, 0.5), (fuzz.partial_ratio, 0.3), (fuzz.token_sort_ratio, 0.2))
+GUILD_BONUS = 5.0
+
+ListKey = Tuple[int, str]
+
+
+@dataclass
+class _Catalog:
+    ids: np.ndarray
+    names: List[str]
+    guilds: List[Optional[str]]
+    scopes: List[str]
+    visible: Dict[str, np.ndarray]
+    bonus: Dict[str, np.ndarray]
+
+    @classmethod
+    def load(cls, rows: Sequence[Any]) -> "_Catalog":
+        ids = np.array([int(row["id"]) for row in rows], dtype=np.int64)
+        names = [normalize_sound_text(row["Filename"]) for row in rows]
+        guilds = [None if row["guild_id"] is None else str(row["guild_id"]) for row in rows]
+        guild_array = np.array(["" if g is None else g for g in guilds], dtype=object)
+        is_global = np.array([g is None for g in guilds], dtype=bool)
+        guild_scopes = sorted({g for g in guilds if g is not None})
+        scopes = [UNSCOPED, GLOBAL_ONLY] + guild_scopes
+        visible = {UNSCOPED: np.ones(len(rows), dtype=bool), GLOBAL_ONLY: is_global}
+        bonus = {scope: np.zeros(len(rows), dtype=np.float64) for scope in (UNSCOPED, GLOBAL_ONLY)}
+        for scope in guild_scopes:
+            local = guild_array == scope
+            visible[scope] = local | is_global
+            bonus[scope] = np.where(local, GUILD_BONUS, 0.0)
+        return cls(ids, names, guilds, scopes, visible, bonus)
+
+    def scopes_for(self, index: int) -> List[str]:
+        """Scopes in which a sound can be the played sound."""
+        guild = self.guilds[index]
+        if guild is None:
+            return list(self.scopes)
+        return [UNSCOPED, guild]
+
+
+class SoundNeighborIndex:
+    """
+    Compute and serve precomputed similar-sound lists.
+
+    Args:
+        repository: Neighbor table access; the background job should pass a
+            repository with its own connection (``use_shared=False``).
+        top_k: Neighbors stored per list (a little above what callers show,
+            so read-time blacklist filtering still leaves enough).
+        chunk_size: Sounds scored per ``cdist`` call.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[SoundNeighborRepository] = None,
+        top_k: int = 30,
+        chunk_size: int = 256,
+    ) -> None:
+        self.repository = repository or SoundNeighborRepository()
+        self.top_k = max(1, int(top_k))
+        self.chunk_size = max(1, int(chunk_size))
+
+    @classmethod
+    def from_env(cls, repository: Optional[SoundNeighborRepository] = None) -> "SoundNeighborIndex":
+        """Build the index using ``SIMILAR_SOUNDS_TOP_K``."""
+        try:
+            top_k = int(os.getenv("SIMILAR_SOUNDS_TOP_K", "30"))
+        except ValueError:
+            top_k = 30
+        return cls(repository, top_k=top_k)
+
+    def neighbors(
+        self,
+        sound_id: int,
+        guild_id: int | str | None,
+        limit: int,
+        *,
+        include_blacklisted: bool = True,
+        caller: str = "discord",
+    ) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Return precomputed neighbors, or ``None`` when the caller should fall
+        back to a live search (list not computed yet or table unavailable).
+        """
+        try:
+            found = self.repository.get_neighbors(
+                int(sound_id),
+                neighbor_scope(guild_id),
+                limit,
+                include_blacklisted=include_blacklisted,
+            )
+        except Exception as e:
+            print(f"[SoundNeighborIndex] Lookup failed: {e}")
+            found = None
+        SIMILAR_SOUNDS_LOOKUPS.inc(caller=caller, result="fallback" if found is None else "table")
+        return found
+
+    def refresh(self) -> int:
+        """
+        Bring the table up to date; blocking, run it off the event loop.
+
+        Returns:
+            Number of lists recomputed.
+        """
+        if not self.repository.is_populated():
+            self.repository.clear_queue()
+            return self.rebuild()
+        changed = self.repository.take_queue()
+        if not changed:
+            return 0
+        return self.apply_changes(changed)
+
+    def rebuild(self) -> int:
+        """Recompute every list from scratch."""
+        started = time.perf_counter()
+        catalog = _Catalog.load(self.repository.get_candidates())
+        stale = set(self.repository.get_thresholds())
+        written = 0
+        for start in range(0, len(catalog.ids), self.chunk_size):
+            lists = self._compute_lists(catalog, range(start, min(start + self.chunk_size, len(catalog.ids))))
+            self.repository.replace_neighbors(lists)
+            stale.difference_update(lists)
+            written += len(lists)
+        self.repository.delete_sources(stale)
+        SIMILAR_SOUNDS_LISTS_UPDATED.inc(written, mode="rebuild")
+        SIMILAR_SOUNDS_REFRESH_SECONDS.observe(time.perf_counter() - started, mode="rebuild")
+        print(f"[SoundNeighborIndex] Rebuilt {written} similar-sound lists for {len(catalog.ids)} sounds")
+        return written
+
+    def apply_changes(self, changed_ids: Iterable[int]) -> int:
+        """Recompute the lists affected by added, renamed, moved or deleted sounds."""
+        started = time.perf_counter()
+        changed = {int(sound_id) for sound_id in changed_ids}
+        catalog = _Catalog.load(self.repository.get_candidates())
+        position = {int(sound_id): index for index, sound_id in enumerate(catalog.ids)}
+        thresholds = self.repository.get_thresholds()
+
+        present = sorted(position[sound_id] for sound_id in changed if sound_id in position)
+        stale = {
+            key
+            for key in thresholds
+            if key[0] in changed
+            and (key[0] not in position or key[1] not in catalog.scopes_for(position[key[0]]))
+        }
+        stale.update(key for key in thresholds if key[1] not in catalog.scopes)
+
+        affected = {
+            position[sound_id]
+            for sound_id, _scope in self.repository.get_sources_referencing(changed)
+            if sound_id in position
+        }
+        affected.update(present)
+        if present:
+            affected.update(self._sources_beaten_by(catalog, present, thresholds))
+
+        lists = self._compute_lists(catalog, sorted(affected)) if affected else {}
+        self.repository.replace_neighbors(lists)
+        self.repository.delete_sources(stale - set(lists))
+        SIMILAR_SOUNDS_LISTS_UPDATED.inc(len(lists), mode="incremental")
+        SIMILAR_SOUNDS_REFRESH_SECONDS.observe(time.perf_counter() - started, mode="incremental")
+        return len(lists)
+
+    def _scores(self, queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+        """Weighted similarity matrix (queries x choices)."""
+        total = np.zeros((len(queries), len(choices)), dtype=np.float64)
+        if not len(queries) or not len(choices):
+            return total
+        for scorer, weight in SCORERS:
+            total += weight * process.cdist(queries, choices, scorer=scorer, dtype=np.float64, workers=1)
+        return total
+
+    def _compute_lists(self, catalog: _Catalog, sources: Iterable[int]) -> Dict[ListKey, List[Tuple[int, float]]]:
+        """Top-K lists for the given source positions in each of their scopes."""
+        sources = list(sources)
+        lists: Dict[ListKey, List[Tuple[int, float]]] = {}
+        for start in range(0, len(sources), self.chunk_size):
+            chunk = sources[start : start + self.chunk_size]
+            base = self._scores([catalog.names[i] for i in chunk], catalog.names)
+            for row, source in enumerate(chunk):
+                for scope in catalog.scopes_for(source):
+                    scores = np.where(catalog.visible[scope], base[row] + catalog.bonus[scope], -np.inf)
+                    scores[source] = -np.inf
+                    lists[(int(catalog.ids[source]), scope)] = self._top(scores, catalog.ids)
+        return lists
+
+    def _top(self, scores: np.ndarray, ids: np.ndarray) -> List[Tuple[int, float]]:
+        available = int(np.isfinite(scores).sum())
+        k = min(self.top_k, available)
+        if k <= 0:
+            return []
+        picked = np.argpartition(-scores, k - 1)[:k]
+        # Best score first; ties keep catalog order like the live search's stable sort.
+        picked = picked[np.lexsort((picked, -scores[picked]))]
+        return [(int(ids[i]), float(scores[i])) for i in picked]
+
+    def _sources_beaten_by(
+        self,
+        catalog: _Catalog,
+        present: Sequence[int],
+        thresholds: Dict[ListKey, Tuple[int, Optional[float]]],
+    ) -> set[int]:
+        """Sources whose stored list a changed name would now enter."""
+        beaten: set[int] = set()
+        present_array = np.array(present, dtype=np.int64)
+        for start in range(0, len(catalog.ids), self.chunk_size):
+            stop = min(start + self.chunk_size, len(catalog.ids))
+            column = self._scores(catalog.names[start:stop], [catalog.names[i] for i in present])
+            for scope in catalog.scopes:
+                visible = catalog.visible[scope][present_array]
+                if not visible.any():
+                    continue
+                scored = np.where(visible, column + catalog.bonus[scope][present_array], -np.inf)
+                # A changed sound never enters its own list.
+                scored[present_array[None, :] == np.arange(start, stop)[:, None]] = -np.inf
+                best = scored.max(axis=1)
+                for offset, value in enumerate(best):
+                    source = start + offset
+                    if not np.isfinite(value) or not catalog.visible[scope][source]:
+                        continue
+                    if scope not in catalog.scopes_for(source):
+                        continue
+                    stored = thresholds.get((int(catalog.ids[source]), scope))
+                    if stored is None or stored[0] < self.top_k or stored[1] is None or value >= stored[1]:
+                        beaten.add(source)
+        return beaten
+
+
+_index: Optional[SoundNeighborIndex] = None
+
+
+def get_sound_neighbor_index() -> SoundNeighborIndex:
+    """Return the process-wide index used for lookups on the shared connection."""
+    global _index
+    if _index is None:
+        _index = SoundNeighborIndex.from_env()
+    return _index
@@ -0,0 +1,253 @@
+"""
+Per-process audio layer for speech-training clip playback.
+
+Labeling sessions page through hundreds of short clips. Each audio request
+used to build a service, run ``ensure_schema``, look the clip up in SQLite
+and probe the filesystem before streaming. ``SpeechTrainingAudioCache``
+keeps an LRU of resolved clip files (and, once played, the bytes of small
+ones) so a repeat request costs a single ``stat``; the ``(mtime, size)``
+pair doubles as the clip's audio version, which feeds strong ETags and
+immutable cache URLs. Listing versions never reads clip bytes.
+In-place edits (keyword trims) change the version, so stale entries are
+replaced on the next request.
+
+Waveform peaks are computed from decoded samples once per clip version and
+kept with the entry so the UI can draw waveforms without fetching and
+decoding every MP3.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PathResolver = Callable[[], "Path | None"]
+SampleDecoder = Callable[[Path], "np.ndarray | None"]
+
+
+@dataclass
+class ClipAudioEntry:
+    """A resolved clip file, optionally with its bytes and computed peaks."""
+
+    clip_id: int
+    path: Path
+    mtime_ns: int
+    size: int
+    data: bytes | None = None
+    peaks: dict[int, list[float]] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        """Return a token that changes whenever the file is rewritten."""
+        return f"{self.mtime_ns:x}-{self.size:x}"
+
+    @property
+    def etag(self) -> str:
+        """Return the strong ETag value (unquoted) for this clip version."""
+        return f"clip-{self.clip_id}-{self.version}"
+
+
+def decode_mono_samples(path: Path) -> np.ndarray | None:
+    """Decode an audio file to mono float samples with pydub (needs ffmpeg)."""
+    try:
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(str(path)).set_channels(1)
+    except Exception as exc:
+        logger.debug("Could not decode %s for peaks: %s", path, exc)
+        return None
+    samples = np.asarray(segment.get_array_of_samples(), dtype=np.float32)
+    full_scale = float(1 << (8 * segment.sample_width - 1))
+    return samples / full_scale if full_scale else samples
+
+
+def compute_peaks(samples: np.ndarray, buckets: int) -> list[float]:
+    """
+    Reduce samples to per-bucket absolute peaks in ``[0, 1]``.
+
+    Args:
+        samples: Mono samples, any numeric dtype.
+        buckets: Number of peaks to return.
+
+    Returns:
+        ``buckets`` peaks rounded to three decimals (all zero for silence).
+    """
+    if buckets <= 0:
+        return []
+    magnitudes = np.abs(np.asarray(samples, dtype=np.float32))
+    if magnitudes.size == 0:
+        return [0.0] * buckets
+    edges = np.linspace(0, magnitudes.size, buckets + 1).astype(np.int64)
+    starts = np.minimum(edges[:-1], magnitudes.size - 1)
+    peaks = np.maximum.reduceat(magnitudes, starts)
+    ceiling = float(peaks.max())
+    if ceiling > 0:
+        peaks = peaks / ceiling
+    return [round(float(value), 3) for value in np.clip(peaks, 0.0, 1.0)]
+
+
+class SpeechTrainingAudioCache:
+    """
+    Thread-safe LRU of resolved speech-training clip files.
+
+    Args:
+        max_entries: Maximum clips remembered.
+        max_inline_bytes: Clips up to this size are kept in memory.
+        max_total_inline_bytes: Memory budget for inline clip bytes.
+        decoder: Callable turning a clip path into mono samples for peaks.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_inline_bytes: int = 256 * 1024,
+        max_total_inline_bytes: int = 32 * 1024 * 1024,
+        decoder: SampleDecoder = decode_mono_samples,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_inline_bytes = max_inline_bytes
+        self.max_total_inline_bytes = max_total_inline_bytes
+        self._decoder = decoder
+        self._entries: OrderedDict[int, ClipAudioEntry] = OrderedDict()
+        self._inline_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, clip_id: int, resolver: PathResolver) -> ClipAudioEntry | None:
+        """
+        Return the current audio entry for a clip, loading small clips' bytes.
+
+        Args:
+            clip_id: Clip primary key.
+            resolver: Called only on a miss or after the file changed; returns
+                the validated clip path or ``None`` when the clip is gone.
+
+        Returns:
+            The entry, or ``None`` when the clip or its file does not exist.
+        """
+        return self._lookup(clip_id, resolver, load_data=True)
+
+    def version(self, clip_id: int, resolver: PathResolver) -> str | None:
+        """
+        Return a clip's audio version without reading the file.
+
+        Costs one ``stat`` for a cached clip; misses resolve and ``stat`` the
+        path but leave the bytes for the first audio request.
+
+        Args:
+            clip_id: Clip primary key.
+            resolver: Path resolver used on a miss.
+
+        Returns:
+            The version token, or ``None`` when the clip or its file is gone.
+        """
+        entry = self._lookup(clip_id, resolver, load_data=False)
+        return entry.version if entry is not None else None
+
+    def _lookup(self, clip_id: int, resolver: PathResolver, *, load_data: bool) -> ClipAudioEntry | None:
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            if entry is not None:
+                self._entries.move_to_end(clip_id)
+
+        if entry is not None:
+            try:
+                stat = entry.path.stat()
+            except OSError:
+                stat = None
+            if stat is not None and (stat.st_mtime_ns, stat.st_size) == (entry.mtime_ns, entry.size):
+                if not load_data or entry.data is not None or entry.size > self.max_inline_bytes:
+                    return entry
+                path = entry.path
+            else:
+                path = resolver()
+        else:
+            path = resolver()
+
+        if path is None:
+            self.invalidate(clip_id)
+            return None
+        try:
+            stat = path.stat()
+            inline = load_data and stat.st_size <= self.max_inline_bytes
+            data = path.read_bytes() if inline else None
+        except OSError:
+            self.invalidate(clip_id)
+            return None
+
+        unchanged = entry is not None and entry.path == path and (
+            (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size)
+        )
+        peaks = entry.peaks if unchanged else {}
+        entry = ClipAudioEntry(
+            clip_id=clip_id,
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            data=data,
+            peaks=peaks,
+        )
+        self._store(entry)
+        return entry
+
+    def get_peaks(self, clip_id: int, resolver: PathResolver, buckets: int) -> list[float] | None:
+        """
+        Return waveform peaks for a clip, computing them once per version.
+
+        Args:
+            clip_id: Clip primary key.
+            resolver: Path resolver used on a cache miss.
+            buckets: Number of peaks requested.
+
+        Returns:
+            Peak list, or ``None`` when the clip is missing or undecodable.
+        """
+        entry = self._lookup(clip_id, resolver, load_data=False)
+        if entry is None:
+            return None
+        peaks = entry.peaks.get(buckets)
+        if peaks is not None:
+            return peaks
+        samples = self._decoder(entry.path)
+        if samples is None:
+            return None
+        peaks = compute_peaks(samples, buckets)
+        entry.peaks[buckets] = peaks
+        return peaks
+
+    def invalidate(self, clip_id: int) -> None:
+        """Forget a clip, e.g. after it was deleted or trimmed."""
+        with self._lock:
+            entry = self._entries.pop(clip_id, None)
+            if entry is not None and entry.data is not None:
+                self._inline_bytes -= len(entry.data)
+
+    @property
+    def size(self) -> int:
+        """Return the number of cached clips."""
+        return len(self._entries)
+
+    def _store(self, entry: ClipAudioEntry) -> None:
+        """Insert an entry and evict least-recently-used clips over budget."""
+        with self._lock:
+            previous = self._entries.pop(entry.clip_id, None)
+            if previous is not None and previous.data is not None:
+                self._inline_bytes -= len(previous.data)
+            self._entries[entry.clip_id] = entry
+            if entry.data is not None:
+                self._inline_bytes += len(entry.data)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._inline_bytes > self.max_total_inline_bytes
+            ):
+                _clip_id, evicted = self._entries.popitem(last=False)
+                if evicted.data is not None:
+                    self._inline_bytes -= len(evicted.data)
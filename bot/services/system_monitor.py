@@ -6,6 +6,11 @@ Provides total CPU/RAM and top per-process CPU usage by reading ``/proc/stat``,
 ``/proc/[pid]/cmdline``.  Preserves two-sample semantics: the first call
 warms and returns ``cpu_warming: true`` with an empty process list.
 
+The per-process scan is incremental: each pid keeps its parsed state and an
+open ``/proc/[pid]/stat`` descriptor (re-read with ``pread``) between calls,
+``cmdline`` is only read once per pid, and when a scan gets expensive the
+next one is deferred so its cost stays a small slice of wall time.
+
 Process display names are improved by reading ``cmdline``: for Python processes
 the script basename is used (e.g. ``personal_greeter.py``) instead of the generic
 ``python``; for other interpreters the script/module basename is preferred.
@@ -20,10 +25,18 @@ import logging
 import os
 import re
 import time
+from dataclasses import dataclass
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# A process scan cheaper than this runs every call; a slower one defers the
+# next scan so scanning takes at most ~5% of wall time.
+PROCESS_SCAN_BUDGET_SECONDS = 0.05
+PROCESS_SCAN_MAX_INTERVAL_SECONDS = 10.0
+# Cap on ``/proc/<pid>/stat`` descriptors kept open between scans.
+DEFAULT_MAX_OPEN_PROC_FDS = 256
+
 # Chrome-family browser binary basenames → display prefix
 _CHROME_DISPLAY_PREFIX: dict[str, str] = {
     "chrome": "chrome",
@@ -115,6 +128,16 @@ def _classify_chrome_process(args: list[str]) -> str | None:
     return f"{prefix} {label}"
 
 
+@dataclass(slots=True)
+class _ProcessEntry:
+    """Scan state kept for one pid between snapshots."""
+
+    comm: str
+    start_ticks: int
+    cpu_ticks: int
+    fd: int | None = None
+
+
 class HostSystemMonitorService:
     """
     Two-sample host system-resource monitor reading from ``/proc``.
@@ -147,8 +170,23 @@ class HostSystemMonitorService:
         self._sys_root: str = sys_root or "/sys"
         # Previous aggregate CPU counters: {"total": int, "idle": int}
         self._prev_cpu: dict[str, int] | None = None
-        # Previous per-process data: {pid: (comm, utime+stime)}
-        self._prev_proc_info: dict[int, tuple[str, int]] = {}
+        # Per-process scan state: {pid: _ProcessEntry}
+        self._proc_entries: dict[int, _ProcessEntry] = {}
+        # Display names resolved from cmdline, kept for the pid's lifetime.
+        self._proc_display_cache: dict[int, tuple[str, str | None] | None] = {}
+        # Aggregate CPU ticks at the last process scan (delta denominator).
+        self._proc_baseline_total: int | None = None
+        self._open_proc_fds = 0
+        self._max_open_proc_fds = max(
+            0,
+            int(
+                os.getenv(
+                    "HOST_SYSTEM_MONITOR_MAX_PROC_FDS", str(DEFAULT_MAX_OPEN_PROC_FDS)
+                )
+            ),
+        )
+        self._next_process_scan_at = 0.0
+        self._last_processes: list[dict[str, Any]] = []
         # Previous aggregate disk counters.
         self._prev_disk_stats: dict[str, int] | None = None
         self._prev_timestamp: float | None = None
@@ -241,11 +279,11 @@ class HostSystemMonitorService:
             # -- per-process CPU -----------------------------------------------
             section_started = time.monotonic()
             if top_limit > 0:
-                processes = self._read_processes(cur_cpu, prev_cpu, top_limit)
+                processes = self._read_processes(cur_cpu, top_limit)
             else:
                 processes = []
                 self._last_process_scan_count = 0
-                self._prev_proc_info = {}
+                self._reset_process_scan()
             _mark("processes", section_started)
             section_started = time.monotonic()
             disk = self._read_disk_io(interval)
@@ -763,14 +801,15 @@ class HostSystemMonitorService:
     def _read_processes(
         self,
         cur_cpu: dict[str, int],
-        prev_cpu: dict[str, int] | None,
         top_limit: int,
     ) -> list[dict[str, Any]]:
         """
         Return top *top_limit* processes sorted by CPU percent of total capacity.
 
-        Uses the delta between previously-stored per-process ticks and the
-        current ticks.  The denominator is the total-system CPU tick delta.
+        Uses the delta between the per-process ticks and the total-system CPU
+        ticks recorded at the previous scan.  When the previous scan was slow
+        the scan is skipped and the last result is returned until the
+        adaptive interval has passed.
 
         Each entry::
 
@@ -783,66 +822,95 @@ class HostSystemMonitorService:
         suitable for tooltips.  Returns an empty list on the first call
         (warming).
         """
-        # Read current per-process data
-        cur_proc: dict[int, tuple[str, int]] = {}
+        started = time.monotonic()
+        if self._proc_entries and started < self._next_process_scan_at:
+            return self._last_processes[:top_limit]
+
+        processes = self._scan_processes(cur_cpu, top_limit)
+        cost = time.monotonic() - started
+        self._next_process_scan_at = started + self._process_scan_interval(cost)
+        self._last_processes = processes
+        return processes
+
+    @staticmethod
+    def _process_scan_interval(cost_seconds: float) -> float:
+        """Return how long to wait before the next scan given the last scan's cost."""
+        if cost_seconds <= PROCESS_SCAN_BUDGET_SECONDS:
+            return 0.0
+        return min(
+            PROCESS_SCAN_MAX_INTERVAL_SECONDS,
+            cost_seconds / PROCESS_SCAN_BUDGET_SECONDS,
+        )
+
+    def _scan_processes(
+        self,
+        cur_cpu: dict[str, int],
+        top_limit: int,
+    ) -> list[dict[str, Any]]:
+        """Update per-pid state from ``/proc`` and build the top-process list."""
         try:
-            for entry in os.listdir(self._proc_root):
-                if not entry.isdigit():
-                    continue
-                pid = int(entry)
-                name, utime, stime = self._read_proc_stat(pid)
-                if name is None:
-                    continue
-                cur_proc[pid] = (name, utime + stime)
-            self._last_process_scan_count = len(cur_proc)
+            with os.scandir(self._proc_root) as entries:
+                pids = [int(entry.name) for entry in entries if entry.name.isdigit()]
         except OSError as exc:
             logger.debug("Can't enumerate /proc: %s", exc)
             self._last_process_scan_count = 0
             return []
 
-        # First call – store as baseline and return nothing.
-        if not self._prev_proc_info:
-            self._prev_proc_info = cur_proc
+        candidates: list[tuple[int, int, str]] = []
+        seen: set[int] = set()
+        for pid in pids:
+            entry = self._proc_entries.get(pid)
+            parsed = self._read_proc_stat(pid, entry)
+            if parsed is None:
+                if entry is not None:
+                    self._forget_process(pid)
+                continue
+            name, cpu_ticks, start_ticks = parsed
+            seen.add(pid)
+            if entry is not None and entry.start_ticks != start_ticks:
+                # PID reused by a new process.
+                self._forget_process(pid)
+                entry = None
+            if entry is None:
+                self._proc_entries[pid] = _ProcessEntry(
+                    comm=name,
+                    start_ticks=start_ticks,
+                    cpu_ticks=cpu_ticks,
+                    fd=self._open_proc_stat_fd(pid),
+                )
+                continue
+            clk_delta = cpu_ticks - entry.cpu_ticks
+            entry.comm = name
+            entry.cpu_ticks = cpu_ticks
+            if clk_delta > 0:
+                candidates.append((clk_delta, pid, name))
+
+        for pid in [pid for pid in self._proc_entries if pid not in seen]:
+            self._forget_process(pid)
+        self._last_process_scan_count = len(seen)
+
+        baseline_total = self._proc_baseline_total
+        self._proc_baseline_total = cur_cpu["total"]
+        # First call – state stored as baseline, return nothing.
+        if baseline_total is None:
             return []
-
-        total_delta = cur_cpu["total"] - (
-            prev_cpu or self._prev_cpu or {}
-        ).get("total", cur_cpu["total"])
+        total_delta = cur_cpu["total"] - baseline_total
         if total_delta <= 0:
-            self._prev_proc_info = cur_proc
             return []
 
         ram_total = self._read_meminfo().get("MemTotal", 0)
-        candidates: list[tuple[float, int, str]] = []
-
-        # Cache for cmdline reads (lazy, per pid).
-        # Values are (display_name, detail_or_None) or None for unresolvable.
-        cmdline_cache: dict[int, tuple[str, str | None] | None] = {}
-
-        for pid, (cur_name, cur_clk) in cur_proc.items():
-            prev_data = self._prev_proc_info.get(pid)
-            if prev_data is None:
-                continue
-
-            prev_name, prev_clk = prev_data
-            clk_delta = cur_clk - prev_clk
-            if clk_delta <= 0:
-                continue
-
-            cpu_pct = min(100.0, max(0.0, clk_delta / total_delta * 100.0))
-            candidates.append((cpu_pct, pid, cur_name))
-
         candidates.sort(key=lambda item: item[0], reverse=True)
         detail_limit = max(top_limit, min(len(candidates), top_limit * 4))
         processes: list[dict[str, Any]] = []
 
-        for cpu_pct, pid, cur_name in candidates[:detail_limit]:
+        for clk_delta, pid, cur_name in candidates[:detail_limit]:
+            cpu_pct = min(100.0, max(0.0, clk_delta / total_delta * 100.0))
             rss = self._read_proc_rss(pid)
             mem_pct = _pct(rss, ram_total)
 
-            # Resolve a more descriptive display name via cmdline
+            # Resolve a more descriptive display name via cmdline (cached per pid)
             display_name, detail = self._resolve_display_name(
-                pid, cur_name, cmdline_cache
+                pid, cur_name, self._proc_display_cache
             )
 
             processes.append(
@@ -857,9 +925,24 @@ class HostSystemMonitorService:
                 }
             )
 
-        self._prev_proc_info = cur_proc
         return processes[:top_limit]
 
+    def _forget_process(self, pid: int) -> None:
+        """Drop cached state for an exited (or reused) pid."""
+        entry = self._proc_entries.pop(pid, None)
+        self._proc_display_cache.pop(pid, None)
+        if entry is not None and entry.fd is not None:
+            self._close_proc_fd(entry.fd)
+
+    def _reset_process_scan(self) -> None:
+        """Close cached descriptors and forget all per-process state."""
+        for pid in list(self._proc_entries):
+            self._forget_process(pid)
+        self._proc_display_cache.clear()
+        self._proc_baseline_total = None
+        self._next_process_scan_at = 0.0
+        self._last_processes = []
+
     @staticmethod
     def _truncate_display_name(name: str, max_len: int = 64) -> str:
         """Truncate an overly long display name, preserving the end suffix if helpful."""
@@ -965,30 +1048,62 @@ class HostSystemMonitorService:
     # Single-process readers
     # ------------------------------------------------------------------
 
-    def _read_proc_stat(self, pid: int) -> tuple[str | None, int, int]:
+    def _read_proc_stat(
+        self,
+        pid: int,
+        entry: _ProcessEntry | None = None,
+    ) -> tuple[str, int, int] | None:
         """
-        Read ``/proc/<pid>/stat`` → ``(name, utime, stime)``.
+        Read ``/proc/<pid>/stat`` → ``(name, utime + stime, starttime)``.
 
-        Returns ``(None, 0, 0)`` on any error (missing PID, permission).
+        Re-reads the entry's cached descriptor when there is one.  Returns
+        ``None`` on any error (exited PID, permission, malformed line).
         """
         try:
-            with open(f"{self._proc_root}/{pid}/stat", encoding="utf-8") as f:
-                raw = f.read()
+            if entry is not None and entry.fd is not None:
+                raw = os.pread(entry.fd, 4096, 0)
+            else:
+                with open(f"{self._proc_root}/{pid}/stat", "rb") as f:
+                    raw = f.read()
         except OSError:
-            return None, 0, 0
+            return None
+        return self._parse_proc_stat(raw.decode("utf-8", errors="replace"))
 
+    @staticmethod
+    def _parse_proc_stat(raw: str) -> tuple[str, int, int] | None:
+        """Parse a ``stat`` line; the name may itself contain ``)``."""
         try:
             name_end = raw.rfind(")")
             if name_end == -1:
-                return None, 0, 0
+                return None
             name_start = raw.index("(") + 1
             name = raw[name_start:name_end]
             after = raw[name_end + 2 :].split()  # skip ") "
             utime = int(after[11]) if len(after) > 11 else 0
             stime = int(after[12]) if len(after) > 12 else 0
-            return name, utime, stime
+            start_ticks = int(after[19]) if len(after) > 19 else 0
+            return name, utime + stime, start_ticks
         except (ValueError, IndexError):
-            return None, 0, 0
+            return None
+
+    def _open_proc_stat_fd(self, pid: int) -> int | None:
+        """Open a descriptor for ``/proc/<pid>/stat`` while under the fd cap."""
+        if self._open_proc_fds >= self._max_open_proc_fds:
+            return None
+        try:
+            fd = os.open(f"{self._proc_root}/{pid}/stat", os.O_RDONLY)
+        except OSError:
+            return None
+        self._open_proc_fds += 1
+        return fd
+
+    def _close_proc_fd(self, fd: int) -> None:
+        """Close a cached ``stat`` descriptor."""
+        self._open_proc_fds -= 1
+        try:
+            os.close(fd)
+        except OSError:
+            pass
 
     def _read_proc_rss(self, pid: int) -> int:
         """Return RSS in bytes from ``/proc/<pid>/status``, or 0."""
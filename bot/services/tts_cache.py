@@ -0,0 +1,191 @@
+"""
+Content-addressed on-disk cache of synthesized TTS audio.
+
+Each entry is the final, loudness-normalized MP3 for one synthesis request,
+stored as ``<sha256>.mp3`` where the hash covers everything that changes
+the audio: provider, voice, model, language, text and the post-processing
+settings (loudnorm mode/targets, output format, gain). A hit is copied into
+``sounds/`` under the request's usual filename, so playback,
+replay and the database row work exactly as for a fresh synthesis while the
+provider call and both ffmpeg loudnorm passes are skipped.
+
+Recency and eviction are handled by ``DiskLRU``: hits refresh the file
+mtime, so recency survives restarts, and entries are evicted
+least-recently-used once the directory exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from bot.metrics import REGISTRY
+from bot.services.disk_lru import DiskLRU
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_LOOKUPS = REGISTRY.counter(
+    "tts_cache_lookups",
+    "TTS synthesis cache lookups by provider and result (hit/miss).",
+    ("provider", "result"),
+)
+TTS_CACHE_BYTES = REGISTRY.gauge(
+    "tts_cache_bytes",
+    "Bytes currently stored in the TTS synthesis cache.",
+)
+TTS_CACHE_EVICTIONS = REGISTRY.counter(
+    "tts_cache_evictions",
+    "TTS synthesis cache entries evicted to stay under the size limit.",
+)
+
+CACHE_SUFFIX = ".mp3"
+
+
+def tts_cache_key(
+    provider: str,
+    *,
+    voice: Optional[str],
+    model: Optional[str],
+    language: Optional[str],
+    text: str,
+    settings: Optional[dict[str, Any]] = None,
+) -> str:
+    """
+    Return the content address of one synthesis request.
+
+    Args:
+        provider: Synthesis backend (``gtts``, ``elevenlabs``).
+        voice: Voice id, character or regional variant.
+        model: Provider model id, if any.
+        language: Language code.
+        text: Exact text sent to the provider.
+        settings: Post-processing and request options that change the audio.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "voice": voice,
+            "model": model,
+            "language": language,
+            "text": text,
+            "settings": settings or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """
+    Size-bounded LRU of synthesized TTS files.
+
+    Args:
+        directory: Cache directory (created on first store).
+        max_bytes: Total size kept before evicting least-recently-used files.
+        enabled: When ``False`` every lookup misses and nothing is stored.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, enabled: bool = True) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.enabled = enabled and self.max_bytes > 0
+        self._lru = DiskLRU(
+            self.directory,
+            CACHE_SUFFIX,
+            self.max_bytes,
+            bytes_gauge=TTS_CACHE_BYTES,
+            evictions=TTS_CACHE_EVICTIONS,
+            log_prefix="[TTSCache]",
+        )
+
+    @classmethod
+    def from_env(cls) -> "TTSAudioCache":
+        """Build the cache from ``TTS_CACHE_*`` environment variables."""
+        import config
+
+        enabled = os.getenv("TTS_CACHE_ENABLED", "true").strip().lower() in ("true", "1", "yes")
+        directory = os.getenv("TTS_CACHE_DIR") or str(Path(config.DATA_DIR) / "tts_cache")
+        try:
+            max_mb = float(os.getenv("TTS_CACHE_MAX_MB", "200"))
+        except ValueError:
+            max_mb = 200.0
+        return cls(directory, int(max_mb * 1024 * 1024), enabled=enabled)
+
+    def fetch(self, key: str, destination: str, provider: str) -> bool:
+        """
+        Materialize a cached entry at ``destination``.
+
+        Args:
+            key: Content address from ``tts_cache_key``.
+            destination: Path the caller would have synthesized into.
+            provider: Metrics label.
+
+        Returns:
+            ``True`` on a hit (``destination`` now holds the audio).
+        """
+        if not self.enabled:
+            return False
+        hit = self._lru.lookup(key)
+        if hit:
+            try:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.copyfile(self._lru.path(key), destination)
+            except Exception as e:
+                logger.warning("[TTSCache] Dropping unreadable entry %s: %s", key, e)
+                self._lru.forget(key)
+                hit = False
+            else:
+                self._lru.touch(key)
+        TTS_CACHE_LOOKUPS.inc(provider=provider, result="hit" if hit else "miss")
+        return hit
+
+    def store(self, key: str, source: str) -> None:
+        """
+        Add a freshly synthesized file to the cache and evict old entries.
+
+        Failures are logged and ignored; the cache is an optimization only.
+        """
+        if not self.enabled:
+            return
+        target = self._lru.path(key)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, target)
+            size = target.stat().st_size
+        except Exception as e:
+            logger.warning("[TTSCache] Could not store %s: %s", source, e)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+
+        self._lru.add(key, size)
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry count, size and per-provider hit rates."""
+        count, total = self._lru.stats()
+        providers = {}
+        for provider in ("gtts", "elevenlabs"):
+            hits = TTS_CACHE_LOOKUPS.value(provider=provider, result="hit")
+            misses = TTS_CACHE_LOOKUPS.value(provider=provider, result="miss")
+            lookups = hits + misses
+            providers[provider] = {
+                "hits": int(hits),
+                "misses": int(misses),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes, "providers": providers}
+
@@ -37,6 +37,7 @@ aliases ("bote", "bota", "boto") configured via VOICE_COMMAND_WAKE_ALIASES.
 """
 
 import asyncio
+import contextlib
 import io
 import json
 import logging
@@ -50,6 +51,7 @@ from typing import Any, Optional
 
 import aiohttp
 
+from bot.services.http_client import PROVIDER_CHAT_LLM, PROVIDER_GROQ, get_http_client
 from config import PROJECT_ROOT
 
 logger = logging.getLogger(__name__)
@@ -182,7 +184,11 @@ class GroqWhisperService:
         """Return True when a GROQ_API_KEY is configured."""
         return bool(self.api_key)
 
-    async def transcribe_detailed(self, wav_bytes: bytes) -> GroqWhisperResult:
+    async def transcribe_detailed(
+        self,
+        wav_bytes: bytes,
+        session: aiohttp.ClientSession | None = None,
+    ) -> GroqWhisperResult:
         """Transcribe a WAV file via Groq Whisper and return a detailed result.
 
         Unlike ``transcribe()`` which collapses empty/failure into ``None``,
@@ -194,6 +200,7 @@ class GroqWhisperService:
 
         Args:
             wav_bytes: Complete WAV file bytes (RIFF header + PCM data).
+            session: Session to use instead of the pooled Groq session.
 
         Returns:
             A ``GroqWhisperResult`` with the outcome.
@@ -222,8 +229,13 @@ class GroqWhisperService:
 
         try:
             timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, headers=headers, data=data) as resp:
+            borrowed = (
+                contextlib.nullcontext(session)
+                if session is not None
+                else get_http_client().borrow(PROVIDER_GROQ)
+            )
+            async with borrowed as http:
+                async with http.post(url, headers=headers, data=data, timeout=timeout) as resp:
                     if resp.status != 200:
                         error_text = await resp.text()
                         logger.error(
@@ -303,8 +315,8 @@ class GroqWhisperService:
 
         try:
             timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, headers=headers, data=data) as resp:
+            async with get_http_client().borrow(PROVIDER_GROQ) as session:
+                async with session.post(url, headers=headers, data=data, timeout=timeout) as resp:
                     if resp.status != 200:
                         error_text = await resp.text()
                         logger.error(
@@ -579,11 +591,12 @@ class VenturaChatService:
         start_time = time.perf_counter()
         try:
             timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with get_http_client().borrow(PROVIDER_CHAT_LLM) as session:
                 async with session.post(
                     self.api_url,
                     headers=self._build_headers(),
                     json=payload,
+                    timeout=timeout,
                 ) as resp:
                     latency = time.perf_counter() - start_time
                     logger.info(
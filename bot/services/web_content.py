@@ -5,17 +5,79 @@ Service layer for web soundboard content endpoints.
 from __future__ import annotations
 
 import math
-from collections.abc import Sequence
+import threading
+from collections.abc import Callable, Hashable, Sequence
 from pathlib import Path
 from typing import Any
 
 from mutagen.mp3 import MP3
 
-from bot.models.web import DiscordWebUser, PaginatedQuery
+from bot.models.web import DiscordWebUser, PageCursor, PaginatedQuery
 from bot.repositories.web_content import WebContentRepository
+from bot.repositories.web_filter_facets import (
+    VERSION_ACTIONS,
+    VERSION_FAVORITES,
+    VERSION_LISTS,
+    VERSION_SOUNDS,
+)
 from bot.repositories.web_user_access import WebUserAccessRepository
+from bot.services.sound_duration import SoundDurationCache
 from bot.services.text_censor import TextCensorService
 
+# Upper bound on explicit sound IDs per duration request.
+MAX_DURATION_BATCH = 5000
+
+
+class FilterFacetCache:
+    """
+    Per-process memo of table filter options keyed by facet versions.
+
+    Entries are reused until the ``web_filter_facet_versions`` counters for
+    their groups change, so repeated page loads cost one small version read
+    instead of rebuilding every option list.
+
+    Args:
+        max_entries: Entries kept before the whole memo is cleared.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: dict[Hashable, tuple[tuple[int, ...], dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        version: tuple[int, ...],
+        producer: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """
+        Return cached filters for *key* or produce them for this version.
+
+        Args:
+            key: Endpoint, filter-key and guild identity.
+            version: Current counters for the groups the filters depend on.
+            producer: Zero-argument callable that queries the filters.
+
+        Returns:
+            The cached or freshly produced filters.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        filters = producer()
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            self._entries[key] = (version, filters)
+        return filters
+
+    @property
+    def size(self) -> int:
+        """Return the current number of cached entries."""
+        return len(self._entries)
+
 
 class WebContentService:
     """
@@ -28,6 +90,8 @@ class WebContentService:
         text_censor_service: TextCensorService,
         user_access_repository: WebUserAccessRepository,
         sounds_dir: str | Path | None = None,
+        filter_facet_cache: FilterFacetCache | None = None,
+        duration_cache: SoundDurationCache | None = None,
     ) -> None:
         """
         Initialize the service.
@@ -37,11 +101,16 @@ class WebContentService:
             text_censor_service: Service used to censor text for web output.
             user_access_repository: Repository for web-session access checks.
             sounds_dir: Directory containing playable MP3 files.
+            filter_facet_cache: Optional per-process memo for filter options.
+            duration_cache: Optional per-process duration map; without one,
+                durations are read from disk on every request.
         """
         self.repository = repository
         self.text_censor_service = text_censor_service
         self.user_access_repository = user_access_repository
         self.sounds_dir = Path(sounds_dir) if sounds_dir is not None else None
+        self.filter_facet_cache = filter_facet_cache
+        self.duration_cache = duration_cache or SoundDurationCache()
 
     def get_actions(
         self,
@@ -63,7 +132,7 @@ class WebContentService:
             API response payload.
         """
         rows = self.repository.get_actions_page(query)
-        total_count = self.repository.count_actions(query)
+        total_count = self._count_rows(query, self.repository.count_actions)
         should_censor = self._should_censor(current_user)
         return {
             "items": [
@@ -92,6 +161,7 @@ class WebContentService:
             ],
             "total_count": total_count,
             "total_pages": self._calculate_total_pages(total_count, query.per_page),
+            "next_cursor": self._build_next_cursor(rows, query, "timestamp", "action_id"),
             "filters": self._get_action_filters(query, include_filters, filter_keys),
         }
 
@@ -111,21 +181,22 @@ class WebContentService:
             include_filters: Whether to include filter metadata in the response.
             filter_keys: Optional subset of favorite filter groups to fetch.
             current_user: Optional authenticated Discord web user.
-            include_durations: Whether to read MP3 metadata for displayed sounds.
+            include_durations: Whether to attach durations for displayed sounds.
 
         Returns:
             API response payload.
         """
         rows = self.repository.get_favorites_page(query)
-        total_count = self.repository.count_favorites(query)
+        total_count = self._count_rows(query, self.repository.count_favorites)
         should_censor = self._should_censor(current_user)
+        durations = self._get_row_durations(rows) if include_durations else {}
         return {
             "items": [
                 {
                     **self._format_sound_item(
                         row,
                         should_censor=should_censor,
-                        include_duration=include_durations,
+                        duration_seconds=durations.get(int(row["sound_id"])),
                     ),
                     "favorite": bool(row.get("favorite")),
                     "slap": bool(row.get("slap")),
@@ -135,6 +206,7 @@ class WebContentService:
             ],
             "total_count": total_count,
             "total_pages": self._calculate_total_pages(total_count, query.per_page),
+            "next_cursor": self._build_next_cursor(rows, query, "last_favorited", "sound_id"),
             "filters": self._get_favorite_filters(query, include_filters, filter_keys),
         }
 
@@ -154,21 +226,22 @@ class WebContentService:
             include_filters: Whether to include filter metadata in the response.
             filter_keys: Optional subset of all-sounds filter groups to fetch.
             current_user: Optional authenticated Discord web user.
-            include_durations: Whether to read MP3 metadata for displayed sounds.
+            include_durations: Whether to attach durations for displayed sounds.
 
         Returns:
             API response payload.
         """
         rows = self.repository.get_all_sounds_page(query)
-        total_count = self.repository.count_all_sounds(query)
+        total_count = self._count_rows(query, self.repository.count_all_sounds)
         should_censor = self._should_censor(current_user)
+        durations = self._get_row_durations(rows) if include_durations else {}
         return {
             "items": [
                 {
                     **self._format_sound_item(
                         row,
                         should_censor=should_censor,
-                        include_duration=include_durations,
+                        duration_seconds=durations.get(int(row["sound_id"])),
                     ),
                     "favorite": bool(row.get("favorite")),
                     "slap": bool(row.get("slap")),
@@ -178,6 +251,7 @@ class WebContentService:
             ],
             "total_count": total_count,
             "total_pages": self._calculate_total_pages(total_count, query.per_page),
+            "next_cursor": self._build_next_cursor(rows, query, "timestamp", "sound_id"),
             "filters": self._get_all_sound_filters(query, include_filters, filter_keys),
         }
 
@@ -185,48 +259,59 @@ class WebContentService:
         self,
         sound_ids: Sequence[int],
         guild_id: int | str | None = None,
+        include_all: bool = False,
     ) -> dict[str, Any]:
         """
-        Read MP3 durations for a batch of sound IDs from disk and return them.
+        Return formatted durations for a batch of sound IDs.
 
-        Deduplicates input IDs, caps the batch to 50, and silently skips
-        IDs whose file is missing or whose metadata cannot be read.
+        Durations come from the per-process duration map; only sounds it has
+        not seen yet are read from disk. Deduplicates input IDs, caps the
+        batch to ``MAX_DURATION_BATCH``, and silently skips IDs whose file is
+        missing or whose metadata cannot be read.
 
         Args:
             sound_ids: Sound database IDs to look up.
             guild_id: Optional guild scope for repository filtering.
+            include_all: Return every visible sound in scope instead of
+                ``sound_ids``.
 
         Returns:
             JSON-friendly payload with a ``durations`` mapping, e.g.
             ``{"durations": {"1": "1:12", "2": "0:15"}}``.
         """
-        # Deduplicate and validate
-        seen: set[int] = set()
-        unique_ids: list[int] = []
-        for sid in sound_ids:
-            sid_int = int(sid) if not isinstance(sid, int) else sid
-            if sid_int > 0 and sid_int not in seen:
-                seen.add(sid_int)
-                unique_ids.append(sid_int)
-
-        if not unique_ids:
-            return {"durations": {}}
-
-        # Cap batch size
-        unique_ids = unique_ids[:50]
-
-        rows = self.repository.get_sound_duration_rows(unique_ids, guild_id=guild_id)
-        durations: dict[str, str] = {}
-        for row in rows:
-            sound_id = str(row["sound_id"])
-            duration_seconds = self._read_sound_duration_seconds(
-                row.get("filename"),
-                fallback_filename=row.get("original_filename"),
+        if include_all:
+            rows = self.repository.get_sound_duration_rows(None, guild_id=guild_id)
+        else:
+            # Deduplicate and validate
+            seen: set[int] = set()
+            unique_ids: list[int] = []
+            for sid in sound_ids:
+                sid_int = int(sid) if not isinstance(sid, int) else sid
+                if sid_int > 0 and sid_int not in seen:
+                    seen.add(sid_int)
+                    unique_ids.append(sid_int)
+
+            if not unique_ids:
+                return {"durations": {}}
+
+            rows = self.repository.get_sound_duration_rows(
+                unique_ids[:MAX_DURATION_BATCH],
+                guild_id=guild_id,
             )
-            if duration_seconds is not None:
-                durations[sound_id] = self._format_duration(duration_seconds)
 
-        return {"durations": durations}
+        durations = self._get_row_durations(rows)
+        return {
+            "durations": {
+                str(sound_id): self._format_duration(seconds)
+                for sound_id, seconds in sorted(durations.items())
+            }
+        }
+
+    def get_sound_durations_version(self) -> int | None:
+        """Return a cheap validator for ``get_sound_durations`` payloads, if any."""
+        if self.sounds_dir is None:
+            return None
+        return self.duration_cache.version()
 
     def _get_action_filters(
         self,
@@ -237,7 +322,11 @@ class WebContentService:
         """Return scoped action filters when requested."""
         if not include_filters:
             return {}
-        return self.repository.get_action_filters(filter_keys, guild_id=query.guild_id)
+        return self._get_cached_filters(
+            ("actions", filter_keys, query.guild_id),
+            (VERSION_ACTIONS,),
+            lambda: self.repository.get_action_filters(filter_keys, guild_id=query.guild_id),
+        )
 
     def _get_favorite_filters(
         self,
@@ -248,7 +337,11 @@ class WebContentService:
         """Return scoped favorite filters when requested."""
         if not include_filters:
             return {}
-        return self.repository.get_favorite_filters(filter_keys, guild_id=query.guild_id)
+        return self._get_cached_filters(
+            ("favorites", filter_keys, query.guild_id),
+            (VERSION_SOUNDS, VERSION_FAVORITES),
+            lambda: self.repository.get_favorite_filters(filter_keys, guild_id=query.guild_id),
+        )
 
     def _get_all_sound_filters(
         self,
@@ -259,7 +352,26 @@ class WebContentService:
         """Return scoped all-sound filters when requested."""
         if not include_filters:
             return {}
-        return self.repository.get_all_sound_filters(filter_keys, guild_id=query.guild_id)
+        return self._get_cached_filters(
+            ("all_sounds", filter_keys, query.guild_id),
+            (VERSION_SOUNDS, VERSION_LISTS),
+            lambda: self.repository.get_all_sound_filters(filter_keys, guild_id=query.guild_id),
+        )
+
+    def _get_cached_filters(
+        self,
+        key: tuple[Any, ...],
+        groups: tuple[str, ...],
+        producer: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Serve filters from the facet memo while their version groups are unchanged."""
+        if self.filter_facet_cache is None:
+            return producer()
+        versions = self.repository.get_filter_facet_versions()
+        if versions is None:
+            return producer()
+        version = tuple(versions.get(group, 0) for group in groups)
+        return self.filter_facet_cache.get_or_set(key, version, producer)
 
     def _censor_text(self, value: str | None, should_censor: bool) -> str | None:
         """Censor hateful text for web responses when needed."""
@@ -281,7 +393,7 @@ class WebContentService:
         self,
         row: dict[str, Any],
         should_censor: bool,
-        include_duration: bool = True,
+        duration_seconds: float | None = None,
     ) -> dict[str, Any]:
         """Format a sound row for web table output."""
         item = {
@@ -306,16 +418,22 @@ class WebContentService:
                 before_at = row.get("first_seen_at")
             if before_at:
                 item["upload_before_at"] = before_at
-        if not include_duration:
-            return item
+        if duration_seconds is not None:
+            item["display_duration"] = self._format_duration(duration_seconds)
+        return item
+
+    def _get_row_durations(self, rows: Sequence[dict[str, Any]]) -> dict[int, float]:
+        """Return durations for sound rows from the duration map (disk on miss)."""
+        if self.sounds_dir is None:
+            return {}
+        return self.duration_cache.get_durations(rows, self._read_row_duration_seconds)
 
-        duration_seconds = self._read_sound_duration_seconds(
+    def _read_row_duration_seconds(self, row: dict[str, Any]) -> float | None:
+        """Read one sound row's MP3 duration, trying the original file after renames."""
+        return self._read_sound_duration_seconds(
             row.get("filename"),
             fallback_filename=row.get("original_filename"),
         )
-        if duration_seconds is not None:
-            item["display_duration"] = self._format_duration(duration_seconds)
-        return item
 
     def _read_sound_duration_seconds(
         self,
@@ -369,6 +487,46 @@ class WebContentService:
         )
 
     @staticmethod
-    def _calculate_total_pages(total_count: int, per_page: int) -> int:
+    def _count_rows(
+        query: PaginatedQuery,
+        counter: Callable[[PaginatedQuery], int],
+    ) -> int | None:
+        """Run the count query unless a cursor-driven client opted out of it."""
+        if query.cursor is not None and not query.include_count:
+            return None
+        return counter(query)
+
+    @staticmethod
+    def _build_next_cursor(
+        rows: Sequence[dict[str, Any]],
+        query: PaginatedQuery,
+        timestamp_key: str,
+        id_key: str,
+    ) -> str | None:
+        """
+        Return the keyset cursor for the page after ``rows``.
+
+        A short page means the scan reached the end, so no cursor is returned.
+        Relevance-ranked search pages carry ``search_rank`` and are paged by
+        offset, so they get no cursor either.
+        """
+        if query.per_page <= 0 or len(rows) < query.per_page:
+            return None
+        last_row = rows[-1]
+        if last_row.get("search_rank") is not None:
+            return None
+        row_id = last_row.get(id_key)
+        if row_id is None:
+            return None
+        timestamp = last_row.get(timestamp_key)
+        return PageCursor(
+            timestamp=str(timestamp) if timestamp is not None else None,
+            id=int(row_id),
+        ).encode()
+
+    @staticmethod
+    def _calculate_total_pages(total_count: int | None, per_page: int) -> int | None:
         """Calculate the total number of pages for a paginated response."""
+        if total_count is None:
+            return None
         return math.ceil(total_count / per_page) if per_page > 0 else 0
@@ -5,7 +5,8 @@ Service layer for the web control-room status panel.
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+import time
+from collections.abc import Callable, Mapping
 from typing import Any
 
 from bot.models.web import DiscordWebUser
@@ -25,6 +26,7 @@ class WebControlRoomService:
         db_path: str,
         text_censor_service: TextCensorService,
         env: Mapping[str, str] | None = None,
+        time_func: Callable[[], float] = time.time,
     ) -> None:
         """
         Initialize the service.
@@ -34,11 +36,13 @@ class WebControlRoomService:
             db_path: SQLite database path.
             text_censor_service: Service used to mask usernames for web output.
             env: Optional environment mapping for deterministic tests.
+            time_func: Clock used to extrapolate elapsed/mute counters.
         """
         self.repository = repository
         self.db_path = db_path
         self.text_censor_service = text_censor_service
         self.env = env
+        self._time = time_func
 
     def get_status(
         self,
@@ -60,7 +64,7 @@ class WebControlRoomService:
             db_path=self.db_path,
             env=self.env,
         )
-        runtime_status = self.repository.get_status(guild_id)
+        runtime_status = self._extrapolate_status(self.repository.get_status(guild_id))
         mute_state = get_web_control_state(
             requested_guild_id=guild_id,
             db_path=self.db_path,
@@ -84,6 +88,32 @@ class WebControlRoomService:
             "mute": mute_state,
         }
 
+    def _extrapolate_status(self, status: dict[str, Any] | None) -> dict[str, Any] | None:
+        """
+        Advance clock-driven counters from when the bot sampled them.
+
+        The bot only rewrites its status row on changes, so elapsed playback
+        time and mute remaining time are projected forward from
+        ``sampled_at_unix``. Rows without it are returned as stored.
+        """
+        if not status or status.get("sampled_at_unix") is None:
+            return status
+        age = max(0.0, self._time() - float(status["sampled_at_unix"]))
+        status = dict(status)
+
+        elapsed = self._coerce_optional_float(status.get("current_elapsed_seconds"))
+        if elapsed is not None and status.get("is_playing") and not status.get("is_paused"):
+            elapsed += age
+            duration = self._coerce_optional_float(status.get("current_duration_seconds"))
+            if duration is not None and duration > 0:
+                elapsed = min(duration, elapsed)
+            status["current_elapsed_seconds"] = elapsed
+
+        if status.get("muted"):
+            remaining = int(status.get("mute_remaining_seconds") or 0)
+            status["mute_remaining_seconds"] = max(0, int(round(remaining - age)))
+        return status
+
     def _format_status(
         self,
         status: dict[str, Any] | None,
@@ -104,6 +134,7 @@ class WebControlRoomService:
                 "current_requester": None,
                 "current_duration_seconds": None,
                 "current_elapsed_seconds": None,
+                "recent_play_traces": [],
                 "updated_at": None,
             }
 
@@ -130,6 +161,7 @@ class WebControlRoomService:
             "current_elapsed_seconds": self._coerce_optional_float(
                 status.get("current_elapsed_seconds")
             ),
+            "recent_play_traces": self._decode_play_traces(status.get("recent_play_traces")),
             "updated_at": status.get("updated_at"),
         }
 
@@ -173,6 +205,18 @@ class WebControlRoomService:
             )
         return formatted
 
+    def _decode_play_traces(self, value: Any) -> list[dict[str, Any]]:
+        """Decode persisted playback startup traces for API output."""
+        if not value:
+            return []
+        try:
+            traces = json.loads(value)
+        except (TypeError, ValueError):
+            return []
+        if not isinstance(traces, list):
+            return []
+        return [trace for trace in traces if isinstance(trace, dict)]
+
     def _censor_username(
         self,
         value: str | None,
@@ -5,7 +5,6 @@ Service layer for web sound option actions.
 from __future__ import annotations
 
 from pathlib import Path
-import re
 from typing import Any
 
 from rapidfuzz import fuzz
@@ -16,7 +15,10 @@ from bot.repositories.action import ActionRepository
 from bot.repositories.event import EventRepository
 from bot.repositories.list import ListRepository
 from bot.repositories.sound import SoundRepository
+from bot.repositories.sound_neighbors import SoundNeighborRepository
+from bot.repositories.sound_search import normalize_sound_text
 from bot.repositories.voice_activity import VoiceActivityRepository
+from bot.services.sound_neighbors import SoundNeighborIndex
 
 
 class WebSoundOptionsService:
@@ -31,6 +33,7 @@ class WebSoundOptionsService:
         action_repository: ActionRepository,
         event_repository: EventRepository,
         voice_activity_repository: VoiceActivityRepository,
+        neighbor_repository: SoundNeighborRepository | None = None,
     ) -> None:
         """
         Initialize the service.
@@ -41,12 +44,17 @@ class WebSoundOptionsService:
             action_repository: Repository for analytics action logging.
             event_repository: Repository for user join/leave event sounds.
             voice_activity_repository: Repository for tracked voice users.
+            neighbor_repository: Precomputed similar-sound lists; without it
+                similar sounds are always scored live.
         """
         self.sound_repository = sound_repository
         self.list_repository = list_repository
         self.action_repository = action_repository
         self.event_repository = event_repository
         self.voice_activity_repository = voice_activity_repository
+        self.neighbor_index = (
+            SoundNeighborIndex(neighbor_repository) if neighbor_repository is not None else None
+        )
 
     def get_options(
         self,
@@ -381,6 +389,18 @@ class WebSoundOptionsService:
         guild_id: int | str | None,
     ) -> list[dict[str, Any]]:
         """Return similar sounds using the same weighted fuzzy scoring as Discord."""
+        if self.neighbor_index is not None:
+            neighbors = self.neighbor_index.neighbors(sound_id, guild_id, 10, caller="web")
+            if neighbors is not None:
+                return [
+                    {
+                        "sound_id": sound["id"],
+                        "display_filename": sound["Filename"],
+                        "score": int(score),
+                    }
+                    for sound, score in neighbors
+                ]
+
         normalized_request = self._normalize_for_similarity(filename)
         scored_matches: list[tuple[float, Any]] = []
         for row in self.sound_repository.get_similarity_candidates(guild_id=guild_id):
@@ -429,22 +449,5 @@ class WebSoundOptionsService:
 
     @staticmethod
     def _normalize_for_similarity(value: str) -> str:
-        """Mirror Database.normalize_text without binding to the singleton DB path."""
-        text = str(value or "")
-        substitutions = {
-            "0": "o",
-            "1": "i",
-            "3": "e",
-            "4": "a",
-            "5": "s",
-            "7": "t",
-            "@": "a",
-            "$": "s",
-            "!": "i",
-        }
-        for key, replacement in substitutions.items():
-            text = text.replace(key, replacement)
-        text = text.replace(".mp3", "")
-        text = re.sub(r"[-_]+", " ", text)
-        text = re.sub(r"\s+", " ", text).strip()
-        return text.lower()
+        """Normalize a name like the live search, without the singleton DB."""
+        return normalize_sound_text(value)
@@ -341,6 +341,8 @@ class WebSpeechTrainingService:
         label: Optional[str] = None,
         search: str = "",
         sort: str = "newest",
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Return IDs of all clips matching the current filters, without pagination.
 
@@ -350,6 +352,9 @@ class WebSpeechTrainingService:
             label: Optional label filter (``"unlabeled"`` for NULL/empty).
             search: Optional search string.
             sort: Sort preset key (e.g. ``"newest"``, ``"oldest"``, …).
+            offset: Matching clips to skip.
+            limit: Optional maximum number of IDs (``total`` then counts
+                only the returned window).
 
         Returns:
             Dict with ``ids`` (list of ints) and ``total`` (int).
@@ -362,6 +367,8 @@ class WebSpeechTrainingService:
             search=search,
             sort_by=sort_by,
             sort_dir=sort_dir,
+            offset=offset,
+            limit=limit,
         )
         return {"ids": ids, "total": len(ids)}
 
@@ -1459,6 +1466,7 @@ class WebSpeechTrainingService:
             return result
 
         # ── Process clips sequentially with throttling ─────────────────
+        from bot.services.http_client import PROVIDER_GROQ, get_http_client
         from bot.services.voice_command import GroqWhisperService
         from pydub import AudioSegment
 
@@ -1466,6 +1474,11 @@ class WebSpeechTrainingService:
         whisper.api_key = groq_api_key
         whisper.model = groq_whisper_model
 
+        async def _transcribe_clip(clip_wav: bytes) -> GroqWhisperResult:
+            # Every asyncio.run() has its own loop, so use a session closed with it.
+            async with get_http_client().dedicated(PROVIDER_GROQ) as session:
+                return await whisper.transcribe_detailed(clip_wav, session=session)
+
         max_retries = WEB_TRANSCRIPT_429_MAX_RETRIES
         base_backoff = WEB_TRANSCRIPT_429_BACKOFF_SECONDS
         max_backoff = WEB_TRANSCRIPT_429_BACKOFF_MAX_SECONDS
@@ -1494,7 +1507,7 @@ class WebSpeechTrainingService:
                 # ── Transcribe with 429 retry loop ─────────────────
                 result: GroqWhisperResult | None = None
                 for attempt in range(max_retries + 1):
-                    result = asyncio.run(whisper.transcribe_detailed(wav_bytes))
+                    result = asyncio.run(_transcribe_clip(wav_bytes))
 
                     if result.status_code == 429 and attempt < max_retries:
                         # Rate limited — backoff and retry
@@ -31,6 +31,10 @@ import re
 import time
 from typing import Any, Optional
 
+from bot.repositories.system_monitor_timeseries import (
+    SystemMonitorTimeSeriesRepository,
+    timeseries_db_path_for,
+)
 from bot.repositories.web_system_status import WebSystemStatusRepository
 
 logger = logging.getLogger(__name__)
@@ -53,6 +57,7 @@ class WebSystemMonitorService:
         repository: Optional[WebSystemStatusRepository] = None,
         db_path: Optional[str] = None,
         cache_ttl: float = 1.0,
+        timeseries_repository: Optional[SystemMonitorTimeSeriesRepository] = None,
     ) -> None:
         """
         Args:
@@ -62,12 +67,19 @@ class WebSystemMonitorService:
                 not provided.
             cache_ttl: Maximum age (seconds) of the in-memory snapshot cache.
                 Set to 0 to disable caching.  Defaults to 1.0.
+            timeseries_repository: Rollup store for metric history.  Defaults
+                to the file next to the snapshot database.
         """
         self._repo = repository or (
             WebSystemStatusRepository(db_path=db_path, use_shared=False)
             if db_path
             else None
         )
+        self._timeseries_repo = timeseries_repository or (
+            SystemMonitorTimeSeriesRepository(db_path=timeseries_db_path_for(self._repo.db_path))
+            if self._repo is not None
+            else None
+        )
         self._cache_ttl = cache_ttl
 
         # In-process snapshot cache: stores the last valid (available) snapshot
@@ -112,7 +124,7 @@ class WebSystemMonitorService:
         Returns:
             Dict with 'samples' list and 'range_seconds' echoed back.
         """
-        if self._repo is None:
+        if self._timeseries_repo is None:
             return {"samples": [], "range_seconds": range_seconds}
 
         valid_ranges = {60, 3600, 86400}
@@ -127,7 +139,7 @@ class WebSystemMonitorService:
         start_time = end_time - range_seconds
 
         try:
-            samples = self._repo.get_samples(
+            samples = self._timeseries_repo.get_samples(
                 metric_type=metric_type,
                 metric_key=metric_key,
                 start_time=start_time,
@@ -157,11 +169,11 @@ class WebSystemMonitorService:
         Returns:
             Dict with 'processes' list and 'timestamp' echoed back.
         """
-        if self._repo is None:
+        if self._timeseries_repo is None:
             return {"processes": [], "timestamp": timestamp}
 
         try:
-            processes = self._repo.get_processes_at_time(
+            processes = self._timeseries_repo.get_processes_at_time(
                 timestamp=timestamp,
                 tolerance_seconds=tolerance_seconds,
                 limit=limit,
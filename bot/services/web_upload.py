@@ -15,8 +15,6 @@ from urllib.parse import urlparse
 
 import requests
 from mutagen.mp3 import MP3
-from pydub import AudioSegment
-from pydub.effects import compress_dynamic_range
 from werkzeug.datastructures import FileStorage
 
 from bot.downloaders.manual import ManualSoundDownloader
@@ -25,6 +23,8 @@ from bot.repositories.action import ActionRepository
 from bot.repositories.sound import SoundRepository
 from bot.repositories.sound_import_notification import SoundImportNotificationRepository
 from bot.repositories.web_upload import WebUploadRepository
+from bot.services.loudness import get_loudness_normalizer, ingest_target, safe_gain
+from bot.services.sound_duration import SoundDurationCache
 
 
 class WebUploadService:
@@ -39,6 +39,7 @@ class WebUploadService:
         action_repository: ActionRepository,
         sounds_dir: str | Path,
         notification_repository: SoundImportNotificationRepository | None = None,
+        duration_cache: SoundDurationCache | None = None,
     ) -> None:
         """
         Initialize the service.
@@ -51,12 +52,16 @@ class WebUploadService:
             notification_repository: Optional outbox for cross-process Discord
                 import notifications. When provided, a notification row is
                 enqueued after each successful upload.
+            duration_cache: Optional duration map; the uploaded file's
+                duration is recorded through it so web tables can show it
+                without reading the MP3 or reloading the map.
         """
         self.upload_repository = upload_repository
         self.sound_repository = sound_repository
         self.action_repository = action_repository
         self.sounds_dir = Path(sounds_dir)
         self.notification_repository = notification_repository
+        self.duration_cache = duration_cache
         self.sounds_dir.mkdir(parents=True, exist_ok=True)
         self.manual_downloader = ManualSoundDownloader()
         self.enable_ingest_loudness_normalization = (
@@ -139,6 +144,7 @@ class WebUploadService:
             filename,
             guild_id=guild_id,
         )
+        self._record_duration(sound_id, final_path)
         upload_id = self.upload_repository.insert_upload(
             guild_id=guild_id,
             sound_id=sound_id,
@@ -178,6 +184,16 @@ class WebUploadService:
             "status": "approved",
         }
 
+    def _record_duration(self, sound_id: int, sound_file: Path) -> None:
+        """Record the new sound's duration in the web duration map."""
+        if self.duration_cache is None:
+            return
+        try:
+            seconds = float(MP3(str(sound_file)).info.length)
+        except Exception:
+            return
+        self.duration_cache.record(sound_id, seconds)
+
     def _save_uploaded_file(
         self,
         uploaded_file: FileStorage,
@@ -328,48 +344,17 @@ class WebUploadService:
 
     def _normalize_mp3_loudness(self, sound_file: Path, target_dbfs: float) -> None:
         """Normalize an MP3 file in-place with compression and peak-safe loudness."""
-        temp_path = sound_file.with_suffix(".normalized.tmp.mp3")
-        try:
-            sound = AudioSegment.from_file(sound_file, format="mp3")
-            current_dbfs = float(sound.dBFS)
-            if current_dbfs == float("-inf"):
-                return
-
-            working_sound = sound
-            compression_applied = False
-            if self.ingest_compression_enabled:
-                working_sound = compress_dynamic_range(
-                    working_sound,
-                    threshold=self.ingest_compression_threshold_dbfs,
-                    ratio=self.ingest_compression_ratio,
-                    attack=5.0,
-                    release=80.0,
-                )
-                compression_applied = True
-
-            working_dbfs = float(working_sound.dBFS)
-            if not math.isfinite(working_dbfs):
-                return
-
-            peak_dbfs = float(working_sound.max_dBFS)
-            gain_change = self._calculate_safe_gain(
-                current_dbfs=working_dbfs,
-                peak_dbfs=peak_dbfs,
-                target_dbfs=target_dbfs,
+        get_loudness_normalizer().normalize(
+            str(sound_file),
+            ingest_target(
+                target_dbfs,
                 peak_ceiling_dbfs=self.ingest_peak_ceiling_dbfs,
-            )
-            if abs(gain_change) < 0.25 and not compression_applied:
-                return
-
-            normalized = working_sound.apply_gain(gain_change)
-            final_peak_dbfs = float(normalized.max_dBFS)
-            if math.isfinite(final_peak_dbfs) and final_peak_dbfs > self.ingest_peak_ceiling_dbfs:
-                normalized = normalized.apply_gain(self.ingest_peak_ceiling_dbfs - final_peak_dbfs)
-
-            normalized.export(temp_path, format="mp3")
-            os.replace(temp_path, sound_file)
-        finally:
-            temp_path.unlink(missing_ok=True)
+                compression_enabled=self.ingest_compression_enabled,
+                compression_threshold_dbfs=self.ingest_compression_threshold_dbfs,
+                compression_ratio=self.ingest_compression_ratio,
+            ),
+            source="ingest",
+        )
 
     @staticmethod
     def _calculate_safe_gain(
@@ -379,11 +364,7 @@ class WebUploadService:
         peak_ceiling_dbfs: float,
     ) -> float:
         """Return gain that targets loudness without exceeding peak ceiling."""
-        desired_gain = target_dbfs - current_dbfs
-        if not math.isfinite(peak_dbfs):
-            return desired_gain
-        max_allowed_gain = peak_ceiling_dbfs - peak_dbfs
-        return min(desired_gain, max_allowed_gain)
+        return safe_gain(current_dbfs, peak_dbfs, target_dbfs, peak_ceiling_dbfs)
 
     def get_inbox(
         self,
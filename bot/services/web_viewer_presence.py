@@ -0,0 +1,118 @@
+"""
+Web viewer presence shared between the web and bot processes.
+
+The web process reports open ``/api/events`` streams and ``/api/`` polling
+through ``WebViewerPresenceService``; the bot asks the same service whether
+anyone is watching so its background loops can slow down when nobody is.
+Writes are throttled to one per ``write_interval_seconds`` per worker except
+when a viewer arrives after an idle period or the last stream closes, so the
+bot reacts to those transitions promptly.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from bot.repositories.web_viewer_presence import WebViewerPresenceRepository
+
+logger = logging.getLogger(__name__)
+
+
+class WebViewerPresenceService:
+    """
+    Report and read web viewer demand.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[WebViewerPresenceRepository] = None,
+        *,
+        worker_id: Optional[str] = None,
+        write_interval_seconds: float = 15.0,
+        stale_after_seconds: float = 60.0,
+        time_func: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            repository: Presence repository (defaults to the shared database).
+            worker_id: Row key for this process; defaults to ``host:pid``.
+            write_interval_seconds: Minimum spacing of routine heartbeat writes.
+            stale_after_seconds: Age after which activity no longer counts.
+            time_func: Wall clock (injectable for tests).
+        """
+        self.repository = repository or WebViewerPresenceRepository()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.write_interval_seconds = max(1.0, write_interval_seconds)
+        self.stale_after_seconds = max(self.write_interval_seconds * 2, stale_after_seconds)
+        self._time = time_func
+        self._lock = threading.Lock()
+        self._stream_clients = 0
+        self._last_request_unix: Optional[float] = None
+        self._last_write_unix: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Web side
+    # ------------------------------------------------------------------
+
+    def stream_opened(self) -> None:
+        """Count a newly opened SSE stream."""
+        with self._lock:
+            self._stream_clients += 1
+        self._write(force=True)
+
+    def stream_closed(self) -> None:
+        """Forget a closed SSE stream."""
+        with self._lock:
+            self._stream_clients = max(0, self._stream_clients - 1)
+            force = self._stream_clients == 0
+        self._write(force=force)
+
+    def request_seen(self) -> None:
+        """Note an API request; writes immediately when it ends an idle period."""
+        now = self._time()
+        with self._lock:
+            previous = self._last_request_unix
+            self._last_request_unix = now
+        idle = previous is None or now - previous >= self.stale_after_seconds
+        self._write(force=idle)
+
+    def heartbeat(self) -> None:
+        """Refresh this worker's row if the write interval has elapsed."""
+        self._write(force=False)
+
+    def _write(self, *, force: bool) -> None:
+        now = self._time()
+        with self._lock:
+            if (
+                not force
+                and self._last_write_unix is not None
+                and now - self._last_write_unix < self.write_interval_seconds
+            ):
+                return
+            first_write = self._last_write_unix is None
+            self._last_write_unix = now
+            stream_clients = self._stream_clients
+            last_request = self._last_request_unix
+        try:
+            self.repository.record(self.worker_id, stream_clients, last_request, now)
+            if first_write:
+                # Rows of workers that exited (or restarted with a new pid).
+                self.repository.prune(now - 86400.0)
+        except sqlite3.Error as exc:
+            logger.debug("[WebViewerPresence] Could not record presence: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Bot side
+    # ------------------------------------------------------------------
+
+    def active_viewer_count(self) -> int:
+        """Return live SSE streams plus recently polling web workers."""
+        return self.repository.count_active_viewers(self._time() - self.stale_after_seconds)
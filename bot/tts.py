@@ -10,13 +10,15 @@ from dotenv import load_dotenv
 from pydub import AudioSegment
 import io
 import json
-import subprocess
 import tempfile
 import re
 import aiohttp
 from datetime import datetime
 from typing import Optional
 from bot.database import Database
+from bot.services.http_client import PROVIDER_ELEVENLABS, get_http_client
+from bot.services.loudness import LoudnessTarget, get_loudness_normalizer
+from bot.services.tts_cache import TTSAudioCache, tts_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -168,10 +170,6 @@ class TTS:
             self.loudnorm_tp = float(os.getenv('TTS_TP_LIMIT', '-1.5'))   # True peak limit dBTP
         except Exception:
             self.loudnorm_tp = -1.5
-        try:
-            self.loudnorm_lra = float(os.getenv('TTS_LRA_TARGET', '11'))  # Loudness range target
-        except Exception:
-            self.loudnorm_lra = 11.0
 
         # --- ElevenLabs TTS optimization knobs ---
         self.el_tts_streaming_enabled = os.getenv("EL_TTS_STREAMING_ENABLED", "true").strip().lower() in ("true", "1", "yes")
@@ -194,6 +192,9 @@ class TTS:
         # Load persisted quota block expiry so the block survives bot restarts.
         self._load_elevenlabs_quota_block()
 
+        # Normalized audio of earlier requests, keyed by everything that shapes it.
+        self.audio_cache = TTSAudioCache.from_env()
+
     @staticmethod
     def _parse_optimize_latency(raw: Optional[str]) -> Optional[int]:
         """Parse and validate the optimize_streaming_latency env value.
@@ -299,84 +300,19 @@ class TTS:
         except Exception as e:
             print(f"TTS normalization warning for {file_path}: {e}")
 
-    def _extract_loudnorm_stats(self, text: str):
-        """Extract JSON stats from ffmpeg loudnorm pass-1 output."""
-        try:
-            start = text.find('{')
-            end = text.rfind('}')
-            if start != -1 and end != -1 and end > start:
-                payload = text[start:end+1]
-                data = json.loads(payload)
-                return {
-                    'input_i': data.get('input_i'),
-                    'input_tp': data.get('input_tp'),
-                    'input_lra': data.get('input_lra'),
-                    'input_thresh': data.get('input_thresh'),
-                    'target_offset': data.get('target_offset')
-                }
-        except Exception as e:
-            print(f"TTS loudnorm stats parse failed: {e}")
-        return None
-
     def _loudnorm_inplace(self, file_path: str):
-        """Run ffmpeg EBU R128 loudness normalization in-place (two-pass if possible)."""
+        """Normalize in-place to the EBU R128 target with a single decode/encode."""
         try:
             ffmpeg = getattr(self.behavior, 'ffmpeg_path', None) or 'ffmpeg'
-            base_dir = os.path.dirname(file_path)
-            tmp_out = os.path.join(base_dir, f".{os.path.basename(file_path)}.loudnorm.tmp.mp3")
-
-            # Pass 1: analyze
-            cmd1 = [
-                ffmpeg, '-hide_banner', '-nostats', '-y',
-                '-i', file_path,
-                '-af', f"loudnorm=I={self.lufs_target}:TP={self.loudnorm_tp}:LRA={self.loudnorm_lra}:print_format=json",
-                '-f', 'null', '-'
-            ]
-            p1 = subprocess.run(cmd1, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            stats = self._extract_loudnorm_stats(p1.stderr.decode('utf-8', errors='ignore'))
-
-            if stats and all(stats.get(k) is not None for k in ['input_i','input_tp','input_lra','input_thresh','target_offset']):
-                # Pass 2: apply with measured values
-                filter2 = (
-                    f"loudnorm=I={self.lufs_target}:TP={self.loudnorm_tp}:LRA={self.loudnorm_lra}:"
-                    f"measured_I={stats['input_i']}:measured_TP={stats['input_tp']}:"
-                    f"measured_LRA={stats['input_lra']}:measured_thresh={stats['input_thresh']}:"
-                    f"offset={stats['target_offset']}:linear=true:print_format=summary"
-                )
-                cmd2 = [
-                    ffmpeg, '-hide_banner', '-nostats', '-y',
-                    '-i', file_path,
-                    '-af', filter2,
-                    '-ar', '44100', '-b:a', '128k',
-                    tmp_out
-                ]
-            else:
-                # Fallback: single-pass loudnorm
-                cmd2 = [
-                    ffmpeg, '-hide_banner', '-nostats', '-y',
-                    '-i', file_path,
-                    '-af', f"loudnorm=I={self.lufs_target}:TP={self.loudnorm_tp}:LRA={self.loudnorm_lra}",
-                    '-ar', '44100', '-b:a', '128k',
-                    tmp_out
-                ]
-
-            p2 = subprocess.run(cmd2, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if p2.returncode == 0 and os.path.exists(tmp_out):
-                os.replace(tmp_out, file_path)
-            else:
-                # Leave original file untouched on failure
-                if os.path.exists(tmp_out):
-                    try:
-                        os.remove(tmp_out)
-                    except Exception:
-                        pass
-                print(f"TTS loudnorm warning: normalization failed for {file_path}; falling back to RMS dBFS normalization")
-                try:
-                    self._normalize_file_inplace(file_path, -20.0)
-                except Exception:
-                    pass
+            target = LoudnessTarget(level=self.lufs_target, measure="lufs", peak_ceiling_dbfs=self.loudnorm_tp)
+            get_loudness_normalizer().normalize(file_path, target, source="tts", ffmpeg=ffmpeg)
         except Exception as e:
-            print(f"TTS loudnorm error: {e}")
+            # Leave the original untouched by the failed job and fall back to RMS.
+            print(f"TTS loudnorm warning: normalization failed for {file_path} ({e}); falling back to RMS dBFS normalization")
+            try:
+                self._normalize_file_inplace(file_path, -20.0)
+            except Exception:
+                pass
 
     def is_on_cooldown(self, guild_id: Optional[int] = None):
         current_time = time.time()
@@ -491,7 +427,7 @@ class TTS:
         self.locked_by_guild[int(guild_id)] = value
 
     def _apply_loudnorm_if_enabled(self, file_path: str):
-        """Apply configurable loudness normalization."""
+        """Apply configurable loudness normalization (blocking; run via ``asyncio.to_thread``)."""
         if self.loudnorm_mode == "off":
             return
         if self.loudnorm_mode == "single":
@@ -499,6 +435,15 @@ class TTS:
             return
         self._loudnorm_inplace(file_path)
 
+    def _loudnorm_cache_settings(self) -> dict:
+        """Return the post-processing settings that are part of a TTS cache key."""
+        return {
+            "loudnorm_mode": self.loudnorm_mode,
+            "lufs_target": self.lufs_target,
+            "true_peak": self.loudnorm_tp,
+            "engine": "numpy_r128",
+        }
+
     def _timestamp_token(self) -> str:
         """Generate a high-resolution timestamp token for unique filenames."""
         return datetime.now().strftime('%d-%m-%y-%H-%M-%S-%f')
@@ -513,20 +458,29 @@ class TTS:
         requester_name="admin",
         guild_id: Optional[int] = None,
     ):
-        if region == "":
-            tts = gTTS(text=text, lang=lang)
-        else:
-            tts = gTTS(text=text, lang=lang, tld=region)
-            
         # Sanitize filename-safe text (keep it reasonably short for FS)
         safe_text = "".join(x for x in text[:30] if x.isalnum() or x in " -_")
         filename = f"tts-{self._timestamp_token()}-{safe_text}.mp3"
         self.filename = filename
         
         path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "sounds", filename))
-        tts.save(path)
-        # Apply configurable loudness normalization for consistent perceived volume
-        self._apply_loudnorm_if_enabled(path)
+        cache_key = tts_cache_key(
+            "gtts",
+            voice=region or None,
+            model=None,
+            language=lang,
+            text=text,
+            settings=self._loudnorm_cache_settings(),
+        )
+        if not self.audio_cache.fetch(cache_key, path, "gtts"):
+            if region == "":
+                tts = gTTS(text=text, lang=lang)
+            else:
+                tts = gTTS(text=text, lang=lang, tld=region)
+            tts.save(path)
+            # Apply configurable loudness normalization for consistent perceived volume
+            await asyncio.to_thread(self._apply_loudnorm_if_enabled, path)
+            self.audio_cache.store(cache_key, path)
         channel = self._get_default_voice_channel(guild_id=guild_id)
         if channel is None:
             await self.behavior.send_error_message("No available voice channel for TTS playback.")
@@ -626,7 +580,7 @@ class TTS:
                 })
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().borrow(PROVIDER_ELEVENLABS) as session:
                 with open(audio_file_path, 'rb') as source_audio:
                     form = aiohttp.FormData()
                     form.add_field('audio', source_audio, filename=os.path.basename(audio_file_path))
@@ -647,7 +601,7 @@ class TTS:
                             )
                             final_audio.export(path, format="mp3")
                             # Configurable loudness normalization
-                            self._apply_loudnorm_if_enabled(path)
+                            await asyncio.to_thread(self._apply_loudnorm_if_enabled, path)
 
                             channel = self._get_default_voice_channel(guild_id=guild_id)
                             if channel is None:
@@ -731,7 +685,7 @@ class TTS:
 
             asyncio.create_task(self.behavior.send_message(view=None, title="Processing", description="Wait like 5s 🦍", delete_time=5))
 
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().borrow(PROVIDER_ELEVENLABS) as session:
                 with open(audio_file_path, 'rb') as source_audio:
                     form = aiohttp.FormData()
                     form.add_field('audio', source_audio, filename=os.path.basename(audio_file_path))
@@ -754,7 +708,7 @@ class TTS:
 
                             final_audio.export(path, format="mp3")
                             # Configurable loudness normalization
-                            self._apply_loudnorm_if_enabled(path)
+                            await asyncio.to_thread(self._apply_loudnorm_if_enabled, path)
 
                             channel = self._get_default_voice_channel(guild_id=guild_id)
                             if channel is None:
@@ -846,6 +800,30 @@ class TTS:
                     except Exception:
                         pass
 
+    async def _play_saved_el_tts(
+        self, guild_id, filename, requester_name, text, *,
+        send_controls, loading_message, requester_avatar_url,
+        sts_thumbnail_url, request_note, allow_tts_interrupt,
+    ) -> bool:
+        """Play a saved ElevenLabs file in the default channel; False if there is none."""
+        channel = self._get_default_voice_channel(guild_id=guild_id)
+        if channel is None:
+            await self.behavior.send_error_message(
+                "No available voice channel for TTS playback."
+            )
+            return False
+        await self.behavior.play_audio(
+            channel, filename, requester_name, is_tts=True,
+            original_message=text,
+            send_controls=send_controls,
+            loading_message=loading_message,
+            requester_avatar_url=requester_avatar_url,
+            sts_thumbnail_url=sts_thumbnail_url,
+            request_note=request_note,
+            allow_tts_interrupt=allow_tts_interrupt,
+        )
+        return True
+
     async def _save_as_mp3_EL_impl(self, text, lang="pt", region="", send_controls=True,
                                   loading_message=None, requester_avatar_url=None, sts_thumbnail_url=None,
                                   requester_name="admin", guild_id: Optional[int] = None,
@@ -879,6 +857,51 @@ class TTS:
             await cooldown_message.delete()
             return
 
+        # ElevenLabs TTS API accepts up to 5000 characters per request.
+        text = text[:5000]
+        voice_settings = {
+            "speed": 1,
+            "stability": 0.0,
+            "similarity_boost": 1.0,
+            "style": 1,
+            "use_speaker_boost": True
+        }
+        path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "sounds", filename))
+        cache_key = tts_cache_key(
+            "elevenlabs",
+            voice=self.voice_id,
+            model=effective_model_id,
+            language=lang,
+            text=text,
+            settings={
+                **self._loudnorm_cache_settings(),
+                "output_format": self.el_tts_output_format,
+                "voice_settings": voice_settings,
+                "boost_volume": boost_volume,
+            },
+        )
+        if self.audio_cache.fetch(cache_key, path, "elevenlabs"):
+            # Cache hit: same row + play_audio path as a fresh synthesis, no API call.
+            Database().insert_sound(
+                os.path.basename(filename),
+                os.path.basename(filename),
+                is_elevenlabs=1,
+                guild_id=guild_id,
+            )
+            if not await self._play_saved_el_tts(
+                guild_id, filename, requester_name, text,
+                send_controls=send_controls,
+                loading_message=loading_message,
+                requester_avatar_url=requester_avatar_url,
+                sts_thumbnail_url=sts_thumbnail_url,
+                request_note=request_note,
+                allow_tts_interrupt=allow_tts_interrupt,
+            ):
+                return
+            self.update_last_request_time(guild_id=guild_id)
+            logger.info("EL_TTS cache hit path=%s text_len=%d", path, len(text))
+            return
+
         # ---- ElevenLabs quota circuit breaker ----------------------------
         if self.is_elevenlabs_quota_blocked(guild_id=guild_id):
             raise ElevenLabsQuotaExceededError(
@@ -892,8 +915,6 @@ class TTS:
         if self.el_tts_live_playback_enabled:
             live_channel = self._get_default_voice_channel(guild_id=guild_id)
 
-        # ElevenLabs TTS API accepts up to 5000 characters per request.
-        text = text[:5000]
         url = self._build_el_tts_url(model_id=effective_model_id)
         headers = {
             "Accept": "audio/mpeg",
@@ -904,18 +925,11 @@ class TTS:
         data = {
             "text": text,
             "model_id": model_id,
-            "voice_settings": {
-                "speed": 1,
-                "stability": 0.0,
-                "similarity_boost": 1.0,
-                "style": 1,
-                "use_speaker_boost": True
-            },
+            "voice_settings": voice_settings,
             "use_enhanced": True
         }
 
         perf_start = time.time()
-        path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "sounds", filename))
         timeout = aiohttp.ClientTimeout(total=self.el_tts_timeout_seconds)
         first_chunk_time: Optional[float] = None
         http_status = None
@@ -929,8 +943,8 @@ class TTS:
             and live_channel is not None
         )
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, json=data, headers=headers) as response:
+        async with get_http_client().borrow(PROVIDER_ELEVENLABS) as session:
+            async with session.post(url, json=data, headers=headers, timeout=timeout) as response:
                 http_status = response.status
                 if response.status == 200:
                     if boost_volume == 0 and not self.el_tts_streaming_enabled:
@@ -1185,7 +1199,8 @@ class TTS:
                         file_size = os.path.getsize(path)
 
                     # Configurable loudness normalization
-                    self._apply_loudnorm_if_enabled(path)
+                    await asyncio.to_thread(self._apply_loudnorm_if_enabled, path)
+                    self.audio_cache.store(cache_key, path)
 
                     # Insert DB row only after successful file write
                     Database().insert_sound(
@@ -1217,22 +1232,16 @@ class TTS:
                     # Playback: if live-stream was started, it is already
                     # playing.  Otherwise fall back to save-then-play.
                     if not ctx.live_playback_started:
-                        channel = self._get_default_voice_channel(guild_id=guild_id)
-                        if channel is None:
-                            await self.behavior.send_error_message(
-                                "No available voice channel for TTS playback."
-                            )
-                            return
-                        await self.behavior.play_audio(
-                            channel, filename, requester_name, is_tts=True,
-                            original_message=text,
+                        if not await self._play_saved_el_tts(
+                            guild_id, filename, requester_name, text,
                             send_controls=send_controls,
                             loading_message=loading_message,
                             requester_avatar_url=requester_avatar_url,
                             sts_thumbnail_url=sts_thumbnail_url,
                             request_note=request_note,
                             allow_tts_interrupt=allow_tts_interrupt,
-                        )
+                        ):
+                            return
                     self.update_last_request_time(guild_id=guild_id)
                     logger.info(
                         "Audio stream saved and played successfully. "
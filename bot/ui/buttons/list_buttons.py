@@ -139,7 +139,12 @@ class SoundListItemButton(Button):
         if not channel:
             channel = self.bot_behavior._audio_service.get_largest_voice_channel(interaction.guild)
         if channel:
-            asyncio.create_task(self.bot_behavior._audio_service.play_audio(channel, self.sound_filename, interaction.user.name))
+            asyncio.create_task(self.bot_behavior._audio_service.play_audio(
+                channel,
+                self.sound_filename,
+                interaction.user.name,
+                requested_at=interaction.created_at.timestamp(),
+            ))
             sound = Database().get_sound(self.sound_filename, False, guild_id=guild_id)
             if sound:
                 ActionRepository().insert(
@@ -193,7 +193,12 @@ class PlaySoundButton(Button):
             if not channel:
                 channel = self.bot_behavior._audio_service.get_largest_voice_channel(interaction.guild)
             if channel:
-                asyncio.create_task(self.bot_behavior._audio_service.play_audio(channel, self.sound_name, interaction.user.name))
+                asyncio.create_task(self.bot_behavior._audio_service.play_audio(
+                    channel,
+                    self.sound_name,
+                    interaction.user.name,
+                    requested_at=interaction.created_at.timestamp(),
+                ))
                 # Log the action
                 sound = Database().get_sound(self.sound_name, False, guild_id=guild_id)
                 if sound:
@@ -312,7 +317,8 @@ async def replay_sound(
                 original_message=original_message,
                 sts_char=sts_char,
                 requester_avatar_url=requester_avatar_url,
-                sts_thumbnail_url=sts_thumbnail_url
+                sts_thumbnail_url=sts_thumbnail_url,
+                requested_at=interaction.created_at.timestamp(),
             ))
             sound_data = Database().get_sounds_by_similarity(audio_file, guild_id=guild_id)
             if sound_data and sound_data[0]:
@@ -124,7 +124,12 @@ class SoundSelect(ui.Select):
         if not channel:
             channel = self.bot_behavior._audio_service.get_largest_voice_channel(interaction.guild)
         if channel:
-            asyncio.create_task(self.bot_behavior._audio_service.play_audio(channel, sound_filename, interaction.user.name))
+            asyncio.create_task(self.bot_behavior._audio_service.play_audio(
+                channel,
+                sound_filename,
+                interaction.user.name,
+                requested_at=interaction.created_at.timestamp(),
+            ))
             sound = Database().get_sound(sound_filename, False, guild_id=guild_id)
             Database().insert_action(
                 interaction.user.name,
@@ -299,7 +304,12 @@ class SimilarSoundsSelect(ui.Select):
         if not channel:
             channel = self.bot_behavior._audio_service.get_largest_voice_channel(interaction.guild)
         if channel:
-            asyncio.create_task(self.bot_behavior._audio_service.play_audio(channel, sound_name, interaction.user.name))
+            asyncio.create_task(self.bot_behavior._audio_service.play_audio(
+                channel,
+                sound_name,
+                interaction.user.name,
+                requested_at=interaction.created_at.timestamp(),
+            ))
             sound = Database().get_sound(sound_name, False, guild_id=guild_id)
             Database().insert_action(
                 interaction.user.name,
@@ -9,6 +9,9 @@ thread that subscribes to Honker stream events via an asyncio event loop
 and pushes them to a thread-safe queue consumed by the Flask SSE generator.
 When Honker is unavailable, the stream sends periodic heartbeats so the
 EventSource stays open and the frontend can fall back to its existing polling.
+
+Open streams and ``/api/`` requests are reported to
+``WebViewerPresenceService`` so the bot knows when the web UI has viewers.
 """
 
 from __future__ import annotations
@@ -17,12 +20,16 @@ import asyncio
 import json
 import logging
 import queue
+import sqlite3
 import threading
 import time
 from typing import Any, Generator
 
 from flask import Flask, Response, current_app, request, stream_with_context
 
+from bot.repositories.web_viewer_presence import WebViewerPresenceRepository
+from bot.services.web_viewer_presence import WebViewerPresenceService
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -41,8 +48,30 @@ def _format_sse(data: Any, event: str | None = None) -> str:
     return "".join(body_lines) + "\n"
 
 
+def _get_viewer_presence() -> WebViewerPresenceService:
+    """Return this worker's presence reporter for the configured database."""
+    db_path = current_app.config["DATABASE_PATH"]
+    presence = current_app.extensions.get("web_viewer_presence")
+    if presence is None or presence.repository.db_path != db_path:
+        presence = WebViewerPresenceService(
+            repository=WebViewerPresenceRepository(db_path=db_path, use_shared=False)
+        )
+        current_app.extensions["web_viewer_presence"] = presence
+    return presence
+
+
 def register_event_routes(app: Flask) -> None:
-    """Register the SSE event stream route."""
+    """Register the SSE event stream route and viewer presence tracking."""
+
+    @app.before_request
+    def note_viewer_request() -> None:
+        """Report API polling as viewer presence (throttled by the service)."""
+        if not request.path.startswith("/api/") or request.path == "/api/events":
+            return
+        try:
+            _get_viewer_presence().request_seen()
+        except sqlite3.Error as exc:
+            logger.debug("[SSE] Viewer presence unavailable: %s", exc)
 
     @app.route("/api/events")
     def stream_events() -> Response:
@@ -67,6 +96,7 @@ def register_event_routes(app: Flask) -> None:
             )
 
         db_path = current_app.config["DATABASE_PATH"]
+        presence = _get_viewer_presence()
 
         def _generate() -> Generator[str, Any, None]:
             """Generate SSE events."""
@@ -83,11 +113,13 @@ def register_event_routes(app: Flask) -> None:
                 db_path, event_queue, stop_event
             )
             uses_honker = honker_thread is not None
+            presence.stream_opened()
 
             last_poll = time.monotonic()
             try:
                 while True:
                     now = time.monotonic()
+                    presence.heartbeat()
 
                     # Check for Honker events with a short timeout.
                     if uses_honker:
@@ -113,6 +145,7 @@ def register_event_routes(app: Flask) -> None:
                 pass
             finally:
                 stop_event.set()
+                presence.stream_closed()
 
         return Response(
             stream_with_context(_generate()),
@@ -0,0 +1,80 @@
+"""
+OpenMetrics ``/metrics`` endpoint for the web process.
+
+Serves the web process registry (``web_`` prefix) followed by the bot's
+last export (``bot_`` prefix, read from ``data/metrics/bot.prom``), so one
+scrape covers both processes. Also records per-endpoint request latency.
+
+Without ``METRICS_BEARER_TOKEN`` the route only answers loopback clients;
+set the token to scrape from another host or container.
+"""
+
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import os
+import time
+from typing import Any
+
+from flask import Flask, Response, current_app, g, request
+
+from bot.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    REGISTRY,
+    bot_metrics_textfile_path,
+    read_metrics_textfile,
+)
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_seconds",
+    "Flask request handling time until the response is returned.",
+    ("endpoint", "status"),
+)
+
+
+def _is_loopback(address: str | None) -> bool:
+    """Return whether a client address is a loopback address."""
+    try:
+        return ipaddress.ip_address(address or "").is_loopback
+    except ValueError:
+        return False
+
+
+def register_metrics_routes(app: Flask) -> None:
+    """Register the ``/metrics`` route and request-timing hooks."""
+
+    @app.before_request
+    def _start_request_timer() -> None:
+        g.metrics_request_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request_time(response: Response) -> Response:
+        started = g.pop("metrics_request_started", None)
+        if started is not None and request.endpoint != "metrics":
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                endpoint=request.endpoint or "unmatched",
+                status=f"{response.status_code // 100}xx",
+            )
+        return response
+
+    @app.route("/metrics")
+    def metrics() -> Any:
+        """Return web and bot metrics in OpenMetrics text format."""
+        token = os.getenv("METRICS_BEARER_TOKEN", "").strip()
+        if token:
+            supplied = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                return Response("unauthorized\n", status=401, mimetype="text/plain")
+        elif not _is_loopback(request.remote_addr):
+            return Response("forbidden\n", status=403, mimetype="text/plain")
+
+        bot_text = read_metrics_textfile(
+            bot_metrics_textfile_path(current_app.config["DATABASE_PATH"])
+        )
+        body = REGISTRY.render("web_", include_eof=False) + bot_text + "# EOF\n"
+        response = Response(body, status=200)
+        response.headers["Content-Type"] = OPENMETRICS_CONTENT_TYPE
+        response.headers["Cache-Control"] = "no-store"
+        return response
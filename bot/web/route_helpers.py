@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import logging
 import os
+import sqlite3
 import tempfile
 import uuid
 from datetime import datetime, timezone
@@ -18,11 +19,13 @@ from flask import current_app, jsonify, request, session, url_for
 from werkzeug.datastructures import FileStorage
 
 from config import TTS_PROFILES
-from bot.models.web import DiscordWebUser, PaginatedQuery
+from bot.models.web import DiscordWebUser, PageCursor, PaginatedQuery
 from bot.repositories.action import ActionRepository
 from bot.repositories.event import EventRepository
 from bot.repositories.list import ListRepository
 from bot.repositories.sound import SoundRepository
+from bot.repositories.sound_duration import SoundDurationRepository
+from bot.repositories.sound_neighbors import SoundNeighborRepository
 from bot.repositories.voice_activity import VoiceActivityRepository
 from bot.repositories.web_analytics import WebAnalyticsRepository
 from bot.repositories.web_content import WebContentRepository
@@ -41,9 +44,11 @@ from bot.repositories.web_user_access import WebUserAccessRepository
 from bot.repositories.web_tts_settings import WebTtsSettingsRepository
 from bot.repositories.speech_training import SpeechTrainingRepository
 from bot.repositories.keyword import KeywordRepository
+from bot.services.sound_duration import SoundDurationCache
+from bot.services.speech_training_audio import SpeechTrainingAudioCache
 from bot.services.web_analytics import WebAnalyticsService
 from bot.services.web_auth import WebAuthService
-from bot.services.web_content import WebContentService
+from bot.services.web_content import FilterFacetCache, WebContentService
 from bot.services.web_control_room import WebControlRoomService
 from bot.services.web_guild import WebGuildService
 from bot.services.web_playback import WebPlaybackService
@@ -74,6 +79,8 @@ def _get_web_content_service() -> WebContentService:
             use_shared=False,
         ),
         sounds_dir=current_app.config["SOUNDS_DIR"],
+        filter_facet_cache=_get_filter_facet_cache(),
+        duration_cache=_get_sound_duration_cache(),
     )
 
 
@@ -88,6 +95,40 @@ def _get_response_cache() -> "ResponseCache":
     return cache
 
 
+def _get_sound_duration_cache() -> SoundDurationCache:
+    """Return the per-process sound-duration map for the configured database."""
+    db_path = current_app.config["DATABASE_PATH"]
+    caches: dict[str, SoundDurationCache] = current_app.extensions.setdefault(
+        "web_sound_duration_caches", {}
+    )
+    cache = caches.get(db_path)
+    if cache is None:
+        repository: SoundDurationRepository | None = SoundDurationRepository(
+            db_path=db_path,
+            use_shared=False,
+        )
+        try:
+            repository.ensure_schema()
+        except sqlite3.Error:
+            repository = None
+        cache = SoundDurationCache(repository=repository)
+        caches[db_path] = cache
+    return cache
+
+
+def _get_filter_facet_cache() -> FilterFacetCache:
+    """Return the per-process filter-option memo for the configured database."""
+    caches: dict[str, FilterFacetCache] = current_app.extensions.setdefault(
+        "web_filter_facet_caches", {}
+    )
+    db_path = current_app.config["DATABASE_PATH"]
+    cache = caches.get(db_path)
+    if cache is None:
+        cache = FilterFacetCache()
+        caches[db_path] = cache
+    return cache
+
+
 def _get_content_visibility_scope(
     current_user: DiscordWebUser | None,
 ) -> str:
@@ -172,6 +213,7 @@ def _get_web_sound_options_service() -> WebSoundOptionsService:
         action_repository=ActionRepository(db_path=db_path, use_shared=False),
         event_repository=EventRepository(db_path=db_path, use_shared=False),
         voice_activity_repository=VoiceActivityRepository(db_path=db_path, use_shared=False),
+        neighbor_repository=SoundNeighborRepository(db_path=db_path, use_shared=False),
     )
 
 
@@ -191,6 +233,7 @@ def _get_web_upload_service() -> WebUploadService:
         sound_repository=SoundRepository(db_path=db_path, use_shared=False),
         action_repository=ActionRepository(db_path=db_path, use_shared=False),
         sounds_dir=current_app.config["SOUNDS_DIR"],
+        duration_cache=_get_sound_duration_cache(),
     )
 
 
@@ -226,6 +269,7 @@ def _queue_web_upload_job(
     jobs[job_id] = {"job_id": job_id, "status": "processing"}
 
     db_path = current_app.config["DATABASE_PATH"]
+    duration_cache = _get_sound_duration_cache()
 
     # Persist job to DB so it survives process restarts.
     try:
@@ -275,6 +319,7 @@ def _queue_web_upload_job(
             custom_name=custom_name,
             source_url=source_url,
             time_limit=time_limit,
+            duration_cache=duration_cache,
         )
     return job_id
 
@@ -292,8 +337,15 @@ def _run_web_upload_job(
     custom_name: str | None,
     source_url: str | None,
     time_limit: int | None,
+    duration_cache: SoundDurationCache | None = None,
 ) -> None:
-    """Process one queued web upload outside the Flask request thread."""
+    """
+    Process one queued web upload outside the Flask request thread.
+
+    ``duration_cache`` is the web process's duration map when the job was
+    queued from a request; jobs resumed without one record through a
+    throwaway map, and the shared map reloads on its change counter.
+    """
     # Helper to update both in-memory dict and persistent DB.
     def _set_job(status: str, **fields: Any) -> None:
         entry: dict[str, Any] = {"job_id": job_id, "status": status}
@@ -354,6 +406,8 @@ def _run_web_upload_job(
             notification_repository=SoundImportNotificationRepository(
                 db_path=db_path, use_shared=False
             ),
+            duration_cache=duration_cache
+            or SoundDurationCache(repository=SoundDurationRepository(db_path=db_path, use_shared=False)),
         )
         current_user = DiscordWebUser.from_session_payload(current_user_payload)
         if current_user is None:
@@ -971,16 +1025,22 @@ def _build_paginated_query(filter_names: tuple[str, ...]) -> PaginatedQuery:
         search_query=request.args.get("search", "").strip(),
         guild_id=selected_guild_id,
         filters={name: _get_filter_values(name) for name in filter_names},
+        cursor=PageCursor.decode(request.args.get("cursor")),
+        include_count=_parse_bool_arg("include_count", True),
     )
 
 
 def _parse_include_filters_arg() -> bool:
     """Return whether a paginated endpoint should include filter metadata."""
-    return request.args.get("include_filters", "1").strip().lower() not in {
-        "0",
-        "false",
-        "no",
-    }
+    return _parse_bool_arg("include_filters", True)
+
+
+def _parse_bool_arg(name: str, default: bool) -> bool:
+    """Return a boolean query arg where ``0``/``false``/``no`` disable it."""
+    raw_value = request.args.get(name)
+    if raw_value is None:
+        return default
+    return raw_value.strip().lower() not in {"0", "false", "no"}
 
 
 def _parse_positive_int_arg(name: str, default: int) -> int:
@@ -1032,6 +1092,7 @@ def _build_initial_soundboard_data(selected_guild_id: int | None = None) -> dict
         "favorites": _prepare_initial_payload(
             service.get_favorites(
                 base_query,
+                filter_keys=("user",),
                 current_user=_get_current_discord_user(),
                 include_durations=False,
             ),
@@ -1174,8 +1235,25 @@ def _get_web_speech_training_service() -> "WebSpeechTrainingService":
     from bot.services.web_speech_training import WebSpeechTrainingService
 
     db_path = current_app.config["DATABASE_PATH"]
-    repo = SpeechTrainingRepository(db_path=db_path, use_shared=False)
-    data_dir = os.getenv(
+    data_dir = _get_speech_training_data_dir()
+    # One service per database/data dir: the schema check runs once per
+    # process, and the repository opens a connection per query anyway.
+    services: dict[str, WebSpeechTrainingService] = current_app.extensions.setdefault(
+        "web_speech_training_services", {}
+    )
+    key = f"{db_path}|{data_dir}"
+    svc = services.get(key)
+    if svc is None:
+        repo = SpeechTrainingRepository(db_path=db_path, use_shared=False)
+        svc = WebSpeechTrainingService(repo, data_dir)
+        svc.ensure_schema()
+        services[key] = svc
+    return svc
+
+
+def _get_speech_training_data_dir() -> str:
+    """Return the speech-training clip directory for this process."""
+    return os.getenv(
         "SPEECH_TRAINING_DATA_DIR",
         os.path.abspath(
             os.path.join(
@@ -1183,9 +1261,19 @@ def _get_web_speech_training_service() -> "WebSpeechTrainingService":
             )
         ),
     )
-    svc = WebSpeechTrainingService(repo, data_dir)
-    svc.ensure_schema()
-    return svc
+
+
+def _get_speech_training_audio_cache() -> SpeechTrainingAudioCache:
+    """Return the per-process clip audio cache for the configured database and data dir."""
+    key = f"{current_app.config['DATABASE_PATH']}|{_get_speech_training_data_dir()}"
+    caches: dict[str, SpeechTrainingAudioCache] = current_app.extensions.setdefault(
+        "web_speech_training_audio_caches", {}
+    )
+    cache = caches.get(key)
+    if cache is None:
+        cache = SpeechTrainingAudioCache()
+        caches[key] = cache
+    return cache
 
 
 def _current_web_user_is_admin() -> bool:
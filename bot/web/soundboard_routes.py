@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import sqlite3
 from typing import Any
@@ -22,6 +24,7 @@ from bot.web.route_helpers import (
     _get_web_content_service,
     _get_web_guild_service,
     _get_web_sound_options_service,
+    _parse_bool_arg,
     _parse_include_filters_arg,
     _remember_selected_guild_id,
     _require_discord_login_api,
@@ -138,9 +141,12 @@ def register_soundboard_routes(app: Flask) -> None:
     def get_sound_durations() -> Any:
         """Return MP3 durations for a batch of sound IDs.
 
-        Accepts repeated ``sound_id`` query parameters and returns a
-        mapping of sound ID to formatted duration string (e.g. ``1:12``).
-        Silently skips IDs whose file is missing or unreadable.
+        Accepts repeated ``sound_id`` query parameters (or ``all=1`` for
+        every visible sound in the selected guild) and returns a mapping of
+        sound ID to formatted duration string (e.g. ``1:12``). Durations are
+        served from the per-process duration map. Silently skips IDs whose
+        file is missing or unreadable. Responses carry a strong ETag so
+        revalidation returns ``304`` when nothing changed.
         """
         raw_ids = request.args.getlist("sound_id")
         sound_ids: list[int] = []
@@ -158,13 +164,39 @@ def register_soundboard_routes(app: Flask) -> None:
         selected_guild_id = _get_selected_guild_id(request.args)
         _remember_selected_guild_id(selected_guild_id)
 
-        payload = _get_web_content_service().get_sound_durations(
+        include_all = _parse_bool_arg("all", False)
+        service = _get_web_content_service()
+        scope = (selected_guild_id, include_all, () if include_all else sorted(set(sound_ids)))
+
+        def _validator_etag(version: int | None) -> str | None:
+            if version is None:
+                return None
+            return hashlib.sha1(repr((version, scope)).encode("utf-8")).hexdigest()
+
+        # The duration map's change counter answers revalidation before any
+        # sound rows are fetched or durations formatted.
+        etag = _validator_etag(service.get_sound_durations_version())
+        if etag is not None and etag in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, max-age=10"
+            return response
+
+        payload = service.get_sound_durations(
             sound_ids,
             guild_id=selected_guild_id,
+            include_all=include_all,
         )
         response = jsonify(payload)
+        # Misses stored while building move the counter, so read it again.
+        etag = _validator_etag(service.get_sound_durations_version())
+        if etag is None:
+            etag = hashlib.sha1(
+                json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            ).hexdigest()
+        response.set_etag(etag)
         response.headers["Cache-Control"] = "private, max-age=10"
-        return response
+        return response.make_conditional(request)
 
     @app.route("/api/sounds/<int:sound_id>/options")
     @_require_discord_login_api
@@ -7,8 +7,10 @@ playing back, labeling, and deleting captured speech clips.
 
 from __future__ import annotations
 
+import io
 import os
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from flask import Flask, current_app, jsonify, render_template, request, send_file
 
@@ -17,6 +19,7 @@ from bot.web.route_helpers import (
     _current_web_user_is_admin,
     _get_current_discord_user,
     _get_selected_guild_id,
+    _get_speech_training_audio_cache,
     _get_web_guild_service,
     _get_web_speech_training_service,
     _parse_positive_int_arg,
@@ -26,6 +29,16 @@ from bot.web.route_helpers import (
 )
 
 
+# Clip ids after the current page whose audio the UI should prefetch.
+AUDIO_PREFETCH_COUNT = 8
+# Limits for batched waveform peak requests.
+PEAKS_MAX_CLIPS = 100
+PEAKS_DEFAULT_BUCKETS = 64
+PEAKS_MAX_BUCKETS = 512
+# Versioned clip URLs (``?v=<audio_version>``) never change content.
+AUDIO_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
 def register_speech_training_routes(app: Flask) -> None:
     """Register speech training dataset routes."""
 
@@ -121,17 +134,39 @@ def register_speech_training_routes(app: Flask) -> None:
         sort = request.args.get("sort", "newest").strip()
         page = _parse_positive_int_arg("page", 1)
         per_page = _parse_positive_int_arg("per_page", 20)
-        return jsonify(
-            svc.get_clips(
+        payload = svc.get_clips(
+            guild_id=guild_id,
+            user_id=user_id,
+            label=label,
+            page=page,
+            per_page=per_page,
+            search=search,
+            sort=sort,
+        )
+        audio_cache = _get_speech_training_audio_cache()
+        for item in payload["items"]:
+            item["audio_version"] = audio_cache.version(
+                item["id"], _clip_audio_resolver(item["id"], clip=item)
+            )
+
+        # Next clips in the same order, so the UI can warm the browser cache.
+        prefetch = []
+        if page < payload["total_pages"]:
+            next_ids = svc.get_clip_ids(
                 guild_id=guild_id,
                 user_id=user_id,
                 label=label,
-                page=page,
-                per_page=per_page,
                 search=search,
                 sort=sort,
-            )
-        )
+                offset=page * per_page,
+                limit=AUDIO_PREFETCH_COUNT,
+            )["ids"]
+            for clip_id in next_ids:
+                version = audio_cache.version(clip_id, _clip_audio_resolver(clip_id))
+                if version is not None:
+                    prefetch.append({"id": clip_id, "audio_version": version})
+        payload["prefetch"] = prefetch
+        return jsonify(payload)
 
     # ------------------------------------------------------------------
     # API: Clip IDs (unpaginated, for "select all matching filters")
@@ -171,15 +206,67 @@ def register_speech_training_routes(app: Flask) -> None:
     @_require_discord_login_api
     @_require_web_admin_api
     def api_speech_training_clip_audio(clip_id: int) -> Any:
-        """Stream an MP3 clip for playback."""
-        svc = _get_web_speech_training_service()
-        clip = svc.get_clip(clip_id)
-        if clip is None:
-            return jsonify({"error": "Clip not found"}), 404
-        path = svc.resolve_audio_path(clip)
-        if path is None:
-            return jsonify({"error": "Audio file not found"}), 404
-        return send_file(str(path), mimetype="audio/mpeg", conditional=True)
+        """Stream an MP3 clip for playback.
+
+        Served from the per-process clip audio cache: small clips come from
+        memory, and repeat requests skip the database lookup. Responses carry
+        a strong ETag from the clip id and file version and support ranges.
+        When ``v`` matches the current ``audio_version`` the response is
+        cacheable as immutable; otherwise clients must revalidate.
+        """
+        errors: list[str] = []
+        entry = _get_speech_training_audio_cache().get(
+            clip_id,
+            _clip_audio_resolver(clip_id, errors=errors),
+        )
+        if entry is None:
+            return jsonify({"error": errors[0] if errors else "Audio file not found"}), 404
+
+        response = send_file(
+            io.BytesIO(entry.data) if entry.data is not None else str(entry.path),
+            mimetype="audio/mpeg",
+            conditional=True,
+            etag=entry.etag,
+            last_modified=entry.mtime_ns / 1_000_000_000,
+        )
+        if request.args.get("v") == entry.version:
+            response.headers["Cache-Control"] = AUDIO_IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    # ------------------------------------------------------------------
+    # API: Batched waveform peaks
+    # ------------------------------------------------------------------
+
+    @app.route("/api/speech_training/clips/peaks")
+    @_require_discord_login_api
+    @_require_web_admin_api
+    def api_speech_training_clip_peaks() -> Any:
+        """Return normalized waveform peaks for several clips.
+
+        Query: ``ids`` (comma-separated or repeated, up to 100) and optional
+        ``buckets`` (8-512, default 64). Clips that are missing or cannot be
+        decoded are omitted. Response: ``{"buckets": 64, "peaks": {"1": [...]}}``.
+        """
+        clip_ids: list[int] = []
+        for raw in request.args.getlist("ids"):
+            for part in raw.split(","):
+                try:
+                    parsed = int(part.strip())
+                except ValueError:
+                    continue
+                if parsed > 0 and parsed not in clip_ids:
+                    clip_ids.append(parsed)
+        buckets = min(max(_parse_positive_int_arg("buckets", PEAKS_DEFAULT_BUCKETS), 8), PEAKS_MAX_BUCKETS)
+
+        audio_cache = _get_speech_training_audio_cache()
+        peaks: dict[str, list[float]] = {}
+        for clip_id in clip_ids[:PEAKS_MAX_CLIPS]:
+            clip_peaks = audio_cache.get_peaks(clip_id, _clip_audio_resolver(clip_id), buckets)
+            if clip_peaks is not None:
+                peaks[str(clip_id)] = clip_peaks
+        return jsonify({"buckets": buckets, "peaks": peaks})
 
     # ------------------------------------------------------------------
     # API: Update label
@@ -222,6 +309,7 @@ def register_speech_training_routes(app: Flask) -> None:
         svc = _get_web_speech_training_service()
         current_user = _get_current_discord_user()
 
+        _get_speech_training_audio_cache().invalidate(clip_id)
         success, error = svc.delete_clip(
             clip_id=clip_id,
             reviewer_user_id=str(current_user.id) if current_user else "",
@@ -283,6 +371,12 @@ def register_speech_training_routes(app: Flask) -> None:
             padding_seconds=padding_seconds,
         )
         if success:
+            entry = _get_speech_training_audio_cache().get(
+                clip_id,
+                _clip_audio_resolver(clip_id),
+            )
+            if entry is not None:
+                metadata = {**metadata, "audio_version": entry.version}
             return jsonify({"status": "ok", **metadata})
         if error == "Clip not found":
             return jsonify({"error": error}), 404
@@ -332,6 +426,9 @@ def register_speech_training_routes(app: Flask) -> None:
             return jsonify({"error": error}), 400
 
         elif action == "delete":
+            audio_cache = _get_speech_training_audio_cache()
+            for clip_id in clip_ids:
+                audio_cache.invalidate(clip_id)
             success, error, count = svc.bulk_delete(
                 clip_ids=clip_ids,
                 reviewer_user_id=str(current_user.id) if current_user else "",
@@ -574,6 +671,35 @@ def register_speech_training_routes(app: Flask) -> None:
         return jsonify(job)
 
 
+def _clip_audio_resolver(
+    clip_id: int,
+    *,
+    clip: dict | None = None,
+    errors: list[str] | None = None,
+) -> Callable[[], Path | None]:
+    """Return a lazy resolver for a clip's audio path (used on cache misses).
+
+    Args:
+        clip_id: Clip primary key.
+        clip: Already-loaded clip row, to skip the database lookup.
+        errors: Optional list that receives the reason when nothing resolves.
+    """
+
+    def _resolve() -> Path | None:
+        svc = _get_web_speech_training_service()
+        found = clip if clip is not None else svc.get_clip(clip_id)
+        if found is None:
+            if errors is not None:
+                errors.append("Clip not found")
+            return None
+        path = svc.resolve_audio_path(found)
+        if path is None and errors is not None:
+            errors.append("Audio file not found")
+        return path
+
+    return _resolve
+
+
 def _redirect_to_login(route_name: str) -> Any:
     """Redirect to Discord login preserving the next route."""
     from flask import redirect, url_for
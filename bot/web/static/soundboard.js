@@ -333,6 +333,51 @@
             all_sounds: getInitialFetchedItems('all_sounds')
         };
 
+        // Keyset cursors per page number, reset whenever search/filters/guild change.
+        // A null signature marks state seeded from the server-rendered first page.
+        // Deep pages may skip the COUNT(*) only while the known total is younger
+        // than PAGE_COUNT_REFRESH_MS; page 1 always re-counts.
+        const PAGE_COUNT_REFRESH_MS = 30000;
+
+        function getInitialPageCursorState(endpoint) {
+            const initialPayload = initialSoundboardData?.[endpoint] || {};
+            const hasTotal = Number.isFinite(initialPayload.total_pages);
+            return {
+                signature: null,
+                cursors: initialPayload.next_cursor ? { 2: initialPayload.next_cursor } : {},
+                totalPages: hasTotal ? initialPayload.total_pages : null,
+                totalCount: Number.isFinite(initialPayload.total_count) ? initialPayload.total_count : null,
+                countedAt: hasTotal ? Date.now() : 0
+            };
+        }
+
+        function hasFreshPageCount(state) {
+            return state.totalPages !== null && Date.now() - state.countedAt < PAGE_COUNT_REFRESH_MS;
+        }
+
+        const pageCursorState = {
+            actions: getInitialPageCursorState('actions'),
+            favorites: getInitialPageCursorState('favorites'),
+            all_sounds: getInitialPageCursorState('all_sounds')
+        };
+
+        function getPageCursorState(endpoint, signature, isDefaultQuery) {
+            const state = pageCursorState[endpoint];
+            if (state.signature === signature) {
+                return state;
+            }
+            if (state.signature === null && isDefaultQuery) {
+                state.signature = signature;
+                return state;
+            }
+            state.signature = signature;
+            state.cursors = {};
+            state.totalPages = null;
+            state.totalCount = null;
+            state.countedAt = 0;
+            return state;
+        }
+
         const lastRenderedFilters = {
             actions: JSON.stringify(getRenderableFilterSnapshot('actions', initialSoundboardData?.actions?.filters)),
             favorites: JSON.stringify(getRenderableFilterSnapshot('favorites', initialSoundboardData?.favorites?.filters)),
@@ -550,6 +595,21 @@
             }
         }
 
+        function describePlayTrace(trace) {
+            if (!trace || typeof trace.total_ms !== 'number') {
+                return '';
+            }
+            const steps = (trace.spans || [])
+                .filter((span) => span.parent === 'play' && typeof span.duration_ms === 'number' && span.duration_ms >= 1)
+                .sort((a, b) => b.duration_ms - a.duration_ms)
+                .slice(0, 4)
+                .map((span) => `${span.name} ${Math.round(span.duration_ms)} ms`);
+            const status = trace.status && trace.status !== 'ok' ? ` [${trace.status}]` : '';
+            const label = cleanSoundLabel(trace.audio_file);
+            return `Last start: ${label} ${Math.round(trace.total_ms)} ms${status}`
+                + (steps.length ? `\n${steps.join(' · ')}` : '');
+        }
+
         function renderControlRoomSubtitleText(value) {
             const element = document.getElementById('controlRoomRequester');
             if (!element) {
@@ -726,6 +786,9 @@
             const nowPlayingLabel = isPlaying ? currentSound : (status.online ? 'Idle' : 'Bot status unavailable');
             setControlRoomText('controlRoomNowPlaying', nowPlayingLabel);
             const nowPlayingEl = document.getElementById('controlRoomNowPlaying');
+            if (nowPlayingEl) {
+                nowPlayingEl.title = describePlayTrace((status.recent_play_traces || [])[0]);
+            }
             if (nowPlayingEl && nowPlayingLabel !== previousNowPlayingText) {
                 nowPlayingEl.classList.add('status-flip');
                 window.setTimeout(() => nowPlayingEl.classList.remove('status-flip'), 600);
@@ -1797,46 +1860,89 @@
             return lines.filter(Boolean).join('\n');
         }
 
+        let soundDurationState = createSoundDurationState('');
+
+        function createSoundDurationState(guildKey) {
+            return {
+                guildKey,
+                durations: {},
+                fullRequest: null,
+                fullLoaded: false,
+                requestedIds: new Set()
+            };
+        }
+
+        function getSoundDurationState() {
+            const guildKey = getSelectedGuildId() || '';
+            if (soundDurationState.guildKey !== guildKey) {
+                soundDurationState = createSoundDurationState(guildKey);
+            }
+            return soundDurationState;
+        }
+
+        function fetchSoundDurations(params) {
+            const guildId = getSelectedGuildId();
+            if (guildId) {
+                params.set('guild_id', guildId);
+            }
+            // no-cache revalidates against the ETag, so an unchanged map comes back as a 304.
+            return fetch('/api/sound_durations?' + params.toString(), { cache: 'no-cache' })
+                .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+                .then(data => data.durations || {});
+        }
+
+        function applySoundDuration(row, duration) {
+            const filenameCell = row.querySelector('.filename');
+            if (!filenameCell) return;
+            const title = filenameCell.querySelector('.sound-title');
+            if (!title) return;
+            const span = document.createElement('span');
+            span.className = 'sound-duration';
+            span.textContent = duration;
+            title.after(span);
+        }
+
         function hydrateSoundDurations() {
+            const state = getSoundDurationState();
             const soundRows = document.querySelectorAll(
                 '#favoritesTableBody tr.sound-options-row, #allSoundsTableBody tr.sound-options-row'
             );
             const missingIds = [];
-            const rowMap = {};
 
             soundRows.forEach(row => {
                 const soundId = row.dataset.soundId;
                 if (!soundId) return;
                 if (row.querySelector('.sound-duration')) return;
+                if (state.durations[soundId]) {
+                    applySoundDuration(row, state.durations[soundId]);
+                    return;
+                }
                 missingIds.push(soundId);
-                rowMap[soundId] = row;
             });
 
             if (missingIds.length === 0) return;
 
-            const params = new URLSearchParams();
-            missingIds.forEach(id => params.append('sound_id', id));
-            const guildId = getSelectedGuildId();
-            if (guildId) {
-                params.set('guild_id', guildId);
+            // One request loads the whole guild's duration map; later renders use it.
+            if (!state.fullRequest) {
+                state.fullRequest = fetchSoundDurations(new URLSearchParams({ all: '1' }))
+                    .then(durations => { Object.assign(state.durations, durations); })
+                    .catch(() => {})
+                    .then(() => {
+                        state.fullLoaded = true;
+                        hydrateSoundDurations();
+                    });
+                return;
             }
+            if (!state.fullLoaded) return;
 
-            fetch('/api/sound_durations?' + params.toString(), { cache: 'no-cache' })
-                .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-                .then(data => {
-                    const durations = data.durations || {};
-                    Object.entries(durations).forEach(([soundId, duration]) => {
-                        const row = rowMap[soundId];
-                        if (!row) return;
-                        const filenameCell = row.querySelector('.filename');
-                        if (!filenameCell) return;
-                        const title = filenameCell.querySelector('.sound-title');
-                        if (!title) return;
-                        const span = document.createElement('span');
-                        span.className = 'sound-duration';
-                        span.textContent = duration;
-                        title.after(span);
-                    });
+            // Sounds the server had not measured yet are asked for once each.
+            const pendingIds = missingIds.filter(soundId => !state.requestedIds.has(soundId));
+            if (pendingIds.length === 0) return;
+            pendingIds.forEach(soundId => state.requestedIds.add(soundId));
+            fetchSoundDurations(new URLSearchParams({ sound_id: pendingIds.join(',') }))
+                .then(durations => {
+                    Object.assign(state.durations, durations);
+                    hydrateSoundDurations();
                 })
                 .catch(() => {});
         }
@@ -2021,7 +2127,14 @@
             const includeFiltersQuery = '&include_filters=0';
             const guildId = getSelectedGuildId();
             const guildQuery = guildId ? `&guild_id=${encodeURIComponent(guildId)}` : '';
-            const apiUrl = `/api/${endpoint}?page=${page}&per_page=${endpointItemsPerPage[endpoint]}&search=${encodeURIComponent(searchQuery)}${guildQuery}${includeFiltersQuery}${filterQuery ? `&${filterQuery}` : ''}`;
+            const cursorSignature = `${endpointItemsPerPage[endpoint]}|${searchQuery}|${guildQuery}|${filterQuery}`;
+            const cursorState = getPageCursorState(endpoint, cursorSignature, !searchQuery && !filterQuery);
+            const pageCursor = page > 1 ? cursorState.cursors[page] : null;
+            // Deep pages continue the keyset scan and reuse a recent total instead of re-counting.
+            const cursorQuery = pageCursor
+                ? `&cursor=${encodeURIComponent(pageCursor)}${hasFreshPageCount(cursorState) ? '&include_count=0' : ''}`
+                : '';
+            const apiUrl = `/api/${endpoint}?page=${page}&per_page=${endpointItemsPerPage[endpoint]}&search=${encodeURIComponent(searchQuery)}${guildQuery}${includeFiltersQuery}${filterQuery ? `&${filterQuery}` : ''}${cursorQuery}`;
 
             if (showLoading) {
                 setEndpointLoading(endpoint, true);
@@ -2037,6 +2150,24 @@
                         renderFilterControls(endpoint, data.filters || {}, fetchersByEndpoint[endpoint]);
                     }
 
+                    // A response for a search/filter the user already changed must not
+                    // seed cursors or totals for the new query.
+                    const isCurrentQuery = cursorState.signature === cursorSignature;
+                    if (isCurrentQuery && data.next_cursor) {
+                        cursorState.cursors[page + 1] = data.next_cursor;
+                    } else if (isCurrentQuery) {
+                        delete cursorState.cursors[page + 1];
+                    }
+                    if (Number.isFinite(data.total_pages)) {
+                        if (isCurrentQuery) {
+                            cursorState.totalPages = data.total_pages;
+                            cursorState.totalCount = data.total_count;
+                            cursorState.countedAt = Date.now();
+                        }
+                    } else if (isCurrentQuery && cursorState.totalPages !== null) {
+                        data = { ...data, total_pages: cursorState.totalPages, total_count: cursorState.totalCount };
+                    }
+
                     const hasNewEntries = JSON.stringify(data.items) !== JSON.stringify(lastFetchedData[endpoint]);
                     updatePaginationControls(page, data.total_pages, totalPagesId, prevButtonId, nextButtonId, pageInputId);
                     updateResultMeta(endpoint, data, page);
@@ -405,6 +405,42 @@
         state.totalPages = data.total_pages || 1;
         renderClips(data.items || [], { animate: !opts.passive });
         renderPagination();
+        prefetchClipAudio(data.prefetch || []);
+    }
+
+    // ── Audio URLs and prefetch ──────────────────────────────────────
+    // Versioned URLs are served as immutable, so warmed clips play from
+    // the browser cache without revalidating. Only the most recent hints
+    // are kept in the document; older <link> tags are removed.
+    var MAX_PREFETCHED_AUDIO = 64;
+    var prefetchedAudioUrls = new Map();
+
+    function clipAudioUrl(clip) {
+        var base = '/api/speech_training/clips/' + clip.id;
+        if (!clip.audio_version) return base + '/audio';
+        return base + '/audio?v=' + encodeURIComponent(clip.audio_version);
+    }
+
+    function prefetchClipAudio(clips) {
+        clips.forEach(function (clip) {
+            if (!clip.audio_version) return;
+            var url = clipAudioUrl(clip);
+            if (prefetchedAudioUrls.has(url)) return;
+            var link = document.createElement('link');
+            link.rel = 'prefetch';
+            link.as = 'audio';
+            link.href = url;
+            document.head.appendChild(link);
+            prefetchedAudioUrls.set(url, link);
+            while (prefetchedAudioUrls.size > MAX_PREFETCHED_AUDIO) {
+                var oldestUrl = prefetchedAudioUrls.keys().next().value;
+                var oldestLink = prefetchedAudioUrls.get(oldestUrl);
+                if (oldestLink && oldestLink.parentNode) {
+                    oldestLink.parentNode.removeChild(oldestLink);
+                }
+                prefetchedAudioUrls.delete(oldestUrl);
+            }
+        });
     }
 
     function escapeHtml(str) {
@@ -756,7 +792,7 @@
             // Expanded details (hidden by default)
             html += '<div class="dataset-clip-details" hidden>';
             html += '<audio class="dataset-clip-player" controls preload="none">';
-            html += '<source src="/api/speech_training/clips/' + clip.id + '/audio" type="audio/mpeg">';
+            html += '<source src="' + escapeHtml(clipAudioUrl(clip)) + '" type="audio/mpeg">';
             html += '</audio>';
             html += '<div class="dataset-clip-fields">';
 
@@ -1067,7 +1103,10 @@
             // Bust the browser cache so the next play uses the new MP3
             var source = audio.querySelector('source');
             if (source) {
-                source.src = '/api/speech_training/clips/' + clipEl.dataset.id + '/audio?v=' + Date.now();
+                source.src = clipAudioUrl({
+                    id: clipEl.dataset.id,
+                    audio_version: data.audio_version || String(Date.now()),
+                });
                 audio.load();
             }
         }
@@ -31,10 +31,10 @@ from bot.commands.rlstore import RocketLeagueStoreCog
 from bot.commands.settings import SettingsCog
 from bot.repositories import VoiceActivityRepository
 from bot.repositories.action import ActionRepository
-from bot.services.web_playback import (
-    ensure_playback_queue_identity_columns,
-    process_playback_queue_request,
-)
+from bot.metrics import REGISTRY
+from bot.services.http_client import close_http_client
+from bot.services.playback_queue_dispatcher import PlaybackQueueDispatcher
+from bot.services.web_playback import process_playback_queue_request
 from config import PLAYBACK_QUEUE_INTERVAL
 import random
 import time
@@ -86,66 +86,45 @@ except ImportError:
 
 # --- Playback queue drain helpers ---
 
-# Serialize concurrent drains from the polling loop and Honker listener
-# so that a Honker-triggered drain and the polling tick do not fetch
-# and process the same unplayed row twice.
-_playback_queue_drain_lock = asyncio.Lock()
+_playback_sound_folder = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "sounds")
+)
 
 
-async def _drain_playback_queue_once() -> None:
-    """Process all unplayed playback_queue rows.
+async def _process_queued_playback(request) -> bool:
+    """Run one claimed playback_queue row against the live bot."""
+    return await process_playback_queue_request(
+        request,
+        bot=bot,
+        behavior=behavior,
+        db=db,
+        sound_folder=_playback_sound_folder,
+        action_logger_factory=ActionRepository,
+    )
 
-    This is the core drain logic shared by the polling loop and the
-    optional Honker notification listener. Serialized with a module-level
-    lock so concurrent calls from both paths do not process the same
-    row twice.
-    """
-    if _playback_queue_drain_lock.locked():
-        return
 
-    async with _playback_queue_drain_lock:
-        try:
-            ensure_playback_queue_identity_columns(db.db_path)
-            cursor = db.cursor
-            cursor.execute(
-                """
-                SELECT
-                    id,
-                    guild_id,
-                    sound_filename,
-                    request_username,
-                    request_user_id,
-                    request_type,
-                    control_action,
-                    play_action
-                FROM playback_queue
-                WHERE played_at IS NULL
-                ORDER BY requested_at ASC
-            """
-            )
-            pending_requests = cursor.fetchall()
+# Claims unplayed rows atomically and runs them on per-guild workers, so a
+# slow voice connect in one guild does not hold up requests for the others.
+_playback_dispatcher = PlaybackQueueDispatcher(db.db_path, _process_queued_playback)
+REGISTRY.gauge(
+    "playback_queue_inflight",
+    "Web playback requests claimed by the bot and not yet finished.",
+).set_function(lambda: _playback_dispatcher.inflight_count)
 
-            if not pending_requests:
-                return
 
-            print(f"[Playback Queue] Found {len(pending_requests)} pending requests.")
+async def _drain_playback_queue_once() -> None:
+    """Claim and dispatch all unplayed playback_queue rows.
 
-            sound_folder = os.path.abspath(
-                os.path.join(os.path.dirname(__file__), "sounds")
-            )
-            for request in pending_requests:
-                await process_playback_queue_request(
-                    request,
-                    bot=bot,
-                    behavior=behavior,
-                    db=db,
-                    sound_folder=sound_folder,
-                    action_logger_factory=ActionRepository,
-                )
-        except sqlite3.Error as db_err:
-            print(f"[Playback Queue] Database error: {db_err}")
-        except Exception as e:
-            print(f"[Playback Queue] Unexpected error in drain: {e}")
+    This is the core drain logic shared by the polling loop and the
+    optional Honker notification listener. Overlapping calls fold into the
+    running drain, and the claim protocol keeps a row from running twice.
+    """
+    try:
+        claimed = await _playback_dispatcher.drain_once()
+        if claimed:
+            print(f"[Playback Queue] Claimed {claimed} pending requests.")
+    except Exception as e:
+        print(f"[Playback Queue] Unexpected error in drain: {e}")
 
 
 # --- Background Task to Handle Web Playback Requests ---
@@ -556,6 +535,8 @@ async def on_close():
     if _honker_playback_listener_task is not None:
         _honker_playback_listener_task.cancel()
         _honker_playback_listener_task = None
+    await _playback_dispatcher.close()
+    await close_http_client()
     print("Cleanup complete.")
 
 # --- New DM Video Link Handler ---
@@ -0,0 +1 @@
+# Downloader tests package
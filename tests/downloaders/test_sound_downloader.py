@@ -0,0 +1,180 @@
+"""
+Tests for bot/downloaders/sound.py - SoundDownloader scrape pipeline.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bot.downloaders import sound as sound_module
+from bot.downloaders.sound import SoundDownloader
+
+
+class _FakeSession:
+    """Records GETs and replays canned responses."""
+
+    def __init__(self, *responses) -> None:
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+def _response(status, content=b"", **headers):
+    return SimpleNamespace(status_code=status, content=content, headers=headers)
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver")
+    monkeypatch.setenv("SCRAPER_DOWNLOAD_MIN_INTERVAL_SECONDS", "0")
+    db_path = tmp_path / "sounds.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE sounds (id INTEGER PRIMARY KEY, originalfilename TEXT, Filename TEXT)")
+    conn.execute("INSERT INTO sounds (originalfilename, Filename) VALUES ('in_db.mp3', 'renamed.mp3')")
+    conn.commit()
+    conn.close()
+
+    instance = SoundDownloader(None, Mock(db_path=str(db_path)))
+    instance.dwdir = str(tmp_path / "downloads")
+    instance.sounds_dir = str(tmp_path / "sounds")
+    instance.http_cache_path = str(tmp_path / "cache.json")
+    (tmp_path / "downloads").mkdir()
+    (tmp_path / "sounds").mkdir()
+    return instance
+
+
+def test_known_filenames_combine_database_and_folders(downloader, tmp_path):
+    (tmp_path / "sounds" / "on_disk.mp3").write_bytes(b"")
+    (tmp_path / "downloads" / "pending.mp3").write_bytes(b"")
+
+    assert downloader._load_known_filenames() == {"in_db.mp3", "on_disk.mp3", "pending.mp3"}
+
+
+def test_download_writes_file_and_refetches_missing_file_in_full(downloader, tmp_path):
+    downloader._session = _FakeSession(
+        _response(200, b"mp3", ETag='"v1"', **{"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        _response(200, b"mp3 again", ETag='"v1"'),
+    )
+
+    assert downloader._download_single_file("https://x/a.mp3", "a.mp3") == ("a.mp3", True, "")
+    assert (tmp_path / "downloads" / "a.mp3").read_bytes() == b"mp3"
+    assert not (tmp_path / "downloads" / "a.mp3.part").exists()
+    assert downloader._is_known("a.mp3")
+
+    # The file was rejected later (removed): no validators, so no 304 can hide it.
+    (tmp_path / "downloads" / "a.mp3").unlink()
+    downloader._known_filenames.clear()
+    assert downloader._download_single_file("https://x/a.mp3", "a.mp3") == ("a.mp3", True, "")
+    assert downloader._session.calls[1][1] == {}
+    assert (tmp_path / "downloads" / "a.mp3").read_bytes() == b"mp3 again"
+
+    downloader._save_http_cache()
+    assert downloader._load_http_cache() == {}
+
+
+def test_download_remembers_404_and_retries_after_429(downloader):
+    downloader._session = _FakeSession(
+        _response(404),
+        _response(429, **{"Retry-After": "0"}),
+        _response(200, b"ok"),
+    )
+    downloader._spacer.back_off = Mock()
+
+    assert downloader._download_single_file("https://x/gone.mp3", "gone.mp3")[2] == "404 not found"
+    assert downloader._download_single_file("https://x/gone.mp3", "gone.mp3")[2] == "404 not found (cached)"
+    assert downloader._download_single_file("https://x/b.mp3", "b.mp3") == ("b.mp3", True, "")
+
+    assert len(downloader._session.calls) == 3
+    downloader._spacer.back_off.assert_called_once_with(1.0)
+    downloader._save_http_cache()
+    assert list(downloader._load_http_cache()) == ["https://x/gone.mp3"]
+
+
+@pytest.mark.asyncio
+async def test_import_batches_inserts_and_skips_known_files(downloader, tmp_path, monkeypatch):
+    downloads = tmp_path / "downloads"
+    files = []
+    for name in ("in_db.mp3", "good.mp3", "broken.mp3", "other.mp3"):
+        (downloads / name).write_bytes(b"x")
+        files.append(str(downloads / name))
+
+    sound_repo = Mock(get_original_filenames=Mock(return_value={"in_db.mp3"}))
+    action_repo = Mock()
+    sound_repo_class = Mock(return_value=sound_repo)
+    monkeypatch.setattr(sound_module, "SoundRepository", sound_repo_class)
+    monkeypatch.setattr(sound_module, "ActionRepository", Mock(return_value=action_repo))
+    notifications = AsyncMock(side_effect=lambda **kwargs: sound_repo.insert_sounds.assert_called_once())
+    monkeypatch.setattr(
+        "bot.services.sound_import_notifications.SoundImportNotificationService",
+        Mock(return_value=Mock(send_notification=notifications)),
+    )
+    downloader._normalize_files = AsyncMock(return_value=[None, ValueError("bad mp3"), None])
+
+    imported = await downloader._import_downloaded_files(files, -18.0)
+
+    assert imported == ["good.mp3", "other.mp3"]
+    downloader._normalize_files.assert_awaited_once_with(files[1:], -18.0)
+    assert [call.kwargs["filename"] for call in notifications.await_args_list] == ["good.mp3", "other.mp3"]
+    sound_repo_class.assert_called_once_with(db_path=downloader.db.db_path, use_shared=False)
+    sound_repo.insert_sounds.assert_called_once_with(["good.mp3", "other.mp3"])
+    action_repo.insert_many.assert_called_once_with("admin", "scrape_sound", ["good.mp3", "other.mp3"])
+    downloader.db.invalidate_sound_cache.assert_called_once_with()
+    assert sorted(p.name for p in (tmp_path / "sounds").iterdir()) == ["good.mp3", "other.mp3"]
+    assert list(downloads.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_import_returns_files_to_downloads_when_insert_fails(downloader, tmp_path, monkeypatch):
+    downloads = tmp_path / "downloads"
+    files = []
+    for name in ("good.mp3", "other.mp3"):
+        (downloads / name).write_bytes(b"x")
+        files.append(str(downloads / name))
+
+    sound_repo = Mock(
+        get_original_filenames=Mock(return_value=set()),
+        insert_sounds=Mock(side_effect=sqlite3.OperationalError("database is locked")),
+    )
+    action_repo = Mock()
+    monkeypatch.setattr(sound_module, "SoundRepository", Mock(return_value=sound_repo))
+    monkeypatch.setattr(sound_module, "ActionRepository", Mock(return_value=action_repo))
+    notifications = AsyncMock()
+    monkeypatch.setattr(
+        "bot.services.sound_import_notifications.SoundImportNotificationService",
+        Mock(return_value=Mock(send_notification=notifications)),
+    )
+    downloader._normalize_files = AsyncMock(return_value=[None, None])
+
+    with pytest.raises(sqlite3.OperationalError):
+        await downloader._import_downloaded_files(files, -18.0)
+
+    notifications.assert_not_awaited()
+    assert sorted(p.name for p in downloads.iterdir()) == ["good.mp3", "other.mp3"]
+    assert list((tmp_path / "sounds").iterdir()) == []
+    action_repo.insert_many.assert_not_called()
+    downloader.db.invalidate_sound_cache.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_normalize_uses_shared_loudness_pool(downloader, monkeypatch):
+    calls = []
+
+    def _normalize(path, target, *, source):
+        calls.append((path, target.level, source))
+        if path == "bad.mp3":
+            raise ValueError("bad mp3")
+
+    monkeypatch.setattr(sound_module, "get_loudness_normalizer", Mock(return_value=Mock(normalize=_normalize)))
+
+    errors = await downloader._normalize_files(["one.mp3", "bad.mp3"], -20.0)
+
+    assert errors[0] is None
+    assert isinstance(errors[1], ValueError)
+    assert sorted(calls) == [("bad.mp3", -20.0, "scrape"), ("one.mp3", -20.0, "scrape")]
@@ -50,6 +50,28 @@ class TestActionRepository:
         finally:
             action_module._publish_soundboard_event = original
 
+    def test_insert_many_batches_rows_and_publishes_once(self, action_repository, db_connection):
+        """insert_many logs one row per target and publishes one event."""
+        from bot.repositories import action as action_module
+        original = action_module._publish_soundboard_event
+        mock_publish = MagicMock(return_value=True)
+        action_module._publish_soundboard_event = mock_publish
+        try:
+            inserted = action_repository.insert_many("admin", "scrape_sound", ["a.mp3", "b.mp3"])
+        finally:
+            action_module._publish_soundboard_event = original
+
+        assert inserted == 2
+        rows = db_connection.execute(
+            "SELECT username, action, target FROM actions ORDER BY id"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            ("admin", "scrape_sound", "a.mp3"),
+            ("admin", "scrape_sound", "b.mp3"),
+        ]
+        mock_publish.assert_called_once()
+        assert mock_publish.call_args.args[2]["count"] == 2
+
     def test_insert_publishes_event_fallback_gracefully(self, action_repository, db_connection):
         """Test insert does not crash when event publishing fails."""
         from bot.repositories import action as action_module
@@ -137,6 +159,19 @@ class TestActionRepository:
         count = action_repository.get_sound_play_count(sample_actions[0])
         assert count == 2
     
+    def test_get_play_counts_by_guild(self, action_repository):
+        """Play counts are grouped per guild, keeping unscoped plays under None."""
+        action_repository.insert("user1", "play_request", "5", guild_id=1)
+        action_repository.insert("user2", "play_from_list", "5", guild_id=1)
+        action_repository.insert("user1", "replay_sound", "5")
+        action_repository.insert("user1", "play_request", "6", guild_id=2)
+        action_repository.insert("user1", "favorite_sound", "6", guild_id=2)
+        action_repository.insert("user1", "play_request", "not-an-id", guild_id=2)
+
+        counts = action_repository.get_play_counts_by_guild()
+
+        assert counts == {"1": {5: 2}, None: {5: 1}, "2": {6: 1}}
+
     def test_get_users_who_favorited(self, action_repository, sample_actions):
         """Test getting users who favorited a sound."""
         # Both user1 and user2 favorited sample_actions[0]
@@ -0,0 +1,64 @@
+"""
+Tests for bot/repositories/sound_duration.py - SoundDurationRepository.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.repositories.sound_duration import SoundDurationRepository
+
+
+@pytest.fixture
+def duration_repository(db_connection, sample_sounds):
+    """Create a SoundDurationRepository with its schema over sample sounds."""
+    from bot.repositories.base import BaseRepository
+
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    repo = SoundDurationRepository(use_shared=True)
+    repo.ensure_schema()
+    yield repo
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+class TestSoundDurationRepository:
+    """Tests for persisted sound durations."""
+
+    def test_upsert_stores_durations_and_bumps_version(self, duration_repository, sample_sounds):
+        """Upserts are readable as a map and advance the change counter."""
+        assert duration_repository.get_version() == 0
+
+        version = duration_repository.upsert_durations({sample_sounds[0]: 1.5, sample_sounds[1]: 3.0})
+        assert version == 1
+        assert duration_repository.get_duration_map() == {sample_sounds[0]: 1.5, sample_sounds[1]: 3.0}
+
+        assert duration_repository.upsert_durations({sample_sounds[0]: 2.0}) == 2
+        assert duration_repository.get_by_id(sample_sounds[0])["duration_seconds"] == 2.0
+
+    def test_empty_upsert_keeps_version(self, duration_repository):
+        """Nothing to store means nothing to invalidate."""
+        assert duration_repository.upsert_durations({}) == 0
+
+    def test_rename_and_delete_drop_stored_duration(self, duration_repository, db_connection, sample_sounds):
+        """Triggers remove rows whose file may have changed."""
+        duration_repository.upsert_durations({sample_sounds[0]: 1.0, sample_sounds[1]: 2.0})
+
+        db_connection.execute("UPDATE sounds SET favorite = 1 WHERE id = ?", (sample_sounds[0],))
+        assert duration_repository.get_version() == 1
+
+        db_connection.execute("UPDATE sounds SET Filename = 'renamed.mp3' WHERE id = ?", (sample_sounds[0],))
+        db_connection.execute("DELETE FROM sounds WHERE id = ?", (sample_sounds[1],))
+
+        assert duration_repository.get_duration_map() == {}
+        assert duration_repository.get_version() == 3
+
+    def test_ensure_schema_is_idempotent(self, duration_repository, sample_sounds):
+        """Running ensure_schema again keeps rows and the counter."""
+        duration_repository.upsert_durations({sample_sounds[0]: 1.0})
+        duration_repository.ensure_schema()
+
+        assert duration_repository.get_duration_map() == {sample_sounds[0]: 1.0}
+        assert duration_repository.get_version() == 1
+        assert duration_repository.is_available() is True
@@ -60,6 +60,37 @@ class TestSoundRepository:
         finally:
             sound_module._publish_soundboard_event = original
 
+    def test_insert_sounds_batches_rows_and_publishes_once(self, sound_repository, db_connection):
+        """insert_sounds writes every row and publishes one sounds_changed event."""
+        from bot.repositories import sound as sound_module
+        original = sound_module._publish_soundboard_event
+        mock_publish = MagicMock(return_value=True)
+        sound_module._publish_soundboard_event = mock_publish
+        try:
+            inserted = sound_repository.insert_sounds(["a.mp3", "b.mp3"])
+        finally:
+            sound_module._publish_soundboard_event = original
+
+        assert inserted == 2
+        assert sound_repository.get_original_filenames() == {"a.mp3", "b.mp3"}
+        mock_publish.assert_called_once()
+        assert mock_publish.call_args.args[1:] == ("sounds_changed", {"count": 2, "guild_id": None})
+        assert sound_repository.insert_sounds([]) == 0
+
+    def test_insert_sounds_logs_publish_failure(self, sound_repository, db_connection, caplog):
+        """insert_sounds keeps the rows and logs when the batch event fails to publish."""
+        from bot.repositories import sound as sound_module
+        original = sound_module._publish_soundboard_event
+        sound_module._publish_soundboard_event = MagicMock(side_effect=RuntimeError("Honker error"))
+        try:
+            with caplog.at_level("WARNING", logger="bot.repositories.sound"):
+                inserted = sound_repository.insert_sounds(["a.mp3"])
+        finally:
+            sound_module._publish_soundboard_event = original
+
+        assert inserted == 1
+        assert "sounds_changed publish failed count=1" in caplog.text
+
     def test_update_sound_by_id_publishes_event(self, sound_repository, sample_sounds):
         """Test update_sound_by_id publishes sounds_changed event."""
         from bot.repositories import sound as sound_module
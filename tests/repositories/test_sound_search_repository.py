@@ -0,0 +1,138 @@
+"""
+Tests for bot/repositories/sound_search.py - SoundSearchRepository.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.repositories.sound_search import SOUND_SEARCH_TABLE, SoundSearchRepository, normalize_sound_text
+
+
+@pytest.fixture
+def search_repository(db_connection, sample_sounds):
+    """Create a SoundSearchRepository with the FTS index built over sample sounds."""
+    from bot.repositories.base import BaseRepository
+
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    repo = SoundSearchRepository(use_shared=True)
+    repo.ensure_schema()
+    yield repo
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+def _indexed_rows(db_connection) -> dict[int, tuple[str, str]]:
+    rows = db_connection.execute(
+        f"SELECT rowid, filename, normalized_name FROM {SOUND_SEARCH_TABLE}"
+    ).fetchall()
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+class TestSoundSearchRepository:
+    """Tests for the sound-name FTS index."""
+
+    def test_ensure_schema_backfills_existing_sounds(self, search_repository, db_connection, sample_sounds):
+        """Existing sounds are indexed when the table is first created."""
+        indexed = _indexed_rows(db_connection)
+
+        assert set(indexed) == set(sample_sounds)
+        assert indexed[4] == ("slap_sound.mp3", "slap sound.mpe")
+
+    def test_triggers_keep_index_in_sync(self, search_repository, db_connection):
+        """Inserts, renames and deletes on ``sounds`` update the index."""
+        db_connection.execute(
+            "INSERT INTO sounds (id, originalfilename, Filename) VALUES (10, 'Big-Honk.mp3', 'Big-Honk.mp3')"
+        )
+        assert _indexed_rows(db_connection)[10] == ("Big-Honk.mp3", "big honk.mpe")
+
+        db_connection.execute("UPDATE sounds SET Filename = 'small_honk.mp3' WHERE id = 10")
+        assert _indexed_rows(db_connection)[10] == ("small_honk.mp3", "small honk.mpe")
+
+        db_connection.execute("DELETE FROM sounds WHERE id = 10")
+        assert 10 not in _indexed_rows(db_connection)
+
+    def test_ensure_schema_is_idempotent(self, search_repository, db_connection, sample_sounds):
+        """Running ensure_schema again does not duplicate rows."""
+        search_repository.ensure_schema()
+
+        count = db_connection.execute(f"SELECT COUNT(*) FROM {SOUND_SEARCH_TABLE}").fetchone()[0]
+        assert count == len(sample_sounds)
+
+    def test_find_similar_candidates_ranks_shared_trigrams(self, search_repository):
+        """Sounds sharing more trigrams with the query rank first."""
+        candidates = search_repository.find_similar_candidates("slap sound")
+
+        assert candidates
+        assert candidates[0][0] == 4
+        assert {sound_id for sound_id, _rank in candidates} == {1, 2, 3, 4}
+        assert all(rank <= 0 for _sound_id, rank in candidates)
+
+    def test_find_similar_candidates_skips_short_queries(self, search_repository):
+        """Queries without a three-letter word cannot use the index."""
+        assert search_repository.find_similar_candidates("ab") is None
+
+    def test_substring_match_matches_like_semantics(self, search_repository, db_connection):
+        """The substring expression finds names containing the term in any case."""
+        expression = SoundSearchRepository.build_substring_match("AP_SOU")
+        rows = db_connection.execute(
+            f"SELECT rowid FROM {SOUND_SEARCH_TABLE} WHERE {SOUND_SEARCH_TABLE} MATCH ?",
+            (expression,),
+        ).fetchall()
+
+        assert [row[0] for row in rows] == [4]
+
+    def test_substring_match_requires_three_characters(self):
+        """Short terms fall back to LIKE scans."""
+        assert SoundSearchRepository.build_substring_match("ab") is None
+
+    def test_is_available(self, search_repository):
+        """The index reports availability once created."""
+        assert search_repository.is_available() is True
+
+    def test_normalized_name_matches_normalize_text(self, search_repository, db_connection):
+        """The indexed name lowercases before stripping ``.mp3`` and collapses spaces."""
+        from bot.database import Database
+
+        name = "Big  -_ Honk\t3.MP3"
+        db_connection.execute(
+            "INSERT INTO sounds (id, originalfilename, Filename) VALUES (11, ?, ?)",
+            (name, name),
+        )
+
+        assert _indexed_rows(db_connection)[11][1] == Database.normalize_text(None, name) == "big honk e.mpe"
+
+    def test_callers_share_normalize_sound_text(self):
+        """Live search, the neighbor index and the web options panel use one normalizer."""
+        from bot.database import Database
+        from bot.services.web_sound_options import WebSoundOptionsService
+
+        name = "L33t_Honk--Remix  Final"
+
+        expected = normalize_sound_text(name)
+        assert expected == "leet honk remix final"
+        assert Database.normalize_text(None, name) == expected
+        assert WebSoundOptionsService._normalize_for_similarity(name) == expected
+        assert normalize_sound_text(None) == ""
+
+    def test_ensure_schema_replaces_triggers_with_old_rules(self, search_repository, db_connection):
+        """Triggers written with older normalization rules are recreated and the index rebuilt."""
+        db_connection.execute("DROP TRIGGER sounds_fts_after_insert")
+        db_connection.execute(
+            f"""
+            CREATE TRIGGER sounds_fts_after_insert AFTER INSERT ON sounds
+            BEGIN
+                INSERT INTO {SOUND_SEARCH_TABLE} (rowid, filename, original_filename, normalized_name)
+                VALUES (NEW.id, NEW.Filename, NEW.originalfilename, LOWER(NEW.Filename));
+            END
+            """
+        )
+        db_connection.execute(
+            "INSERT INTO sounds (id, originalfilename, Filename) VALUES (12, 'Old  Name.mp3', 'Old  Name.mp3')"
+        )
+        assert _indexed_rows(db_connection)[12][1] == "old  name.mp3"
+
+        search_repository.ensure_schema()
+
+        assert _indexed_rows(db_connection)[12][1] == "old name.mpe"
@@ -0,0 +1,139 @@
+"""
+Tests for bot/repositories/system_monitor_timeseries.py - tiered rollups.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from bot.repositories.system_monitor_timeseries import (
+    SystemMonitorTimeSeriesRepository,
+    timeseries_db_path_for,
+)
+
+NOW = 1_700_000_000 - 1_700_000_000 % 300
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a repository backed by a temp time-series file."""
+    return SystemMonitorTimeSeriesRepository(db_path=str(tmp_path / "system_monitor.db"))
+
+
+def test_db_path_sits_next_to_main_database(tmp_path, monkeypatch):
+    """The time-series file lives beside the main database unless overridden."""
+    monkeypatch.delenv("SYSTEM_MONITOR_DB_PATH", raising=False)
+    assert timeseries_db_path_for(str(tmp_path / "database.db")) == str(tmp_path / "system_monitor.db")
+
+    monkeypatch.setenv("SYSTEM_MONITOR_DB_PATH", "/elsewhere/ts.db")
+    assert timeseries_db_path_for(str(tmp_path / "database.db")) == "/elsewhere/ts.db"
+
+
+def test_reads_without_file_return_empty_and_do_not_create_it(repo):
+    """The web can query before the bot has written anything."""
+    assert repo.get_samples("cpu", "", NOW - 60, NOW, now=NOW) == []
+    assert repo.get_processes_at_time(NOW, now=NOW) == []
+    assert not os.path.exists(repo.db_path)
+
+
+def test_rollups_keep_min_max_and_average(repo):
+    """Each tier aggregates the samples that fall into its buckets."""
+    repo.record_samples([("cpu", "", NOW + offset, float(offset)) for offset in range(20)])
+
+    raw = repo.get_samples("cpu", "", NOW, NOW + 19, now=NOW + 19)
+    assert len(raw) == 20
+    assert raw[3] == {"time": NOW + 3, "value": 3.0, "min": 3.0, "max": 3.0}
+
+    ten_second = repo._execute(
+        "SELECT bucket, min_value, max_value, sum_value / sample_count AS avg "
+        "FROM system_monitor_rollups WHERE tier = 10 ORDER BY bucket"
+    )
+    assert [tuple(row) for row in ten_second] == [(NOW, 0.0, 9.0, 4.5), (NOW + 10, 10.0, 19.0, 14.5)]
+
+
+def test_range_queries_pick_tier_that_fits_max_points(repo):
+    """Longer ranges read coarser tiers and never exceed max_points."""
+    assert repo.select_tier(NOW - 60, NOW, 500, now=NOW).width_seconds == 1
+    assert repo.select_tier(NOW - 3600, NOW, 500, now=NOW).width_seconds == 10
+    assert repo.select_tier(NOW - 86400, NOW, 500, now=NOW).width_seconds == 300
+
+    repo.record_samples([("ram", "", NOW - 3600 + offset, 50.0) for offset in range(3600)])
+    hour = repo.get_samples("ram", "", NOW - 3600, NOW, max_points=500, now=NOW)
+    assert len(hour) == 360
+    assert all(point["value"] == 50.0 for point in hour)
+
+    merged = repo.get_samples("ram", "", NOW - 3600, NOW, max_points=100, now=NOW)
+    assert len(merged) <= 100
+
+
+def test_retention_prunes_each_tier_independently(repo):
+    """Old 1 s buckets go first while coarser tiers keep the history."""
+    repo.record_samples([("cpu", "", NOW - 3 * 3600, 10.0)])
+    repo.record_samples([("cpu", "", NOW, 20.0)])
+
+    tiers = {
+        row["tier"]: row["count"]
+        for row in repo._execute(
+            "SELECT tier, COUNT(*) AS count FROM system_monitor_rollups GROUP BY tier"
+        )
+    }
+    assert tiers == {1: 1, 10: 2, 300: 2}
+
+    old = repo.get_samples("cpu", "", NOW - 3 * 3600 - 60, NOW - 3 * 3600 + 60, now=NOW)
+    assert [point["value"] for point in old] == [10.0]
+
+
+def test_processes_at_time_returns_closest_bucket_per_process(repo):
+    """Process lookups dedupe by key and sort by CPU."""
+    repo.record_samples([
+        ("process", "1:python", NOW - 2, 30.0),
+        ("process", "1:python", NOW, 40.0),
+        ("process", "2:ffmpeg", NOW + 1, 60.0),
+        ("cpu", "", NOW, 99.0),
+    ])
+
+    processes = repo.get_processes_at_time(NOW, tolerance_seconds=5, now=NOW)
+    assert [(p["key"], p["value"]) for p in processes] == [("2:ffmpeg", 60.0), ("1:python", 40.0)]
+
+
+def test_writes_reuse_one_connection(repo):
+    """Per-second samples do not reopen the database."""
+    repo.record_samples([("cpu", "", NOW, 1.0)])
+    conn = repo._write_conn
+    repo.record_samples([("cpu", "", NOW + 1, 2.0)])
+
+    assert repo._write_conn is conn
+    repo.close()
+    assert repo._write_conn is None
+
+
+def test_legacy_samples_are_folded_into_tiers_and_table_dropped(repo, tmp_path):
+    """History from the old main-database table survives the move."""
+    import sqlite3
+
+    main_db = str(tmp_path / "database.db")
+    conn = sqlite3.connect(main_db)
+    conn.execute(
+        "CREATE TABLE system_monitor_samples (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "metric_type TEXT NOT NULL, metric_key TEXT NOT NULL DEFAULT '', "
+        "timestamp INTEGER NOT NULL, value REAL NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO system_monitor_samples (metric_type, metric_key, timestamp, value) VALUES (?, ?, ?, ?)",
+        [("ram", "", NOW + offset, float(offset)) for offset in range(20)]
+        + [("ram", "", NOW - 40 * 86400, 99.0)],
+    )
+    conn.commit()
+    conn.close()
+
+    assert repo.import_legacy_samples(main_db, now=NOW + 20) > 0
+    repo.record_samples([("ram", "", NOW + 5, 5.0)])
+
+    points = repo.get_samples("ram", "", NOW, NOW + 9, max_points=1, now=NOW + 20)
+    assert points == [{"time": NOW, "value": 50 / 11, "min": 0.0, "max": 9.0}]
+    conn = sqlite3.connect(main_db)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'system_monitor_samples'").fetchone() is None
+    conn.close()
+    assert repo.import_legacy_samples(main_db, now=NOW + 20) == 0
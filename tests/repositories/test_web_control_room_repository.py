@@ -37,3 +37,36 @@ def test_upsert_status_and_get_status(tmp_path):
     assert status["current_duration_seconds"] == 12.5
     assert status["current_elapsed_seconds"] == 4.0
     assert "Gabi" in status["voice_members"]
+
+
+def test_upsert_statuses_writes_batch(tmp_path):
+    repository = WebControlRoomRepository(db_path=str(tmp_path / "control_room.db"), use_shared=False)
+    base = {
+        "guild_name": "Guild",
+        "voice_connected": False,
+        "voice_channel_id": None,
+        "voice_channel_name": None,
+        "voice_member_count": 0,
+        "voice_members": [],
+        "is_playing": False,
+        "is_paused": False,
+        "current_sound": None,
+        "current_requester": None,
+        "current_duration_seconds": None,
+        "current_elapsed_seconds": None,
+        "muted": False,
+        "mute_remaining_seconds": 0,
+    }
+
+    written = repository.upsert_statuses(
+        [
+            {**base, "guild_id": 1, "sampled_at_unix": 100.0},
+            {**base, "guild_id": 2, "current_sound": "a.mp3"},
+        ]
+    )
+
+    assert written == 2
+    assert repository.upsert_statuses([]) == 0
+    assert repository.get_status(1)["sampled_at_unix"] == 100.0
+    assert repository.get_status(2)["sampled_at_unix"] is None
+    assert repository.get_status(2)["current_sound"] == "a.mp3"
@@ -0,0 +1,246 @@
+"""
+Tests for bot/repositories/web_filter_facets.py - WebFilterFacetRepository.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.repositories.web_content import WebContentRepository
+from bot.repositories.web_filter_facets import (
+    FACET_ACTION,
+    FACET_ACTION_SOUND,
+    FACET_ACTION_USER,
+    FACET_FAVORITE_SOUND,
+    FACET_SOUND,
+    FACET_SOUND_DATE,
+    WebFilterFacetRepository,
+)
+from bot.services.web_content import FilterFacetCache, WebContentService
+
+
+@pytest.fixture
+def shared_connection(db_connection):
+    """Share the test connection with repositories."""
+    from bot.repositories.base import BaseRepository
+
+    db_connection.executemany(
+        "INSERT INTO sounds (id, originalfilename, Filename, favorite, blacklist, is_elevenlabs, timestamp, guild_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, "honk.mp3", "honk.mp3", 1, 0, 0, "2024-01-02 10:00:00", "111"),
+            (2, "owl.mp3", "owl.mp3", 0, 0, 0, "2024-01-01 09:00:00", None),
+            (3, "hidden.mp3", "hidden.mp3", 1, 1, 0, "2024-01-03 09:00:00", None),
+            (4, "other.mp3", "other.mp3", 0, 0, 0, "2024-01-04 09:00:00", "222"),
+        ],
+    )
+    db_connection.executemany(
+        "INSERT INTO actions (username, action, target, timestamp, guild_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("alice", "play_sound", "1", "2024-01-05 10:00:00", "111"),
+            ("bob", "play_sound", "2", "2024-01-05 10:01:00", None),
+            ("carol", "join", "", "2024-01-05 10:02:00", "222"),
+        ],
+    )
+    db_connection.commit()
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    yield db_connection
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+@pytest.fixture
+def facet_repository(shared_connection):
+    """Create a WebFilterFacetRepository with facets backfilled."""
+    repo = WebFilterFacetRepository(use_shared=True)
+    repo.ensure_schema()
+    return repo
+
+
+def _distinct_filters(guild_id):
+    """Return action/all-sound filters from the original DISTINCT queries."""
+    repository = WebContentRepository(use_shared=True)
+    repository._filter_facets_available = False
+    return (
+        repository.get_action_filters(guild_id=guild_id),
+        repository.get_favorite_filters(("sound",), guild_id=guild_id),
+        repository.get_all_sound_filters(("sound", "date"), guild_id=guild_id),
+    )
+
+
+def _facet_filters(guild_id):
+    """Return the same filters served from the facet table."""
+    repository = WebContentRepository(use_shared=True)
+    assert repository._filter_facets_index_available() is True
+    return (
+        repository.get_action_filters(guild_id=guild_id),
+        repository.get_favorite_filters(("sound",), guild_id=guild_id),
+        repository.get_all_sound_filters(("sound", "date"), guild_id=guild_id),
+    )
+
+
+class TestWebFilterFacetRepository:
+    """Tests for the trigger-maintained filter facets."""
+
+    def test_backfill_matches_distinct_queries(self, facet_repository, shared_connection):
+        """Facets built from existing rows equal the SELECT DISTINCT results."""
+        for guild_id in (None, 111, 222):
+            assert _facet_filters(guild_id) == _distinct_filters(guild_id)
+
+        assert facet_repository.get_values(FACET_ACTION_USER, guild_id=111) == ["alice", "bob"]
+        assert facet_repository.get_values(FACET_SOUND_DATE) == ["2024-01-04", "2024-01-02", "2024-01-01"]
+
+    def test_triggers_track_action_writes(self, facet_repository, shared_connection):
+        """Inserting and deleting actions adjusts reference counts."""
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target, guild_id) VALUES ('dave', 'favorite_sound', '1', '111')"
+        )
+        facet_repository.roll_up_actions()
+        assert facet_repository.get_values(FACET_ACTION_USER, guild_id=111) == ["alice", "bob", "dave"]
+        assert "favorite_sound" in facet_repository.get_values(FACET_ACTION)
+
+        shared_connection.execute("DELETE FROM actions WHERE username = 'dave'")
+        assert facet_repository.get_values(FACET_ACTION_USER, guild_id=111) == ["alice", "bob"]
+        assert "favorite_sound" not in facet_repository.get_values(FACET_ACTION)
+
+    def test_triggers_track_sound_visibility_and_renames(self, facet_repository, shared_connection):
+        """Blacklisting, favoriting and renaming sounds update every facet."""
+        shared_connection.execute("UPDATE sounds SET blacklist = 1 WHERE id = 1")
+        assert "honk.mp3" not in facet_repository.get_values(FACET_SOUND)
+        assert facet_repository.get_values(FACET_FAVORITE_SOUND) == []
+
+        shared_connection.execute("UPDATE sounds SET blacklist = 0, favorite = 1, Filename = 'goose.mp3' WHERE id = 1")
+        assert facet_repository.get_values(FACET_FAVORITE_SOUND) == ["goose.mp3"]
+        assert facet_repository.get_values(FACET_ACTION_SOUND, guild_id=111) == ["goose.mp3", "owl.mp3"]
+
+        shared_connection.execute("DELETE FROM sounds WHERE id = 1")
+        assert facet_repository.get_values(FACET_ACTION_SOUND, guild_id=111) == ["1", "owl.mp3"]
+        for guild_id in (None, 111, 222):
+            assert _facet_filters(guild_id) == _distinct_filters(guild_id)
+
+    def test_versions_bump_for_relevant_groups(self, facet_repository, shared_connection):
+        """Only the invalidation groups affected by a write advance."""
+        before = facet_repository.get_versions()
+
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target) VALUES ('erin', 'play_sound', '2')"
+        )
+        assert facet_repository.get_versions() == before
+        facet_repository.roll_up_actions()
+        after_play = facet_repository.get_versions()
+        assert after_play["actions"] == before["actions"] + 1
+        assert after_play["favorites"] == before["favorites"]
+
+        shared_connection.execute(
+            "INSERT INTO sound_lists (list_name, creator) VALUES ('party', 'erin')"
+        )
+        assert facet_repository.get_versions()["lists"] == before["lists"] + 1
+
+    def test_ensure_schema_is_idempotent(self, facet_repository, shared_connection):
+        """Running ensure_schema again does not double-count facets."""
+        facet_repository.ensure_schema()
+
+        count = shared_connection.execute(
+            "SELECT ref_count FROM web_filter_facets WHERE scope = 'action' AND value = 'play_sound' AND guild_id = '111'"
+        ).fetchone()[0]
+        assert count == 1
+
+    def test_current_triggers_are_left_alone(self, facet_repository, shared_connection):
+        """A repeat ensure_schema neither recreates triggers nor recounts."""
+        versions = facet_repository.get_versions()
+
+        facet_repository.ensure_schema()
+
+        assert facet_repository.get_versions() == versions
+
+    def test_action_inserts_have_no_facet_trigger(self, facet_repository, shared_connection):
+        """Inserting actions does no facet work, and reads do not roll them up."""
+        triggers = shared_connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'actions' AND sql LIKE '%INSERT ON%'"
+        ).fetchall()
+        assert triggers == []
+
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target, guild_id) VALUES ('erin', 'play_sound', '1', '111')"
+        )
+        pending = shared_connection.execute(
+            "SELECT COUNT(*) FROM web_filter_facets WHERE value = 'erin'"
+        ).fetchone()[0]
+        assert pending == 0
+        changes = shared_connection.total_changes
+        assert "erin" not in facet_repository.get_values(FACET_ACTION_USER, guild_id=111)
+        facet_repository.get_versions()
+        assert shared_connection.total_changes == changes
+
+        facet_repository.roll_up_actions()
+        assert "erin" in facet_repository.get_values(FACET_ACTION_USER, guild_id=111)
+
+    def test_reused_action_ids_are_counted(self, facet_repository, shared_connection):
+        """Deleting the newest action pulls the watermark back for the reused id."""
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target, guild_id) VALUES ('erin', 'play_sound', '1', '111')"
+        )
+        facet_repository.roll_up_actions()
+        shared_connection.execute("DELETE FROM actions WHERE username = 'erin'")
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target, guild_id) VALUES ('fay', 'play_sound', '1', '111')"
+        )
+        facet_repository.roll_up_actions()
+
+        assert facet_repository.get_values(FACET_ACTION_USER, guild_id=111) == ["alice", "bob", "fay"]
+
+    def test_rename_before_rollup_is_counted_once(self, facet_repository, shared_connection):
+        """Actions not yet rolled up are labelled with the sound's current name."""
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target, guild_id) VALUES ('erin', 'play_sound', '1', '111')"
+        )
+        shared_connection.execute("UPDATE sounds SET Filename = 'goose.mp3' WHERE id = 1")
+        facet_repository.roll_up_actions()
+
+        assert facet_repository.get_values(FACET_ACTION_SOUND, guild_id=111) == ["goose.mp3", "owl.mp3"]
+        count = shared_connection.execute(
+            "SELECT ref_count FROM web_filter_facets WHERE scope = 'action_sound' AND value = 'goose.mp3'"
+        ).fetchone()[0]
+        assert count == 2
+        for guild_id in (None, 111, 222):
+            assert _facet_filters(guild_id) == _distinct_filters(guild_id)
+
+
+class TestFilterFacetCache:
+    """Tests for the per-process filter memo in WebContentService."""
+
+    def test_cached_filters_refresh_after_relevant_write(self, facet_repository, shared_connection):
+        """Filters are reused until a write bumps the group version."""
+        from unittest.mock import Mock
+
+        from bot.models.web import PaginatedQuery
+
+        repository = WebContentRepository(use_shared=True)
+        service = WebContentService(
+            repository=repository,
+            text_censor_service=Mock(),
+            user_access_repository=Mock(),
+            filter_facet_cache=FilterFacetCache(),
+        )
+        query = PaginatedQuery(page=1, per_page=5)
+        calls = []
+        original = repository.get_action_filters
+
+        def _counting(*args, **kwargs):
+            calls.append(args)
+            return original(*args, **kwargs)
+
+        repository.get_action_filters = _counting
+
+        first = service._get_action_filters(query, True, ("user",))
+        second = service._get_action_filters(query, True, ("user",))
+        assert first == second == {"user": ["alice", "bob", "carol"]}
+        assert len(calls) == 1
+
+        shared_connection.execute(
+            "INSERT INTO actions (username, action, target) VALUES ('zed', 'play_sound', '2')"
+        )
+        facet_repository.roll_up_actions()
+        assert service._get_action_filters(query, True, ("user",)) == {"user": ["alice", "bob", "carol", "zed"]}
+        assert len(calls) == 2
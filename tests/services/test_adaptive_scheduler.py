@@ -0,0 +1,149 @@
+"""
+Tests for bot/services/adaptive_scheduler.py - AdaptiveLoopScheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from bot.services.adaptive_scheduler import (
+    DEMAND_INTERACTION,
+    DEMAND_VIEWERS,
+    DEMAND_VOICE,
+    AdaptiveLoopScheduler,
+    LoopCadence,
+)
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeLoop:
+    """Minimal stand-in for ``discord.ext.tasks.Loop``."""
+
+    def __init__(self, coro=None) -> None:
+        self.coro = coro or self._noop
+        self.intervals: list[float] = []
+
+    @staticmethod
+    async def _noop(*_args, **_kwargs) -> None:
+        return None
+
+    def change_interval(self, *, seconds: float) -> None:
+        self.intervals.append(seconds)
+
+
+def _scheduler(clock=None, jitter_fraction=0.0) -> AdaptiveLoopScheduler:
+    return AdaptiveLoopScheduler(
+        jitter_fraction=jitter_fraction,
+        interaction_window_seconds=60.0,
+        rng=random.Random(7),
+        time_func=clock or _Clock(),
+    )
+
+
+def test_refresh_switches_between_idle_and_active_only_on_change():
+    scheduler = _scheduler()
+    loop = _FakeLoop()
+    scheduler.register("control_room", loop, LoopCadence(1.0, 15.0, (DEMAND_VIEWERS,)))
+
+    assert scheduler.refresh() == {"control_room": 15.0}
+    assert scheduler.refresh() == {}
+
+    scheduler.update_demand(viewers=2, voice=False)
+    assert scheduler.refresh() == {"control_room": 1.0}
+
+    scheduler.update_demand(viewers=0, voice=True)
+    assert scheduler.refresh() == {"control_room": 15.0}
+    assert loop.intervals == [15.0, 1.0, 15.0]
+
+
+def test_interaction_demand_expires_after_window():
+    clock = _Clock()
+    scheduler = _scheduler(clock)
+    loop = _FakeLoop()
+    scheduler.register("status", loop, LoopCadence(4.0, 60.0, (DEMAND_VOICE, DEMAND_INTERACTION)))
+
+    scheduler.note_interaction()
+    assert scheduler.active_demands() == {DEMAND_INTERACTION}
+    assert scheduler.refresh() == {"status": 4.0}
+
+    clock.now += 61.0
+    assert scheduler.active_demands() == set()
+    assert scheduler.refresh() == {"status": 60.0}
+
+
+def test_jitter_is_stable_per_loop_and_spreads_equal_cadences():
+    scheduler = _scheduler(jitter_fraction=0.2)
+    cadence = LoopCadence(1.0, 10.0, (DEMAND_VIEWERS,))
+    scheduler.register("a", _FakeLoop(), cadence)
+    scheduler.register("b", _FakeLoop(), cadence)
+
+    idle = scheduler.refresh()
+    scheduler.update_demand(viewers=1, voice=False)
+    active = scheduler.refresh()
+
+    assert idle["a"] != idle["b"]
+    for name in ("a", "b"):
+        assert 10.0 <= idle[name] <= 12.0
+        assert idle[name] == pytest.approx(active[name] * 10.0, abs=0.01)
+
+
+def test_tracked_loop_keeps_interval_and_collects_runtime_stats():
+    calls = []
+
+    async def _coro(owner):
+        calls.append(owner)
+
+    async def _failing(_owner):
+        raise RuntimeError("boom")
+
+    scheduler = _scheduler()
+    tracked = _FakeLoop(_coro)
+    failing = _FakeLoop(_failing)
+    scheduler.register("tracked", tracked)
+    scheduler.register("failing", failing)
+    scheduler.register("tracked", _FakeLoop())  # duplicate names are ignored
+
+    assert scheduler.refresh() == {}
+    assert tracked.coro.__name__ == "_coro"
+
+    asyncio.run(tracked.coro("svc"))
+    asyncio.run(tracked.coro("svc"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(failing.coro("svc"))
+
+    stats = scheduler.stats()
+    assert calls == ["svc", "svc"]
+    assert stats["demands"] == []
+    assert stats["loops"]["tracked"]["runs"] == 2
+    assert stats["loops"]["tracked"]["interval_seconds"] is None
+    assert stats["loops"]["failing"]["errors"] == 1
+    assert tracked.intervals == []
+
+
+def test_on_change_callback_receives_new_interval():
+    seen = []
+    scheduler = _scheduler()
+    scheduler.register(
+        "telemetry",
+        _FakeLoop(),
+        LoopCadence(0.5, 5.0, (DEMAND_VOICE,)),
+        on_change=seen.append,
+    )
+
+    scheduler.refresh()
+    scheduler.update_demand(viewers=0, voice=True)
+    scheduler.refresh()
+
+    assert seen == [5.0, 0.5]
@@ -799,6 +799,39 @@ class TestAudioService:
         assert "file=clip.mp3" in caplog.text
         assert "max_gap=0.120s" in wrapped.summary()
 
+    def test_playback_diagnostics_audio_source_records_first_packet_trace(self, monkeypatch):
+        """First read and the first packet hand-off are recorded on the play trace."""
+        from bot.services.audio import PlaybackDiagnosticsAudioSource
+        from bot.services.playback_trace import PlaybackTrace
+
+        source = _FakeAudioSource([b"frame1", b"frame2", b"frame3"])
+        times = iter([100.0, 100.0, 100.004, 100.03, 100.031, 100.05, 100.051])
+        monkeypatch.setattr("bot.services.audio.time.monotonic", lambda: next(times))
+        trace = PlaybackTrace("play-1", 123, "clip.mp3", time_func=lambda: 99.9)
+        on_first_packet = Mock()
+
+        wrapped = PlaybackDiagnosticsAudioSource(
+            source,
+            guild_id=123,
+            audio_file="clip.mp3",
+            play_id="play-1",
+            gap_warning_seconds=0.0,
+            read_warning_seconds=0.0,
+            trace=trace,
+            on_first_packet=on_first_packet,
+        )
+        wrapped.read()
+        on_first_packet.assert_not_called()
+        wrapped.read()
+        wrapped.read()
+
+        on_first_packet.assert_called_once_with()
+        spans = {span["name"]: span for span in trace.to_dict()["spans"]}
+        assert spans["first_read"]["start_ms"] == 100.0
+        assert spans["first_read"]["duration_ms"] == 4.0
+        assert spans["first_read"]["attrs"] == {"bytes": 6}
+        assert spans["first_packet"]["start_ms"] == 110.0
+
     def test_build_play_after_timing_debug_flags_slow_callback(self, audio_service):
         """Duration diagnostics flag when callback elapsed time exceeds sent frames."""
         player = Mock()
@@ -16,6 +16,12 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
+@pytest.fixture(autouse=True)
+def _isolated_system_monitor_db(monkeypatch, tmp_path):
+    """Keep time-series writes out of the repository's data directory."""
+    monkeypatch.setenv("SYSTEM_MONITOR_DB_PATH", str(tmp_path / "system_monitor.db"))
+
+
 class TestBackgroundService:
     """Tests for background service notification behavior."""
 
@@ -1485,6 +1491,7 @@ class TestBotStatusCpu:
             behavior=Mock(),
         )
         service.web_system_status_repo.upsert_snapshot = Mock()
+        service.system_monitor_timeseries_repo = Mock()
 
         snapshot = {"available": True, "total_cpu_percent": 42.0}
         with patch(
@@ -1547,6 +1554,38 @@ class TestBotStatusCpu:
             include_sensors=False,
         )
 
+    @pytest.mark.asyncio
+    @patch("bot.services.background.ActionRepository")
+    @patch("bot.services.background.SoundRepository")
+    async def test_adaptive_scheduler_slows_viewer_loops_while_voice_stays_active(
+        self, _mock_sound_repo, _mock_action_repo
+    ):
+        """Loops follow their own demand signals: voice yes, web viewers no."""
+        from bot.services.background import BackgroundService
+
+        channel = Mock(members=[Mock(bot=False)])
+        voice_client = Mock(channel=channel)
+        voice_client.is_connected.return_value = True
+        service = BackgroundService(
+            bot=Mock(guilds=[Mock(voice_client=voice_client)]),
+            audio_service=Mock(),
+            sound_service=Mock(),
+            behavior=Mock(),
+        )
+        service._web_viewer_presence = Mock(active_viewer_count=Mock(return_value=0))
+        service._perf_expected_tick_monotonic = 12.0
+        service._register_adaptive_loops()
+
+        await type(service).adaptive_scheduler_loop.coro(service)
+
+        assert 15.0 <= service.web_control_room_status_loop.seconds <= 16.5
+        assert 8.0 <= service.web_system_monitor_status_loop.seconds <= 8.8
+        assert 30.0 <= service.keyword_detection_health_check.seconds <= 33.0
+        assert 0.5 <= service.performance_telemetry_loop.seconds <= 0.55
+        assert service._perf_tick_rate_seconds == service.performance_telemetry_loop.seconds
+        assert service._perf_expected_tick_monotonic is None
+        assert service._loop_scheduler.stats()["demands"] == ["voice"]
+
     @pytest.mark.asyncio
     @patch("bot.services.background.ActionRepository")
     @patch("bot.services.background.SoundRepository")
@@ -0,0 +1,87 @@
+"""
+Tests for bot/services/card_cache.py - image store and rendered card cache.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from bot.services.card_cache import (
+    IMAGE_CACHE_LOOKUPS,
+    RENDERED_CARD_LOOKUPS,
+    ImageStore,
+    RenderedCardCache,
+)
+
+
+def _response(status, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+def test_store_serves_fresh_entries_then_revalidates_with_validators(tmp_path):
+    clock = [1000.0]
+    store = ImageStore(tmp_path / "images", 1024, fresh_seconds=60, time_func=lambda: clock[0])
+    before = {r: IMAGE_CACHE_LOOKUPS.value(result=r) for r in ("hit", "miss", "revalidated", "stale")}
+
+    with patch("bot.services.card_cache.requests.get") as get:
+        get.return_value = _response(200, b"avatar", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"})
+        assert store.get("https://cdn/a.png") == b"avatar"
+        assert store.get("https://cdn/a.png") == b"avatar"
+        assert get.call_count == 1
+
+        clock[0] += 61
+        get.return_value = _response(304)
+        assert store.get("https://cdn/a.png") == b"avatar"
+        headers = get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+
+        # The revalidation renewed freshness, and a restart keeps the entry.
+        reopened = ImageStore(tmp_path / "images", 1024, fresh_seconds=60, time_func=lambda: clock[0])
+        assert reopened.get("https://cdn/a.png") == b"avatar"
+        assert get.call_count == 2
+
+        clock[0] += 61
+        get.side_effect = OSError("offline")
+        assert reopened.get("https://cdn/a.png") == b"avatar"
+
+    assert IMAGE_CACHE_LOOKUPS.value(result="miss") == before["miss"] + 1
+    assert IMAGE_CACHE_LOOKUPS.value(result="hit") == before["hit"] + 2
+    assert IMAGE_CACHE_LOOKUPS.value(result="revalidated") == before["revalidated"] + 1
+    assert IMAGE_CACHE_LOOKUPS.value(result="stale") == before["stale"] + 1
+
+
+def test_store_evicts_least_recently_used_images(tmp_path):
+    store = ImageStore(tmp_path / "images", 10)
+
+    with patch("bot.services.card_cache.requests.get") as get:
+        for url in ("a", "b"):
+            get.return_value = _response(200, url.encode() * 4)
+            store.get(url)
+        store.get("a")
+        get.return_value = _response(200, b"cccc")
+        store.get("c")
+        get.return_value = _response(404)
+        assert store.get("b") is None
+
+    assert not (tmp_path / "images" / f"{ImageStore.key('b')}.img").exists()
+    assert (tmp_path / "images" / f"{ImageStore.key('a')}.img").exists()
+
+
+def test_rendered_cards_are_keyed_by_data_and_bounded():
+    cache = RenderedCardCache(max_bytes=10)
+    key = cache.key("sound", {"sound_name": "a", "play_count": 1}, "t1")
+    hits_before = RENDERED_CARD_LOOKUPS.value(card="sound", result="hit")
+
+    assert cache.get("sound", key) is None
+    cache.put(key, b"png-1")
+    assert cache.get("sound", key) == b"png-1"
+    assert key != cache.key("sound", {"sound_name": "a", "play_count": 2}, "t1")
+    assert key != cache.key("sound", {"sound_name": "a", "play_count": 1}, "t2")
+    assert key == cache.key("sound", {"play_count": 1, "sound_name": "a"}, "t1")
+
+    cache.put("other", b"png-22")
+    assert cache.get("sound", key) is None
+    assert RENDERED_CARD_LOOKUPS.value(card="sound", result="hit") == hits_before + 1
@@ -0,0 +1,106 @@
+"""
+Tests for bot/services/card_raster.py - native Pillow sound-card renderer.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from bot.services.card_raster import CARD_WIDTH, NATIVE_RENDERS, NativeSoundCardRenderer, _icon, fonts_available
+from bot.services.image_generator import ImageGeneratorService
+
+pytestmark = pytest.mark.skipif(not fonts_available(), reason="DejaVu fonts not installed")
+
+
+@pytest.fixture
+def icons():
+    return ImageGeneratorService.__new__(ImageGeneratorService)._build_encoded_icons()
+
+
+def _card_data(icons, **overrides):
+    data = {
+        "sound_name": "airhorn",
+        "title_font_size": 26,
+        "speaker_icon": icons["volume"],
+        "icon_timer": icons["timer"],
+        "icon_chart": icons["chart"],
+        "icon_folder": icons["folder"],
+        "icon_heart": icons["heart"],
+        "icon_event": icons["event"],
+        "card_class": "",
+        "play_count": 12,
+        "duration": "0:05",
+        "download_date": "2024-01-02",
+        "lists": "memes",
+        "favorited_by": "alice",
+        "requester_avatar_b64": None,
+        "sts_thumbnail_b64": None,
+        "event_data": None,
+        "is_single_summary": False,
+        "show_footer": True,
+        "has_stats": True,
+        "notification_only": False,
+        "accent_color": "#5865F2",
+        "request_note": "play airhorn",
+    }
+    data.update(overrides)
+    return data
+
+
+def _size(png):
+    with Image.open(io.BytesIO(png)) as image:
+        return image.size
+
+
+def test_standard_and_summary_cards_render_at_template_width(icons):
+    renderer = NativeSoundCardRenderer(icons)
+
+    standard = renderer.render(_card_data(icons))
+    summary = renderer.render(
+        _card_data(
+            icons,
+            speaker_icon=None,
+            card_class="summary-notification",
+            play_count=None,
+            duration=None,
+            lists=None,
+            favorited_by=None,
+            event_data="Joins: 5 | Leaves: 3 | Plays: 40",
+            show_footer=False,
+            request_note=None,
+        )
+    )
+    notification = renderer.render(
+        _card_data(icons, has_stats=False, show_footer=False, notification_only=True, request_note=None)
+    )
+
+    assert _size(standard)[0] == CARD_WIDTH
+    assert _size(summary)[0] == CARD_WIDTH
+    # Three summary items wrap to two grid rows, so the card grows past the title-only card.
+    assert _size(notification)[1] < _size(summary)[1]
+    with Image.open(io.BytesIO(standard)) as image:
+        # Rounded corners stay transparent; the border takes the accent colour.
+        assert image.getpixel((0, 0))[3] == 0
+        assert image.getpixel((CARD_WIDTH // 2, 2))[:3] == (0x58, 0x65, 0xF2)
+
+
+def test_unsupported_glyphs_and_overflowing_pills_fall_back(icons):
+    renderer = NativeSoundCardRenderer(icons)
+    unsupported_before = NATIVE_RENDERS.value(result="unsupported")
+
+    assert renderer.render(_card_data(icons, sound_name="party \U0001f389")) is None
+    assert renderer.render(_card_data(icons, favorited_by="x" * 200)) is None
+    assert NATIVE_RENDERS.value(result="unsupported") == unsupported_before + 2
+
+
+def test_icon_paths_keep_even_odd_holes(icons):
+    import base64
+
+    timer = _icon(base64.b64decode(icons["timer"]).decode(), 48)
+    alpha = timer.getchannel("A")
+
+    # The stopwatch face is a ring: opaque outline around a transparent centre.
+    assert alpha.getpixel((16, 30)) < 64
+    assert max(alpha.getpixel((x, 30)) for x in range(4, 12)) > 200
+    assert timer.getpixel((24, 10))[:3] == (0x58, 0x65, 0xF2)
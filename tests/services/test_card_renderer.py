@@ -0,0 +1,149 @@
+"""
+Tests for bot/services/card_renderer.py - CardRendererPool with fake drivers.
+"""
+
+import base64
+import threading
+import time
+
+from bot.services.card_renderer import CARD_RENDERS, CardRendererPool, split_document
+
+CARD_TEMPLATE = "<html><head><style>.card{color:red}</style></head><body style=\"margin:0\"><div class=\"card\">BODY</div></body></html>"
+
+
+def _card(text) -> str:
+    return CARD_TEMPLATE.replace("BODY", str(text))
+
+
+OTHER = "<html><head><style>.card{color:blue}</style></head><body><div class=\"card\">x</div></body></html>"
+
+
+class _FakeDriver:
+    """Selenium driver stand-in that records navigation and body swaps."""
+
+    def __init__(self, gate=None, fail=False):
+        self.gate = gate
+        self.fail = fail
+        self.loads = 0
+        self.swaps = []
+
+    def set_window_size(self, width, height):
+        pass
+
+    def get(self, url):
+        self.loads += 1
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            return "complete"
+        if "getBoundingClientRect" in script:
+            return {"x": 0, "y": 0, "width": 10, "height": 10, "viewportWidth": 900, "viewportHeight": 640}
+        return None
+
+    def execute_async_script(self, script, body_html, body_style):
+        self.swaps.append((body_html, body_style))
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("tab crashed")
+        return {"data": base64.b64encode(b"png").decode()}
+
+    def quit(self):
+        pass
+
+
+def test_same_template_swaps_body_instead_of_reloading():
+    driver = _FakeDriver()
+    pool = CardRendererPool(1, driver_factory=lambda: driver)
+
+    assert pool.render(_card("a"), (900, 300)) == b"png"
+    assert pool.render(_card("b"), (900, 300)) == b"png"
+    assert pool.render(OTHER, (900, 300)) == b"png"
+
+    assert driver.loads == 2
+    assert driver.swaps == [('<div class="card">b</div>', "margin:0")]
+    assert split_document("<div>fragment</div>") is None
+
+
+def test_pool_caps_concurrent_drivers_and_reuses_them():
+    created = []
+    active = [0, 0]
+    lock = threading.Lock()
+
+    class _SlowDriver(_FakeDriver):
+        def execute_cdp_cmd(self, cmd, params):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return super().execute_cdp_cmd(cmd, params)
+
+    def _factory():
+        created.append(_SlowDriver())
+        return created[-1]
+
+    pool = CardRendererPool(2, queue_limit=4, driver_factory=_factory)
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(pool.render(_card(i), (900, 300))))
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [b"png"] * 6
+    assert len(created) == 2
+    assert active[1] == 2
+    assert pool.stats() == {"live": 2, "busy": 0, "idle": 2}
+
+
+def test_full_queue_rejects_and_failed_driver_is_replaced():
+    gate = threading.Event()
+    drivers = [_FakeDriver(gate=gate), _FakeDriver(fail=True), _FakeDriver()]
+    pool = CardRendererPool(1, queue_limit=0, driver_factory=lambda: drivers.pop(0))
+    rejected_before = CARD_RENDERS.value(result="rejected")
+
+    first = []
+    worker = threading.Thread(target=lambda: first.append(pool.render(_card(1), (900, 300))))
+    worker.start()
+    deadline = time.monotonic() + 5
+    while pool.stats()["busy"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert pool.render(_card(2), (900, 300)) is None
+    gate.set()
+    worker.join()
+
+    assert first == [b"png"]
+    assert CARD_RENDERS.value(result="rejected") == rejected_before + 1
+
+    pool.close()
+    assert pool.render(_card(3), (900, 300)) is None
+    assert pool.render(_card(4), (900, 300)) == b"png"
+    assert pool.stats()["live"] == 1
+
+
+def test_driver_start_failure_backs_off():
+    clock = [0.0]
+    attempts = []
+
+    def _factory():
+        attempts.append(1)
+        raise RuntimeError("chrome missing")
+
+    pool = CardRendererPool(2, driver_factory=_factory, retry_after=60.0, time_func=lambda: clock[0])
+
+    assert pool.render(_card(1), (900, 300)) is None
+    assert pool.render(_card(2), (900, 300)) is None
+    clock[0] = 61.0
+    assert pool.render(_card(3), (900, 300)) is None
+    assert len(attempts) == 2
+    assert pool.stats()["live"] == 0
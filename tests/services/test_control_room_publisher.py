@@ -0,0 +1,112 @@
+"""
+Tests for bot/services/control_room_publisher.py - ControlRoomStatePublisher.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.repositories.web_control_room import WebControlRoomRepository
+from bot.services.control_room_publisher import ControlRoomStatePublisher
+
+
+def _status(guild_id=1, **overrides):
+    """Return one guild status as the background loop builds it."""
+    status = {
+        "guild_id": guild_id,
+        "guild_name": "Guild",
+        "voice_connected": True,
+        "voice_channel_id": 456,
+        "voice_channel_name": "Voice",
+        "voice_member_count": 1,
+        "voice_members": [{"id": "1", "name": "Gabi", "avatar_url": ""}],
+        "is_playing": True,
+        "is_paused": False,
+        "current_sound": "now.mp3",
+        "current_requester": "gabi",
+        "current_duration_seconds": 30.0,
+        "current_elapsed_seconds": 0.0,
+        "muted": False,
+        "mute_remaining_seconds": 0,
+    }
+    status.update(overrides)
+    return status
+
+
+class _CountingRepository(WebControlRoomRepository):
+    """Repository that records each batch written."""
+
+    def __init__(self, db_path):
+        super().__init__(db_path=db_path, use_shared=False)
+        self.batches = []
+
+    def upsert_statuses(self, statuses):
+        self.batches.append([str(status["guild_id"]) for status in statuses])
+        return super().upsert_statuses(statuses)
+
+
+@pytest.fixture
+def clock():
+    """Mutable fake wall clock."""
+    return [1_000.0]
+
+
+@pytest.fixture
+def publisher(tmp_path, clock):
+    """Create a publisher over a temp status table."""
+    repository = _CountingRepository(str(tmp_path / "control_room.db"))
+    return ControlRoomStatePublisher(repository, time_func=lambda: clock[0])
+
+
+class TestControlRoomStatePublisher:
+    """Tests for change-only, batched status persistence."""
+
+    def test_first_tick_writes_all_guilds_in_one_batch(self, publisher):
+        """Every guild is written once, together."""
+        assert publisher.publish([_status(1), _status(2)]) == ["1", "2"]
+        assert publisher.repository.batches == [["1", "2"]]
+        row = publisher.repository.get_status(1)
+        assert row["sampled_at_unix"] == 1_000.0
+        assert row["current_elapsed_seconds"] == 0.0
+
+    def test_clock_advancing_counters_are_not_rewritten(self, publisher, clock):
+        """Elapsed time that follows the wall clock needs no write."""
+        publisher.publish([_status(1, muted=True, mute_remaining_seconds=60)])
+        for tick in range(1, 10):
+            clock[0] = 1_000.0 + tick
+            written = publisher.publish(
+                [_status(1, current_elapsed_seconds=float(tick), muted=True, mute_remaining_seconds=60 - tick)]
+            )
+            assert written == []
+        assert len(publisher.repository.batches) == 1
+
+    def test_field_changes_and_drift_are_written(self, publisher, clock):
+        """Only the guild that changed is written on a tick."""
+        publisher.publish([_status(1), _status(2)])
+
+        clock[0] = 1_001.0
+        assert publisher.publish(
+            [_status(1, current_elapsed_seconds=1.0), _status(2, current_sound="next.mp3", current_elapsed_seconds=0.0)]
+        ) == ["2"]
+
+        clock[0] = 1_002.0
+        # Guild 1 seeked back; guild 2 kept pace with the clock.
+        assert publisher.publish(
+            [_status(1, current_elapsed_seconds=0.0), _status(2, current_sound="next.mp3", current_elapsed_seconds=1.0)]
+        ) == ["1"]
+        assert publisher.latest(1)["sampled_at_unix"] == 1_002.0
+
+    def test_paused_playback_must_stay_still(self, publisher, clock):
+        """A paused track is expected to keep its elapsed value."""
+        publisher.publish([_status(1, is_paused=True, current_elapsed_seconds=5.0)])
+        clock[0] = 1_005.0
+        assert publisher.publish([_status(1, is_paused=True, current_elapsed_seconds=5.0)]) == []
+
+    def test_heartbeat_rewrites_idle_guild(self, publisher, clock):
+        """Idle rows are refreshed so ``updated_at`` stays recent."""
+        idle = _status(1, is_playing=False, current_sound=None, current_elapsed_seconds=None)
+        publisher.publish([idle])
+        clock[0] = 1_059.0
+        assert publisher.publish([idle]) == []
+        clock[0] = 1_060.0
+        assert publisher.publish([idle]) == ["1"]
@@ -0,0 +1,68 @@
+"""
+Tests for bot/services/disk_lru.py - shared on-disk LRU index.
+"""
+
+import os
+from unittest.mock import MagicMock
+
+from bot.services.disk_lru import DiskLRU
+
+
+def _lru(directory, max_bytes, **kwargs):
+    return DiskLRU(directory, ".bin", max_bytes, bytes_gauge=MagicMock(), evictions=MagicMock(), **kwargs)
+
+
+def _write(lru, key, body, mtime=None):
+    lru.directory.mkdir(parents=True, exist_ok=True)
+    path = lru.path(key)
+    path.write_bytes(body)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_index_is_rebuilt_from_mtimes_and_counts_only_indexed_files(tmp_path):
+    seed = _lru(tmp_path, 100)
+    _write(seed, "new", b"12", mtime=2_000)
+    _write(seed, "old", b"123", mtime=1_000)
+    (tmp_path / "old.json").write_text("{}")
+
+    lru = _lru(tmp_path, 6)
+
+    assert lru.stats() == (2, 5)
+    lru._bytes_gauge.set.assert_called_with(5)
+
+    _write(lru, "next", b"12")
+    lru.add("next", 2)
+    assert not lru.path("old").exists()
+    assert lru.stats() == (2, 4)
+
+
+def test_add_evicts_least_recently_used_entries_with_sidecars(tmp_path):
+    lru = _lru(tmp_path, 4, sidecar_suffixes=(".json",))
+    _write(lru, "a", b"aa")
+    (tmp_path / "a.json").write_text("{}")
+    lru.add("a", 2)
+    _write(lru, "b", b"bb")
+    lru.add("b", 2)
+
+    assert lru.lookup("a")
+    _write(lru, "c", b"cc")
+    lru.add("c", 2)
+
+    assert lru.lookup("a") and lru.lookup("c")
+    assert not lru.lookup("b")
+    assert not lru.path("b").exists()
+    assert lru.path("a", ".json").exists()
+    assert lru.stats() == (2, 4)
+    lru._evictions.inc.assert_called_once_with(1)
+
+
+def test_newest_entry_is_kept_even_when_over_budget(tmp_path):
+    lru = _lru(tmp_path, 1)
+    _write(lru, "big", b"12345")
+    lru.add("big", 5)
+
+    assert lru.stats() == (1, 5)
+    lru.forget("big")
+    assert lru.stats() == (0, 0)
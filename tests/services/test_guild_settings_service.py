@@ -0,0 +1,112 @@
+"""
+Tests for bot/services/guild_settings.py - GuildSettingsService read-through cache.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.repositories.base import BaseRepository
+from bot.services import guild_settings as guild_settings_module
+from bot.services.guild_settings import (
+    GUILD_SETTINGS_CHANNEL,
+    GuildSettingsCache,
+    GuildSettingsService,
+)
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def shared_db(db_connection):
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    yield db_connection
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+@pytest.fixture
+def publish(monkeypatch):
+    mock_publish = MagicMock(return_value=True)
+    monkeypatch.setattr(guild_settings_module, "_publish_notification", mock_publish)
+    return mock_publish
+
+
+def _count_calls(service, *names):
+    calls = {name: 0 for name in names}
+    for name in names:
+        original = getattr(service.repo, name)
+
+        def _wrapped(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+
+        setattr(service.repo, name, _wrapped)
+    return calls
+
+
+def test_reads_are_served_from_memory_and_defaults_created_once(shared_db, publish):
+    service = GuildSettingsService(cache=GuildSettingsCache())
+    calls = _count_calls(service, "get_by_guild_id", "upsert_defaults")
+
+    first = service.get(123)
+    for _ in range(5):
+        assert service.get("123") == first
+
+    assert calls == {"get_by_guild_id": 2, "upsert_defaults": 1}
+    publish.assert_not_called()
+
+    # Callers get copies, so mutating a result does not corrupt the cache.
+    first.stt_enabled = not first.stt_enabled
+    assert service.get(123).stt_enabled != first.stt_enabled
+
+
+def test_updates_write_through_and_notify_other_processes(shared_db, publish):
+    cache = GuildSettingsCache()
+    writer = GuildSettingsService(cache=cache)
+    reader = GuildSettingsService(cache=cache)
+    assert reader.get(55).periodic_enabled is False
+
+    writer.set_feature(55, "periodic_enabled", True)
+    writer.set_channels(55, bot_text_channel_id=10)
+
+    calls = _count_calls(reader, "get_by_guild_id", "upsert_defaults")
+    settings = reader.get(55)
+    assert settings.periodic_enabled is True
+    assert settings.bot_text_channel_id == "10"
+    assert calls == {"get_by_guild_id": 0, "upsert_defaults": 0}
+    publish.assert_called_with(":memory:", GUILD_SETTINGS_CHANNEL, {"guild_id": "55"})
+    assert publish.call_count == 2
+
+
+def test_invalidation_and_ttl_reload_without_writing(shared_db, publish):
+    clock = _Clock()
+    cache = GuildSettingsCache(ttl_seconds=60.0, time_func=clock)
+    service = GuildSettingsService(cache=cache)
+    service.get(7)
+    shared_db.execute("UPDATE guild_settings SET stt_enabled = 1 WHERE guild_id = '7'")
+
+    calls = _count_calls(service, "get_by_guild_id", "upsert_defaults")
+    assert service.get(7).stt_enabled is False
+
+    cache.invalidate(7)
+    assert service.get(7).stt_enabled is True
+
+    shared_db.execute("UPDATE guild_settings SET stt_enabled = 0 WHERE guild_id = '7'")
+    clock.now += 61.0
+    assert service.get(7).stt_enabled is False
+    assert calls == {"get_by_guild_id": 2, "upsert_defaults": 0}
+
+
+def test_invalid_ttl_env_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("GUILD_SETTINGS_CACHE_TTL_SECONDS", "five minutes")
+
+    assert guild_settings_module._env_float("GUILD_SETTINGS_CACHE_TTL_SECONDS", 300.0) == 300.0
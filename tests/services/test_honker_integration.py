@@ -434,6 +434,156 @@ class TestPublish:
         assert result is False
 
 
+    def test_publish_soundboard_event_batches_in_background(
+        self, clear_honker_state, patch_import, fake_honker_module
+    ):
+        """Async soundboard events are coalesced and NOTIFYed by the publisher thread."""
+        import bot.services.honker_integration as hi
+        hi._honker_imported = True
+        hi._honker_available = True
+        try:
+            assert hi.publish_soundboard_event(":memory:", "actions_changed", {"guild_id": "1", "action": "a"})
+            assert hi.publish_soundboard_event(":memory:", "actions_changed", {"guild_id": "1", "action": "b"})
+            assert hi.publish_soundboard_event(":memory:", "actions_changed", {"guild_id": "2"})
+            assert hi.get_soundboard_publisher(":memory:").flush(timeout=2.0)
+        finally:
+            hi.flush_soundboard_publishers()
+
+        conn = _FakeConnection(":memory:")
+        payloads = [payload for _channel, payload in conn._notifications]
+        assert payloads == [
+            {"type": "actions_changed", "data": {"guild_id": "1", "action": "b", "coalesced": 2}},
+            {"type": "actions_changed", "data": {"guild_id": "2"}},
+        ]
+        assert conn.stream("soundboard_events").published == payloads
+
+    def test_publish_soundboard_event_sync_mode(
+        self, clear_honker_state, patch_import, fake_honker_module, monkeypatch
+    ):
+        """HONKER_PUBLISH_ASYNC=false publishes on the caller's thread."""
+        import bot.services.honker_integration as hi
+        hi._honker_imported = True
+        hi._honker_available = True
+        monkeypatch.setattr(hi, "_HONKER_PUBLISH_ASYNC", False)
+
+        assert hi.publish_soundboard_event(":memory:", "sounds_changed") is True
+        assert _FakeConnection(":memory:")._notifications == [
+            ("soundboard_events", {"type": "sounds_changed"})
+        ]
+
+
+    def test_required_publishes_synchronously_and_raises(
+        self, clear_honker_state, honker_required_env, fake_honker_module, patch_import
+    ):
+        """HONKER_REQUIRED=true bypasses the async publisher so failures raise."""
+        import bot.services.honker_integration as hi
+        hi._honker_imported = True
+        hi._honker_available = True
+        import honker as _fake_honker
+        original_open = _fake_honker.open
+        try:
+            _fake_honker.open = MagicMock(side_effect=RuntimeError("db locked"))
+            with pytest.raises(RuntimeError):
+                hi.publish_soundboard_event(":memory:", "sounds_changed")
+        finally:
+            _fake_honker.open = original_open
+        assert ":memory:" not in hi._soundboard_publishers
+
+    def test_invalid_publish_env_falls_back_to_default(self, monkeypatch):
+        """Malformed tuning values do not break the import."""
+        import bot.services.honker_integration as hi
+        monkeypatch.setenv("HONKER_PUBLISH_COALESCE_MS", "fast")
+        monkeypatch.setenv("HONKER_PUBLISH_MAX_PENDING", "-5")
+
+        assert hi._env_int("HONKER_PUBLISH_COALESCE_MS", 50, minimum=0) == 50
+        assert hi._env_int("HONKER_PUBLISH_MAX_PENDING", 1000, minimum=1) == 1
+        assert hi._env_int("HONKER_UNSET_VALUE", 7, minimum=0) == 7
+
+
+class TestSoundboardEventPublisher:
+    """Coalescing, batching and backpressure of SoundboardEventPublisher."""
+
+    def test_keeps_events_with_different_key_fields_apart(self):
+        """Different reasons or job IDs are never merged."""
+        from bot.services.honker_integration import SoundboardEventPublisher
+
+        batches = []
+        publisher = SoundboardEventPublisher(
+            "db",
+            coalesce_window_seconds=0.05,
+            publish_func=lambda _db, payloads: batches.append(payloads),
+        )
+        try:
+            publisher.submit("control_room_changed", {"guild_id": "1", "reason": "playback_started"})
+            publisher.submit("control_room_changed", {"guild_id": "1", "reason": "playback_finished"})
+            publisher.submit("upload_job_changed", {"job_id": "a"})
+            publisher.submit("upload_job_changed", {"job_id": "b"})
+            assert publisher.flush(timeout=2.0)
+        finally:
+            publisher.stop()
+
+        assert len(batches) == 1
+        assert len(batches[0]) == 4
+
+    def test_drops_new_events_when_queue_is_full(self):
+        """Distinct events beyond max_pending are rejected, duplicates still merge."""
+        import threading
+        from bot.services.honker_integration import SoundboardEventPublisher
+
+        release = threading.Event()
+        batches = []
+
+        def _publish(_db, payloads):
+            release.wait(2.0)
+            batches.append(payloads)
+
+        publisher = SoundboardEventPublisher(
+            "db",
+            coalesce_window_seconds=0.0,
+            max_pending=1,
+            publish_func=_publish,
+        )
+        try:
+            assert publisher.submit("sounds_changed", {"guild_id": "1"}) is True
+            # Wait for the first batch to be taken in flight.
+            for _ in range(200):
+                if publisher._in_flight:
+                    break
+                threading.Event().wait(0.005)
+            assert publisher.submit("sounds_changed", {"guild_id": "2"}) is True
+            assert publisher.submit("sounds_changed", {"guild_id": "2"}) is True
+            assert publisher.submit("sounds_changed", {"guild_id": "3"}) is False
+            release.set()
+            assert publisher.flush(timeout=2.0)
+        finally:
+            publisher.stop()
+
+        assert [len(batch) for batch in batches] == [1, 1]
+        assert batches[1][0]["data"] == {"guild_id": "2", "coalesced": 2}
+
+    def test_failed_batch_does_not_stop_publisher(self):
+        """A failing publish is logged and later events still go out."""
+        from bot.services.honker_integration import SoundboardEventPublisher
+
+        calls = []
+
+        def _publish(_db, payloads):
+            calls.append(payloads)
+            if len(calls) == 1:
+                raise OSError("database is locked")
+
+        publisher = SoundboardEventPublisher("db", coalesce_window_seconds=0.0, publish_func=_publish)
+        try:
+            publisher.submit("sounds_changed")
+            assert publisher.flush(timeout=2.0)
+            publisher.submit("sounds_changed")
+            assert publisher.flush(timeout=2.0)
+        finally:
+            publisher.stop()
+
+        assert len(calls) == 2
+
+
 # ============================================================================
 # HONKER_REQUIRED fail-fast tests
 # ============================================================================
@@ -0,0 +1,140 @@
+"""
+Tests for bot/services/http_client.py - OutboundHTTPClient against a local stub server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.services.http_client import (
+    OUTBOUND_REQUESTS,
+    OUTBOUND_TOTAL,
+    OUTBOUND_TTFB,
+    OutboundHTTPClient,
+)
+
+
+class _Stub:
+    """Records peer sockets and in-flight requests seen by the server."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.peers: set = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.peers.add(request.transport.get_extra_info("peername"))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return web.json_response({"ok": True}, status=int(request.query.get("status", 200)))
+        finally:
+            self.in_flight -= 1
+
+
+async def _serve(stub: _Stub) -> TestServer:
+    app = web.Application()
+    app.router.add_get("/", stub.handle)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_reuse_one_connection_and_record_timings():
+    stub = _Stub()
+    server = await _serve(stub)
+    client = OutboundHTTPClient({"stub": 4})
+    ttfb_before = OUTBOUND_TTFB.count(provider="stub")
+    total_before = OUTBOUND_TOTAL.count(provider="stub")
+    ok_before = OUTBOUND_REQUESTS.value(provider="stub", status="200")
+    try:
+        for status in (200, 200, 503):
+            async with client.borrow("stub") as session:
+                async with session.get(server.make_url("/"), params={"status": status}) as resp:
+                    await resp.json()
+        assert client.session("stub") is session
+    finally:
+        await client.close()
+        await server.close()
+
+    assert len(stub.peers) == 1
+    assert session.closed
+    assert OUTBOUND_TTFB.count(provider="stub") == ttfb_before + 3
+    assert OUTBOUND_TOTAL.count(provider="stub") == total_before + 3
+    assert OUTBOUND_REQUESTS.value(provider="stub", status="200") == ok_before + 2
+    assert OUTBOUND_REQUESTS.value(provider="stub", status="503") >= 1
+
+
+@pytest.mark.asyncio
+async def test_provider_limit_caps_concurrent_requests():
+    stub = _Stub(delay=0.05)
+    server = await _serve(stub)
+    client = OutboundHTTPClient({"slow": 2})
+
+    async def _call() -> int:
+        async with client.borrow("slow") as session:
+            async with session.get(server.make_url("/")) as resp:
+                await resp.read()
+                return resp.status
+
+    try:
+        statuses = await asyncio.gather(*(_call() for _ in range(6)))
+    finally:
+        await client.close()
+        await server.close()
+
+    assert statuses == [200] * 6
+    assert stub.max_in_flight == 2
+    assert len(stub.peers) == 2
+
+
+@pytest.mark.asyncio
+async def test_providers_get_separate_pools_and_failures_are_counted():
+    client = OutboundHTTPClient({"a": 1}, default_limit=3)
+    errors_before = OUTBOUND_REQUESTS.value(provider="b", status="error")
+    try:
+        session_a, session_b = client.session("a"), client.session("b")
+        assert session_a is not session_b
+        assert session_b.connector.limit == 3
+        with pytest.raises(Exception):
+            await session_b.get("http://127.0.0.1:9/unreachable")
+    finally:
+        await client.close()
+
+    assert OUTBOUND_REQUESTS.value(provider="b", status="error") == errors_before + 1
+
+
+def test_session_from_finished_loop_is_closed_when_replaced():
+    client = OutboundHTTPClient({"stub": 1})
+
+    async def _take() -> object:
+        return client.session("stub")
+
+    first = asyncio.run(_take())
+    second = asyncio.run(_take())
+
+    assert first is not second
+    assert first.closed
+    assert client._sessions["stub"][1] is second
+    second.detach()
+
+
+def test_dedicated_session_is_closed_on_exit():
+    client = OutboundHTTPClient({"stub": 1})
+
+    async def _use() -> object:
+        async with client.dedicated("stub") as session:
+            assert not session.closed
+        return session
+
+    session = asyncio.run(_use())
+
+    assert session.closed
+    assert "stub" not in client._sessions
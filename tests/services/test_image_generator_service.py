@@ -7,12 +7,20 @@ import os
 import sys
 from unittest.mock import patch
 
+import pytest
 from PIL import Image
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
+@pytest.fixture(autouse=True)
+def _html_sound_cards(monkeypatch, tmp_path):
+    """These tests inspect the Jinja HTML, so keep cards on the browser path."""
+    monkeypatch.setenv("SOUND_CARD_RENDERER", "html")
+    monkeypatch.setenv("IMAGE_CACHE_DIR", str(tmp_path / "image_cache"))
+
+
 def _create_png_bytes(width: int, height: int) -> bytes:
     """Create in-memory PNG bytes for testing."""
     image = Image.new("RGBA", (width, height), (255, 0, 0, 255))
@@ -379,3 +387,18 @@ class TestImageGeneratorService:
         assert service._estimate_rl_store_canvas_height(0, 5) == 520
         assert service._estimate_rl_store_canvas_height(5, 5) == 760
         assert service._estimate_rl_store_canvas_height(10, 5) == 1120
+
+    def test_identical_sound_cards_render_once(self):
+        """Repeating a card with the same data should reuse the rendered PNG."""
+        from bot.services.image_generator import ImageGeneratorService
+
+        service = ImageGeneratorService()
+        rendered = _create_png_bytes(580, 180)
+
+        with patch.object(service, "_render_html_to_png", return_value=rendered) as render:
+            first = service._generate_sound_card_sync(sound_name="airhorn.mp3", requester="tester", play_count=3)
+            second = service._generate_sound_card_sync(sound_name="airhorn.mp3", requester="tester", play_count=3)
+            service._generate_sound_card_sync(sound_name="airhorn.mp3", requester="tester", play_count=4)
+
+        assert first == second
+        assert render.call_count == 2
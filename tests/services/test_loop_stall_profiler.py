@@ -0,0 +1,130 @@
+"""
+Tests for bot/services/loop_stall_profiler.py - EventLoopStallProfiler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from bot.services.loop_stall_profiler import (
+    EventLoopStallProfiler,
+    fold_stack,
+    playback_tag,
+)
+
+
+def _blocking_render(seconds):
+    """Stand-in for a synchronous call made on the event loop."""
+    time.sleep(seconds)
+
+
+def test_fold_stack_is_root_to_leaf():
+    """Folded stacks read outermost frame first."""
+
+    def inner():
+        return fold_stack(sys._getframe())
+
+    stack = inner()
+    frames = stack.split(";")
+    assert frames[-1].startswith("inner (test_loop_stall_profiler.py:")
+    assert frames[-2].startswith("test_fold_stack_is_root_to_leaf (")
+
+
+def test_playback_tag_uses_active_files():
+    """The root tag separates playback stalls from idle ones."""
+    assert playback_tag([]) == "idle"
+    assert playback_tag(
+        [{"audio_file": "/sounds/b b.mp3"}, {"audio_file": "/sounds/a.mp3"}]
+    ) == "playing:a.mp3,b_b.mp3"
+
+
+def test_poll_opens_and_closes_stall_with_fake_clock(tmp_path):
+    """Samples accumulate while the heartbeat is late and flush when it returns."""
+    profiler = EventLoopStallProfiler(
+        tmp_path,
+        threshold_seconds=0.2,
+        heartbeat_interval_seconds=0.05,
+        context_func=lambda: [{"audio_file": "song.mp3"}],
+    )
+    profiler._loop_thread_id = threading.get_ident()
+    profiler._last_beat = 100.0
+
+    profiler.poll(100.1)
+    assert profiler._current is None
+    profiler.poll(100.3)
+    profiler.poll(100.4)
+    assert sum(profiler._current.samples.values()) == 2
+
+    profiler._last_beat = 100.45
+    profiler.poll(100.46)
+
+    stats = profiler.stats()
+    assert stats["stall_count"] == 1
+    assert stats["recent_stalls"][0]["tag"] == "playing:song.mp3"
+    assert stats["recent_stalls"][0]["duration_ms"] == pytest.approx(350.0)
+    folded = list(tmp_path.glob("stalls-*.folded"))
+    assert len(folded) == 1
+    lines = folded[0].read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("playing:song.mp3;")
+    assert lines[0].endswith(" 2")
+
+
+def test_watchdog_sleeps_until_heartbeat_could_be_late(tmp_path):
+    """A healthy loop is not polled every sample period; an open stall is."""
+    profiler = EventLoopStallProfiler(tmp_path, threshold_seconds=0.25, heartbeat_interval_seconds=0.05)
+    profiler._loop_thread_id = threading.get_ident()
+    profiler._last_beat = 100.0
+
+    assert profiler.sample_interval_seconds >= 0.1
+    assert profiler._next_wait(100.0) == pytest.approx(0.3)
+    assert profiler._next_wait(100.25) == pytest.approx(profiler.sample_interval_seconds)
+
+    profiler.poll(100.4)
+    assert profiler._current is not None
+    assert profiler._next_wait(100.4) == profiler.sample_interval_seconds
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_on_loop_is_attributed(tmp_path):
+    """A real blocking call shows up in the sampled stack."""
+    profiler = EventLoopStallProfiler(
+        tmp_path,
+        threshold_seconds=0.1,
+        heartbeat_interval_seconds=0.02,
+        sample_interval_seconds=0.01,
+    )
+    profiler.start()
+    try:
+        await asyncio.sleep(0.1)
+        _blocking_render(0.4)
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if profiler.stats()["stall_count"]:
+                break
+    finally:
+        profiler.stop()
+
+    stats = profiler.stats()
+    assert stats["stall_count"] >= 1
+    assert "_blocking_render" in stats["recent_stalls"][0]["top_stack"]
+    assert not profiler.running
+
+
+def test_old_folded_files_are_pruned(tmp_path):
+    """Only ``retention_days`` of folded files are kept."""
+    (tmp_path / "stalls-20000101.folded").write_text("idle;x 1\n", encoding="utf-8")
+    profiler = EventLoopStallProfiler(tmp_path, retention_days=2)
+    profiler._loop_thread_id = threading.get_ident()
+    profiler._last_beat = 0.0
+    profiler.poll(1.0)
+    profiler._last_beat = 1.0
+    profiler.poll(1.01)
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert "stalls-20000101.folded" not in names
+    assert len(names) == 1
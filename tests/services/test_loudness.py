@@ -0,0 +1,113 @@
+"""
+Tests for bot/services/loudness.py - NumPy loudness analysis and processing.
+"""
+
+import numpy as np
+import pytest
+
+from bot.services import loudness
+from bot.services.loudness import (
+    LOUDNESS_RESULTS,
+    LoudnessNormalizer,
+    LoudnessTarget,
+    compress,
+    ingest_target,
+    integrated_loudness,
+    peak_dbfs,
+    process,
+    rms_dbfs,
+)
+
+RATE = 48000
+
+
+def _sine(amplitude: float, seconds: float = 3.0, freq: float = 997.0, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    wave = (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    return np.repeat(wave[:, None], channels, axis=1)
+
+
+def test_integrated_loudness_matches_bs1770_reference_levels():
+    # A full-scale 1 kHz sine in one channel reads -3.01 LUFS; stereo sums channels.
+    assert integrated_loudness(_sine(1.0), RATE) == pytest.approx(-3.01, abs=0.1)
+    assert integrated_loudness(_sine(0.5, channels=2), RATE) == pytest.approx(-6.02, abs=0.1)
+    # K-weighting attenuates low frequencies.
+    assert integrated_loudness(_sine(1.0, freq=40.0), RATE) < -5.0
+    # Silence after the tone is gated out instead of dragging the level down.
+    padded = np.concatenate([_sine(0.5), np.zeros((RATE * 3, 1), dtype=np.float32)])
+    assert integrated_loudness(padded, RATE) == pytest.approx(integrated_loudness(_sine(0.5), RATE), abs=0.5)
+    assert integrated_loudness(np.zeros((RATE, 2), dtype=np.float32), RATE) == float("-inf")
+
+
+def test_compressor_reduces_only_material_above_threshold():
+    quiet, loud = _sine(0.05, 1.0), _sine(0.9, 1.0)
+    compressed = compress(np.concatenate([quiet, loud]), RATE, threshold_dbfs=-14.0, ratio=6.0)
+
+    assert rms_dbfs(compressed[: RATE // 2]) == pytest.approx(rms_dbfs(quiet), abs=0.01)
+    expected = -14.0 + (rms_dbfs(loud) + 14.0) / 6.0
+    assert rms_dbfs(compressed[RATE + RATE // 2 :]) == pytest.approx(expected, abs=0.5)
+
+
+def test_process_hits_target_under_peak_ceiling_and_skips_no_ops():
+    target = LoudnessTarget(level=-16.0, measure="lufs", peak_ceiling_dbfs=-1.5)
+    output, report = process(_sine(0.1, channels=2), RATE, target)
+    assert report.output_level == pytest.approx(-16.0, abs=0.05)
+    assert peak_dbfs(output) <= -1.5 + 1e-3
+
+    # A quiet but peaky clip is limited by the ceiling rather than the target.
+    spiky = _sine(0.02, channels=2)
+    spiky[100] = 0.9
+    output, report = process(spiky, RATE, target)
+    assert report.output_level < -16.0
+    assert peak_dbfs(output) == pytest.approx(-1.5, abs=0.01)
+
+    rms_target = ingest_target(
+        -9.0,
+        peak_ceiling_dbfs=-2.0,
+        compression_enabled=False,
+        compression_threshold_dbfs=-14.0,
+        compression_ratio=6.0,
+    )
+    assert process(_sine(0.5), RATE, rms_target) is None
+    assert process(np.zeros((RATE, 1), dtype=np.float32), RATE, target) is None
+
+
+def test_normalizer_decodes_and_encodes_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        loudness, "decode_pcm", lambda path, ffmpeg: calls.append(("decode", path)) or (_sine(0.1), RATE)
+    )
+    monkeypatch.setattr(
+        loudness,
+        "encode_mp3",
+        lambda samples, rate, path, ffmpeg, bitrate: calls.append(("encode", path, round(rms_dbfs(samples), 1))),
+    )
+    normalized_before = LOUDNESS_RESULTS.value(source="test", result="normalized")
+
+    report = LoudnessNormalizer(max_workers=0).normalize(
+        "clip.mp3", LoudnessTarget(level=-20.0, measure="rms"), source="test"
+    )
+
+    assert report.gain_db == pytest.approx(-20.0 - rms_dbfs(_sine(0.1)), abs=0.01)
+    assert calls == [("decode", "clip.mp3"), ("encode", "clip.mp3", -20.0)]
+    assert LOUDNESS_RESULTS.value(source="test", result="normalized") == normalized_before + 1
+
+
+def test_worker_import_does_not_load_the_bot():
+    """Pool workers import this module; it must not pull in discord or the bot."""
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, bot.services.loudness; "
+            "print(sorted(m for m in ('discord', 'vosk', 'bot.core', 'bot.database') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,40 @@
+"""
+Tests for bot/services/metrics_server.py - MetricsHttpServer.
+"""
+
+from __future__ import annotations
+
+import aiohttp
+import pytest
+
+from bot.metrics import MetricsRegistry
+from bot.services.metrics_server import MetricsHttpServer
+
+
+def test_from_env_is_disabled_without_port(monkeypatch):
+    """The endpoint only starts when BOT_METRICS_PORT is set."""
+    monkeypatch.delenv("BOT_METRICS_PORT", raising=False)
+    assert MetricsHttpServer.from_env() is None
+
+    monkeypatch.setenv("BOT_METRICS_PORT", "9464")
+    server = MetricsHttpServer.from_env()
+    assert (server.host, server.port) == ("127.0.0.1", 9464)
+
+
+@pytest.mark.asyncio
+async def test_serves_registry_over_http():
+    """GET /metrics returns the registry with the bot prefix."""
+    registry = MetricsRegistry()
+    registry.counter("plays", "Plays.").inc(3)
+    server = MetricsHttpServer(port=0, registry=registry)
+    port = await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                body = await response.text()
+                content_type = response.headers["Content-Type"]
+    finally:
+        await server.stop()
+
+    assert content_type.startswith("application/openmetrics-text")
+    assert "bot_plays_total 3" in body
@@ -0,0 +1,227 @@
+"""
+Tests for bot/services/playback_queue_dispatcher.py - PlaybackQueueDispatcher.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from bot.services.playback_queue_dispatcher import (
+    PLAYBACK_QUEUE_UNPLAYED_INDEX,
+    PlaybackQueueDispatcher,
+)
+from bot.services.web_playback import ensure_playback_queue_identity_columns
+
+
+@pytest.fixture
+def queue_db(tmp_path):
+    """Create a playback_queue table as the web process leaves it."""
+    db_path = tmp_path / "queue.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE playback_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            sound_filename TEXT NOT NULL,
+            requested_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            played_at DATETIME
+        )
+        """
+    )
+    conn.commit()
+    conn.close()
+    ensure_playback_queue_identity_columns(str(db_path))
+    return str(db_path)
+
+
+def _enqueue(db_path, guild_id, sound_filename, request_type="play_sound", control_action=None):
+    """Insert one queue row the way the web process does."""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            "INSERT INTO playback_queue (guild_id, sound_filename, request_type, control_action) "
+            "VALUES (?, ?, ?, ?)",
+            (guild_id, sound_filename, request_type, control_action),
+        )
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def _played_ids(db_path):
+    """Return ids of rows with ``played_at`` set."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT id FROM playback_queue WHERE played_at IS NOT NULL")}
+    finally:
+        conn.close()
+
+
+def _marking_handler(db_path, calls, gates=None):
+    """Return a handler that records the row, waits on a gate and marks it played."""
+
+    async def _handler(row):
+        calls.append(row)
+        gate = (gates or {}).get(row[1])
+        if gate is not None:
+            await gate.wait()
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("UPDATE playback_queue SET played_at = CURRENT_TIMESTAMP WHERE id = ?", (row[0],))
+            conn.commit()
+        finally:
+            conn.close()
+        return True
+
+    return _handler
+
+
+class TestPlaybackQueueDispatcher:
+    """Tests for claiming and per-guild dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_adds_claim_column_index_and_processes_rows_in_order(self, queue_db):
+        """Rows in one guild run in request order and the schema is migrated once."""
+        first = _enqueue(queue_db, 1, "a.mp3")
+        second = _enqueue(queue_db, 1, "b.mp3")
+        calls = []
+        dispatcher = PlaybackQueueDispatcher(queue_db, _marking_handler(queue_db, calls), logger_func=lambda _: None)
+
+        assert await dispatcher.drain_once() == 2
+        await dispatcher.wait_idle()
+
+        assert [row[0] for row in calls] == [first, second]
+        assert calls[0][2] == "a.mp3"
+        assert _played_ids(queue_db) == {first, second}
+        conn = sqlite3.connect(queue_db)
+        index = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (PLAYBACK_QUEUE_UNPLAYED_INDEX,),
+        ).fetchone()
+        conn.close()
+        assert "played_at IS NULL" in index[0]
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_two_consumers_never_claim_the_same_row(self, queue_db):
+        """The UPDATE ... RETURNING claim gives each row to one dispatcher."""
+        for index in range(6):
+            _enqueue(queue_db, index % 2, f"{index}.mp3")
+        calls_a, calls_b = [], []
+        dispatcher_a = PlaybackQueueDispatcher(queue_db, _marking_handler(queue_db, calls_a), logger_func=lambda _: None)
+        dispatcher_b = PlaybackQueueDispatcher(queue_db, _marking_handler(queue_db, calls_b), logger_func=lambda _: None)
+
+        await asyncio.gather(dispatcher_a.drain_once(), dispatcher_b.drain_once())
+        await dispatcher_a.wait_idle()
+        await dispatcher_b.wait_idle()
+
+        ids_a = {row[0] for row in calls_a}
+        ids_b = {row[0] for row in calls_b}
+        assert ids_a.isdisjoint(ids_b)
+        assert len(ids_a | ids_b) == 6
+        await dispatcher_a.close()
+        await dispatcher_b.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_guild_does_not_block_other_guilds(self, queue_db):
+        """A request stuck in one guild leaves other guilds free to run."""
+        slow = _enqueue(queue_db, 1, "slow.mp3")
+        fast = _enqueue(queue_db, 2, "fast.mp3")
+        gate = asyncio.Event()
+        calls = []
+        dispatcher = PlaybackQueueDispatcher(
+            queue_db,
+            _marking_handler(queue_db, calls, gates={1: gate}),
+            logger_func=lambda _: None,
+        )
+
+        await dispatcher.drain_once()
+        for _ in range(50):
+            if fast in _played_ids(queue_db):
+                break
+            await asyncio.sleep(0.01)
+
+        assert _played_ids(queue_db) == {fast}
+        assert dispatcher.stats()["inflight"] == 1
+
+        # A second drain while the slow row is running does not re-dispatch it.
+        assert await dispatcher.drain_once() == 0
+        gate.set()
+        await dispatcher.wait_idle()
+        assert _played_ids(queue_db) == {slow, fast}
+        assert [row[0] for row in calls].count(slow) == 1
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_rapid_control_requests_coalesce_to_latest(self, queue_db):
+        """Repeated slaps waiting in a guild collapse into the newest one."""
+        gate = asyncio.Event()
+        blocker = _enqueue(queue_db, 1, "busy.mp3")
+        slaps = [_enqueue(queue_db, 1, "__web_control__", "slap", "slap") for _ in range(3)]
+        toggles = [_enqueue(queue_db, 1, "__web_control__", "toggle_mute", "toggle_mute") for _ in range(2)]
+        calls = []
+        dispatcher = PlaybackQueueDispatcher(
+            queue_db,
+            _marking_handler(queue_db, calls, gates={1: gate}),
+            logger_func=lambda _: None,
+        )
+
+        await dispatcher.drain_once()
+        gate.set()
+        await dispatcher.wait_idle()
+
+        assert [row[0] for row in calls] == [blocker, slaps[-1], *toggles]
+        assert _played_ids(queue_db) == {blocker, *slaps, *toggles}
+        assert dispatcher.stats()["coalesced"] == 2
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_claims_are_reclaimed_and_latency_is_recorded(self, queue_db):
+        """Rows claimed by a dead consumer run after the stale timeout."""
+        row_id = _enqueue(queue_db, 1, "a.mp3")
+        conn = sqlite3.connect(queue_db)
+        now = conn.execute("SELECT CAST(strftime('%s', 'now') AS REAL)").fetchone()[0]
+        conn.close()
+        calls = []
+        dispatcher = PlaybackQueueDispatcher(
+            queue_db,
+            _marking_handler(queue_db, calls),
+            stale_claim_seconds=30.0,
+            logger_func=lambda _: None,
+            time_func=lambda: now,
+        )
+        await asyncio.to_thread(dispatcher._claim_pending)
+        dispatcher._inflight.clear()
+
+        assert await dispatcher.drain_once() == 0
+
+        dispatcher._time = lambda: now + 31.0
+        assert await dispatcher.drain_once() == 1
+        await dispatcher.wait_idle()
+
+        assert [row[0] for row in calls] == [row_id]
+        stats = dispatcher.stats()
+        assert stats["started"] == 1
+        assert stats["latency_max_seconds"] >= 30.0
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_mark_row_played(self, queue_db):
+        """A failing handler does not leave the row to be retried forever."""
+        row_id = _enqueue(queue_db, 1, "a.mp3")
+
+        async def _failing(_row):
+            raise RuntimeError("boom")
+
+        dispatcher = PlaybackQueueDispatcher(queue_db, _failing, logger_func=lambda _: None)
+        await dispatcher.drain_once()
+        await dispatcher.wait_idle()
+
+        assert _played_ids(queue_db) == {row_id}
+        assert dispatcher.stats()["failed"] == 1
+        await dispatcher.close()
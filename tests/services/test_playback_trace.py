@@ -0,0 +1,100 @@
+"""
+Tests for bot/services/playback_trace.py - PlaybackTrace and PlaybackTracer.
+"""
+
+from __future__ import annotations
+
+import json
+
+from bot.services.playback_trace import PlaybackTrace, PlaybackTracer
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now: float = 50.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_trace_builds_span_tree_from_interaction_time():
+    clock = _Clock()
+    trace = PlaybackTrace(
+        "1-1000",
+        1,
+        "clip.mp3",
+        requested_at_unix=999.8,
+        time_func=clock,
+        wall_time_func=lambda: 1000.0,
+    )
+
+    with trace.span("voice_connect"):
+        clock.now += 0.3
+    spawn = trace.begin("ffmpeg_spawn")
+    trace.add_span("ffmpeg_probe", clock.now, clock.now + 0.05, parent="ffmpeg_spawn")
+    clock.now += 0.1
+    trace.end(spawn, codec="copy")
+    trace.mark("first_packet")
+    clock.now += 0.01
+    trace.finish()
+
+    summary = trace.to_dict()
+    spans = {span["name"]: span for span in summary["spans"]}
+    assert summary["status"] == "ok"
+    assert summary["started_at"] == 999.8
+    assert summary["total_ms"] == 610.0
+    assert spans["interaction"]["duration_ms"] == 200.0
+    assert spans["voice_connect"] == {
+        "name": "voice_connect",
+        "parent": "play",
+        "start_ms": 200.0,
+        "duration_ms": 300.0,
+    }
+    assert spans["ffmpeg_probe"]["parent"] == "ffmpeg_spawn"
+    assert spans["ffmpeg_spawn"]["attrs"] == {"codec": "copy"}
+    assert spans["first_packet"]["start_ms"] == 600.0
+    assert spans["first_packet"]["duration_ms"] == 0.0
+
+
+def test_trace_ignores_missing_or_invalid_interaction_time():
+    trace = PlaybackTrace("p", 1, "clip.mp3", requested_at_unix=object(), time_func=_Clock())
+
+    assert [span["name"] for span in trace.to_dict()["spans"]] == []
+
+
+def test_tracer_keeps_recent_traces_per_guild_and_finishes_once(tmp_path):
+    export_path = tmp_path / "traces" / "plays.jsonl"
+    tracer = PlaybackTracer(capacity=3, export_path=export_path, time_func=_Clock())
+
+    first = tracer.start("a", 1, "a.mp3")
+    second = tracer.start("b", 2, "b.mp3")
+    third = tracer.start("c", 1, "c.mp3")
+    assert tracer.get("b") is second
+
+    first.finish("muted")
+    first.finish("ok")
+    second.finish()
+    third.finish()
+
+    assert tracer.get("b") is None
+    assert [trace["play_id"] for trace in tracer.recent(limit=2)] == ["c", "b"]
+    assert [trace["play_id"] for trace in tracer.recent(guild_id=1)] == ["c", "a"]
+    lines = [json.loads(line) for line in export_path.read_text().splitlines()]
+    assert [(line["play_id"], line["status"]) for line in lines] == [
+        ("a", "muted"),
+        ("b", "ok"),
+        ("c", "ok"),
+    ]
+
+
+def test_tracer_abandons_oldest_active_trace_when_full():
+    tracer = PlaybackTracer(capacity=1, time_func=_Clock())
+
+    stale = tracer.start("old", 1, "old.mp3")
+    tracer.start("new", 1, "new.mp3")
+
+    assert stale.status == "abandoned"
+    assert tracer.get("old") is None
+    assert tracer.recent()[0]["play_id"] == "old"
@@ -0,0 +1,142 @@
+"""
+Tests for bot/services/progress_updates.py - shared progress-bar edit scheduler.
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import discord
+import pytest
+
+from bot.services.progress_updates import PROGRESS_EDITS, ProgressJob, ProgressUpdateScheduler
+
+
+def _job(key, edits, *, channel_id=1, duration=0.2, label=None, active=lambda: True, edit=None):
+    async def _record(text, final):
+        edits.append((key, text, final))
+        return True
+
+    return ProgressJob(
+        key=key,
+        channel_id=channel_id,
+        duration=duration,
+        offset=0.0,
+        label=label or (lambda elapsed: f"{elapsed:.2f}"),
+        final_label="done",
+        edit=edit or _record,
+        is_active=active,
+    )
+
+
+def test_interval_follows_duration_within_bounds():
+    scheduler = ProgressUpdateScheduler(min_interval=1.0, max_interval=3.0, steps=7)
+
+    assert scheduler.interval_for(3.0) == 1.0
+    assert scheduler.interval_for(14.0) == 2.0
+    assert scheduler.interval_for(600.0) == 3.0
+
+
+@pytest.mark.asyncio
+async def test_jobs_across_guilds_share_one_timer_and_skip_unchanged_labels():
+    scheduler = ProgressUpdateScheduler(min_interval=0.02, max_interval=0.02, channel_edits=100)
+    edits = []
+    unchanged_before = PROGRESS_EDITS.value(result="unchanged")
+
+    first = asyncio.create_task(scheduler.run(_job("a", edits, channel_id=1)))
+    second = asyncio.create_task(scheduler.run(_job("b", edits, channel_id=2, label=lambda elapsed: "static")))
+    await asyncio.sleep(0.05)
+    timer = scheduler._timer
+    assert scheduler.active_jobs() == 2
+    await asyncio.gather(first, second)
+
+    assert scheduler._timer is timer
+    assert edits[-1][2] and edits[-2][2]
+    assert {key for key, text, final in edits if final} == {"a", "b"}
+    # The static label is edited once, then only the final edit follows.
+    assert [text for key, text, final in edits if key == "b"] == ["static", "done"]
+    assert PROGRESS_EDITS.value(result="unchanged") > unchanged_before
+    assert scheduler.active_jobs() == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_back_off_and_stale_messages_stop():
+    scheduler = ProgressUpdateScheduler(min_interval=0.01, max_interval=0.01, channel_edits=100)
+    edits = []
+    response = Mock(status=429, reason="Too Many Requests")
+    calls = []
+
+    async def _limited(text, final):
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) == 1:
+            error = discord.HTTPException(response, {"message": "rate limited", "retry_after": 0.1})
+            error.retry_after = 0.1
+            raise error
+        edits.append(text)
+        return True
+
+    limited_before = PROGRESS_EDITS.value(result="rate_limited")
+    await scheduler.run(_job("a", edits, duration=0.15, edit=_limited))
+
+    assert PROGRESS_EDITS.value(result="rate_limited") == limited_before + 1
+    assert calls[1] - calls[0] >= 0.09
+    assert edits[-1] == "done"
+
+    stale = []
+    await scheduler.run(_job("b", stale, duration=5.0, active=lambda: False))
+    assert stale == []
+
+
+@pytest.mark.asyncio
+async def test_channel_budget_defers_edits_and_cancel_removes_job():
+    scheduler = ProgressUpdateScheduler(
+        min_interval=0.01, max_interval=0.01, channel_edits=2, channel_window=10.0
+    )
+    edits = []
+
+    task = asyncio.create_task(scheduler.run(_job("a", edits, duration=5.0)))
+    await asyncio.sleep(0.1)
+    assert len(edits) == 2
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler.active_jobs() == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_edit_does_not_hold_other_channels():
+    scheduler = ProgressUpdateScheduler(min_interval=0.01, max_interval=0.01, channel_edits=100)
+    edits = []
+    release = asyncio.Event()
+
+    async def _stuck(text, final):
+        await release.wait()
+        return True
+
+    slow = asyncio.create_task(scheduler.run(_job("slow", [], channel_id=1, duration=5.0, edit=_stuck)))
+    await scheduler.run(_job("fast", edits, channel_id=2, duration=0.1))
+
+    assert edits[-1] == ("fast", "done", True)
+    assert scheduler.active_jobs() == 1
+    release.set()
+    slow.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await slow
+
+
+@pytest.mark.asyncio
+async def test_failing_job_resolves_and_others_keep_running():
+    scheduler = ProgressUpdateScheduler(min_interval=0.01, max_interval=0.01, channel_edits=100)
+    edits = []
+
+    def _broken():
+        raise RuntimeError("guild state gone")
+
+    broken = asyncio.create_task(scheduler.run(_job("broken", [], active=_broken)))
+    await asyncio.wait_for(
+        asyncio.gather(broken, scheduler.run(_job("ok", edits, duration=0.1))),
+        timeout=2.0,
+    )
+
+    assert edits[-1] == ("ok", "done", True)
+    assert scheduler.active_jobs() == 0
@@ -0,0 +1,152 @@
+"""
+Tests for bot/services/sound_autocomplete.py - SoundAutocompleteService.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from bot.services.sound_autocomplete import (
+    IndexedSound,
+    SoundAutocompleteService,
+    SoundNameIndex,
+)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.replace(".mp3", "").replace("_", " ").replace("-", " ").split()).lower()
+
+
+class _FakeDatabase:
+    """Stand-in exposing the ``Database`` sound cache API used by the service."""
+
+    def __init__(self, sounds):
+        self.rows = sounds
+        self.refreshes = 0
+        self.fuzzy_calls = []
+        self.fuzzy_results = []
+        self.fuzzy_gate = None
+        self._sound_cache_normalized = None
+        self._cache_timestamp = None
+
+    def normalize_text(self, text):
+        return _normalize(text)
+
+    def refresh_sound_cache(self):
+        self.refreshes += 1
+        self._sound_cache_normalized = [(dict(row), _normalize(row["Filename"])) for row in self.rows]
+        self._cache_timestamp = float(self.refreshes)
+
+    def get_sound_cache_snapshot(self):
+        return self._sound_cache_normalized, self._cache_timestamp
+
+    def invalidate_sound_cache(self):
+        self._sound_cache_normalized = None
+        self._cache_timestamp = None
+
+    def get_sounds_by_similarity_indexed(self, query, num_results, guild_id=None):
+        if self.fuzzy_gate is not None:
+            self.fuzzy_gate.wait(timeout=5)
+        self.fuzzy_calls.append(query)
+        return [({"Filename": name}, 50.0) for name in self.fuzzy_results[:num_results]]
+
+
+class _FakeActions:
+    def __init__(self, counts=None):
+        self.counts = counts or {}
+
+    def get_play_counts_by_guild(self):
+        return self.counts
+
+
+def _row(sound_id, filename, guild_id=None, blacklist=0, is_elevenlabs=0):
+    return {
+        "id": sound_id,
+        "Filename": filename,
+        "guild_id": guild_id,
+        "blacklist": blacklist,
+        "is_elevenlabs": is_elevenlabs,
+    }
+
+
+def test_index_matches_token_prefixes_and_ranks_with_popularity_prior():
+    sounds = [
+        IndexedSound(1, "bom dia", "bom dia", None),
+        IndexedSound(2, "bom-dia-vietnam", "bom dia vietnam", None),
+        IndexedSound(3, "grande bomba", "grande bomba", None),
+        IndexedSound(4, "bomdia local", "bomdia local", "7"),
+        IndexedSound(5, "bom dia other guild", "bom dia other guild", "8"),
+    ]
+    index = SoundNameIndex(sounds, {None: {2: 3}, "7": {3: 500}})
+
+    assert index.search("bom dia", 10) == ["bom dia", "bom-dia-vietnam", "bom dia other guild"]
+    assert index.search("bomdia", 10, guild_id=7) == ["bom dia", "bom-dia-vietnam", "bomdia local"]
+    assert index.search("dia", 10, guild_id=7) == ["bom-dia-vietnam", "bom dia"]
+    # 500 guild plays lift an inner-token match above the whole-name prefix "bom dia".
+    assert index.search("bom", 4, guild_id=7) == ["bom-dia-vietnam", "bomdia local", "grande bomba", "bom dia"]
+    assert index.search("zzz", 10) == []
+
+
+def test_complete_uses_index_cache_and_rebuilds_after_invalidation():
+    database = _FakeDatabase([_row(1, "bruh.mp3"), _row(2, "bruh-2.mp3"), _row(3, "secret.mp3", blacklist=1)])
+    service = SoundAutocompleteService(database, _FakeActions())
+
+    async def _scenario():
+        first = await service.complete("BR", limit=2)
+        again = await service.complete("br", limit=2)
+        hidden = await service.complete("secret", limit=2)
+        database.rows.append(_row(4, "brutal.mp3"))
+        database.invalidate_sound_cache()
+        stale = await service.complete("bru", limit=3)
+        await service._rebuild
+        fresh = await service.complete("bru", limit=3)
+        return first, again, hidden, stale, fresh
+
+    first, again, hidden, stale, fresh = asyncio.run(_scenario())
+
+    assert first == again == ["bruh", "bruh-2"]
+    assert hidden == []
+    assert database.fuzzy_calls == ["secret", "bru"]
+    assert stale == ["bruh", "bruh-2"]
+    assert fresh == ["bruh", "brutal", "bruh-2"]
+    assert database.refreshes == 2
+    assert len(service._results) == 1
+
+
+def test_fuzzy_fill_tops_up_prefix_results_and_skips_short_queries():
+    database = _FakeDatabase([_row(1, "tambor.mp3")])
+    database.fuzzy_results = ["tambor.mp3", "tombola.mp3"]
+    service = SoundAutocompleteService(database, _FakeActions())
+
+    async def _scenario():
+        return await service.complete("tamb", limit=5), await service.complete("ta", limit=5)
+
+    typed, short = asyncio.run(_scenario())
+
+    assert typed == ["tambor", "tombola"]
+    assert short == ["tambor"]
+    assert database.fuzzy_calls == ["tamb"]
+
+
+def test_newer_keystroke_cancels_pending_fuzzy_fill():
+    database = _FakeDatabase([_row(1, "xylo.mp3")])
+    database.fuzzy_results = ["xylophone.mp3"]
+    database.fuzzy_gate = threading.Event()
+    service = SoundAutocompleteService(database, _FakeActions())
+
+    async def _scenario():
+        older = asyncio.ensure_future(service.complete("xyz", requester=42))
+        while 42 not in service._pending:
+            await asyncio.sleep(0)
+        newer = asyncio.ensure_future(service.complete("xyzz", requester=42))
+        await asyncio.sleep(0.01)
+        database.fuzzy_gate.set()
+        return await older, await newer
+
+    older, newer = asyncio.run(_scenario())
+
+    assert older == []
+    assert newer == ["xylophone"]
+    assert service._pending == {}
+    assert service._latest == {}
@@ -0,0 +1,146 @@
+"""
+Tests for bot/services/sound_duration.py - SoundDurationCache.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.repositories.sound_duration import SoundDurationRepository
+from bot.services.sound_duration import SoundDurationCache
+
+
+@pytest.fixture
+def duration_repository(db_connection, sample_sounds):
+    """Create a SoundDurationRepository bound to the test connection."""
+    from bot.repositories.base import BaseRepository
+
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    repo = SoundDurationRepository(use_shared=True)
+    repo.ensure_schema()
+    yield repo
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+class _Reader:
+    """Duration reader that records which sounds were read from disk."""
+
+    def __init__(self, durations):
+        self.durations = durations
+        self.calls: list[int] = []
+
+    def __call__(self, row):
+        self.calls.append(row["sound_id"])
+        return self.durations.get(row["sound_id"])
+
+
+def _rows(*sound_ids):
+    return [{"sound_id": sound_id} for sound_id in sound_ids]
+
+
+class TestSoundDurationCache:
+    """Tests for the per-process duration map."""
+
+    def test_reads_each_file_once_and_persists(self, duration_repository):
+        """Misses are read, stored, and then served from memory."""
+        cache = SoundDurationCache(repository=duration_repository)
+        reader = _Reader({1: 4.0, 2: 9.5})
+
+        assert cache.get_durations(_rows(1, 2), reader) == {1: 4.0, 2: 9.5}
+        assert cache.get_durations(_rows(1, 2), reader) == {1: 4.0, 2: 9.5}
+
+        assert reader.calls == [1, 2]
+        assert duration_repository.get_duration_map() == {1: 4.0, 2: 9.5}
+
+    def test_reloads_after_other_process_changes(self, duration_repository, db_connection):
+        """A rename elsewhere drops the stored duration and forces a re-read."""
+        cache = SoundDurationCache(repository=duration_repository)
+        reader = _Reader({1: 4.0})
+        cache.get_durations(_rows(1), reader)
+
+        db_connection.execute("UPDATE sounds SET Filename = 'other.mp3' WHERE id = 1")
+        reader.durations[1] = 6.0
+
+        assert cache.get_durations(_rows(1), reader) == {1: 6.0}
+        assert reader.calls == [1, 1]
+
+    def test_caps_disk_reads_per_call(self, duration_repository):
+        """A cold map fills over several calls instead of one long one."""
+        cache = SoundDurationCache(repository=duration_repository, max_reads_per_call=2)
+        reader = _Reader({1: 1.0, 2: 2.0, 3: 3.0})
+
+        assert cache.get_durations(_rows(1, 2, 3), reader) == {1: 1.0, 2: 2.0}
+        assert cache.get_durations(_rows(1, 2, 3), reader) == {1: 1.0, 2: 2.0, 3: 3.0}
+
+    def test_remembers_unreadable_files_briefly(self, duration_repository):
+        """Missing files are not re-read until the negative entry expires."""
+        now = [100.0]
+        cache = SoundDurationCache(
+            repository=duration_repository,
+            unreadable_ttl=30.0,
+            _time_func=lambda: now[0],
+        )
+        reader = _Reader({})
+
+        cache.get_durations(_rows(1), reader)
+        cache.get_durations(_rows(1), reader)
+        now[0] += 31.0
+        cache.get_durations(_rows(1), reader)
+
+        assert reader.calls == [1, 1]
+
+    def test_without_repository_reads_every_time(self):
+        """No persisted store means plain disk reads."""
+        cache = SoundDurationCache()
+        reader = _Reader({1: 2.0})
+
+        cache.get_durations(_rows(1), reader)
+        cache.get_durations(_rows(1), reader)
+        cache.record(1, 2.0)
+
+        assert reader.calls == [1, 1]
+
+    def test_record_adds_upload_duration(self, duration_repository):
+        """Recorded durations are served without touching disk."""
+        cache = SoundDurationCache(repository=duration_repository)
+        cache.record(3, 12.0)
+
+        assert cache.get_durations(_rows(3), _Reader({})) == {3: 12.0}
+
+    def test_missing_store_is_reprobed_only_after_ttl(self):
+        """A store without its table is not probed on every call."""
+        now = [0.0]
+        probes = []
+
+        class _MissingStore:
+            def is_available(self):
+                probes.append(now[0])
+                return False
+
+        cache = SoundDurationCache(
+            repository=_MissingStore(),
+            unavailable_ttl=30.0,
+            _time_func=lambda: now[0],
+        )
+        reader = _Reader({1: 2.0})
+
+        cache.get_durations(_rows(1), reader)
+        cache.get_durations(_rows(1), reader)
+        now[0] += 31.0
+        cache.get_durations(_rows(1), reader)
+
+        assert probes == [0.0, 31.0]
+        assert cache.version() is None
+
+    def test_version_is_withheld_while_cold_fill_is_pending(self, duration_repository):
+        """No validator is offered until capped reads have caught up."""
+        cache = SoundDurationCache(repository=duration_repository, max_reads_per_call=1)
+        reader = _Reader({1: 1.0, 2: 2.0})
+
+        cache.get_durations(_rows(1, 2), reader)
+        assert cache.version() is None
+
+        cache.get_durations(_rows(1, 2), reader)
+        assert cache.version() == duration_repository.get_version()
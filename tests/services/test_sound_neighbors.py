@@ -0,0 +1,122 @@
+"""
+Tests for bot/services/sound_neighbors.py - precomputed similar-sound lists.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+
+from bot.repositories.sound import SoundRepository
+from bot.repositories.sound_neighbors import SoundNeighborRepository
+from bot.services.sound_neighbors import SoundNeighborIndex
+from bot.services.web_sound_options import WebSoundOptionsService
+
+SOUNDS = [
+    (1, "big_honk.mp3", 0, None),
+    (2, "big-honk-remix.mp3", 0, None),
+    (3, "honk.mp3", 0, "111"),
+    (4, "owl hoot.mp3", 0, None),
+    (5, "hidden honk.mp3", 1, None),
+    (6, "other guild honk.mp3", 0, "222"),
+    (7, "sad trombone.mp3", 0, None),
+]
+
+
+@pytest.fixture
+def neighbor_repository(db_connection):
+    """Share the test connection and create the neighbor tables."""
+    from bot.repositories.base import BaseRepository
+
+    db_connection.executemany(
+        "INSERT INTO sounds (id, originalfilename, Filename, blacklist, is_elevenlabs, guild_id) "
+        "VALUES (?, ?, ?, ?, 0, ?)",
+        [(sound_id, name, name, blacklist, guild_id) for sound_id, name, blacklist, guild_id in SOUNDS],
+    )
+    db_connection.commit()
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    repository = SoundNeighborRepository()
+    repository.ensure_schema()
+    yield repository
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+def _live_similar(sound_id, filename, guild_id):
+    """Score similar sounds live, the way the web panel does without the table."""
+    service = WebSoundOptionsService(SoundRepository(), Mock(), Mock(), Mock(), Mock())
+    return service._get_similar_sounds(filename, sound_id, guild_id)
+
+
+class TestSoundNeighborIndex:
+    """Tests for building, reading and updating the neighbor table."""
+
+    def test_lookup_falls_back_until_lists_are_computed(self, neighbor_repository):
+        index = SoundNeighborIndex(neighbor_repository, top_k=5)
+
+        assert index.neighbors(1, None, 5) is None
+
+        assert index.refresh() > 0
+        expected = [row["sound_id"] for row in _live_similar(1, "big_honk.mp3", None)[:2]]
+        assert [sound["id"] for sound, _score in index.neighbors(1, None, 2)] == expected
+
+    def test_rebuild_matches_live_scoring(self, neighbor_repository):
+        index = SoundNeighborIndex(neighbor_repository, top_k=10, chunk_size=2)
+        index.rebuild()
+
+        for sound_id, name, _blacklist, guild_id in SOUNDS:
+            for scope in {None, guild_id, "111", "999"}:
+                if guild_id is not None and scope is not None and scope != guild_id:
+                    continue
+                expected = _live_similar(sound_id, name, scope)
+                found = index.neighbors(sound_id, scope, 10)
+                assert [(sound["id"], int(score)) for sound, score in found] == [
+                    (row["sound_id"], row["score"]) for row in expected
+                ]
+
+    def test_guild_without_local_sounds_reads_globals_only_list(self, neighbor_repository):
+        index = SoundNeighborIndex(neighbor_repository, top_k=10)
+        index.refresh()
+
+        found = index.neighbors(1, 999, 5)
+
+        assert found is not None
+        assert [sound["id"] for sound, _ in found] == [
+            row["sound_id"] for row in _live_similar(1, "big_honk.mp3", 999)[:5]
+        ]
+        assert {sound["guild_id"] for sound, _ in found} == {None}
+        assert index.neighbors(3, 999, 5) is None
+
+    def test_blacklisted_sounds_are_filtered_on_read(self, neighbor_repository):
+        index = SoundNeighborIndex(neighbor_repository, top_k=10)
+        index.rebuild()
+
+        with_blacklisted = [sound["id"] for sound, _ in index.neighbors(3, "111", 10)]
+        without = [sound["id"] for sound, _ in index.neighbors(3, "111", 10, include_blacklisted=False)]
+
+        assert 5 in with_blacklisted
+        assert 6 not in with_blacklisted
+        assert without == [sound_id for sound_id in with_blacklisted if sound_id != 5]
+
+    def test_triggers_queue_changes_and_refresh_updates_lists(self, neighbor_repository, db_connection):
+        index = SoundNeighborIndex(neighbor_repository, top_k=2)
+        index.refresh()
+        assert [sound["id"] for sound, _ in index.neighbors(7, None, 2)] != [8]
+
+        db_connection.execute(
+            "INSERT INTO sounds (id, originalfilename, Filename, is_elevenlabs) VALUES (8, 'x', 'sad trombones.mp3', 0)"
+        )
+        db_connection.execute("UPDATE sounds SET Filename = 'tiny owl.mp3' WHERE id = 2")
+        db_connection.execute("DELETE FROM sounds WHERE id = 4")
+        db_connection.commit()
+
+        assert index.refresh() > 0
+        assert neighbor_repository.take_queue() == []
+        assert index.neighbors(7, None, 1)[0][0]["id"] == 8
+        assert index.neighbors(4, None, 2) is None
+        for sound_id in (1, 2, 3, 5, 6, 7, 8):
+            name = db_connection.execute("SELECT Filename FROM sounds WHERE id = ?", (sound_id,)).fetchone()[0]
+            expected = [row["sound_id"] for row in _live_similar(sound_id, name, None)[:2]]
+            assert [sound["id"] for sound, _ in index.neighbors(sound_id, None, 2)] == expected
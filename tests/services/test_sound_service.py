@@ -419,3 +419,51 @@ class TestSoundServiceUpload:
         mock_normalize.assert_awaited_once_with(saved_path)
         mock_insert_sound.assert_called_once_with(filename, filename, guild_id=999)
         mock_invalidate_cache.assert_called_once()
+
+
+class TestSoundServiceSuggestions:
+    """Tests for post-play suggestion lookups."""
+
+    @pytest.fixture
+    def mock_service(self):
+        """Create a minimally mocked SoundService."""
+        from bot.services.sound import SoundService
+
+        return SoundService(
+            bot_behavior=Mock(),
+            bot=Mock(),
+            audio_service=Mock(),
+            message_service=Mock(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_neighbor_lookup_runs_off_the_event_loop(self, mock_service):
+        """The neighbor index and live fallback are both read in a worker thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        seen_threads = []
+        index = Mock()
+        index.neighbors.side_effect = lambda *args, **kwargs: seen_threads.append(threading.get_ident())
+        mock_service.sound_repo = Mock(get_sound=Mock(return_value=(7, "orig.mp3", "honk.mp3")))
+        mock_service.db = Mock(get_sounds_by_similarity=Mock(return_value=[]))
+        message = Mock(guild=Mock(id=5))
+
+        with patch("bot.services.sound.get_sound_neighbor_index", return_value=index):
+            await mock_service.find_and_update_similar_sounds(message, "honk.mp3", None)
+
+        index.neighbors.assert_called_once_with(7, 5, 26, include_blacklisted=False)
+        mock_service.db.get_sounds_by_similarity.assert_called_once_with("honk", 26, 0.00001, 5)
+        assert seen_threads and loop_thread not in seen_threads
+
+    def test_live_search_skipped_when_neighbors_are_known(self, mock_service):
+        """Precomputed neighbor lists are returned without the fuzzy fallback."""
+        neighbors = [({"id": 8, "Filename": "honk2.mp3"}, 90)]
+        index = Mock(neighbors=Mock(return_value=neighbors))
+        mock_service.sound_repo = Mock(get_sound=Mock(return_value=(7, "orig.mp3", "honk.mp3")))
+        mock_service.db = Mock()
+
+        with patch("bot.services.sound.get_sound_neighbor_index", return_value=index):
+            assert mock_service._lookup_similar_sounds("honk.mp3", None, 3) == neighbors
+
+        mock_service.db.get_sounds_by_similarity.assert_not_called()
@@ -0,0 +1,123 @@
+"""
+Tests for bot/services/speech_training_audio.py - SpeechTrainingAudioCache.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from bot.services.speech_training_audio import SpeechTrainingAudioCache, compute_peaks
+
+
+def _resolver(path, calls):
+    """Return a resolver that records each call."""
+
+    def _resolve():
+        calls.append(path)
+        return path if path.is_file() else None
+
+    return _resolve
+
+
+class TestSpeechTrainingAudioCache:
+    """Tests for the clip audio LRU."""
+
+    def test_hit_skips_resolver_and_keeps_small_clip_bytes(self, tmp_path):
+        """A repeat lookup only stats the file."""
+        clip = tmp_path / "a.mp3"
+        clip.write_bytes(b"abc")
+        cache = SpeechTrainingAudioCache()
+        calls = []
+
+        first = cache.get(1, _resolver(clip, calls))
+        second = cache.get(1, _resolver(clip, calls))
+
+        assert first is second
+        assert first.data == b"abc"
+        assert first.etag == f"clip-1-{first.version}"
+        assert len(calls) == 1
+
+    def test_version_lookup_does_not_read_bytes(self, tmp_path):
+        """Listing versions stats the file; bytes load on the first playback."""
+        clip = tmp_path / "a.mp3"
+        clip.write_bytes(b"abc")
+        cache = SpeechTrainingAudioCache()
+        calls = []
+
+        version = cache.version(1, _resolver(clip, calls))
+        assert cache._entries[1].data is None
+        entry = cache.get(1, _resolver(clip, calls))
+
+        assert entry.version == version
+        assert entry.data == b"abc"
+        assert len(calls) == 1
+
+    def test_rewritten_file_gets_new_version(self, tmp_path):
+        """Changing a clip in place (e.g. a trim) reloads the entry."""
+        clip = tmp_path / "a.mp3"
+        clip.write_bytes(b"abc")
+        cache = SpeechTrainingAudioCache()
+        calls = []
+        before = cache.get(1, _resolver(clip, calls))
+
+        clip.write_bytes(b"abcdef")
+        os.utime(clip, ns=(before.mtime_ns + 1_000_000, before.mtime_ns + 1_000_000))
+        after = cache.get(1, _resolver(clip, calls))
+
+        assert after.version != before.version
+        assert after.data == b"abcdef"
+        assert len(calls) == 2
+
+    def test_missing_file_returns_none_and_large_files_stay_on_disk(self, tmp_path):
+        """Missing clips are not cached and big clips are streamed from disk."""
+        big = tmp_path / "big.mp3"
+        big.write_bytes(b"x" * 32)
+        cache = SpeechTrainingAudioCache(max_inline_bytes=16)
+
+        assert cache.get(1, _resolver(tmp_path / "gone.mp3", [])) is None
+        entry = cache.get(2, _resolver(big, []))
+        assert entry.data is None
+        assert entry.path == big
+        assert cache.size == 1
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        """Inline bytes and entry count are both bounded."""
+        paths = []
+        for index in range(3):
+            path = tmp_path / f"{index}.mp3"
+            path.write_bytes(b"x" * 10)
+            paths.append(path)
+        cache = SpeechTrainingAudioCache(max_total_inline_bytes=20)
+
+        cache.get(0, _resolver(paths[0], []))
+        cache.get(1, _resolver(paths[1], []))
+        cache.get(0, _resolver(paths[0], []))
+        cache.get(2, _resolver(paths[2], []))
+
+        calls = []
+        cache.get(1, _resolver(paths[1], calls))
+        assert calls == [paths[1]]
+        assert cache.size == 2
+
+    def test_peaks_are_computed_once_per_version(self, tmp_path):
+        """The decoder runs once per clip version and bucket count."""
+        clip = tmp_path / "a.mp3"
+        clip.write_bytes(b"abc")
+        decoded = []
+
+        def _decoder(path):
+            decoded.append(path)
+            return np.array([0.0, 0.5, -1.0, 0.25], dtype=np.float32)
+
+        cache = SpeechTrainingAudioCache(decoder=_decoder)
+        assert cache.get_peaks(1, _resolver(clip, []), 2) == [0.5, 1.0]
+        assert cache.get_peaks(1, _resolver(clip, []), 2) == [0.5, 1.0]
+        assert len(decoded) == 1
+
+    def test_compute_peaks_handles_short_and_silent_input(self):
+        """More buckets than samples and silence still give fixed-size output."""
+        assert compute_peaks(np.array([0.2, -0.4]), 4) == [0.5, 0.5, 1.0, 1.0]
+        assert compute_peaks(np.zeros(10), 3) == [0.0, 0.0, 0.0]
+        assert compute_peaks(np.array([]), 2) == [0.0, 0.0]
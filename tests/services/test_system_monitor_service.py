@@ -638,6 +638,127 @@ def test_chrome_process_detail_json_safe(tmp_path):
     json.dumps(snap)
 
 
+# ======================================================================
+# HostSystemMonitorService — incremental process scanner
+# ======================================================================
+
+
+def _write_stat(root: Path, pid: int, name: str, ticks: int, start_ticks: int = 1) -> None:
+    """Write a full-width ``/proc/<pid>/stat`` line including starttime."""
+    fields = ["R", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", str(ticks), "0"]
+    fields += ["0", "0", "20", "0", "1", "0", str(start_ticks)]
+    _write_proc(root, f"{pid}/stat", f"{pid} ({name}) {' '.join(fields)}\n")
+
+
+def test_cmdline_is_read_once_per_pid(tmp_path, monkeypatch):
+    """Display names are resolved from cmdline only for newly seen pids."""
+    _make_proc_tree(tmp_path, processes={101: ("python", 10, 0, 1024)})
+    _write_proc_binary(tmp_path, "101/cmdline", b"python3\x00/app/bot.py\x00")
+    svc = HostSystemMonitorService(proc_root=str(tmp_path))
+    svc.get_snapshot()
+
+    real_open = open
+    cmdline_reads = []
+
+    def counting_open(path, *args, **kwargs):
+        if str(path).endswith("/cmdline"):
+            cmdline_reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    for tick in range(2, 5):
+        _make_proc_tree(
+            tmp_path,
+            cpu_fields=(100 * tick, 50, 25, 800 * tick, 10, 0, 0, 0, 0, 0),
+            processes={101: ("python", 10 * tick, 0, 1024)},
+        )
+        _write_proc_binary(tmp_path, "101/cmdline", b"python3\x00/app/bot.py\x00")
+        snap = svc.get_snapshot()
+        assert snap["top_processes"][0]["display_name"] == "bot.py"
+
+    assert len(cmdline_reads) == 1
+
+
+def test_reused_pid_gets_fresh_display_name(tmp_path):
+    """A new starttime for a known pid drops its cached state."""
+    _make_proc_tree(tmp_path)
+    _write_stat(tmp_path, 101, "python", 10, start_ticks=5)
+    _write_proc_binary(tmp_path, "101/cmdline", b"python3\x00/app/old.py\x00")
+    svc = HostSystemMonitorService(proc_root=str(tmp_path))
+    svc.get_snapshot()
+    _make_proc_tree(tmp_path, cpu_fields=(200, 50, 25, 1600, 10, 0, 0, 0, 0, 0))
+    _write_stat(tmp_path, 101, "python", 20, start_ticks=5)
+    assert svc.get_snapshot()["top_processes"][0]["display_name"] == "old.py"
+
+    _make_proc_tree(tmp_path, cpu_fields=(300, 50, 25, 2400, 10, 0, 0, 0, 0, 0))
+    _write_stat(tmp_path, 101, "python", 30, start_ticks=900)
+    _write_proc_binary(tmp_path, "101/cmdline", b"python3\x00/app/new.py\x00")
+    # The reused pid warms again before it is reported.
+    assert svc.get_snapshot()["top_processes"] == []
+
+    _make_proc_tree(tmp_path, cpu_fields=(400, 50, 25, 3200, 10, 0, 0, 0, 0, 0))
+    _write_stat(tmp_path, 101, "python", 40, start_ticks=900)
+    assert svc.get_snapshot()["top_processes"][0]["display_name"] == "new.py"
+
+
+def test_stat_descriptors_are_capped_and_closed(tmp_path, monkeypatch):
+    """Open ``stat`` fds stay under the cap and close when pids exit or scans stop."""
+    import shutil
+
+    monkeypatch.setenv("HOST_SYSTEM_MONITOR_MAX_PROC_FDS", "2")
+    procs = {pid: (f"proc{pid}", 10, 0, 1024) for pid in range(101, 105)}
+    _make_proc_tree(tmp_path, processes=procs)
+    svc = HostSystemMonitorService(proc_root=str(tmp_path))
+    svc.get_snapshot()
+    assert svc._open_proc_fds == 2
+
+    held = [pid for pid, entry in svc._proc_entries.items() if entry.fd is not None]
+    shutil.rmtree(tmp_path / str(held[0]))
+    svc.get_snapshot()
+    assert held[0] not in svc._proc_entries
+    assert svc._open_proc_fds == 1
+
+    svc.get_snapshot(top_limit=0)
+    assert svc._open_proc_fds == 0
+    assert svc._proc_entries == {}
+
+
+def test_slow_scan_defers_next_scan(tmp_path, monkeypatch):
+    """An expensive scan is followed by cached results until the interval passes."""
+    import bot.services.system_monitor as system_monitor
+
+    _make_proc_tree(tmp_path, processes={101: ("worker", 10, 0, 1024)})
+    svc = HostSystemMonitorService(proc_root=str(tmp_path))
+    svc.get_snapshot()
+    _make_proc_tree(
+        tmp_path,
+        cpu_fields=(200, 50, 25, 1600, 10, 0, 0, 0, 0, 0),
+        processes={101: ("worker", 50, 0, 1024)},
+    )
+
+    start = time.monotonic() + 1.0
+    clock = [start]
+    monkeypatch.setattr(system_monitor.time, "monotonic", lambda: clock[0])
+    real_scan = svc._scan_processes
+
+    def slow_scan(*args):
+        clock[0] += 0.2
+        return real_scan(*args)
+
+    monkeypatch.setattr(svc, "_scan_processes", slow_scan)
+    first = svc.get_snapshot()["top_processes"]
+    assert first[0]["pid"] == 101
+    assert svc._process_scan_interval(0.2) == pytest.approx(4.0)
+
+    clock[0] += 1.0
+    assert svc.get_snapshot()["top_processes"] == first
+    assert clock[0] == pytest.approx(start + 1.2)
+
+    clock[0] += 4.0
+    svc.get_snapshot()
+    assert clock[0] == pytest.approx(start + 5.4)
+
+
 # ======================================================================
 # HostSystemMonitorService — CPU temperature from sysfs
 # ======================================================================
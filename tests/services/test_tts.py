@@ -24,6 +24,12 @@ from bot.tts import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_tts_cache(tmp_path, monkeypatch):
+    """Keep the synthesis cache out of the real data directory."""
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "tts_cache"))
+
+
 # ============================================================================
 # Helper: build a TTS instance with minimal deps
 # ============================================================================
@@ -0,0 +1,87 @@
+"""
+Tests for bot/services/tts_cache.py and the cached TTS synthesis paths.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.services.tts_cache import TTS_CACHE_LOOKUPS, TTSAudioCache, tts_cache_key
+from bot.tts import TTS
+
+
+def _write(path, payload: bytes) -> str:
+    path.write_bytes(payload)
+    return str(path)
+
+
+def test_cache_key_covers_voice_text_and_settings():
+    base = dict(voice="v1", model="m", language="pt", text="ola", settings={"loudnorm_mode": "off"})
+
+    assert tts_cache_key("gtts", **base) == tts_cache_key("gtts", **base)
+    assert tts_cache_key("gtts", **base) != tts_cache_key("elevenlabs", **base)
+    assert tts_cache_key("gtts", **base) != tts_cache_key("gtts", **{**base, "voice": "v2"})
+    assert tts_cache_key("gtts", **base) != tts_cache_key("gtts", **{**base, "text": "olá"})
+    assert tts_cache_key("gtts", **base) != tts_cache_key(
+        "gtts", **{**base, "settings": {"loudnorm_mode": "two_pass"}}
+    )
+
+
+def test_fetch_copies_hits_and_evicts_least_recently_used(tmp_path):
+    cache = TTSAudioCache(tmp_path / "cache", max_bytes=10)
+    sounds = tmp_path / "sounds"
+
+    assert cache.fetch("a", str(sounds / "miss.mp3"), "gtts") is False
+    cache.store("a", _write(tmp_path / "a.mp3", b"aaaa"))
+    cache.store("b", _write(tmp_path / "b.mp3", b"bbbb"))
+    assert cache.fetch("a", str(sounds / "hit.mp3"), "gtts") is True
+    assert (sounds / "hit.mp3").read_bytes() == b"aaaa"
+
+    cache.store("c", _write(tmp_path / "c.mp3", b"cccc"))
+
+    assert cache.fetch("b", str(sounds / "evicted.mp3"), "gtts") is False
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == ["a.mp3", "c.mp3"]
+    assert cache.stats()["bytes"] == 8
+
+
+def test_index_is_rebuilt_from_disk_in_mtime_order(tmp_path):
+    directory = tmp_path / "cache"
+    first = TTSAudioCache(directory, max_bytes=100)
+    first.store("old", _write(tmp_path / "old.mp3", b"1234"))
+    first.store("new", _write(tmp_path / "new.mp3", b"5678"))
+    os.utime(directory / "old.mp3", (1, 1))
+
+    reopened = TTSAudioCache(directory, max_bytes=6)
+    reopened.store("newest", _write(tmp_path / "newest.mp3", b"90"))
+
+    assert not (directory / "old.mp3").exists()
+    assert reopened.fetch("new", str(tmp_path / "out.mp3"), "elevenlabs") is True
+
+
+def test_repeated_gtts_request_is_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "tts_cache"))
+    (tmp_path / "sounds").mkdir()
+    behavior = MagicMock()
+    behavior.play_audio = AsyncMock()
+    tts = TTS(behavior, MagicMock(), cooldown_seconds=0)
+    tts.loudnorm_mode = "off"
+    tts._get_default_voice_channel = MagicMock(return_value=MagicMock())
+
+    def _fake_gtts(**_kwargs):
+        engine = MagicMock()
+        engine.save.side_effect = lambda path: Path(path).write_bytes(b"speech")
+        return engine
+
+    hits_before = TTS_CACHE_LOOKUPS.value(provider="gtts", result="hit")
+    with patch("bot.tts.gTTS", side_effect=_fake_gtts) as gtts_cls, patch("bot.tts.Database"), patch(
+        "bot.tts.os.path.dirname", return_value=str(tmp_path / "bot")
+    ):
+        asyncio.run(tts.save_as_mp3("ola mundo", "pt"))
+        asyncio.run(tts.save_as_mp3("ola mundo", "pt"))
+
+    assert gtts_cls.call_count == 1
+    assert behavior.play_audio.await_count == 2
+    second_file = behavior.play_audio.await_args_list[1].args[1]
+    assert (tmp_path / "sounds" / second_file).read_bytes() == b"speech"
+    assert TTS_CACHE_LOOKUPS.value(provider="gtts", result="hit") == hits_before + 1
@@ -7,8 +7,7 @@ from bot.services.text_censor import TextCensorService
 from bot.services.web_control_room import WebControlRoomService
 
 
-def test_web_control_room_service_combines_runtime_and_mute(tmp_path):
-    db_path = tmp_path / "control_room_service.db"
+def _create_control_room_db(db_path):
     conn = sqlite3.connect(db_path)
     try:
         conn.execute("CREATE TABLE guild_settings (guild_id TEXT PRIMARY KEY)")
@@ -29,6 +28,11 @@ def test_web_control_room_service_combines_runtime_and_mute(tmp_path):
     finally:
         conn.close()
 
+
+def test_web_control_room_service_combines_runtime_and_mute(tmp_path):
+    db_path = tmp_path / "control_room_service.db"
+    _create_control_room_db(db_path)
+
     repository = WebControlRoomRepository(db_path=str(db_path), use_shared=False)
     repository.upsert_status(
         guild_id=123,
@@ -87,3 +91,83 @@ def test_web_control_room_service_combines_runtime_and_mute(tmp_path):
         {"id": "2", "name": "Diogo", "avatar_url": ""},
     ]
     assert logged_in_payload["status"]["current_requester"] == "web-user"
+
+
+def test_web_control_room_service_extrapolates_sampled_counters(tmp_path):
+    db_path = tmp_path / "control_room_service.db"
+    _create_control_room_db(db_path)
+
+    repository = WebControlRoomRepository(db_path=str(db_path), use_shared=False)
+    repository.upsert_status(
+        guild_id=123,
+        guild_name="Guild",
+        voice_connected=True,
+        voice_channel_id=456,
+        voice_channel_name="Voice",
+        voice_member_count=1,
+        voice_members=[],
+        is_playing=True,
+        is_paused=False,
+        current_sound="now.mp3",
+        current_requester="web-user",
+        current_duration_seconds=12.5,
+        current_elapsed_seconds=4.0,
+        muted=True,
+        mute_remaining_seconds=90,
+        sampled_at_unix=1_000.0,
+    )
+    clock = [1_003.0]
+    service = WebControlRoomService(
+        repository=repository,
+        db_path=str(db_path),
+        text_censor_service=TextCensorService(),
+        time_func=lambda: clock[0],
+    )
+
+    payload = service.get_status({})
+    assert payload["status"]["current_elapsed_seconds"] == 7.0
+    assert payload["mute"]["remaining_seconds"] == 87
+
+    clock[0] = 1_030.0
+    payload = service.get_status({})
+    assert payload["status"]["current_elapsed_seconds"] == 12.5
+    assert payload["mute"]["remaining_seconds"] == 60
+
+
+def test_web_control_room_service_returns_recent_play_traces(tmp_path):
+    db_path = tmp_path / "control_room_service.db"
+    _create_control_room_db(db_path)
+
+    trace = {
+        "play_id": "123-1",
+        "audio_file": "now.mp3",
+        "status": "ok",
+        "total_ms": 640.0,
+        "spans": [{"name": "voice_connect", "parent": "play", "start_ms": 0.0, "duration_ms": 310.0}],
+    }
+    repository = WebControlRoomRepository(db_path=str(db_path), use_shared=False)
+    repository.upsert_status(
+        guild_id=123,
+        guild_name="Guild",
+        voice_connected=True,
+        voice_channel_id=456,
+        voice_channel_name="Voice",
+        voice_member_count=0,
+        voice_members=[],
+        is_playing=False,
+        is_paused=False,
+        current_sound=None,
+        current_requester=None,
+        current_duration_seconds=None,
+        current_elapsed_seconds=None,
+        muted=False,
+        mute_remaining_seconds=0,
+        recent_play_traces=[trace],
+    )
+    service = WebControlRoomService(
+        repository=repository,
+        db_path=str(db_path),
+        text_censor_service=TextCensorService(),
+    )
+
+    assert service.get_status({})["status"]["recent_play_traces"] == [trace]
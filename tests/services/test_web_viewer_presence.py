@@ -0,0 +1,77 @@
+"""
+Tests for bot/services/web_viewer_presence.py and its repository.
+"""
+
+from __future__ import annotations
+
+from bot.repositories.web_viewer_presence import WebViewerPresenceRepository
+from bot.services.web_viewer_presence import WebViewerPresenceService
+
+
+class _Clock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _service(tmp_path, clock, worker_id="web:1") -> WebViewerPresenceService:
+    repository = WebViewerPresenceRepository(db_path=str(tmp_path / "presence.db"), use_shared=False)
+    return WebViewerPresenceService(
+        repository,
+        worker_id=worker_id,
+        write_interval_seconds=15.0,
+        stale_after_seconds=60.0,
+        time_func=clock,
+    )
+
+
+def test_streams_count_as_viewers_until_closed(tmp_path):
+    clock = _Clock()
+    service = _service(tmp_path, clock)
+
+    service.stream_opened()
+    service.stream_opened()
+    assert service.active_viewer_count() == 2
+
+    service.stream_closed()
+    service.stream_closed()
+    assert service.active_viewer_count() == 0
+
+
+def test_request_writes_are_throttled_and_expire(tmp_path):
+    clock = _Clock()
+    service = _service(tmp_path, clock)
+    writes = []
+    record = service.repository.record
+    service.repository.record = lambda *args: (writes.append(args), record(*args))
+
+    service.request_seen()
+    clock.now += 5.0
+    service.request_seen()
+    clock.now += 11.0
+    service.request_seen()
+
+    assert [args[3] for args in writes] == [1_000.0, 1_016.0]
+    assert service.active_viewer_count() == 1
+
+    clock.now += 61.0
+    assert service.active_viewer_count() == 0
+    service.request_seen()
+    assert len(writes) == 3
+
+
+def test_rows_from_dead_workers_are_ignored(tmp_path):
+    clock = _Clock()
+    alive = _service(tmp_path, clock, worker_id="web:1")
+    dead = _service(tmp_path, clock, worker_id="web:2")
+
+    dead.stream_opened()
+    clock.now += 120.0
+    alive.stream_opened()
+
+    assert alive.active_viewer_count() == 1
+    assert [row["worker_id"] for row in alive.repository.get_all()] == ["web:1", "web:2"]
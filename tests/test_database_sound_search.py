@@ -0,0 +1,87 @@
+"""
+Tests for Database similarity search backed by the sounds_fts trigram index.
+"""
+
+import pytest
+
+from bot.database import Database
+from bot.repositories.base import BaseRepository
+from bot.repositories.sound_search import SoundSearchRepository
+
+
+@pytest.fixture
+def indexed_database(db_connection, monkeypatch):
+    """Return a Database bound to the test connection with the FTS index built."""
+    db_connection.executemany(
+        "INSERT INTO sounds (id, originalfilename, Filename, blacklist, is_elevenlabs, guild_id) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (1, "big honk.mp3", "big honk.mp3", 0, 0, None),
+            (2, "honk honk honk.mp3", "honk honk honk.mp3", 0, 0, "111"),
+            (3, "quiet owl.mp3", "quiet owl.mp3", 0, 0, None),
+            (4, "honk blacklisted.mp3", "honk blacklisted.mp3", 1, 0, None),
+            (5, "honk other guild.mp3", "honk other guild.mp3", 0, 0, "222"),
+        ],
+    )
+    db_connection.commit()
+
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    for attribute in ("_sound_cache", "_sound_cache_normalized", "_sound_cache_by_id", "_cache_timestamp"):
+        monkeypatch.setattr(Database, attribute, None)
+    monkeypatch.setattr(Database, "_sound_search_available", False)
+
+    db = object.__new__(Database)
+    db.conn = db_connection
+    db.cursor = db_connection.cursor()
+    db.db_path = ":memory:"
+    db._ensure_sound_search_index()
+    yield db
+
+    BaseRepository._shared_connection = None
+    BaseRepository._shared_db_path = None
+
+
+def test_indexed_similarity_filters_and_ranks_candidates(indexed_database):
+    """Indexed search applies the same visibility rules as the full scan."""
+    results = indexed_database.get_sounds_by_similarity_indexed("honk", 2, guild_id=111)
+
+    assert [sound["id"] for sound, _score in results] == [2, 1]
+    assert Database._sound_search_available is True
+
+
+def test_indexed_similarity_falls_back_for_short_queries(indexed_database, monkeypatch):
+    """Queries too short for trigrams use the full in-memory scan."""
+    calls = []
+    original = Database.get_sounds_by_similarity
+
+    def _spy(self, req_sound, num_results=5, sleep_interval=0.0, guild_id=None):
+        calls.append(req_sound)
+        return original(self, req_sound, num_results, guild_id=guild_id)
+
+    monkeypatch.setattr(Database, "get_sounds_by_similarity", _spy)
+
+    results = indexed_database.get_sounds_by_similarity_indexed("ow", 1)
+
+    assert calls == ["ow"]
+    assert len(results) == 1
+
+
+def test_indexed_similarity_sees_new_sounds_after_cache_invalidation(indexed_database, db_connection):
+    """Triggers index new rows; the id cache reloads after invalidation."""
+    db_connection.execute(
+        "INSERT INTO sounds (id, originalfilename, Filename, blacklist, is_elevenlabs) VALUES (6, 'owl hoot.mp3', 'owl hoot.mp3', 0, 0)"
+    )
+    indexed_database.invalidate_sound_cache()
+
+    results = indexed_database.get_sounds_by_similarity_indexed("owl hoot", 1)
+
+    assert [sound["id"] for sound, _score in results] == [6]
+
+
+def test_sound_search_repository_unavailable_without_index(db_connection):
+    """Databases without the FTS table report the index as unavailable."""
+    BaseRepository.set_shared_connection(db_connection, ":memory:")
+    try:
+        assert SoundSearchRepository().is_available() is False
+    finally:
+        BaseRepository._shared_connection = None
+        BaseRepository._shared_db_path = None
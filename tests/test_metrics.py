@@ -0,0 +1,117 @@
+"""
+Tests for bot/metrics.py - MetricsRegistry and OpenMetrics rendering.
+"""
+
+from __future__ import annotations
+
+import gc
+import threading
+
+import pytest
+
+from bot.metrics import (
+    MetricsRegistry,
+    bot_metrics_textfile_path,
+    read_metrics_textfile,
+    write_metrics_textfile,
+)
+
+
+def test_counter_sums_per_thread_shards():
+    """Increments from several threads are merged at render time."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests", "Requests seen.", ("reason",))
+
+    def _work():
+        for _ in range(1000):
+            counter.inc(reason="a")
+
+    threads = [threading.Thread(target=_work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(2, reason="b")
+
+    assert counter.value(reason="a") == 4000
+    text = registry.render("bot_")
+    assert "# TYPE bot_requests counter" in text
+    assert 'bot_requests_total{reason="a"} 4000' in text
+    assert 'bot_requests_total{reason="b"} 2' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_exited_thread_shards_are_folded_into_base():
+    """Short-lived threads (one per Flask request) do not leave shards behind."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests", "Requests seen.")
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1,))
+
+    def _work():
+        counter.inc()
+        histogram.observe(0.05)
+
+    for _ in range(50):
+        thread = threading.Thread(target=_work)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert counter._shards == {}
+    assert histogram._shards == {}
+    assert counter.value() == 50
+    assert histogram.count() == 50
+    assert 'latency_seconds_bucket{le="0.1"} 50' in registry.render().splitlines()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets are cumulative and end with +Inf, count and sum."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("startup_seconds", "Startup.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'startup_seconds_bucket{le="0.1"} 1' in lines
+    assert 'startup_seconds_bucket{le="1"} 3' in lines
+    assert 'startup_seconds_bucket{le="+Inf"} 4' in lines
+    assert "startup_seconds_count 4" in lines
+    assert "startup_seconds_sum 4.05" in lines
+    assert histogram.count() == 4
+
+
+def test_gauges_and_redeclaration():
+    """Redeclaring returns the same metric; type clashes are rejected."""
+    registry = MetricsRegistry()
+    gauge = registry.gauge("depth", "Queue depth.")
+    gauge.set(3)
+    assert registry.gauge("depth", "Queue depth.") is gauge
+    with pytest.raises(ValueError):
+        registry.counter("depth", "Clash.")
+
+    callback = registry.gauge("inflight", "In flight.")
+    callback.set_function(lambda: 7)
+    text = registry.render("web_")
+    assert "web_depth 3" in text
+    assert "web_inflight 7" in text
+
+
+def test_label_values_are_escaped():
+    """Quotes and backslashes in label values stay parseable."""
+    registry = MetricsRegistry()
+    registry.counter("events", "Events.", ("name",)).inc(name='a"b\\c')
+    assert 'events_total{name="a\\"b\\\\c"} 1' in registry.render()
+
+
+def test_textfile_round_trip_drops_eof(tmp_path, monkeypatch):
+    """The bot export sits next to the database and is read without # EOF."""
+    monkeypatch.delenv("BOT_METRICS_TEXTFILE", raising=False)
+    path = bot_metrics_textfile_path(str(tmp_path / "database.db"))
+    assert path == str(tmp_path / "metrics" / "bot.prom")
+
+    registry = MetricsRegistry()
+    registry.gauge("up", "Up.").set(1)
+    write_metrics_textfile(path, registry.render("bot_"))
+
+    assert read_metrics_textfile(path) == "# TYPE bot_up gauge\n# HELP bot_up Up.\nbot_up 1\n"
+    assert read_metrics_textfile(str(tmp_path / "missing.prom")) == ""
@@ -180,6 +180,19 @@ class TestJavaScriptSyntax:
         assert "renderSystemMonitorHoverChart" in content
         assert "updateSystemMonitorChartReadout" in content
 
+    @pytest.mark.parametrize("filename", ["soundboard.js"])
+    def test_deep_pages_recount_after_total_ages(self, filename):
+        """Verify cursor pages only skip the count while the known total is recent."""
+        filepath = os.path.join(STATIC_DIR, filename)
+        assert os.path.exists(filepath), f"JS file not found: {filepath}"
+        with open(filepath, "r", encoding="utf-8") as fh:
+            content = fh.read()
+
+        assert "PAGE_COUNT_REFRESH_MS = 30000" in content
+        assert "hasFreshPageCount(cursorState) ? '&include_count=0' : ''" in content
+        assert "cursorState.totalPages !== null ? '&include_count=0'" not in content
+        assert "cursorState.signature === cursorSignature" in content
+
     @pytest.mark.parametrize("filename", SPEECH_TRAINING_ONLY)
     def test_keyword_confidence_wording(self, filename):
         """Verify keyword scan confidence chips show keyword name and percentage."""
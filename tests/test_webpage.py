@@ -2117,6 +2117,104 @@ def test_api_sound_durations_skips_missing_file(web_client, monkeypatch):
     assert response.get_json() == {"durations": {}}
 
 
+def test_api_sound_durations_all_serves_cached_map_with_etag(web_client, monkeypatch):
+    client, db_path = web_client
+    sounds_dir = Path(app.config["SOUNDS_DIR"])
+    (sounds_dir / "alpha.mp3").write_bytes(b"fake mp3")
+    (sounds_dir / "beta.mp3").write_bytes(b"fake mp3")
+    reads = []
+
+    class FakeAudioInfo:
+        length = 72.2
+
+    class FakeMp3:
+        info = FakeAudioInfo()
+
+        def __init__(self, path: str):
+            reads.append(Path(path).name)
+
+    monkeypatch.setattr("bot.services.web_content.MP3", FakeMp3)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, is_elevenlabs, blacklist, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (1, "alpha.mp3", "alpha.mp3", 0, 0, "2026-04-01 12:00:00"),
+                (2, "beta.mp3", "beta.mp3", 0, 1, "2026-04-01 12:00:00"),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    response = client.get("/api/sound_durations?all=1")
+    assert response.status_code == 200
+    assert response.get_json() == {"durations": {"1": "1:12"}}
+    etag = response.headers["ETag"]
+
+    revalidated = client.get("/api/sound_durations?all=1", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert reads == ["alpha.mp3"]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        stored = conn.execute("SELECT sound_id, duration_seconds FROM sound_durations").fetchall()
+    finally:
+        conn.close()
+    assert stored == [(1, 72.2)]
+
+
+def test_api_sound_durations_revalidates_without_building_payload(web_client, monkeypatch):
+    client, db_path = web_client
+    (Path(app.config["SOUNDS_DIR"]) / "alpha.mp3").write_bytes(b"fake mp3")
+
+    class FakeMp3:
+        class info:
+            length = 15.0
+
+        def __init__(self, path: str):
+            pass
+
+    monkeypatch.setattr("bot.services.web_content.MP3", FakeMp3)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, is_elevenlabs, blacklist, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (1, "alpha.mp3", "alpha.mp3", 0, 0, "2026-04-01 12:00:00"),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    etag = client.get("/api/sound_durations?sound_id=1").headers["ETag"]
+
+    from bot.services.web_content import WebContentService
+
+    builds = []
+    original = WebContentService.get_sound_durations
+
+    def _spy(self, *args, **kwargs):
+        builds.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(WebContentService, "get_sound_durations", _spy)
+    revalidated = client.get("/api/sound_durations?sound_id=1", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert builds == []
+
+    other_scope = client.get("/api/sound_durations?all=1", headers={"If-None-Match": etag})
+    assert other_scope.status_code == 200
+    assert len(builds) == 1
+
+
 def test_web_sound_rows_include_upload_hover_metadata(web_client):
     client, db_path = web_client
 
@@ -2265,6 +2363,7 @@ def test_web_table_endpoints_return_filter_options_and_apply_column_filters(web_
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {
             "action": ["favorite_sound", "play_from_list", "play_request"],
             "user": ["alice", "bob"],
@@ -2285,6 +2384,7 @@ def test_web_table_endpoints_return_filter_options_and_apply_column_filters(web_
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {
             "sound": ["alpha.mp3", "beta.mp3"],
             "user": ["bob"],
@@ -2304,6 +2404,7 @@ def test_web_table_endpoints_return_filter_options_and_apply_column_filters(web_
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {
             "sound": ["alpha.mp3", "beta.mp3", "gamma.mp3"],
             "date": ["2026-04-03", "2026-04-02", "2026-04-01"],
@@ -2363,6 +2464,7 @@ def test_all_sounds_endpoint_returns_and_applies_sound_list_filter(web_client):
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {
             "sound": ["alpha.mp3", "beta.mp3"],
             "date": ["2026-04-02", "2026-04-01"],
@@ -2962,6 +3064,7 @@ def test_favorites_endpoint_returns_and_applies_user_filter(web_client):
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {
             "sound": ["alpha.mp3", "beta.mp3", "gamma.mp3"],
             "user": ["alice", "bob"],
@@ -2999,6 +3102,7 @@ def test_actions_endpoint_can_skip_filter_metadata(web_client):
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {},
     }
 
@@ -3041,6 +3145,7 @@ def test_favorites_endpoint_can_skip_filter_metadata(web_client):
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {},
     }
 
@@ -3076,10 +3181,205 @@ def test_all_sounds_endpoint_can_skip_filter_metadata(web_client):
         ],
         "total_count": 1,
         "total_pages": 1,
+        "next_cursor": None,
         "filters": {},
     }
 
 
+def test_actions_endpoint_cursor_pages_follow_keyset_order(web_client):
+    client, db_path = web_client
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO actions (username, action, target, timestamp, guild_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                ("alice", "play_request", f"sound{index}.mp3", timestamp, "111")
+                for index, timestamp in enumerate(
+                    [
+                        "2026-04-04 12:00:00",
+                        "2026-04-04 12:01:00",
+                        "2026-04-04 12:01:00",
+                        "2026-04-04 12:01:00",
+                        "2026-04-04 12:02:00",
+                    ]
+                )
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    first_page = client.get("/api/actions?per_page=2&include_filters=0").get_json()
+    assert [item["display_filename"] for item in first_page["items"]] == ["sound4.mp3", "sound3.mp3"]
+    assert first_page["total_count"] == 5
+    assert first_page["next_cursor"]
+
+    second_page = client.get(
+        f"/api/actions?page=2&per_page=2&include_filters=0&include_count=0&cursor={first_page['next_cursor']}"
+    ).get_json()
+    assert [item["display_filename"] for item in second_page["items"]] == ["sound2.mp3", "sound1.mp3"]
+    assert second_page["total_count"] is None
+    assert second_page["total_pages"] is None
+
+    third_page = client.get(
+        f"/api/actions?page=3&per_page=2&include_filters=0&cursor={second_page['next_cursor']}"
+    ).get_json()
+    assert [item["display_filename"] for item in third_page["items"]] == ["sound0.mp3"]
+    assert third_page["total_count"] == 5
+    assert third_page["next_cursor"] is None
+
+
+def test_sound_table_cursors_continue_after_last_row(web_client):
+    client, db_path = web_client
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, favorite, slap, is_elevenlabs, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (1, "alpha.mp3", "alpha.mp3", 1, 0, 0, "2026-04-01 12:00:00"),
+                (2, "beta.mp3", "beta.mp3", 1, 0, 0, "2026-04-02 12:00:00"),
+                (3, "gamma.mp3", "gamma.mp3", 1, 0, 0, None),
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO actions (username, action, target, timestamp, guild_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                ("alice", "favorite_sound", "1", "2026-04-04 12:00:00", "111"),
+                ("alice", "favorite_sound", "2", "2026-04-04 12:05:00", "111"),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    def collect(endpoint: str) -> list[str]:
+        names: list[str] = []
+        url = f"/api/{endpoint}?per_page=1&include_filters=0"
+        for _ in range(5):
+            payload = client.get(url).get_json()
+            names.extend(item["display_filename"] for item in payload["items"])
+            if not payload["next_cursor"]:
+                break
+            url = f"/api/{endpoint}?per_page=1&include_filters=0&cursor={payload['next_cursor']}"
+        return names
+
+    assert collect("all_sounds") == ["beta.mp3", "alpha.mp3", "gamma.mp3"]
+    assert collect("favorites") == ["beta.mp3", "alpha.mp3", "gamma.mp3"]
+
+
+def test_sound_table_search_uses_fts_index_when_available(web_client):
+    from bot.repositories.sound_search import SoundSearchRepository
+
+    client, db_path = web_client
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, favorite, slap, is_elevenlabs, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (1, "Big-Honk.mp3", "honk renamed.mp3", 1, 0, 0, "2026-04-01 12:00:00"),
+                (2, "beta.mp3", "beta.mp3", 1, 0, 0, "2026-04-02 12:00:00"),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    SoundSearchRepository(db_path=str(db_path), use_shared=False).ensure_schema()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, favorite, slap, is_elevenlabs, timestamp)
+            VALUES (3, 'gamma-honk.mp3', 'gamma-honk.mp3', 0, 0, 0, '2026-04-03 12:00:00')
+            """
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    all_sounds = client.get("/api/all_sounds?search=HONK&include_filters=0").get_json()
+    favorites = client.get("/api/favorites?search=big-h&include_filters=0").get_json()
+    short_search = client.get("/api/all_sounds?search=be&include_filters=0").get_json()
+
+    assert [item["sound_id"] for item in all_sounds["items"]] == [3, 1]
+    assert all_sounds["total_count"] == 2
+    assert [item["sound_id"] for item in favorites["items"]] == [1]
+    assert favorites["total_count"] == 1
+    assert [item["sound_id"] for item in short_search["items"]] == [2]
+
+
+def test_sound_table_search_orders_by_relevance(web_client):
+    from bot.repositories.sound_search import SoundSearchRepository
+
+    client, db_path = web_client
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO sounds (id, originalfilename, Filename, favorite, slap, is_elevenlabs, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (1, "honk.mp3", "honk.mp3", 1, 0, 0, "2026-04-01 12:00:00"),
+                (2, "x.mp3", "a very long clip name that also says honk somewhere.mp3", 1, 0, 0, "2026-04-02 12:00:00"),
+                (3, "y.mp3", "honk honk.mp3", 1, 0, 0, "2026-04-03 12:00:00"),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    SoundSearchRepository(db_path=str(db_path), use_shared=False).ensure_schema()
+
+    first = client.get("/api/all_sounds?search=honk&per_page=2&include_filters=0").get_json()
+    second = client.get("/api/all_sounds?search=honk&page=2&per_page=2&include_filters=0").get_json()
+    favorites = client.get("/api/favorites?search=honk&include_filters=0").get_json()
+
+    assert [item["sound_id"] for item in first["items"]] == [1, 3]
+    assert first["next_cursor"] is None
+    assert [item["sound_id"] for item in second["items"]] == [2]
+    assert [item["sound_id"] for item in favorites["items"]] == [1, 3, 2]
+
+
+def test_paginated_endpoints_ignore_invalid_cursor(web_client):
+    client, db_path = web_client
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO actions (username, action, target, timestamp, guild_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            ("alice", "play_request", "alpha.mp3", "2026-04-04 12:00:00", "111"),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    response = client.get("/api/actions?include_filters=0&include_count=0&cursor=not-a-cursor")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [item["display_filename"] for item in payload["items"]] == ["alpha.mp3"]
+    assert payload["total_count"] == 1
+
+
 def test_soundboard_initial_render_skips_unused_filter_payloads(web_client):
     client, db_path = web_client
 
@@ -3246,6 +3546,41 @@ def test_system_monitor_endpoint_returns_json_safely(web_client):
     assert "top_processes" in payload
 
 
+def test_metrics_endpoint_serves_web_and_bot_metrics(web_client, monkeypatch):
+    """/metrics renders web metrics, appends the bot export and ends with one EOF."""
+    client, db_path = web_client
+    monkeypatch.delenv("BOT_METRICS_TEXTFILE", raising=False)
+    monkeypatch.delenv("METRICS_BEARER_TOKEN", raising=False)
+    metrics_dir = db_path.parent / "metrics"
+    metrics_dir.mkdir()
+    (metrics_dir / "bot.prom").write_text(
+        "# TYPE bot_playback_queue_inflight gauge\nbot_playback_queue_inflight 2\n# EOF\n",
+        encoding="utf-8",
+    )
+
+    client.get("/api/system_monitor/status")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+    body = response.get_data(as_text=True)
+    assert 'web_http_request_seconds_count{endpoint="system_monitor_status",status="2xx"}' in body
+    assert "bot_playback_queue_inflight 2" in body
+    assert body.count("# EOF") == 1
+    assert body.endswith("# EOF\n")
+
+    remote = {"REMOTE_ADDR": "203.0.113.7"}
+    assert client.get("/metrics", environ_base=remote).status_code == 403
+
+    monkeypatch.setenv("METRICS_BEARER_TOKEN", "secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
+    assert (
+        client.get("/metrics", headers={"Authorization": "Bearer secret"}, environ_base=remote).status_code
+        == 200
+    )
+
+
 def test_system_monitor_endpoint_clamps_limit(web_client):
     """The limit query parameter is clamped to 1-8."""
     client, _ = web_client
@@ -3507,6 +3842,34 @@ def test_control_room_status_cache_control_header(web_client):
     assert "max-age=0" in cc or "no-cache" in cc or "must-revalidate" in cc
 
 
+def test_api_requests_report_web_viewer_presence(web_client):
+    """Polling the API marks this worker as having a viewer for the bot."""
+    client, db_path = web_client
+    _clear_response_cache()
+
+    client.get("/")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'web_viewer_presence'"
+        ).fetchone() is None
+    finally:
+        conn.close()
+
+    client.get("/api/control_room/status")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT stream_clients, last_request_unix FROM web_viewer_presence"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert len(rows) == 1
+    assert rows[0][0] == 0
+    assert rows[0][1] == pytest.approx(time.time(), abs=30)
+
+
 def test_web_control_state_cache_returns_same_payload(web_client):
     """Two identical calls within TTL hit control-state service only once."""
     client, db_path = web_client
@@ -3873,6 +4236,58 @@ class TestSpeechTrainingRoutes:
         resp = client.get("/api/speech_training/clips/1/audio")
         assert resp.status_code == 404
 
+    def test_api_clip_audio_serves_versioned_cacheable_audio(self, web_client, tmp_path, monkeypatch):
+        """Audio carries a strong ETag, revalidates to 304 and is immutable when versioned."""
+        client, db_path = web_client
+        _login_web_user(client, username="admin", admin_guild_ids=["111"])
+        monkeypatch.setenv("SPEECH_TRAINING_DATA_DIR", str(tmp_path))
+        clip_dir = tmp_path / "111" / "user1_1"
+        clip_dir.mkdir(parents=True)
+        (clip_dir / "a.mp3").write_bytes(b"ID3" + b"\x00" * 64)
+        (clip_dir / "b.mp3").write_bytes(b"ID3" + b"\x01" * 64)
+
+        from bot.repositories.speech_training import SpeechTrainingRepository
+        from bot.services.web_speech_training import WebSpeechTrainingService
+
+        WebSpeechTrainingService(
+            SpeechTrainingRepository(db_path=db_path, use_shared=False), str(tmp_path)
+        ).ensure_schema()
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.executemany(
+                "INSERT INTO speech_training_clips "
+                "(guild_id, user_id, username, display_name, folder_name, filename, "
+                "relative_path, duration_seconds, byte_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    ("111", "1", "user1", "User One", "user1_1", "a.mp3", "111/user1_1/a.mp3", 1.0, 67),
+                    ("111", "1", "user1", "User One", "user1_1", "b.mp3", "111/user1_1/b.mp3", 1.0, 67),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        listing = client.get("/api/speech_training/clips?guild_id=111&per_page=1&sort=oldest").get_json()
+        version = listing["items"][0]["audio_version"]
+        assert version
+        assert [entry["id"] for entry in listing["prefetch"]] == [2]
+
+        resp = client.get(f"/api/speech_training/clips/1/audio?v={version}")
+        assert resp.status_code == 200
+        assert resp.data.startswith(b"ID3")
+        assert resp.headers["Cache-Control"] == "private, max-age=31536000, immutable"
+        etag = resp.headers["ETag"]
+        assert etag == f'"clip-1-{version}"'
+
+        revalidated = client.get("/api/speech_training/clips/1/audio", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["Cache-Control"] == "private, no-cache"
+
+        ranged = client.get("/api/speech_training/clips/1/audio", headers={"Range": "bytes=0-2"})
+        assert ranged.status_code == 206
+        assert ranged.data == b"ID3"
+
     def test_api_clip_label_update(self, web_client):
         """POST label updates the clip and reviewer metadata."""
         client, db_path = web_client